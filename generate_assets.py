@@ -55,8 +55,7 @@ def main():
         
         # Generate terrain tiles
         print("Generating terrain tiles...")
-        terrain_generator_path = os.path.join("src", "tools", "asset_generator", "terrain_generator.py")
-        subprocess.run([sys.executable, terrain_generator_path], check=True)
+        subprocess.run([sys.executable, "-m", "src.tools.asset_generator.terrain_generator"], check=True)
         
         # Record end time and calculate duration
         end_time = time.time()
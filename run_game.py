@@ -8,7 +8,6 @@ Main entry point for Nightfall Defenders game
 import sys
 import os
 import math
-import random
 import argparse
 
 # Add src directory to Python path
@@ -16,6 +15,13 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(current_dir, "src")
 sys.path.insert(0, src_dir)
 
+# Time the imports below when profiling startup
+startup_profiler = None
+if "--profile-startup" in sys.argv:
+    from engine.startup_profiler import StartupProfiler
+    startup_profiler = StartupProfiler()
+    startup_profiler.install()
+
 from direct.showbase.ShowBase import ShowBase
 from direct.gui.OnscreenText import OnscreenText
 from direct.gui.DirectGui import DirectFrame, DirectLabel, DirectButton, DGG
@@ -26,7 +32,6 @@ from panda3d.core import (
 )
 
 # Import game modules
-from game.player import Player
 from game.day_night_cycle import DayNightCycle
 from game.entity_manager import EntityManager
 from game.adaptive_difficulty import AdaptiveDifficultySystem
@@ -35,19 +40,20 @@ from game.main_menu import MainMenuScene
 from game.pause_menu import PauseMenu
 
 # Import physics systems
-from src.engine.physics import PhysicsManager
+from engine.physics import PhysicsManager
 
-# Import new systems
-from game.character_class import ClassManager, ClassType
-from game.skill_tree import SkillTree
-from game.class_selection_ui import ClassSelectionUI
-from game.skill_tree_ui import SkillTreeUI
+# Import new systems (UI screens shown after the main menu are imported on first use)
+from game.character_class import ClassManager
 import game.skill_definitions as skill_definitions
 from game.random_events import RandomEventSystem
 from game.night_fog import NightFog
+from game.world_chunks import WorldChunkManager
+from game.terrain import TerrainManager
+
+# Import engine systems
+from engine.resource_manager import ResourceManager
 
 # Import UI components
-from engine.ui.info_box import InfoBoxUI
 from engine.ui.notification import NotificationSystem
 
 class NightfallDefendersGame(ShowBase):
@@ -110,6 +116,8 @@ class NightfallDefendersGame(ShowBase):
         if self.ui_initialized:
             return
             
+        from engine.ui.info_box import InfoBoxUI
+        
         # Player stats box
         self.player_stats_box = InfoBoxUI(
             self, 
@@ -216,6 +224,9 @@ class NightfallDefendersGame(ShowBase):
     
     def setup_game_systems(self):
         """Initialize game systems"""
+        # Resource manager (asset loading and caching)
+        self.resource_manager = ResourceManager(self)
+        
         # Entity manager
         self.entity_manager = EntityManager(self)
         
@@ -330,6 +341,10 @@ class NightfallDefendersGame(ShowBase):
         if hasattr(self, 'audio_manager'):
             self.audio_manager.update(dt)
         
+        # Finish and start asynchronous asset loads
+        if hasattr(self, 'resource_manager'):
+            self.resource_manager.update()
+        
         # If game is paused, don't update gameplay systems
         if self.paused or not self.game_started:
             # Still update UI
@@ -352,6 +367,14 @@ class NightfallDefendersGame(ShowBase):
         # Update camera
         self.update_camera()
         
+        # Stream world chunks around the camera
+        if hasattr(self, 'world_chunks'):
+            self.world_chunks.update(self.camera.getPos(self.render))
+        
+        # Swap in rebuilt terrain blocks and update the terrain LOD
+        if hasattr(self, 'terrain'):
+            self.terrain.update()
+        
         # Update UI
         self.update_ui()
         
@@ -614,6 +637,7 @@ class NightfallDefendersGame(ShowBase):
                 self.create_ui()
             
             # Initialize skill tree UI
+            from game.skill_tree_ui import SkillTreeUI
             self.skill_tree_ui = SkillTreeUI(self, None, None)  # Will be properly initialized when player is created
             
             # Create the game world
@@ -678,7 +702,7 @@ class NightfallDefendersGame(ShowBase):
             
             # Initialize the renderer if not done yet
             if not hasattr(self, 'renderer'):
-                from src.engine.renderer import Renderer
+                from engine.renderer import Renderer
                 self.renderer = Renderer(self)
             
             # Set up the shader pipeline
@@ -819,6 +843,8 @@ class NightfallDefendersGame(ShowBase):
 
     def create_player(self):
         """Create the player after class selection"""
+        from game.player import Player
+        
         # Create the player
         self.player = Player(self)
         self.player.position = LVector3f(0, 0, 0)
@@ -864,40 +890,19 @@ class NightfallDefendersGame(ShowBase):
 
     def create_terrain(self):
         """Create the game terrain"""
-        # Create ground plane
-        try:
-            # Try to load plane model first
-            ground = self.loader.loadModel("models/plane")
-        except:
-            # Fallback to box model if plane isn't available
-            print("Plane model not found, using box model for ground instead")
-            ground = self.loader.loadModel("models/box")
-            ground.setScale(100, 100, 0.1)  # Make it flat like a plane
-        
-        ground.setColor(0.3, 0.6, 0.3, 1)  # Green color
-        ground.reparentTo(self.render)
+        # Noise heightfield rendered as level-of-detail terrain blocks
+        self.terrain = TerrainManager(self)
+        if hasattr(self, 'physics_manager'):
+            self.physics_manager.set_terrain(self.terrain)
         
         # Add some decoration to the terrain (trees, rocks, etc.)
         self.add_environment_objects()
     
     def add_environment_objects(self):
         """Add decorative objects to the environment"""
-        # Add some trees
-        try:
-            for i in range(20):
-                x = random.uniform(-50, 50)
-                y = random.uniform(-50, 50)
-                
-                # Don't place trees too close to the player start position
-                if abs(x) < 10 and abs(y) < 10:
-                    continue
-                    
-                tree = self.loader.loadModel("models/tree")
-                tree.setPos(x, y, 0)
-                tree.setScale(random.uniform(0.8, 1.2))
-                tree.reparentTo(self.render)
-        except:
-            print("Tree models not available, skipping environment decoration")
+        # Trees, rocks and resource nodes are streamed in chunks around the camera
+        self.world_chunks = WorldChunkManager(self)
+        self.world_chunks.update(Vec3(0, 0, 0))
     
     def setup_lighting(self):
         """Set up scene lighting"""
@@ -948,10 +953,17 @@ def main():
                         help='Enable adaptive difficulty system')
     parser.add_argument('--night-fog', action='store_true',
                         help='Enable night fog effect')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print import times and the time to the first frame')
     args = parser.parse_args()
     
     # Create and start the game
+    if startup_profiler:
+        startup_profiler.mark("imports done")
     app = NightfallDefendersGame()
+    if startup_profiler:
+        startup_profiler.mark("game initialized")
+        startup_profiler.watch_first_frame(app)
     
     # Apply command line options
     if args.debug:
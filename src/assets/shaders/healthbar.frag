@@ -0,0 +1,16 @@
+#version 330
+
+// Input from vertex shader
+in vec2 bar_uv;
+in float bar_fill;
+in vec4 bar_color;
+
+// Color of the empty part of the bar
+uniform vec4 frame_color;
+
+// Output color
+out vec4 fragColor;
+
+void main() {
+    fragColor = bar_uv.x <= bar_fill ? bar_color : frame_color;
+}
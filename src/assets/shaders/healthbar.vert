@@ -0,0 +1,33 @@
+#version 330
+
+// Standard vertex attributes
+uniform mat4 p3d_ModelViewMatrix;
+uniform mat4 p3d_ProjectionMatrix;
+in vec4 p3d_Vertex;
+
+// Per-bar attributes (repeated on each corner of the quad)
+in float visible;
+in vec2 corner;
+in float fill;
+in vec4 barcolor;
+
+// Size of a bar in world units
+uniform vec2 bar_size;
+
+// Output to fragment shader
+out vec2 bar_uv;
+out float bar_fill;
+out vec4 bar_color;
+
+void main() {
+    // Expand the quad around its anchor in view space so it faces the camera
+    vec4 view_pos = p3d_ModelViewMatrix * p3d_Vertex;
+    view_pos.xy += corner * bar_size;
+    
+    // Hidden or culled bars collapse outside the clip volume
+    gl_Position = visible > 0.5 ? p3d_ProjectionMatrix * view_pos : vec4(2.0, 2.0, 2.0, 1.0);
+    
+    bar_uv = corner + vec2(0.5);
+    bar_fill = fill;
+    bar_color = barcolor;
+}
@@ -4,18 +4,32 @@
 """
 Nightfall Defenders - Engine Module
 Core engine components for the game
+
+Exported classes are imported on first use (PEP 562).
 """
 
-from .config import GameConfig
-from .resource_manager import ResourceManager
-from .renderer import Renderer
-from .input_manager import InputManager
-from .scene_manager import SceneManager
+import importlib
+
+# Exported names and the submodules defining them
+_LAZY_EXPORTS = {
+    'GameConfig': '.config',
+    'ResourceManager': '.resource_manager',
+    'Renderer': '.renderer',
+    'InputManager': '.input_manager',
+    'SceneManager': '.scene_manager'
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    """Import an exported class from its submodule on first access"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    'GameConfig',
-    'ResourceManager',
-    'Renderer',
-    'InputManager',
-    'SceneManager'
-] 
+def __dir__():
+    """List the module attributes including the lazy exports"""
+    return sorted(set(globals()) | set(__all__))
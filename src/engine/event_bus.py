@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Event Bus for Nightfall Defenders
+Typed game events buffered per frame and delivered to subscribers in batches
+"""
+
+import struct
+
+class EventType:
+    """
+    Interned event type
+    
+    Each name maps to a single EventType for the whole process, with a
+    small integer id the bus indexes its buffers and subscribers by, so
+    emitting an event involves no string comparison.
+    """
+    
+    # Interned event types by name and by id
+    _by_name = {}
+    _by_id = []
+    
+    def __init__(self, type_id, name, fields):
+        """
+        Initialize the event type (use EventType.intern)
+        
+        Args:
+            type_id (int): Interned id
+            name (str): Event name
+            fields (tuple): Names of the event values
+        """
+        self.id = type_id
+        self.name = name
+        self.fields = fields
+    
+    @classmethod
+    def intern(cls, name, fields=()):
+        """
+        Get the event type of a name, creating it on first use
+        
+        Args:
+            name (str): Event name
+            fields (tuple): Names of the event values
+        
+        Returns:
+            EventType: The interned event type
+        """
+        event_type = cls._by_name.get(name)
+        if event_type is None:
+            event_type = cls(len(cls._by_id), name, tuple(fields))
+            cls._by_name[name] = event_type
+            cls._by_id.append(event_type)
+        elif event_type.fields != tuple(fields):
+            raise ValueError(f"Event type {name!r} already has fields {event_type.fields}")
+        return event_type
+    
+    @classmethod
+    def get(cls, type_id):
+        """
+        Get an event type by id
+        
+        Args:
+            type_id (int): Interned id
+        
+        Returns:
+            EventType: The event type
+        """
+        return cls._by_id[type_id]
+    
+    def __repr__(self):
+        return f"EventType({self.name!r}, {self.fields})"
+
+class EventBus:
+    """
+    Frame-batched event bus
+    
+    emit() stores the event values in a preallocated per-type buffer.
+    flush(), called once at the end of each frame, hands every subscriber
+    of a type the list of that type's events of the frame, in one call,
+    so the cost of an event does not grow with the number of subscribers.
+    Events emitted by subscribers during a flush are delivered on the
+    next flush.
+    """
+    
+    def __init__(self, capacity=64, recorder=None):
+        """
+        Initialize the event bus
+        
+        Args:
+            capacity (int): Initial number of buffered events per type and frame
+            recorder (EventRecorder): Optional recorder of the event stream
+        """
+        self.capacity = capacity
+        self.recorder = recorder
+        
+        # Per type id: event slots, number of used slots and subscribers
+        self.buffers = []
+        self.counts = []
+        self.subscribers = []
+        
+        # Ids of the types that have events this frame, in first-emit order
+        self.pending = []
+        
+        # Number of flushed frames
+        self.frame = 0
+    
+    def _ensure_type(self, type_id):
+        """Allocate the buffers of every type up to an id"""
+        while len(self.buffers) <= type_id:
+            self.buffers.append([None] * self.capacity)
+            self.counts.append(0)
+            self.subscribers.append([])
+    
+    def subscribe(self, event_type, callback):
+        """
+        Subscribe to the events of a type
+        
+        Args:
+            event_type (EventType): Event type
+            callback: Function receiving the list of value tuples of a frame
+        """
+        self._ensure_type(event_type.id)
+        self.subscribers[event_type.id].append(callback)
+    
+    def unsubscribe(self, event_type, callback):
+        """
+        Unsubscribe from the events of a type
+        
+        Args:
+            event_type (EventType): Event type
+            callback: Function passed to subscribe
+        """
+        if event_type.id < len(self.subscribers) and callback in self.subscribers[event_type.id]:
+            self.subscribers[event_type.id].remove(callback)
+    
+    def emit(self, event_type, *values):
+        """
+        Buffer an event until the end of the frame
+        
+        Args:
+            event_type (EventType): Event type
+            *values: Event values, in the order of the type's fields
+        """
+        type_id = event_type.id
+        if type_id >= len(self.buffers):
+            self._ensure_type(type_id)
+        
+        count = self.counts[type_id]
+        if count == 0:
+            self.pending.append(type_id)
+        
+        buffer = self.buffers[type_id]
+        if count == len(buffer):
+            # Grow the buffer for the rest of the session
+            buffer.extend([None] * len(buffer))
+        buffer[count] = values
+        self.counts[type_id] = count + 1
+    
+    def flush(self):
+        """
+        Deliver the events of the frame to the subscribers
+        
+        Returns:
+            int: Number of delivered events
+        """
+        pending = self.pending
+        if not pending:
+            self.frame += 1
+            return 0
+        
+        self.pending = []
+        delivered = 0
+        for type_id in pending:
+            count = self.counts[type_id]
+            buffer = self.buffers[type_id]
+            events = buffer[:count]
+            
+            # Release the slots before the callbacks run, so that events
+            # they emit are buffered for the next frame
+            self.counts[type_id] = 0
+            for i in range(count):
+                buffer[i] = None
+            
+            if self.recorder:
+                self.recorder.record(self.frame, EventType.get(type_id), events)
+            
+            for callback in self.subscribers[type_id]:
+                try:
+                    callback(events)
+                except Exception as e:
+                    print(f"Error delivering {EventType.get(type_id).name} events: {e}")
+            delivered += count
+        
+        self.frame += 1
+        return delivered
+    
+    def clear(self):
+        """Drop the buffered events without delivering them"""
+        for type_id in self.pending:
+            buffer = self.buffers[type_id]
+            for i in range(self.counts[type_id]):
+                buffer[i] = None
+            self.counts[type_id] = 0
+        self.pending = []
+
+# Record kinds of the binary event log
+_LOG_MAGIC = b"NFEV"
+_LOG_VERSION = 1
+_RECORD_TYPE = 1
+_RECORD_STRING = 2
+_RECORD_BATCH = 3
+
+# Value tags of the binary event log
+_VALUE_NONE = 0
+_VALUE_INT = 1
+_VALUE_FLOAT = 2
+_VALUE_STRING = 3
+_VALUE_TRUE = 4
+_VALUE_FALSE = 5
+
+def _pack_text(text):
+    """Pack a length-prefixed UTF-8 string"""
+    data = text.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+class EventRecorder:
+    """
+    Writes the event stream to a compact binary log
+    
+    The log starts with a magic number and a version. Event types and
+    string values are written once, the first time they appear, and then
+    referred to by id; each flushed frame adds one batch record per event
+    type with the frame number and the tagged values of its events.
+    """
+    
+    def __init__(self, path):
+        """
+        Open the log
+        
+        Args:
+            path (str): Path of the log file
+        """
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(_LOG_MAGIC + struct.pack("<H", _LOG_VERSION))
+        
+        # Ids already written to the log
+        self.written_types = set()
+        self.strings = {}
+    
+    def _pack_value(self, value, out):
+        """Append a tagged value to a buffer, defining new strings first"""
+        if value is None:
+            out += struct.pack("<B", _VALUE_NONE)
+        elif value is True:
+            out += struct.pack("<B", _VALUE_TRUE)
+        elif value is False:
+            out += struct.pack("<B", _VALUE_FALSE)
+        elif isinstance(value, int) and -2**63 <= value < 2**63:
+            out += struct.pack("<Bq", _VALUE_INT, value)
+        elif isinstance(value, (int, float)):
+            out += struct.pack("<Bd", _VALUE_FLOAT, value)
+        else:
+            text = str(value)
+            string_id = self.strings.get(text)
+            if string_id is None:
+                string_id = len(self.strings)
+                self.strings[text] = string_id
+                self.file.write(struct.pack("<BI", _RECORD_STRING, string_id) + _pack_text(text))
+            out += struct.pack("<BI", _VALUE_STRING, string_id)
+    
+    def record(self, frame, event_type, events):
+        """
+        Write the events of a type for one frame
+        
+        Args:
+            frame (int): Frame number
+            event_type (EventType): Event type
+            events (list): Value tuples of the events
+        """
+        if event_type.id not in self.written_types:
+            self.written_types.add(event_type.id)
+            record = bytearray(struct.pack("<BH", _RECORD_TYPE, event_type.id))
+            record += _pack_text(event_type.name)
+            record += struct.pack("<B", len(event_type.fields))
+            for field in event_type.fields:
+                record += _pack_text(field)
+            self.file.write(record)
+        
+        batch = bytearray()
+        for values in events:
+            batch += struct.pack("<B", len(values))
+            for value in values:
+                self._pack_value(value, batch)
+        self.file.write(struct.pack("<BHII", _RECORD_BATCH, event_type.id, frame, len(events)) + batch)
+    
+    def close(self):
+        """Close the log"""
+        if not self.file.closed:
+            self.file.close()
+
+def read_event_log(path):
+    """
+    Read a binary event log
+    
+    Args:
+        path (str): Path of the log file
+    
+    Returns:
+        list: (frame, event name, values dict) tuples in recorded order
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    if data[:4] != _LOG_MAGIC:
+        raise ValueError(f"{path} is not an event log")
+    version, = struct.unpack_from("<H", data, 4)
+    if version != _LOG_VERSION:
+        raise ValueError(f"Unsupported event log version {version}")
+    
+    def read_text(offset):
+        length, = struct.unpack_from("<H", data, offset)
+        start = offset + 2
+        return data[start:start + length].decode("utf-8"), start + length
+    
+    types = {}
+    strings = {}
+    events = []
+    offset = 6
+    while offset < len(data):
+        kind = data[offset]
+        offset += 1
+        if kind == _RECORD_TYPE:
+            type_id, = struct.unpack_from("<H", data, offset)
+            name, offset = read_text(offset + 2)
+            field_count = data[offset]
+            offset += 1
+            fields = []
+            for _ in range(field_count):
+                field, offset = read_text(offset)
+                fields.append(field)
+            types[type_id] = (name, fields)
+        elif kind == _RECORD_STRING:
+            string_id, = struct.unpack_from("<I", data, offset)
+            strings[string_id], offset = read_text(offset + 4)
+        elif kind == _RECORD_BATCH:
+            type_id, frame, count = struct.unpack_from("<HII", data, offset)
+            offset += 10
+            name, fields = types[type_id]
+            for _ in range(count):
+                value_count = data[offset]
+                offset += 1
+                values = []
+                for _ in range(value_count):
+                    tag = data[offset]
+                    offset += 1
+                    if tag == _VALUE_INT:
+                        value, = struct.unpack_from("<q", data, offset)
+                        offset += 8
+                    elif tag == _VALUE_FLOAT:
+                        value, = struct.unpack_from("<d", data, offset)
+                        offset += 8
+                    elif tag == _VALUE_STRING:
+                        string_id, = struct.unpack_from("<I", data, offset)
+                        value = strings[string_id]
+                        offset += 4
+                    else:
+                        value = {_VALUE_TRUE: True, _VALUE_FALSE: False}.get(tag)
+                    values.append(value)
+                events.append((frame, name, dict(zip(fields, values))))
+        else:
+            raise ValueError(f"Corrupt event log at byte {offset - 1}")
+    return events
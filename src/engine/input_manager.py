@@ -29,6 +29,10 @@ class InputManager(DirectObject):
         self.mouse_position = (0, 0)
         self.mouse_delta = (0, 0)
         self.last_mouse_position = (0, 0)
+        self.mouse_available = False
+        
+        # Session replay feeding the mouse position instead of the window
+        self.replay = None
         
         # Input mapping
         self.key_map = {
@@ -115,12 +119,28 @@ class InputManager(DirectObject):
         """
         self.action_states[action] = pressed
     
+    def read_mouse(self):
+        """
+        Read the mouse position of the current frame
+        
+        Returns:
+            tuple: (x, y) in screen space, or None when the pointer is outside the window
+        """
+        if self.replay:
+            return self.replay.mouse
+        
+        watcher = getattr(self.game, 'mouseWatcherNode', None)
+        if watcher is not None and watcher.hasMouse():
+            return (watcher.getMouseX(), watcher.getMouseY())
+        return None
+    
     def update(self, dt):
         """Update input state"""
         # Update mouse position and delta
-        if self.game.mouseWatcherNode.hasMouse():
-            x = self.game.mouseWatcherNode.getMouseX()
-            y = self.game.mouseWatcherNode.getMouseY()
+        position = self.read_mouse()
+        self.mouse_available = position is not None
+        if position is not None:
+            x, y = position
             
             self.mouse_position = (x, y)
             self.mouse_delta = (
@@ -181,6 +201,15 @@ class InputManager(DirectObject):
             
         return (x, y)
     
+    def has_mouse(self):
+        """
+        Check if the mouse pointer is inside the window
+        
+        Returns:
+            bool: True if the mouse position is valid
+        """
+        return self.mouse_available
+    
     def get_mouse_position(self):
         """
         Get the current mouse position
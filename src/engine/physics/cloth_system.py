@@ -15,7 +15,7 @@ from panda3d.core import (
     LineSegs, TransparencyAttrib
 )
 
-from src.engine.physics.verlet import VerletSystem, VerletPoint, DistanceConstraint
+from engine.physics.verlet import VerletSystem, VerletPoint, DistanceConstraint
 
 class ClothSystem:
     """Simulates cloth using Verlet physics"""
@@ -11,8 +11,8 @@ from typing import List, Dict, Tuple, Set, Optional
 from panda3d.core import Vec3, Point3, NodePath, CollisionTraverser, CollisionNode
 from panda3d.core import CollisionHandlerQueue, CollisionRay, CollisionSphere
 
-from src.engine.physics.verlet import VerletSystem, VerletPoint
-from src.engine.physics.cloth_system import ClothSystem
+from engine.physics.verlet import VerletSystem, VerletPoint
+from engine.physics.cloth_system import ClothSystem
 
 # Size of spatial grid cells for partitioning
 GRID_CELL_SIZE = 10.0
@@ -235,6 +235,10 @@ class PhysicsManager:
         # Static collision objects (terrain, buildings)
         self.static_collision_objects = {}
         
+        # Ground for the muscle-driven characters, set once the terrain exists
+        self.terrain = None
+        self.characters = {}
+        
         # Physics configuration
         self.gravity = Vec3(0, 0, -9.8)  # Default gravity
         self.verlet_system.set_gravity(self.gravity)
@@ -273,7 +277,8 @@ class PhysicsManager:
             "radius": radius,
             "mass": mass,
             "forces": [],  # List of forces acting on this entity
-            "verlet_rig": None  # Optional Verlet rig for animation
+            "verlet_rig": None,  # Optional Verlet rig for animation
+            "character_physics": None  # Optional muscle-driven character
         }
         
         # Add to spatial grid
@@ -320,6 +325,43 @@ class PhysicsManager:
         
         return joints
     
+    def set_terrain(self, terrain):
+        """
+        Set the terrain the characters stand on
+        
+        Args:
+            terrain: Terrain with height_at(x, y), or None for flat ground
+        """
+        self.terrain = terrain
+        for character in self.characters.values():
+            character.terrain = terrain
+    
+    def create_character_physics(self, entity_id: str, character_model: Dict, facing_right: bool = True):
+        """
+        Create a muscle-driven character for an entity, grounded on the terrain
+        
+        Args:
+            entity_id: Entity ID to create the character for
+            character_model: Character model from BodyPartGenerator
+            facing_right: Whether the character is facing right
+            
+        Returns:
+            CharacterPhysics: The character, or None for unknown entities
+        """
+        if entity_id not in self.physics_entities:
+            print(f"Warning: Cannot create character physics for unknown entity {entity_id}")
+            return None
+        
+        # Imported here so the engine does not load game modules at startup
+        from game.character_physics import CharacterPhysics
+        
+        entity = self.physics_entities[entity_id]
+        character = CharacterPhysics(self.verlet_system, terrain=self.terrain)
+        character.initialize_from_model(character_model, entity["position"], facing_right)
+        entity["character_physics"] = character
+        self.characters[entity_id] = character
+        return character
+    
     def create_cloth(self, position: Vec3, width: float, height: float, render_node: NodePath = None,
                     texture_path: str = None, cloth_type: str = "flag") -> Dict:
         """
@@ -427,6 +469,10 @@ class PhysicsManager:
         # Update Verlet physics (character animation and cloth)
         self.verlet_system.update(dt)
         
+        # Drive the muscle-driven characters, with ground contact from the terrain
+        for character in self.characters.values():
+            character.update(dt)
+        
         # Update cloth physics
         self.cloth_system.update(dt)
         
@@ -796,6 +842,7 @@ class PhysicsManager:
     def clear(self):
         """Clear all physics objects"""
         self.physics_entities.clear()
+        self.characters.clear()
         self.static_collision_objects.clear()
         self.spatial_grid.clear()
         
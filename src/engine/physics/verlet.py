@@ -24,8 +24,8 @@ class VerletPoint:
             mass: Point mass
             fixed: Whether the point is fixed (immovable)
         """
-        self.position = position.copy()
-        self.old_position = position.copy()
+        self.position = Vec3(position)
+        self.old_position = Vec3(position)
         self.acceleration = Vec3(0, 0, 0)
         self.mass = max(0.01, mass)  # Avoid zero mass
         self.inv_mass = 1.0 / self.mass if not fixed else 0.0
@@ -59,7 +59,7 @@ class VerletPoint:
         self.accumulated_force = Vec3(0, 0, 0)
         
         # Save current position
-        temp = self.position.copy()
+        temp = Vec3(self.position)
         
         # Verlet integration
         inertia = self.position - self.old_position
@@ -93,8 +93,8 @@ class VerletPoint:
         Args:
             position: New position
         """
-        self.position = position.copy()
-        self.old_position = position.copy()
+        self.position = Vec3(position)
+        self.old_position = Vec3(position)
     
     def move(self, delta: Vec3):
         """
@@ -35,6 +35,10 @@ class Renderer:
         # Setup graphics quality based on config
         self.setup_graphics_quality()
         
+        # Headless replays have no window to render to
+        if self.game.win is None:
+            return
+        
         # Create render targets
         self.setup_render_targets()
         
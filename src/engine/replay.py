@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Session Replay for Nightfall Defenders
+Records the inputs, random seed and frame times of a session and replays them
+"""
+
+import itertools
+import struct
+import time
+
+from direct.showbase.DirectObject import DirectObject
+from panda3d.core import ClockObject
+
+# Button events captured from the window
+_BUTTONS = (
+    [chr(c) for c in range(ord("a"), ord("z") + 1)] +
+    [str(d) for d in range(10)] +
+    [f"f{n}" for n in range(1, 13)] +
+    ["arrow_up", "arrow_down", "arrow_left", "arrow_right",
+     "space", "escape", "enter", "tab", "shift", "control", "alt",
+     "mouse1", "mouse2", "mouse3"]
+)
+
+# Held modifiers prefix the other buttons' events, in the window's modifier order
+# (e.g. "shift-w", "shift-control-w-up"); the modifier keys themselves are never prefixed
+_MODIFIERS = ("shift", "control", "alt", "meta")
+_MODIFIER_PREFIXES = [""] + ["-".join(held) + "-"
+                             for count in range(1, len(_MODIFIERS) + 1)
+                             for held in itertools.combinations(_MODIFIERS, count)]
+_EVENTS = [event for button in _BUTTONS if button not in _MODIFIERS
+           for event in (button, button + "-up")] + ["wheel_up", "wheel_down"]
+RECORDED_INPUTS = tuple([prefix + event for prefix in _MODIFIER_PREFIXES for event in _EVENTS] +
+                        [modifier + suffix for modifier in _MODIFIERS for suffix in ("", "-up")])
+
+# Record kinds of the session log
+_LOG_MAGIC = b"NFRP"
+_LOG_VERSION = 1
+_RECORD_STRING = 1
+_RECORD_INPUT = 2
+_RECORD_MOUSE = 3
+_RECORD_NO_MOUSE = 4
+_RECORD_SCENE = 5
+_RECORD_FRAME = 6
+
+def _pack_text(text):
+    """Pack a length-prefixed UTF-8 string"""
+    data = text.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+class SessionRecorder(DirectObject):
+    """
+    Writes a session to a compact binary log
+    
+    The log starts with a magic number, a version and the seed of the
+    shared random generator. Each frame then adds the input events
+    received since the previous frame, the mouse position and the scene
+    when they changed, and the frame dt.
+    """
+    
+    def __init__(self, path, seed):
+        """
+        Open the log and start capturing input events
+        
+        Args:
+            path (str): Path of the log file
+            seed (int): Seed of the shared random generator
+        """
+        DirectObject.__init__(self)
+        
+        self.path = path
+        self.seed = seed
+        self.file = open(path, "wb")
+        self.file.write(_LOG_MAGIC + struct.pack("<HQ", _LOG_VERSION, seed))
+        
+        # Strings already written to the log
+        self.strings = {}
+        
+        # Input events received since the last frame
+        self.inputs = []
+        
+        # Last written mouse position and scene
+        self.mouse = None
+        self.scene = None
+        self.frame = 0
+        
+        for name in RECORDED_INPUTS:
+            self.accept(name, self.inputs.append, [name])
+    
+    def _string_id(self, text):
+        """Get the id of a string, defining it in the log on first use"""
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings[text] = string_id
+            self.file.write(struct.pack("<BI", _RECORD_STRING, string_id) + _pack_text(text))
+        return string_id
+    
+    def begin_frame(self, game, dt):
+        """
+        Write the inputs and the state of a frame before it is updated
+        
+        Args:
+            game: The game instance
+            dt (float): Frame delta time
+        """
+        record = bytearray()
+        for name in self.inputs:
+            record += struct.pack("<BI", _RECORD_INPUT, self._string_id(name))
+        self.inputs.clear()
+        
+        mouse = game.input_manager.read_mouse()
+        if mouse != self.mouse:
+            if mouse is None:
+                record += struct.pack("<B", _RECORD_NO_MOUSE)
+            else:
+                record += struct.pack("<Bdd", _RECORD_MOUSE, mouse[0], mouse[1])
+            self.mouse = mouse
+        
+        scene = getattr(game.scene_manager, 'current_scene_name', None)
+        if scene is not None and scene != self.scene:
+            record += struct.pack("<BI", _RECORD_SCENE, self._string_id(scene))
+            self.scene = scene
+        
+        record += struct.pack("<Bd", _RECORD_FRAME, dt)
+        self.file.write(record)
+        self.frame += 1
+    
+    def close(self):
+        """Stop capturing input events and close the log"""
+        self.ignoreAll()
+        if not self.file.closed:
+            self.file.close()
+
+def read_session_log(path):
+    """
+    Read a session log
+    
+    Args:
+        path (str): Path of the log file
+    
+    Returns:
+        tuple: (seed, frames), each frame being a (dt, inputs, mouse, scene)
+            tuple; mouse is the position for the frame or None, scene is
+            None unless it changed before the frame
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    if data[:4] != _LOG_MAGIC:
+        raise ValueError(f"{path} is not a session log")
+    version, seed = struct.unpack_from("<HQ", data, 4)
+    if version != _LOG_VERSION:
+        raise ValueError(f"Unsupported session log version {version}")
+    
+    strings = {}
+    frames = []
+    inputs = []
+    mouse = None
+    scene = None
+    offset = 14
+    while offset < len(data):
+        kind = data[offset]
+        offset += 1
+        if kind == _RECORD_STRING:
+            string_id, length = struct.unpack_from("<IH", data, offset)
+            offset += 6
+            strings[string_id] = data[offset:offset + length].decode("utf-8")
+            offset += length
+        elif kind == _RECORD_INPUT:
+            string_id, = struct.unpack_from("<I", data, offset)
+            offset += 4
+            inputs.append(strings[string_id])
+        elif kind == _RECORD_MOUSE:
+            mouse = struct.unpack_from("<dd", data, offset)
+            offset += 16
+        elif kind == _RECORD_NO_MOUSE:
+            mouse = None
+        elif kind == _RECORD_SCENE:
+            string_id, = struct.unpack_from("<I", data, offset)
+            offset += 4
+            scene = strings[string_id]
+        elif kind == _RECORD_FRAME:
+            dt, = struct.unpack_from("<d", data, offset)
+            offset += 8
+            frames.append((dt, inputs, mouse, scene))
+            inputs = []
+            scene = None
+        else:
+            raise ValueError(f"Corrupt session log at byte {offset - 1}")
+    return seed, frames
+
+class SessionReplay:
+    """
+    Drives the game from a session log
+    
+    While replaying, live button events are renamed so the game only sees
+    the recorded ones, the mouse position comes from the log, and the
+    global clock is slaved to the recorded frame times so intervals run
+    exactly as they did. The wall-clock time of each replayed frame is
+    measured for profiling.
+    """
+    
+    def __init__(self, path):
+        """
+        Load a session log
+        
+        Args:
+            path (str): Path of the log file
+        """
+        self.path = path
+        self.seed, self.frames = read_session_log(path)
+        self.frame = 0
+        self.mouse = None
+        self.playing = False
+        
+        # Wall-clock duration of each replayed frame update, in seconds
+        self.frame_times = []
+        self.frame_start = None
+    
+    def start(self, game):
+        """
+        Take over the game's input and clock
+        
+        Args:
+            game: The game instance
+        """
+        self.playing = True
+        
+        # Live button events get a prefix no handler listens to
+        for thrower in getattr(game, 'buttonThrowers', None) or []:
+            thrower.node().setPrefix("live-")
+        
+        game.input_manager.replay = self
+        ClockObject.getGlobalClock().setMode(ClockObject.MSlave)
+    
+    def stop(self, game):
+        """
+        Give the input and the clock back to the player
+        
+        Args:
+            game: The game instance
+        """
+        self.playing = False
+        for thrower in getattr(game, 'buttonThrowers', None) or []:
+            thrower.node().setPrefix("")
+        game.input_manager.replay = None
+        ClockObject.getGlobalClock().setMode(ClockObject.MNormal)
+    
+    @property
+    def finished(self):
+        """Whether every recorded frame has been replayed"""
+        return self.frame >= len(self.frames)
+    
+    def begin_frame(self, game):
+        """
+        Apply the recorded inputs and state of the next frame
+        
+        Args:
+            game: The game instance
+        
+        Returns:
+            float: Recorded frame delta time, None once the log is exhausted
+        """
+        if self.finished:
+            return None
+        
+        dt, inputs, mouse, scene = self.frames[self.frame]
+        self.frame += 1
+        self.mouse = mouse
+        
+        clock = ClockObject.getGlobalClock()
+        clock.setFrameTime(clock.getFrameTime() + dt)
+        
+        for name in inputs:
+            game.messenger.send(name)
+        
+        # Scene changes made from GUI clicks are not input events
+        scene_manager = game.scene_manager
+        if scene is not None and getattr(scene_manager, 'current_scene_name', None) != scene:
+            scene_manager.change_scene(scene)
+        
+        self.frame_start = time.perf_counter()
+        return dt
+    
+    def end_frame(self):
+        """Measure the wall-clock time of the frame update"""
+        if self.frame_start is not None:
+            self.frame_times.append(time.perf_counter() - self.frame_start)
+            self.frame_start = None
+    
+    def get_summary(self):
+        """
+        Summarise the measured frame times
+        
+        Returns:
+            dict: Frame count and mean, median, p95, p99 and max times in milliseconds
+        """
+        times = sorted(self.frame_times)
+        if not times:
+            return {'frames': 0}
+        
+        def percentile(q):
+            return times[min(len(times) - 1, int(q * len(times)))] * 1000.0
+        
+        return {
+            'frames': len(times),
+            'mean_ms': sum(times) / len(times) * 1000.0,
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'max_ms': times[-1] * 1000.0
+        }
+    
+    def write_frame_times(self, path):
+        """
+        Write the frame-time curve as CSV
+        
+        Args:
+            path (str): Path of the CSV file
+        """
+        with open(path, "w") as f:
+            f.write("frame,dt,update_ms\n")
+            for i, update_time in enumerate(self.frame_times):
+                f.write(f"{i},{self.frames[i][0]:.6f},{update_time * 1000.0:.3f}\n")
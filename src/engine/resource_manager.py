@@ -7,18 +7,87 @@ Resource Manager for Nightfall Defenders
 
 import os
 import json
+import heapq
+import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from panda3d.core import (
     Texture, TextureStage, 
     PNMImage, Filename, 
-    SamplerState, LoaderOptions
+    SamplerState, LoaderOptions,
+    NodePath, CardMaker, Shader
 )
 
+class AssetRequest:
+    """
+    A queued or in-flight asset load
+    
+    Requests are resolved on the main thread by ResourceManager.update(),
+    which then calls every registered callback with the loaded asset (or
+    None if loading failed).
+    """
+    
+    def __init__(self, kind, key, args, priority):
+        """
+        Initialize the request
+        
+        Args:
+            kind (str): Asset kind ("texture", "model", "shader" or "sound")
+            key (str): Cache key of the asset
+            args (tuple): Arguments needed to load and store the asset
+            priority (float): Load priority, lower loads first
+        """
+        self.kind = kind
+        self.key = key
+        self.args = args
+        self.priority = priority
+        self.started = False
+        self.finished = False
+        self.result = None
+        self.callbacks = []
+    
+    def done(self):
+        """Check whether the asset has been loaded (or failed to load)"""
+        return self.finished
+    
+    def add_callback(self, callback):
+        """
+        Call a function with the asset once it has loaded
+        
+        Args:
+            callback (callable): Function taking the loaded asset; called
+                immediately if the request has already finished
+        """
+        if self.finished:
+            callback(self.result)
+        else:
+            self.callbacks.append(callback)
+    
+    def resolve(self, result):
+        """
+        Finish the request and run its callbacks
+        
+        Args:
+            result: The loaded asset or None
+        """
+        self.result = result
+        self.finished = True
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"Error in asset callback for {self.key}: {e}")
+
 class ResourceManager:
     """
     Manages loading and caching of game resources
     including textures, models, audio, and config files
     """
     
+    # Off-screen requests load after every on-screen one within this distance
+    OFFSCREEN_PRIORITY_PENALTY = 1000.0
+    
     def __init__(self, game):
         """Initialize the resource manager"""
         self.game = game
@@ -30,6 +99,22 @@ class ResourceManager:
         self.sounds = {}
         self.shaders = {}
         self.config_files = {}
+        self.atlases = {}
+        
+        # Asynchronous loading: requests by cache key, and a priority queue of
+        # (priority, sequence, request) waiting to start
+        self.requests = {}
+        self.request_queue = []
+        self.request_sequence = itertools.count()
+        self.max_in_flight = 4
+        self.in_flight = 0
+        self.async_loading = True
+        self.executor = None
+        self.completed = queue.Queue()
+        
+        # Shown until the real assets arrive
+        self.placeholder_model = None
+        self.placeholder_texture = None
         
         # Asset directories
         self.asset_dir = os.path.join("src", "assets")
@@ -74,21 +159,8 @@ class ResourceManager:
         if texture_path in self.textures:
             return self.textures[texture_path]
         
-        # Load the texture
-        full_path = os.path.join(self.asset_dir, texture_path)
-        texture = self.loader.loadTexture(full_path)
-        
-        if texture:
-            # Configure texture settings
-            texture.setMinfilter(minfilter)
-            texture.setMagfilter(magfilter)
-            
-            # Cache the texture
-            self.textures[texture_path] = texture
-            return texture
-        
-        print(f"Failed to load texture: {texture_path}")
-        return None
+        args = (texture_path, minfilter, magfilter)
+        return self._store_asset("texture", args, self._load_asset_file("texture", args))
     
     def load_model(self, model_path):
         """
@@ -101,19 +173,13 @@ class ResourceManager:
             NodePath: The loaded model
         """
         # Check if model is already loaded
-        if model_path in self.models:
-            return self.models[model_path].copyTo(self.game.render)
-        
-        # Load the model
-        full_path = os.path.join(self.asset_dir, model_path)
-        model = self.loader.loadModel(full_path)
+        if model_path not in self.models:
+            args = (model_path,)
+            self._store_asset("model", args, self._load_asset_file("model", args))
         
+        model = self.models.get(model_path)
         if model:
-            # Cache the model
-            self.models[model_path] = model
             return model.copyTo(self.game.render)
-        
-        print(f"Failed to load model: {model_path}")
         return None
     
     def load_shader(self, vertex_path, fragment_path):
@@ -133,19 +199,8 @@ class ResourceManager:
         if shader_key in self.shaders:
             return self.shaders[shader_key]
         
-        # Load the shader
-        vertex_path = os.path.join(self.shader_dir, vertex_path)
-        fragment_path = os.path.join(self.shader_dir, fragment_path)
-        
-        shader = self.loader.loadShader(vertex_path, fragment_path)
-        
-        if shader:
-            # Cache the shader
-            self.shaders[shader_key] = shader
-            return shader
-        
-        print(f"Failed to load shader: {vertex_path}, {fragment_path}")
-        return None
+        args = (vertex_path, fragment_path)
+        return self._store_asset("shader", args, self._load_asset_file("shader", args))
     
     def load_sound(self, sound_path, volume=1.0, looping=False):
         """
@@ -160,27 +215,377 @@ class ResourceManager:
             AudioSound: The loaded sound
         """
         # Check if sound is already loaded
-        if sound_path in self.sounds:
-            sound = self.sounds[sound_path]
-            sound.setVolume(volume)
-            sound.setLoop(looping)
-            return sound
-        
-        # Load the sound
-        full_path = os.path.join(self.sound_dir, sound_path)
-        sound = self.loader.loadSfx(full_path)
+        if sound_path not in self.sounds:
+            args = (sound_path,)
+            self._store_asset("sound", args, self._load_asset_file("sound", args))
         
+        sound = self.sounds.get(sound_path)
         if sound:
             sound.setVolume(volume)
             sound.setLoop(looping)
+        return sound
+    
+    def _get_model_path(self, model_path):
+        """
+        Find the file to load for a model path
+        
+        Args:
+            model_path (str): Path relative to the asset directory, or a
+                model on Panda3D's model path such as "models/box"
             
-            # Cache the sound
-            self.sounds[sound_path] = sound
-            return sound
+        Returns:
+            str: Path to pass to the loader
+        """
+        full_path = os.path.join(self.asset_dir, model_path)
+        for extension in ("", ".egg", ".bam", ".egg.pz"):
+            if os.path.isfile(full_path + extension):
+                return full_path
+        return model_path
+    
+    def _load_asset_file(self, kind, args):
+        """
+        Load an asset from disk without touching the caches
+        
+        This is the blocking part of a load and may run on a loader thread.
+        Sounds are only read here, to warm the file cache: Panda3D's audio
+        manager is not thread-safe, so _store_asset creates them.
         
-        print(f"Failed to load sound: {sound_path}")
+        Args:
+            kind (str): Asset kind
+            args (tuple): Load arguments of the asset
+            
+        Returns:
+            The loaded asset, the path of a sound to create, or None
+        """
+        if kind == "texture":
+            return self.loader.loadTexture(os.path.join(self.asset_dir, args[0]))
+        elif kind == "model":
+            return self.loader.loadModel(self._get_model_path(args[0]))
+        elif kind == "shader":
+            return Shader.load(Shader.SL_GLSL,
+                               vertex=os.path.join(self.shader_dir, args[0]),
+                               fragment=os.path.join(self.shader_dir, args[1]))
+        elif kind == "sound":
+            sound_path = os.path.join(self.sound_dir, args[0])
+            if os.path.isfile(sound_path):
+                with open(sound_path, 'rb') as f:
+                    f.read()
+            return sound_path
         return None
     
+    def _store_asset(self, kind, args, asset):
+        """
+        Configure and cache a loaded asset (main thread only)
+        
+        Args:
+            kind (str): Asset kind
+            args (tuple): Load arguments of the asset
+            asset: The loaded asset or None
+            
+        Returns:
+            The cached asset or None if loading failed
+        """
+        if kind == "sound" and isinstance(asset, str):
+            asset = self.loader.loadSfx(asset)
+        
+        if not asset:
+            if kind == "shader":
+                print(f"Failed to load shader: {args[0]}, {args[1]}")
+            else:
+                print(f"Failed to load {kind}: {args[0]}")
+            return None
+        
+        if kind == "texture":
+            texture_path, minfilter, magfilter = args
+            asset.setMinfilter(minfilter)
+            asset.setMagfilter(magfilter)
+            self.textures[texture_path] = asset
+        elif kind == "model":
+            self.models[args[0]] = asset
+        elif kind == "shader":
+            self.shaders[f"{args[0]}:{args[1]}"] = asset
+        elif kind == "sound":
+            self.sounds[args[0]] = asset
+        return asset
+    
+    def _get_cached_asset(self, kind, key):
+        """Get an asset from the cache of its kind, or None"""
+        cache = {"texture": self.textures, "model": self.models,
+                 "shader": self.shaders, "sound": self.sounds}[kind]
+        return cache.get(key)
+    
+    def get_load_priority(self, position=None):
+        """
+        Compute the load priority of an asset used at a world position
+        
+        Assets for on-screen positions load first, nearest to the player
+        first; off-screen assets follow.
+        
+        Args:
+            position (Vec3): World position where the asset is shown, or
+                None for assets needed right away (UI, player)
+            
+        Returns:
+            float: Priority, lower loads first
+        """
+        if position is None:
+            return 0.0
+        
+        priority = 0.0
+        player = getattr(self.game, 'player', None)
+        if player is not None and hasattr(player, 'position'):
+            priority = (position - player.position).length()
+        
+        if not self._is_on_screen(position):
+            priority += self.OFFSCREEN_PRIORITY_PENALTY
+        return priority
+    
+    def _is_on_screen(self, position):
+        """Check whether a world position is inside the camera frustum"""
+        if not hasattr(self.game, 'cam') or not hasattr(self.game, 'camNode'):
+            return True
+        try:
+            point = self.game.cam.getRelativePoint(self.game.render, position)
+            return self.game.camNode.isInView(point)
+        except Exception:
+            return True
+    
+    def _request_asset(self, kind, key, args, callback=None, priority=None, position=None):
+        """
+        Queue an asset load, joining a request already in flight for it
+        
+        Args:
+            kind (str): Asset kind
+            key (str): Cache key of the asset
+            args (tuple): Load arguments of the asset
+            callback (callable): Called with the asset once loaded
+            priority (float): Explicit priority, lower loads first
+            position (Vec3): World position used to compute the priority
+            
+        Returns:
+            AssetRequest: The request for the asset
+        """
+        if priority is None:
+            priority = self.get_load_priority(position)
+        
+        cached = self._get_cached_asset(kind, key)
+        request = self.requests.get((kind, key))
+        if cached is not None:
+            request = AssetRequest(kind, key, args, priority)
+            request.resolve(cached)
+        elif request is None:
+            request = AssetRequest(kind, key, args, priority)
+            self.requests[(kind, key)] = request
+            heapq.heappush(self.request_queue, (priority, next(self.request_sequence), request))
+        elif not request.started and priority < request.priority:
+            # Requeue at the more urgent priority; the old entry is skipped
+            request.priority = priority
+            heapq.heappush(self.request_queue, (priority, next(self.request_sequence), request))
+        
+        if callback is not None:
+            request.add_callback(callback)
+        return request
+    
+    def load_texture_async(self, texture_path, callback=None, priority=None, position=None,
+                           minfilter=SamplerState.FT_linear, magfilter=SamplerState.FT_linear):
+        """
+        Load a texture without blocking the frame
+        
+        Args:
+            texture_path (str): Path to the texture file
+            callback (callable): Called with the texture once loaded
+            priority (float): Explicit priority, lower loads first
+            position (Vec3): World position used to compute the priority
+            minfilter (int): Minification filter
+            magfilter (int): Magnification filter
+            
+        Returns:
+            AssetRequest: The request for the texture
+        """
+        return self._request_asset("texture", texture_path, (texture_path, minfilter, magfilter),
+                                   callback, priority, position)
+    
+    def load_model_async(self, model_path, callback=None, priority=None, position=None):
+        """
+        Load a model without blocking the frame
+        
+        The callback receives the cached model, which should be instanced
+        with copyTo() rather than reparented.
+        
+        Args:
+            model_path (str): Path to the model file
+            callback (callable): Called with the model once loaded
+            priority (float): Explicit priority, lower loads first
+            position (Vec3): World position used to compute the priority
+            
+        Returns:
+            AssetRequest: The request for the model
+        """
+        return self._request_asset("model", model_path, (model_path,), callback, priority, position)
+    
+    def load_shader_async(self, vertex_path, fragment_path, callback=None, priority=None):
+        """
+        Load a shader program without blocking the frame
+        
+        Args:
+            vertex_path (str): Path to the vertex shader
+            fragment_path (str): Path to the fragment shader
+            callback (callable): Called with the shader once loaded
+            priority (float): Explicit priority, lower loads first
+            
+        Returns:
+            AssetRequest: The request for the shader
+        """
+        return self._request_asset("shader", f"{vertex_path}:{fragment_path}",
+                                   (vertex_path, fragment_path), callback, priority)
+    
+    def load_sound_async(self, sound_path, callback=None, priority=None, position=None):
+        """
+        Load a sound without blocking the frame
+        
+        Args:
+            sound_path (str): Path to the sound file
+            callback (callable): Called with the sound once loaded
+            priority (float): Explicit priority, lower loads first
+            position (Vec3): World position used to compute the priority
+            
+        Returns:
+            AssetRequest: The request for the sound
+        """
+        return self._request_asset("sound", sound_path, (sound_path,), callback, priority, position)
+    
+    def attach_model_async(self, model_path, parent, callback=None, priority=None, position=None,
+                           fallback=None):
+        """
+        Attach a model that shows a placeholder until it has loaded
+        
+        Transforms and colors set on the returned node also apply to the
+        real model once it replaces the placeholder.
+        
+        Args:
+            model_path (str): Path to the model file
+            parent (NodePath): Node to attach the model to
+            callback (callable): Called with the returned node once the model is in
+            priority (float): Explicit priority, lower loads first
+            position (Vec3): World position used to compute the priority
+            fallback (callable): Called with the returned node when the model fails
+                to load, replacing the placeholder
+            
+        Returns:
+            NodePath: Node holding the placeholder, then the model
+        """
+        holder = parent.attachNewNode(f"Model_{os.path.basename(model_path)}")
+        placeholder = self.get_placeholder_model().instanceTo(holder)
+        
+        def on_loaded(model):
+            if holder.isEmpty():
+                return
+            if model is not None:
+                placeholder.removeNode()
+                model.copyTo(holder)
+            elif fallback is not None:
+                placeholder.removeNode()
+                fallback(holder)
+            if callback is not None:
+                callback(holder)
+        
+        self.load_model_async(model_path, on_loaded, priority, position)
+        return holder
+    
+    def apply_texture_async(self, texture_path, node_path, priority=None, position=None):
+        """
+        Texture a node, showing a placeholder texture until it has loaded
+        
+        Args:
+            texture_path (str): Path to the texture file
+            node_path (NodePath): Node to texture
+            priority (float): Explicit priority, lower loads first
+            position (Vec3): World position used to compute the priority
+            
+        Returns:
+            AssetRequest: The request for the texture
+        """
+        if texture_path not in self.textures:
+            node_path.setTexture(self.get_placeholder_texture(), 1)
+        
+        def on_loaded(texture):
+            if texture is not None and not node_path.isEmpty():
+                node_path.setTexture(texture, 1)
+        
+        return self.load_texture_async(texture_path, on_loaded, priority, position)
+    
+    def get_placeholder_model(self):
+        """Get the model shown while a model is loading"""
+        if self.placeholder_model is None:
+            cm = CardMaker("placeholder")
+            cm.setFrame(-0.5, 0.5, 0, 1)
+            self.placeholder_model = NodePath(cm.generate())
+            self.placeholder_model.setColor(0.5, 0.5, 0.5, 1)
+            self.placeholder_model.setBillboardPointEye()
+        return self.placeholder_model
+    
+    def get_placeholder_texture(self):
+        """Get the texture shown while a texture is loading"""
+        if self.placeholder_texture is None:
+            self.placeholder_texture = self.create_empty_texture(1, 1, (0.5, 0.5, 0.5, 1))
+        return self.placeholder_texture
+    
+    def update(self):
+        """Finish completed loads and start queued ones, most urgent first"""
+        self._finish_completed_loads()
+        
+        while self.request_queue and self.in_flight < self.max_in_flight:
+            priority, _, request = heapq.heappop(self.request_queue)
+            
+            # Skip entries superseded by a more urgent requeue
+            if request.started or priority != request.priority:
+                continue
+            
+            request.started = True
+            self.in_flight += 1
+            if self.async_loading:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                                       thread_name_prefix="ResourceLoader")
+                self.executor.submit(self._load_in_background, request)
+            else:
+                self._load_in_background(request)
+        
+        if not self.async_loading:
+            self._finish_completed_loads()
+    
+    def _load_in_background(self, request):
+        """
+        Load the asset of a request (runs on a loader thread)
+        
+        Args:
+            request (AssetRequest): The request to load
+        """
+        try:
+            asset = self._load_asset_file(request.kind, request.args)
+        except Exception as e:
+            print(f"Error loading {request.kind} {request.key}: {e}")
+            asset = None
+        self.completed.put((request, asset))
+    
+    def _finish_completed_loads(self):
+        """Cache loaded assets and resolve their requests on the main thread"""
+        while True:
+            try:
+                request, asset = self.completed.get_nowait()
+            except queue.Empty:
+                break
+            
+            self.in_flight -= 1
+            self.requests.pop((request.kind, request.key), None)
+            request.resolve(self._store_asset(request.kind, request.args, asset))
+    
+    def shutdown(self):
+        """Stop the loader threads"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+    
     def load_config(self, config_path):
         """
         Load a JSON configuration file
@@ -209,6 +614,59 @@ class ResourceManager:
             print(f"Failed to load config: {config_path} - {e}")
             return None
     
+    def load_atlas(self, index_path):
+        """
+        Load a generated texture atlas and its page textures
+        
+        Args:
+            index_path (str): Path to the atlas index, relative to the asset directory
+            
+        Returns:
+            dict: The atlas index, or None if it could not be loaded
+        """
+        if index_path in self.atlases:
+            return self.atlases[index_path]
+        
+        try:
+            with open(os.path.join(self.asset_dir, index_path), 'r') as f:
+                index = json.load(f)
+        except Exception as e:
+            print(f"Failed to load atlas: {index_path} - {e}")
+            return None
+        
+        # Pages sit next to the index; every sprite of a page shares its texture
+        atlas_dir = os.path.dirname(index_path)
+        index["textures"] = [self.load_texture(os.path.join(atlas_dir, page_file))
+                             for page_file in index.get("page_files", [])]
+        
+        self.atlases[index_path] = index
+        return index
+    
+    def get_atlas_frame(self, index_path, sprite, frame=0):
+        """
+        Get the texture and UV rectangle of one frame of an atlas sprite
+        
+        Args:
+            index_path (str): Path to the atlas index, as passed to load_atlas
+            sprite (str): Sprite name in the atlas
+            frame (int): Frame number, wrapped around the sprite's frame count
+            
+        Returns:
+            tuple: (Texture, (u0, v0, u1, v1)) or None if the sprite is unknown
+        """
+        index = self.load_atlas(index_path)
+        if not index or sprite not in index["sprites"]:
+            return None
+        
+        frames = index["sprites"][sprite]["frames"]
+        page, x, y, width, height = frames[frame % len(frames)]
+        page_width, page_height = index["pages"][page]
+        
+        # Atlas rows run top-down, texture V runs bottom-up
+        uv = (x / page_width, 1.0 - (y + height) / page_height,
+              (x + width) / page_width, 1.0 - y / page_height)
+        return index["textures"][page], uv
+    
     def create_empty_texture(self, width, height, color=(1, 1, 1, 1)):
         """
         Create an empty texture with a solid color
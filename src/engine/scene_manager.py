@@ -417,6 +417,7 @@ class SceneManager:
         self.game = game
         self.scenes = {}
         self.current_scene = None
+        self.current_scene_name = None
         
         # Create scenes
         self.scenes["menu"] = MainMenuScene(game, self)
@@ -453,6 +454,7 @@ class SceneManager:
         
         # Enter new scene
         self.current_scene = self.scenes[scene_name]
+        self.current_scene_name = scene_name
         self.current_scene.enter()
     
     def update(self, dt):
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Startup Profiler for Nightfall Defenders
+Measures module import times and the time to the first rendered frame
+"""
+
+import builtins
+import importlib.util
+import sys
+import time
+
+class ImportRecord:
+    """Time spent importing one module, including the modules it imported"""
+    
+    def __init__(self, name):
+        """
+        Initialize the record
+        
+        Args:
+            name (str): Module name
+        """
+        self.name = name
+        self.duration = 0.0
+        self.children = []
+    
+    @property
+    def self_duration(self):
+        """Time spent in this module excluding its imports"""
+        return self.duration - sum(child.duration for child in self.children)
+
+class StartupProfiler:
+    """
+    Records an import-time tree and startup milestones
+    
+    Installed before the game modules are imported, it wraps the import
+    function to time every module that is imported for the first time.
+    Milestones such as the first rendered frame are recorded relative to
+    the moment the profiler was installed.
+    """
+    
+    def __init__(self):
+        """Initialize the profiler"""
+        self.start_time = time.perf_counter()
+        self.root = ImportRecord("<startup>")
+        self.stack = [self.root]
+        self.milestones = []
+        self.original_import = None
+    
+    def install(self):
+        """Start timing imports"""
+        if self.original_import is not None:
+            return
+        self.start_time = time.perf_counter()
+        self.original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+    
+    def uninstall(self):
+        """Stop timing imports"""
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+    
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """Import a module, timing it if it has not been imported before"""
+        module_name = name
+        if level != 0:
+            try:
+                package = (globals or {}).get('__package__')
+                module_name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                pass
+        if module_name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+        
+        record = ImportRecord(module_name)
+        self.stack[-1].children.append(record)
+        self.stack.append(record)
+        start = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            record.duration = time.perf_counter() - start
+            self.stack.pop()
+    
+    def mark(self, label):
+        """
+        Record a startup milestone
+        
+        Args:
+            label (str): Name of the milestone
+        """
+        self.milestones.append((label, time.perf_counter() - self.start_time))
+    
+    def watch_first_frame(self, base, min_ms=1.0):
+        """
+        Report once the first frame has been rendered
+        
+        Args:
+            base: The ShowBase instance
+            min_ms (float): Hide imports faster than this in the report
+        """
+        def on_first_frame(task):
+            self.mark("first frame")
+            self.uninstall()
+            self.report(min_ms)
+            return task.done
+        
+        # Sort after the render task so it runs once the frame is drawn
+        base.taskMgr.add(on_first_frame, "StartupProfilerFirstFrame", sort=60)
+    
+    def report(self, min_ms=1.0):
+        """
+        Print the import-time tree and the startup milestones
+        
+        Args:
+            min_ms (float): Hide imports faster than this
+        """
+        total = sum(child.duration for child in self.root.children)
+        print(f"=== Startup profile: {total * 1000:.1f} ms in imports ===")
+        print(f"{'total':>13} {'self':>13}  module")
+        for child in sorted(self.root.children, key=lambda r: r.duration, reverse=True):
+            self._print_record(child, 0, min_ms)
+        
+        print("=== Startup milestones ===")
+        for label, elapsed in self.milestones:
+            print(f"{elapsed * 1000:10.1f} ms  {label}")
+    
+    def _print_record(self, record, depth, min_ms):
+        """Print an import record and its slow children"""
+        if record.duration * 1000 < min_ms:
+            return
+        print(f"{record.duration * 1000:10.1f} ms {record.self_duration * 1000:10.1f} ms  "
+              f"{'  ' * depth}{record.name}")
+        for child in sorted(record.children, key=lambda r: r.duration, reverse=True):
+            self._print_record(child, depth + 1, min_ms)
@@ -4,11 +4,34 @@
 """
 UI Package for Nightfall Defenders
 Provides UI components and systems for the game
+
+Exported classes are imported on first use (PEP 562).
 """
 
-from engine.ui.component import UIComponent
-from engine.ui.button import Button
-from engine.ui.ui_manager import UIManager
+import importlib
 
 # Version of the UI system
-__version__ = "0.1.0" 
\ No newline at end of file
+__version__ = "0.1.0"
+
+# Exported names and the submodules defining them
+_LAZY_EXPORTS = {
+    'UIComponent': '.component',
+    'Button': '.button',
+    'UIManager': '.ui_manager',
+    'RetainedLayer': '.retained'
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    """Import an exported class from its submodule on first access"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List the module attributes including the lazy exports"""
+    return sorted(set(globals()) | set(__all__))
@@ -7,11 +7,33 @@ Provides temporary pop-up notifications and messages
 """
 
 from direct.gui.DirectGui import DirectFrame, DirectLabel, DGG
-from panda3d.core import TextNode, Vec4
+from direct.interval.IntervalGlobal import Sequence, Wait, Func, LerpColorScaleInterval
+from panda3d.core import TextNode, TransparencyAttrib, Vec4
 import time
 
 class NotificationSystem:
-    """System for displaying temporary notifications"""
+    """
+    System for displaying temporary notifications
+    
+    Notifications are shown in a fixed pool of slots created up front.
+    Each slot keeps its frame and label for the whole game: showing a
+    notification only sets the label text (and the frame color when the
+    type changes), and the fade out is an interval on the slot's color
+    scale, so a burst of notifications creates no nodes at all.
+    """
+    
+    # Frame colors by notification type
+    COLORS = {
+        "info": (0.2, 0.3, 0.7, 0.8),      # Blue
+        "warning": (0.8, 0.6, 0.2, 0.8),   # Orange
+        "error": (0.8, 0.2, 0.2, 0.8),     # Red
+        "success": (0.2, 0.7, 0.3, 0.8),   # Green
+        "quest": (0.6, 0.3, 0.8, 0.8),     # Purple
+        "item": (0.3, 0.7, 0.7, 0.8)       # Teal
+    }
+    
+    # Seconds a notification takes to fade out once its duration is over
+    FADE_TIME = 1.0
     
     def __init__(self, game):
         """
@@ -30,64 +52,91 @@ class NotificationSystem:
             parent=game.aspect2d
         )
         
-        # List of active notifications
+        # List of active notifications, oldest first
         self.notifications = []
         
         # Maximum number of visible notifications
         self.max_visible = 5
         
-        # Add task to update notifications
-        self.game.taskMgr.add(self.update_notifications, "update_notifications")
+        # One slot per visible notification, reused for the whole game
+        self.slots = [self._create_slot() for _ in range(self.max_visible)]
+        self.free_slots = list(self.slots)
     
-    def add_notification(self, message, duration=5.0, type="info"):
+    def _create_slot(self):
         """
-        Add a new notification
+        Create a hidden notification slot
         
-        Args:
-            message: Notification message
-            duration: Duration in seconds
-            type: Type of notification ('info', 'warning', 'error', 'success')
+        Returns:
+            dict: The slot frame, its label and the type it is colored for
         """
-        # Determine color based on type
-        colors = {
-            "info": (0.2, 0.3, 0.7, 0.8),      # Blue
-            "warning": (0.8, 0.6, 0.2, 0.8),   # Orange
-            "error": (0.8, 0.2, 0.2, 0.8),     # Red
-            "success": (0.2, 0.7, 0.3, 0.8),   # Green
-            "quest": (0.6, 0.3, 0.8, 0.8),     # Purple
-            "item": (0.3, 0.7, 0.7, 0.8)       # Teal
-        }
-        
-        frame_color = colors.get(type, colors["info"])
-        text_color = (1, 1, 1, 1)  # White text
-        
-        # Create notification frame
-        notification = DirectFrame(
-            frameColor=frame_color,
+        frame = DirectFrame(
+            frameColor=self.COLORS["info"],
             frameSize=(-0.7, 0.7, -0.05, 0.05),
             pos=(0, 0, 0),  # Will be positioned later
             parent=self.container
         )
         
-        # Add text
+        # The label inherits the color scale of the frame, so fading the
+        # frame fades the text with it
+        frame.setTransparency(TransparencyAttrib.MAlpha)
+        
         text = DirectLabel(
-            text=message,
+            text="",
             text_scale=0.04,
-            text_fg=text_color,
+            text_fg=(1, 1, 1, 1),  # White text
             text_align=TextNode.ACenter,
             frameColor=(0, 0, 0, 0),
-            parent=notification
+            parent=frame
         )
         
-        # Add to notifications list with metadata
-        self.notifications.append({
-            "frame": notification,
-            "text": text,
+        frame.hide()
+        return {"frame": frame, "text": text, "type": "info"}
+    
+    def add_notification(self, message, duration=5.0, type="info"):
+        """
+        Add a new notification
+        
+        When every slot is in use, the oldest notification gives its slot
+        to the new one.
+        
+        Args:
+            message: Notification message
+            duration: Duration in seconds
+            type: Type of notification ('info', 'warning', 'error', 'success')
+        """
+        if not self.free_slots:
+            self._remove_notification(self.notifications[0])
+        slot = self.free_slots.pop()
+        
+        # Only the text and, for another type, the frame color change
+        if slot["text"]["text"] != message:
+            slot["text"]["text"] = message
+        color_type = type if type in self.COLORS else "info"
+        if slot["type"] != color_type:
+            slot["frame"]["frameColor"] = self.COLORS[color_type]
+            slot["type"] = color_type
+        slot["frame"].setColorScale(1, 1, 1, 1)
+        slot["frame"].show()
+        
+        notification = {
+            "frame": slot["frame"],
+            "text": slot["text"],
+            "slot": slot,
             "created": time.time(),
             "duration": duration,
-            "alpha": 1.0,
             "type": type
-        })
+        }
+        
+        # Wait, fade out, then give the slot back
+        notification["interval"] = Sequence(
+            Wait(duration),
+            LerpColorScaleInterval(slot["frame"], self.FADE_TIME, Vec4(1, 1, 1, 0), startColorScale=Vec4(1, 1, 1, 1)),
+            Func(self._remove_notification, notification, True)
+        )
+        
+        # Add to notifications list with metadata
+        self.notifications.append(notification)
+        notification["interval"].start()
         
         # Reposition all notifications
         self._reposition_notifications()
@@ -95,96 +144,33 @@ class NotificationSystem:
         # Play sound based on notification type
         self._play_notification_sound(type)
     
-    def update_notifications(self, task):
+    def _remove_notification(self, notification, faded=False):
         """
-        Update notifications (fade out, remove expired)
+        Hide a notification and return its slot to the pool
         
         Args:
-            task: Task instance
-        
-        Returns:
-            Task continuation flag
+            notification: The notification to remove
+            faded: True when called at the end of the fade interval
         """
-        current_time = time.time()
-        to_remove = []
-        
-        for i, notification in enumerate(self.notifications):
-            # Calculate age of notification
-            age = current_time - notification["created"]
-            
-            # If past duration, start fading out
-            if age > notification["duration"]:
-                # Calculate fade (1 second fade out)
-                fade_time = 1.0
-                fade_progress = min(1.0, (age - notification["duration"]) / fade_time)
-                
-                # Update alpha
-                new_alpha = 1.0 - fade_progress
-                notification["alpha"] = new_alpha
-                
-                # Apply alpha to frame
-                frame_color = list(notification["frame"]["frameColor"])
-                frame_color[3] = new_alpha
-                notification["frame"]["frameColor"] = tuple(frame_color)
-                
-                # For text, we need to recreate it with new alpha since fg is not directly accessible
-                old_text = notification["text"]
-                text_pos = old_text.getPos()
-                
-                # Create new text with updated alpha
-                new_text = DirectLabel(
-                    text=old_text["text"],
-                    text_scale=old_text["text_scale"],
-                    text_align=TextNode.ACenter,
-                    text_fg=(1, 1, 1, new_alpha),  # Use the new alpha here
-                    frameColor=(0, 0, 0, 0),
-                    parent=notification["frame"]
-                )
-                new_text.setPos(text_pos)
-                
-                # Remove old text
-                old_text.destroy()
-                
-                # Update reference
-                notification["text"] = new_text
-                
-                # Mark for removal if completely faded
-                if fade_progress >= 1.0:
-                    to_remove.append(i)
-        
-        # Remove expired notifications (in reverse order to maintain indices)
-        for i in reversed(to_remove):
-            # Clean up the notification
-            self.notifications[i]["frame"].destroy()
-            # Remove from list
-            self.notifications.pop(i)
-        
-        # Reposition remaining notifications if any were removed
-        if to_remove:
-            self._reposition_notifications()
-        
-        return task.cont
+        if notification not in self.notifications:
+            return
+        
+        self.notifications.remove(notification)
+        
+        # Stop the fade of a notification removed early, before its slot
+        # is reused
+        if not faded:
+            notification["interval"].pause()
+        
+        notification["frame"].hide()
+        self.free_slots.append(notification["slot"])
+        self._reposition_notifications()
     
     def _reposition_notifications(self):
         """Reposition notifications in the container"""
-        # Ensure we don't show too many
-        visible_count = min(len(self.notifications), self.max_visible)
-        
-        # Hide excess notifications (oldest first)
-        for i in range(visible_count, len(self.notifications)):
-            self.notifications[i]["frame"].hide()
-        
-        # Position visible notifications
-        for i in range(visible_count):
-            # Start from the newest (bottom of the list)
-            index = len(self.notifications) - 1 - i
-            if index >= 0:
-                notification = self.notifications[index]
-                
-                # Position from top to bottom
-                y_pos = -i * 0.12
-                notification["frame"].setPos(0, 0, y_pos)
-                notification["frame"].show()
+        # Position from top to bottom, newest first
+        for i, notification in enumerate(reversed(self.notifications)):
+            notification["frame"].setPos(0, 0, -i * 0.12)
     
     def _play_notification_sound(self, type):
         """
@@ -200,13 +186,12 @@ class NotificationSystem:
     
     def clear_all(self):
         """Clear all notifications"""
-        for notification in self.notifications:
-            notification["frame"].destroy()
-        
-        self.notifications = []
+        for notification in list(self.notifications):
+            self._remove_notification(notification)
     
     def cleanup(self):
         """Clean up resources"""
         self.clear_all()
+        self.slots = []
+        self.free_slots = []
         self.container.destroy()
-        self.game.taskMgr.remove("update_notifications") 
\ No newline at end of file
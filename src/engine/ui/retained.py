@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Retained-Mode UI Layer for Nightfall Defenders
+Keeps stable DirectGui widgets per model key and patches only what changed
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+# Marks a property the widget has never shown
+_MISSING = object()
+
+def patch_widget(widget, changed: Dict[str, Any]):
+    """
+    Apply changed view model properties to a DirectGui widget
+    
+    "pos", "scale" and "color" go through the NodePath setters; every
+    other property is a DirectGui option (frameColor, text, extraArgs...).
+    
+    Args:
+        widget: The widget to patch
+        changed: Properties that differ from what the widget shows
+    """
+    for name, value in changed.items():
+        if name == "pos":
+            widget.setPos(*value)
+        elif name == "scale":
+            widget.setScale(value)
+        elif name == "color":
+            widget.setColor(*value)
+        else:
+            widget[name] = value
+
+def destroy_widget(widget):
+    """
+    Destroy a DirectGui widget or remove a plain NodePath
+    
+    Args:
+        widget: The widget to destroy
+    """
+    if hasattr(widget, 'destroy'):
+        widget.destroy()
+    else:
+        widget.removeNode()
+
+class RetainedLayer:
+    """
+    Stable widgets for a keyed view model
+    
+    A view model maps each key (a skill node, a recipe, a building...) to
+    a flat dict of properties. update() diffs a new view model against the
+    properties the widgets currently show: keys that appear get a widget
+    from the pool (or a new one), keys that stay only have their changed
+    properties patched, and keys that leave release their widget to the
+    pool, hidden, for the next key that appears. A refresh where nothing
+    changed touches no widget at all.
+    
+    Every view model of a layer should use the same property names, since
+    a pooled widget is patched against the properties of its previous key.
+    """
+    
+    def __init__(self, create: Callable, apply: Callable = patch_widget, max_pool: int = 64):
+        """
+        Initialize the layer
+        
+        Args:
+            create: Function (key, props) -> widget showing the properties
+            apply: Function (widget, changed) patching a widget
+            max_pool: Maximum number of released widgets kept for reuse
+        """
+        self.create = create
+        self.apply = apply
+        self.max_pool = max_pool
+        
+        # Widgets and the properties they show, by key
+        self.widgets = {}
+        self.props = {}
+        
+        # Released widgets with the properties they last showed
+        self.pool = []
+        
+        # Widget operations, for profiling
+        self.stats = {"created": 0, "reused": 0, "patched": 0, "released": 0}
+    
+    def update(self, models: Dict[Hashable, Dict[str, Any]]) -> int:
+        """
+        Show a new view model
+        
+        Args:
+            models: Properties by key
+        
+        Returns:
+            int: Number of keys whose widget was created, patched or released
+        """
+        changes = 0
+        for key in [key for key in self.widgets if key not in models]:
+            self.release(key)
+            changes += 1
+        
+        for key, props in models.items():
+            if self.patch(key, props):
+                changes += 1
+        return changes
+    
+    def patch(self, key: Hashable, props: Dict[str, Any]) -> bool:
+        """
+        Show new properties for one key, creating its widget if needed
+        
+        Args:
+            key: Model key
+            props: Properties to show (all of them, or only some)
+        
+        Returns:
+            bool: True if a widget was created or patched
+        """
+        widget = self.widgets.get(key)
+        if widget is None:
+            self._acquire(key, props)
+            return True
+        
+        shown = self.props[key]
+        changed = self._diff(shown, props)
+        if not changed:
+            return False
+        
+        self.apply(widget, changed)
+        shown.update(changed)
+        self.stats["patched"] += 1
+        return True
+    
+    def _diff(self, shown: Dict[str, Any], props: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the properties that differ from the shown ones"""
+        return {name: value for name, value in props.items() if shown.get(name, _MISSING) != value}
+    
+    def _acquire(self, key: Hashable, props: Dict[str, Any]):
+        """Get a widget for a new key, from the pool when possible"""
+        if self.pool:
+            widget, shown = self.pool.pop()
+            changed = self._diff(shown, props)
+            if changed:
+                self.apply(widget, changed)
+                shown.update(changed)
+            widget.show()
+            self.stats["reused"] += 1
+        else:
+            widget = self.create(key, props)
+            shown = dict(props)
+            self.stats["created"] += 1
+        
+        self.widgets[key] = widget
+        self.props[key] = shown
+        return widget
+    
+    def release(self, key: Hashable):
+        """
+        Hide the widget of a key and keep it for reuse
+        
+        Args:
+            key: Model key
+        """
+        widget = self.widgets.pop(key, None)
+        if widget is None:
+            return
+        
+        shown = self.props.pop(key)
+        widget.hide()
+        if len(self.pool) < self.max_pool:
+            self.pool.append((widget, shown))
+        else:
+            destroy_widget(widget)
+        self.stats["released"] += 1
+    
+    def get(self, key: Hashable):
+        """
+        Get the widget of a key
+        
+        Args:
+            key: Model key
+        
+        Returns:
+            The widget, or None if the key is not shown
+        """
+        return self.widgets.get(key)
+    
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Get the shown (key, widget) pairs"""
+        return list(self.widgets.items())
+    
+    def clear(self):
+        """Release every widget to the pool"""
+        for key in list(self.widgets):
+            self.release(key)
+    
+    def destroy(self):
+        """Destroy every widget, including the pooled ones"""
+        for widget in self.widgets.values():
+            destroy_widget(widget)
+        for widget, _ in self.pool:
+            destroy_widget(widget)
+        self.widgets.clear()
+        self.props.clear()
+        self.pool.clear()
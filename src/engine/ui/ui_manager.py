@@ -57,9 +57,9 @@ class UIManager:
         Returns:
             Task continuation value
         """
-        # Get mouse position
-        mouse_watcher = self.game.mouseWatcherNode
-        if mouse_watcher.hasMouse():
+        # Get mouse position (there is no mouse watcher without a window)
+        mouse_watcher = getattr(self.game, 'mouseWatcherNode', None)
+        if mouse_watcher is not None and mouse_watcher.hasMouse():
             # Get mouse position in render2d coordinates (-1 to 1)
             mouse_pos = Point2(mouse_watcher.getMouse())
             
@@ -136,9 +136,10 @@ class UIManager:
         from panda3d.core import TransparencyAttrib
         
         # Hide the system cursor
-        props = self.game.win.getProperties()
-        props.setCursorHidden(True)
-        self.game.win.requestProperties(props)
+        if self.game.win is not None:
+            props = self.game.win.getProperties()
+            props.setCursorHidden(True)
+            self.game.win.requestProperties(props)
         
         # Create cursor image
         if image_path:
@@ -169,9 +170,10 @@ class UIManager:
     def disable_custom_cursor(self):
         """Disable the custom cursor and restore the system cursor"""
         # Show the system cursor
-        props = self.game.win.getProperties()
-        props.setCursorHidden(False)
-        self.game.win.requestProperties(props)
+        if self.game.win is not None:
+            props = self.game.win.getProperties()
+            props.setCursorHidden(False)
+            self.game.win.requestProperties(props)
         
         # Remove the cursor image
         if self.cursor_image:
@@ -4,33 +4,41 @@
 """
 Nightfall Defenders - Game Module
 Game-specific components and systems
+
+Exported classes are imported on first use (PEP 562), so importing one
+game submodule does not load the whole game.
 """
 
-from game.main import NightfallDefenders
-from game.day_night_cycle import DayNightCycle
-from game.camera_controller import CameraController
-from game.player import Player
-from game.enemy import Enemy, BasicEnemy, RangedEnemy
-from game.projectile import Projectile, StraightProjectile, ArcingProjectile, HomingProjectile, SpiralProjectile
-from game.entity_manager import EntityManager
+import importlib
 
-__all__ = [
-    'NightfallDefenders',
-    'DayNightCycle',
-    'CameraController',
-    'Player',
-    'Enemy',
-    'BasicEnemy',
-    'RangedEnemy',
-    'Projectile',
-    'StraightProjectile',
-    'ArcingProjectile',
-    'HomingProjectile',
-    'SpiralProjectile',
-    'EntityManager'
-]
+# Exported names and the submodules defining them
+_LAZY_EXPORTS = {
+    'NightfallDefenders': '.main',
+    'DayNightCycle': '.day_night_cycle',
+    'CameraController': '.camera_controller',
+    'Player': '.player',
+    'Enemy': '.enemy',
+    'BasicEnemy': '.enemy',
+    'RangedEnemy': '.enemy',
+    'Projectile': '.projectile',
+    'StraightProjectile': '.projectile',
+    'ArcingProjectile': '.projectile',
+    'HomingProjectile': '.projectile',
+    'SpiralProjectile': '.projectile',
+    'EntityManager': '.entity_manager'
+}
 
-"""
-Game module for Nightfall Defenders
-This file marks the 'game' directory as a Python package.
-""" 
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    """Import an exported class from its submodule on first access"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List the module attributes including the lazy exports"""
+    return sorted(set(globals()) | set(__all__))
@@ -14,6 +14,7 @@ from .ability_system import (
     AbilityType, Ability, ElementType, ProjectileAbility, MeleeAbility, 
     SpecializationPath, AreaAbility
 )
+from .definitions import get_table
 
 class AbilityFactory:
     """Factory for creating abilities and fusions"""
@@ -764,230 +765,13 @@ class AbilityFactory:
             )
 
 
-# Define standard abilities
-STANDARD_ABILITIES = {
-    # Warrior abilities
-    "axe_slash": {
-        "type": "melee",
-        "name": "Axe Slash",
-        "description": "A powerful slash with your axe.",
-        "damage": 20,
-        "range": 2.0,
-        "angle": 90.0,
-        "cooldown": 0.8,
-        "resource_cost": 0,
-        "element_type": ElementType.NONE,
-        "icon": "axe_slash_icon.png"
-    },
-    
-    "whirlwind": {
-        "type": "melee",
-        "name": "Whirlwind",
-        "description": "Spin in a circle, damaging all enemies around you.",
-        "damage": 15,
-        "range": 3.0,
-        "angle": 360.0,
-        "cooldown": 5.0,
-        "resource_cost": 20,
-        "element_type": ElementType.WIND,
-        "icon": "whirlwind_icon.png"
-    },
-    
-    # Mage abilities
-    "magic_bolt": {
-        "type": "projectile",
-        "name": "Magic Bolt",
-        "description": "Fire a bolt of arcane energy.",
-        "projectile_type": "straight",
-        "damage": 15,
-        "speed": 15.0,
-        "cooldown": 0.5,
-        "resource_cost": 5,
-        "element_type": ElementType.ARCANE,
-        "icon": "magic_bolt_icon.png"
-    },
-    
-    "fireball": {
-        "type": "projectile",
-        "name": "Fireball",
-        "description": "Launch a ball of fire that explodes on impact.",
-        "projectile_type": "arcing",
-        "damage": 30,
-        "speed": 10.0,
-        "cooldown": 3.0,
-        "resource_cost": 15,
-        "element_type": ElementType.FIRE,
-        "icon": "fireball_icon.png"
-    },
-    
-    # Cleric abilities
-    "mace_hit": {
-        "type": "melee",
-        "name": "Mace Hit",
-        "description": "Strike with your mace.",
-        "damage": 18,
-        "range": 1.8,
-        "angle": 60.0,
-        "cooldown": 0.7,
-        "resource_cost": 0,
-        "element_type": ElementType.NONE,
-        "icon": "mace_hit_icon.png"
-    },
-    
-    "healing_light": {
-        "type": "area",
-        "name": "Healing Light",
-        "description": "Create an area of healing energy.",
-        "effect_type": "heal",
-        "value": 20,
-        "radius": 4.0,
-        "duration": 3.0,
-        "cooldown": 6.0,
-        "resource_cost": 25,
-        "element_type": ElementType.HOLY,
-        "icon": "healing_light_icon.png"
-    },
-    
-    # Ranger abilities
-    "sniper_shot": {
-        "type": "projectile",
-        "name": "Sniper Shot",
-        "description": "Fire a high-damage arrow at a single target.",
-        "projectile_type": "straight",
-        "damage": 40,
-        "speed": 25.0,
-        "cooldown": 4.0,
-        "resource_cost": 15,
-        "element_type": ElementType.NONE,
-        "icon": "sniper_shot_icon.png"
-    },
-    
-    "multishot": {
-        "type": "projectile",
-        "name": "Multishot",
-        "description": "Fire multiple arrows in a spread.",
-        "projectile_type": "spread",
-        "damage": 12,
-        "speed": 15.0,
-        "cooldown": 2.5,
-        "resource_cost": 10,
-        "element_type": ElementType.NONE,
-        "icon": "multishot_icon.png"
-    },
-    
-    # Alchemist abilities
-    "deploy_turret": {
-        "type": "area",
-        "name": "Deploy Turret",
-        "description": "Deploy an automatic turret that shoots nearby enemies.",
-        "effect_type": "summon",
-        "value": 8,  # Damage per shot
-        "radius": 0.5,  # Turret size
-        "duration": 20.0,  # Turret lifetime
-        "cooldown": 10.0,
-        "resource_cost": 25,
-        "element_type": ElementType.NONE,
-        "icon": "turret_icon.png"
-    },
-    
-    "potion_throw": {
-        "type": "projectile",
-        "name": "Potion Throw",
-        "description": "Throw a volatile potion that explodes on impact, dealing area damage.",
-        "projectile_type": "arcing",
-        "damage": 25,
-        "speed": 12.0,
-        "cooldown": 3.0,
-        "resource_cost": 15,
-        "element_type": ElementType.ARCANE,
-        "icon": "potion_icon.png"
-    },
-    
-    "healing_potion": {
-        "type": "area",
-        "name": "Healing Potion",
-        "description": "Throw a healing potion that creates a mist, healing allies in the area over time.",
-        "effect_type": "heal",
-        "value": 5,  # Healing per second
-        "radius": 3.0,
-        "duration": 5.0,
-        "cooldown": 12.0,
-        "resource_cost": 30,
-        "element_type": ElementType.WATER,
-        "icon": "healing_potion_icon.png"
-    },
-    
-    "multi_turret": {
-        "type": "area",
-        "name": "Multi-Turret",
-        "description": "Deploy three smaller turrets in a triangle formation.",
-        "effect_type": "summon",
-        "value": 5,  # Damage per shot (per turret)
-        "radius": 0.3,  # Turret size
-        "duration": 15.0,  # Turret lifetime
-        "cooldown": 20.0,
-        "resource_cost": 40,
-        "element_type": ElementType.NONE,
-        "icon": "multi_turret_icon.png"
-    },
-    
-    # Summoner abilities
-    "spirit_summon": {
-        "type": "area",
-        "name": "Spirit Summon",
-        "description": "Summon a spirit to fight for you.",
-        "effect_type": "summon",
-        "value": 15,  # Spirit damage
-        "radius": 1.0,  # Spirit size
-        "duration": 30.0,  # Spirit lifetime
-        "cooldown": 8.0,
-        "resource_cost": 30,
-        "element_type": ElementType.ARCANE,
-        "icon": "spirit_icon.png"
-    },
-    
-    "spirit_command": {
-        "type": "area",
-        "name": "Spirit Command",
-        "description": "Order your spirits to focus on a target area, increasing their damage.",
-        "effect_type": "buff",
-        "value": 1.5,  # Damage multiplier
-        "radius": 5.0,
-        "element_type": ElementType.ARCANE,
-        "duration": 5.0,
-        "cooldown": 10.0,
-        "resource_cost": 15,
-        "icon": "command_icon.png"
-    },
-    
-    "spirit_shield": {
-        "type": "area",
-        "name": "Spirit Shield",
-        "description": "Create a protective barrier of spirits that absorbs damage.",
-        "effect_type": "buff",
-        "value": 50,  # Shield amount
-        "radius": 2.0,
-        "duration": 8.0,
-        "cooldown": 15.0,
-        "resource_cost": 25,
-        "element_type": ElementType.ARCANE,
-        "icon": "spirit_shield_icon.png"
-    },
-    
-    "spirit_fusion": {
-        "type": "area",
-        "name": "Spirit Fusion",
-        "description": "Fuse all active spirits into a powerful elemental that deals massive damage.",
-        "effect_type": "summon",
-        "value": 50,  # Elemental damage
-        "radius": 2.0,  # Elemental size
-        "duration": 10.0,  # Elemental lifetime
-        "cooldown": 30.0,
-        "resource_cost": 50,
-        "element_type": ElementType.ARCANE,
-        "icon": "fusion_spirit_icon.png"
-    }
-}
+def __getattr__(name):
+    """Load the standard abilities from the definitions store on first access"""
+    if name != "STANDARD_ABILITIES":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = get_table("standard_abilities")
+    globals()[name] = value
+    return value
 
 def create_ability(ability_id):
     """
@@ -999,270 +783,9 @@ def create_ability(ability_id):
     Returns:
         Ability: The created ability, or None if not found
     """
-    # Class primary abilities
-    ability_definitions = {
-        # ========== Warrior Abilities ==========
-        "axe_slash": {
-            "name": "Axe Slash",
-            "description": "A powerful melee attack with your axe",
-            "type": "melee",
-            "damage": 20,
-            "range": 2.0,
-            "angle": 90.0,
-            "cooldown": 0.5,
-            "resource_cost": 5,
-            "icon": "axe_slash_icon.png"
-        },
-        "whirlwind": {
-            "name": "Whirlwind",
-            "description": "Spin around, damaging all enemies in a circle",
-            "type": "melee",
-            "damage": 15,
-            "range": 3.0,
-            "angle": 360.0,
-            "cooldown": 4.0,
-            "resource_cost": 15,
-            "icon": "whirlwind_icon.png"
-        },
-        
-        # ========== Mage Abilities ==========
-        "magic_bolt": {
-            "name": "Magic Bolt",
-            "description": "Hurl a bolt of arcane energy",
-            "type": "projectile",
-            "projectile_type": "straight",
-            "damage": 15,
-            "speed": 12.0,
-            "cooldown": 0.7,
-            "resource_cost": 5,
-            "icon": "magic_bolt_icon.png"
-        },
-        "fireball": {
-            "name": "Fireball",
-            "description": "Throw a ball of fire that explodes on impact",
-            "type": "projectile",
-            "projectile_type": "arcing",
-            "damage": 25,
-            "speed": 10.0,
-            "cooldown": 3.0,
-            "resource_cost": 15,
-            "icon": "fireball_icon.png",
-            "on_hit_effect": "explosion",
-            "explosion_radius": 3.0,
-            "explosion_damage": 10
-        },
-        "mana_shield": {
-            "name": "Mana Shield",
-            "description": "Create a protective barrier that absorbs damage at the cost of mana",
-            "type": "area",
-            "effect_type": "shield",
-            "value": 50,
-            "radius": 0,
-            "duration": 8.0,
-            "cooldown": 12.0,
-            "resource_cost": 25,
-            "icon": "mana_shield_icon.png"
-        },
-        
-        # ========== Cleric Abilities ==========
-        "mace_hit": {
-            "name": "Mace Hit",
-            "description": "Strike with your mace",
-            "type": "melee",
-            "damage": 18,
-            "range": 2.0,
-            "angle": 60.0,
-            "cooldown": 0.6,
-            "resource_cost": 5,
-            "icon": "mace_hit_icon.png"
-        },
-        "healing_light": {
-            "name": "Healing Light",
-            "description": "Create a burst of healing energy that restores health to you and nearby allies",
-            "type": "area",
-            "effect_type": "heal",
-            "value": 25,
-            "radius": 5.0,
-            "duration": 0,
-            "cooldown": 8.0,
-            "resource_cost": 20,
-            "icon": "healing_light_icon.png"
-        },
-        "consecration": {
-            "name": "Consecration",
-            "description": "Sanctify the ground, damaging enemies and healing allies in the area",
-            "type": "area",
-            "effect_type": "dual",
-            "damage_value": 5,
-            "heal_value": 3,
-            "radius": 4.0,
-            "duration": 6.0,
-            "cooldown": 10.0,
-            "resource_cost": 25,
-            "icon": "consecration_icon.png"
-        },
-        
-        # ========== Ranger Abilities ==========
-        "snipe_shot": {
-            "name": "Snipe Shot",
-            "description": "Fire a precise shot with your bow",
-            "type": "projectile",
-            "projectile_type": "straight",
-            "damage": 18,
-            "speed": 15.0,
-            "cooldown": 0.8,
-            "resource_cost": 5,
-            "icon": "snipe_shot_icon.png",
-            "crit_chance_bonus": 0.1
-        },
-        "multi_shot": {
-            "name": "Multi Shot",
-            "description": "Fire three arrows in a spread pattern",
-            "type": "projectile",
-            "projectile_type": "spread",
-            "projectile_count": 3,
-            "spread_angle": 30,
-            "damage": 12,
-            "speed": 12.0,
-            "cooldown": 3.0,
-            "resource_cost": 15,
-            "icon": "multi_shot_icon.png"
-        },
-        "snare_trap": {
-            "name": "Snare Trap",
-            "description": "Place a trap that slows enemies when triggered",
-            "type": "area",
-            "effect_type": "trap",
-            "value": 5,
-            "radius": 2.0,
-            "duration": 15.0,
-            "effect_duration": 5.0,
-            "slow_amount": 0.5,
-            "cooldown": 8.0,
-            "resource_cost": 15,
-            "icon": "snare_trap_icon.png"
-        },
-        "evasion_roll": {
-            "name": "Evasion Roll",
-            "description": "Quickly dodge in any direction, becoming briefly invulnerable",
-            "type": "movement",
-            "distance": 5.0,
-            "invulnerability_duration": 0.5,
-            "cooldown": 5.0,
-            "resource_cost": 10,
-            "icon": "evasion_roll_icon.png"
-        },
-        
-        # ========== Alchemist Abilities ==========
-        "deploy_turret": {
-            "name": "Deploy Turret",
-            "description": "Place an automated turret that fires at nearby enemies",
-            "type": "summon",
-            "summon_type": "turret",
-            "summon_health": 50,
-            "summon_damage": 8,
-            "summon_range": 8.0,
-            "attack_speed": 1.0,
-            "duration": 20.0,
-            "cooldown": 12.0,
-            "resource_cost": 20,
-            "icon": "deploy_turret_icon.png"
-        },
-        "acid_flask": {
-            "name": "Acid Flask",
-            "description": "Throw a flask of acid that creates a damaging pool",
-            "type": "projectile",
-            "projectile_type": "arcing",
-            "damage": 5,
-            "speed": 8.0,
-            "cooldown": 6.0,
-            "resource_cost": 15,
-            "on_hit_effect": "acid_pool",
-            "acid_pool_radius": 3.0,
-            "acid_pool_damage": 8,
-            "acid_pool_duration": 5.0,
-            "icon": "acid_flask_icon.png"
-        },
-        "healing_elixir": {
-            "name": "Healing Elixir",
-            "description": "Create a potion that restores health",
-            "type": "item",
-            "effect_type": "heal",
-            "value": 35,
-            "cooldown": 15.0,
-            "resource_cost": 20,
-            "icon": "healing_elixir_icon.png"
-        },
-        "flame_turret": {
-            "name": "Flame Turret",
-            "description": "Deploy a turret that fires flaming projectiles",
-            "type": "summon",
-            "summon_type": "flame_turret",
-            "summon_health": 40,
-            "summon_damage": 12,
-            "fire_damage_over_time": 3,
-            "fire_duration": 3.0,
-            "summon_range": 7.0,
-            "attack_speed": 1.2,
-            "duration": 15.0,
-            "cooldown": 15.0,
-            "resource_cost": 25,
-            "icon": "flame_turret_icon.png"
-        },
-        
-        # ========== Summoner Abilities ==========
-        "summon_spirit": {
-            "name": "Summon Spirit",
-            "description": "Call forth a spirit to fight for you",
-            "type": "summon",
-            "summon_type": "spirit",
-            "summon_health": 40,
-            "summon_damage": 10,
-            "summon_range": 5.0,
-            "attack_speed": 1.0,
-            "duration": 30.0,
-            "cooldown": 8.0,
-            "resource_cost": 20,
-            "icon": "summon_spirit_icon.png"
-        },
-        "summon_fire_elemental": {
-            "name": "Summon Fire Elemental",
-            "description": "Summon a fire elemental that burns enemies",
-            "type": "summon",
-            "summon_type": "fire_elemental",
-            "summon_health": 60,
-            "summon_damage": 15,
-            "fire_damage_over_time": 5,
-            "fire_duration": 3.0,
-            "summon_range": 4.0,
-            "attack_speed": 1.2,
-            "duration": 20.0,
-            "cooldown": 15.0,
-            "resource_cost": 30,
-            "icon": "fire_elemental_icon.png"
-        },
-        "summon_frost_elemental": {
-            "name": "Summon Frost Elemental",
-            "description": "Summon a frost elemental that slows enemies",
-            "type": "summon",
-            "summon_type": "frost_elemental",
-            "summon_health": 70,
-            "summon_damage": 12,
-            "slow_amount": 0.4,
-            "slow_duration": 2.0,
-            "summon_range": 4.0,
-            "attack_speed": 0.8,
-            "duration": 20.0,
-            "cooldown": 15.0,
-            "resource_cost": 30,
-            "icon": "frost_elemental_icon.png"
-        }
-    }
-    
-    if ability_id in ability_definitions:
-        ability_data = ability_definitions[ability_id]
-        ability = AbilityFactory._create_ability_from_data(ability_id, ability_data)
-        return ability
+    ability_data = get_table("abilities").get(ability_id)
+    if ability_data is not None:
+        return AbilityFactory._create_ability_from_data(ability_id, ability_data)
     
     return None
 
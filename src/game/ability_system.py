@@ -11,6 +11,8 @@ from enum import Enum
 import math
 import random
 
+from game.stat_engine import StatEngine
+
 class AbilityType(Enum):
     """Types of abilities"""
     PROJECTILE = "projectile"
@@ -67,7 +69,12 @@ class Ability:
         """
         self.name = name
         self.description = description
-        self.damage = damage
+        
+        # Damage is derived from the base damage and the modifiers of the ability
+        self.stats = StatEngine({"damage": damage})
+        self.total_damage = None
+        self.total_damage_key = None
+        
         self.cooldown = cooldown
         self.range = range
         self.ability_type = ability_type
@@ -96,6 +103,15 @@ class Ability:
         # Upgrades and modifications
         self.modifiers = {}
     
+    @property
+    def damage(self):
+        """Base damage, before the level and modifiers"""
+        return self.stats.get_base("damage")
+    
+    @damage.setter
+    def damage(self, value):
+        self.stats.set_base("damage", value)
+    
     def use(self, caster, target_pos):
         """
         Use the ability
@@ -201,7 +217,7 @@ class Ability:
             mod_data: Modifier data dictionary
         """
         self.modifiers[mod_id] = mod_data
-        self._apply_modifiers()
+        self._apply_modifiers(mod_id)
     
     def remove_modifier(self, mod_id):
         """
@@ -215,15 +231,35 @@ class Ability:
         """
         if mod_id in self.modifiers:
             del self.modifiers[mod_id]
-            self._apply_modifiers()
+            self._apply_modifiers(mod_id)
             return True
         return False
     
-    def _apply_modifiers(self):
-        """Apply all current modifiers to the ability"""
-        # Reset to base stats first
-        # Then apply all modifiers
-        pass
+    def _apply_modifiers(self, mod_id):
+        """
+        Update the stat source of a modifier
+        
+        Args:
+            mod_id: Modifier ID, removed from the stats if no longer present
+        """
+        mod_data = self.modifiers.get(mod_id)
+        if mod_data is None:
+            self.stats.remove_source(mod_id)
+            return
+        
+        self.stats.set_source(
+            mod_id,
+            additive={"damage": mod_data['damage_bonus']} if 'damage_bonus' in mod_data else None,
+            multiplicative={"damage": mod_data['damage_multiplier']} if 'damage_multiplier' in mod_data else None
+        )
+    
+    def recalculate_stats(self):
+        """Refresh the modifiers after the ability was changed directly"""
+        for mod_id in list(self.stats.sources):
+            if mod_id not in self.modifiers:
+                self.stats.remove_source(mod_id)
+        for mod_id in self.modifiers:
+            self._apply_modifiers(mod_id)
     
     def specialize(self, path):
         """
@@ -356,15 +392,13 @@ class Ability:
     
     def get_total_damage(self):
         """Calculate total damage with modifiers"""
-        base_damage = self.damage * (1 + 0.1 * (self.level - 1))  # 10% per level
-        
-        # Apply modifiers
-        modifier_multiplier = 1.0
-        for mod_id, mod_data in self.modifiers.items():
-            if 'damage_multiplier' in mod_data:
-                modifier_multiplier *= mod_data['damage_multiplier']
-        
-        return int(base_damage * modifier_multiplier)
+        # Cached until the stats or the level change, since every projectile reads it
+        key = (self.stats.revision, self.level)
+        if key != self.total_damage_key:
+            level_multiplier = 1 + 0.1 * (self.level - 1)  # 10% per level
+            self.total_damage = int(self.stats.get("damage") * level_multiplier)
+            self.total_damage_key = key
+        return self.total_damage
         
     def _perform_melee_attack(self, caster, target_pos):
         """Perform a melee attack"""
@@ -11,6 +11,8 @@ import random
 import time
 from enum import Enum
 
+from game.streaming_stats import EWMA
+
 class DifficultyPreset(Enum):
     """Enumeration of difficulty presets"""
     EASY = 1
@@ -74,9 +76,15 @@ class AdaptiveDifficultySystem:
         
         # Performance trends
         self.recent_performance_rating = 0.0  # -1.0 to 1.0 (struggling to excelling)
-        self.performance_history = []  # List of historical performance ratings
+        self.performance_trend = EWMA(alpha=0.2)  # Smoothed rating, about the last 10 refreshes
         self.adjustment_history = []  # List of adjustment events
         
+        # The rating is refreshed on this cadence after new events instead
+        # of after every damage event
+        self.rating_interval = 1.0  # seconds
+        self.rating_dirty = False
+        self.last_rating_time = 0.0
+        
         # Configuration
         self.adjustment_frequency = 300  # Seconds between major adjustments
         self.adjustment_strength = 0.1  # Maximum adjustment per cycle
@@ -142,6 +150,9 @@ class AdaptiveDifficultySystem:
         Args:
             dt: Delta time in seconds
         """
+        # Refresh the performance rating if events came in
+        self._refresh_performance_rating()
+        
         # Check if it's time for periodic adjustment
         current_time = time.time()
         if current_time - self.last_adjustment_time >= self.adjustment_frequency:
@@ -176,8 +187,8 @@ class AdaptiveDifficultySystem:
         elif event_type == 'close_call':
             self.performance_metrics['close_calls'] += amount
             
-        # Update real-time performance rating
-        self._update_performance_rating()
+        # The rating is refreshed on the next cadence tick
+        self.rating_dirty = True
     
     def record_resource_event(self, event_type, resource_type, amount):
         """
@@ -248,8 +259,8 @@ class AdaptiveDifficultySystem:
             # Player died during boss fight
             self._adjust_difficulty_for_boss_death()
             
-        # Update performance rating
-        self._update_performance_rating()
+        # The rating is refreshed on the next cadence tick
+        self.rating_dirty = True
     
     def record_night_survived(self, health_percentage):
         """
@@ -268,6 +279,24 @@ class AdaptiveDifficultySystem:
         # Reset consecutive deaths counter
         self.consecutive_deaths = 0
     
+    def _refresh_performance_rating(self, force=False):
+        """
+        Recompute the performance rating if events came in since the last refresh
+        
+        Args:
+            force: Refresh now instead of waiting for the cadence
+        """
+        if not self.rating_dirty:
+            return
+        
+        current_time = time.time()
+        if not force and current_time - self.last_rating_time < self.rating_interval:
+            return
+        
+        self._update_performance_rating()
+        self.rating_dirty = False
+        self.last_rating_time = current_time
+    
     def _update_performance_rating(self):
         """Update the real-time performance rating based on metrics"""
         # Calculate combat performance
@@ -305,10 +334,8 @@ class AdaptiveDifficultySystem:
             boss_score * boss_weight
         ) * 2 - 1  # Scale from 0-1 to -1-1
         
-        # Add to history
-        self.performance_history.append(self.recent_performance_rating)
-        if len(self.performance_history) > 10:
-            self.performance_history = self.performance_history[-10:]
+        # Add to the smoothed trend
+        self.performance_trend.update(self.recent_performance_rating)
     
     def _evaluate_and_adjust_difficulty(self):
         """Evaluate performance and make difficulty adjustments"""
@@ -316,11 +343,12 @@ class AdaptiveDifficultySystem:
         if self.difficulty_preset != DifficultyPreset.CUSTOM:
             return
             
-        # Calculate average performance over recent history
-        if not self.performance_history:
+        # Use the smoothed performance over recent refreshes
+        self._refresh_performance_rating(force=True)
+        if self.performance_trend.count == 0:
             return
             
-        avg_performance = sum(self.performance_history) / len(self.performance_history)
+        avg_performance = self.performance_trend.value
         
         # Determine adjustment direction and strength
         adjustment = -avg_performance * self.adjustment_strength
@@ -506,7 +534,8 @@ class AdaptiveDifficultySystem:
         }
         
         self.recent_performance_rating = 0.0
-        self.performance_history = []
+        self.performance_trend = EWMA(alpha=0.2)
+        self.rating_dirty = False
         self.consecutive_deaths = 0
     
     def get_current_difficulty_factors(self):
@@ -535,6 +564,7 @@ class AdaptiveDifficultySystem:
             dict: Statistics about difficulty adjustments
         """
         recent_adjustments = self.adjustment_history[-5:] if self.adjustment_history else []
+        self._refresh_performance_rating(force=True)
         
         return {
             'preset': self.difficulty_preset.name,
@@ -9,9 +9,12 @@ Implements sound effects, music, and 3D positional audio
 import os
 import json
 import random
+import itertools
 from typing import Dict, List, Optional, Tuple
 from panda3d.core import AudioSound, AudioManager as P3DAudioManager
 from panda3d.core import Point3, Vec3
+from game.voice_manager import VoiceManager, SoundPool
+from game.sound_bank import SoundBankManager
 
 class SoundCategory:
     """Enum for sound categories for volume control"""
@@ -44,8 +47,19 @@ class AudioManager:
         # Sound asset cache
         self.sound_cache = {}
         
-        # Active sounds (currently playing)
-        self.active_sounds = {}
+        # Resolved file paths by requested sound path
+        self.resolved_paths = {}
+        
+        # Manifest of sound files, preloaded in banks per time of day
+        self.sound_banks = SoundBankManager(self)
+        self.current_time_of_day = None
+        
+        # Voice limits, stealing and rate limiting
+        self.voice_manager = VoiceManager()
+        
+        # Active sounds (currently playing), tracked by the voice manager
+        self.active_sounds = self.voice_manager.voices
+        self.sound_id_counter = itertools.count()
         
         # Missing sound files set - to avoid repeated warnings
         self.missing_sound_files = set()
@@ -76,12 +90,9 @@ class AudioManager:
             "default_max_distance": 50.0
         }
         
-        # Sound pools for frequently used sounds to avoid constant loading
+        # Pre-created sound instances per effect for overlapping playback
         self.sound_pools = {}
         
-        # Sound cooldown system to prevent sound spamming
-        self.sound_cooldowns = {}
-        
         # List of ambient loops currently active
         self.ambient_loops = {}
         
@@ -109,6 +120,7 @@ class AudioManager:
         """Load audio configuration from file"""
         # Try to load configuration from the config file
         config_path = os.path.join("src", "assets", "configs", "audio_config.json")
+        config = {}
         
         if os.path.exists(config_path):
             try:
@@ -134,6 +146,10 @@ class AudioManager:
                 if "3d_audio" in config:
                     self.audio_3d_settings = config["3d_audio"]
                 
+                # Apply voice limits and priorities
+                if "voices" in config:
+                    self.voice_manager.configure(config["voices"])
+                
                 print(f"Audio configuration loaded from {config_path}")
             except Exception as e:
                 print(f"Error loading audio config: {e}")
@@ -141,6 +157,10 @@ class AudioManager:
         else:
             print(f"Audio config file not found at {config_path}")
             print("Using default audio settings")
+        
+        # Resolve all sound files once and group them into banks
+        self.sound_banks.build_manifest(config)
+        self.resolved_paths.clear()
     
     def load_sound(self, sound_path: str, positional: bool = False) -> Optional[AudioSound]:
         """
@@ -162,17 +182,9 @@ class AudioManager:
             return self.sound_cache[cache_key]
             
         # Make sure the path exists
-        if not os.path.exists(sound_path):
-            # Try relative to assets
-            asset_path = os.path.join("src", "assets", "sounds", sound_path)
-            if os.path.exists(asset_path):
-                sound_path = asset_path
-            else:
-                # Only print warning once per sound file
-                if sound_path not in self.missing_sound_files:
-                    print(f"Warning: Sound file not found: {sound_path}")
-                    self.missing_sound_files.add(sound_path)
-                return None
+        sound_path = self._resolve_sound_path(sound_path)
+        if sound_path is None:
+            return None
         
         try:
             # Load the sound
@@ -197,8 +209,132 @@ class AudioManager:
                 self.missing_sound_files.add(sound_path)
             return None
     
+    def _resolve_sound_path(self, sound_path: str) -> Optional[str]:
+        """
+        Find the file for a sound path using the manifest
+        
+        Args:
+            sound_path: Path to the sound file, absolute or relative to the sound assets
+            
+        Returns:
+            Existing file path or None if not found
+        """
+        if sound_path in self.resolved_paths:
+            return self.resolved_paths[sound_path]
+            
+        resolved = None
+        entry = self.sound_banks.resolve(sound_path)
+        if entry is not None:
+            resolved = entry["path"]
+        else:
+            # Paths outside the sound assets are checked once
+            if os.path.exists(sound_path):
+                resolved = sound_path
+            elif sound_path not in self.missing_sound_files:
+                # Only print warning once per sound file
+                print(f"Warning: Sound file not found: {sound_path}")
+                self.missing_sound_files.add(sound_path)
+        
+        self.resolved_paths[sound_path] = resolved
+        return resolved
+    
+    def get_pool_key(self, resolved_path: str, positional: bool) -> str:
+        """
+        Get the key of the sound pool for a file
+        
+        Args:
+            resolved_path: Path of the sound file
+            positional: Whether the sound is 3D positional
+            
+        Returns:
+            str: Pool key
+        """
+        return f"{resolved_path}_{positional}"
+    
+    def create_sound_pool(self, resolved_path: str, positional: bool, category: str,
+                          stream: bool = False) -> Optional[SoundPool]:
+        """
+        Create the pre-created instances of a sound (main thread only)
+        
+        Args:
+            resolved_path: Path of the sound file
+            positional: Whether the instances should be 3D positional
+            category: Sound category, which decides the pool size
+            stream: Whether to stream the file instead of decoding it fully
+            
+        Returns:
+            SoundPool or None if the sound could not be loaded
+        """
+        mode = P3DAudioManager.SM_stream if stream else P3DAudioManager.SM_sample
+        sounds = []
+        for _ in range(self.voice_manager.get_pool_size(category)):
+            sound = self.audio_manager.getSound(resolved_path, positional, mode)
+            if sound:
+                sounds.append(sound)
+        return SoundPool(sounds) if sounds else None
+    
+    def _get_sound_pool(self, sound_path: str, positional: bool, category: str) -> Optional[SoundPool]:
+        """
+        Get the pool of pre-created instances for a sound, creating it if needed
+        
+        Args:
+            sound_path: Path to the sound file
+            positional: Whether the instances should be 3D positional
+            category: Sound category, which decides the pool size
+            
+        Returns:
+            SoundPool or None if the sound could not be loaded
+        """
+        resolved_path = self._resolve_sound_path(sound_path)
+        if resolved_path is None:
+            return None
+        
+        pool_key = self.get_pool_key(resolved_path, positional)
+        if pool_key in self.sound_pools:
+            self.sound_banks.touch(sound_path)
+            return self.sound_pools[pool_key]
+        
+        # Not preloaded: load it now
+        pool = None
+        entry = self.sound_banks.resolve(sound_path)
+        stream = entry["stream"] if entry else category in SoundBankManager.STREAMED_CATEGORIES
+        try:
+            pool = self.create_sound_pool(resolved_path, positional, category, stream)
+            if pool is None and resolved_path not in self.missing_sound_files:
+                print(f"Warning: Failed to load sound: {resolved_path}")
+                self.missing_sound_files.add(resolved_path)
+        except Exception as e:
+            if resolved_path not in self.missing_sound_files:
+                print(f"Error loading sound {resolved_path}: {e}")
+                self.missing_sound_files.add(resolved_path)
+        
+        # Failed loads are remembered as None so they are not retried
+        self.sound_pools[pool_key] = pool
+        return pool
+    
+    def _get_3d_distances(self, sound_name: str) -> Tuple[float, float]:
+        """
+        Get the attenuation distances for a sound
+        
+        Args:
+            sound_name: Name of the sound
+            
+        Returns:
+            tuple: (min_distance, max_distance)
+        """
+        if "footstep" in sound_name:
+            return (self.audio_3d_settings["footstep_min_distance"],
+                    self.audio_3d_settings["footstep_max_distance"])
+        elif "ambient" in sound_name:
+            return (self.audio_3d_settings["ambient_min_distance"],
+                    self.audio_3d_settings["ambient_max_distance"])
+        else:
+            return (self.audio_3d_settings["default_min_distance"],
+                    self.audio_3d_settings["default_max_distance"])
+    
     def play_sound(self, sound_name: str, volume: float = 1.0, loop: bool = False, 
-                  position: Tuple[float, float, float] = None, category: str = SoundCategory.SFX) -> Optional[str]:
+                  position: Tuple[float, float, float] = None, category: str = SoundCategory.SFX,
+                  priority: float = None) -> Optional[str]:
         """
         Play a sound effect
         
@@ -208,17 +344,15 @@ class AudioManager:
             loop: Whether to loop the sound
             position: 3D position for the sound (x, y, z) or None for non-positional
             category: Sound category for volume control
+            priority: Importance when voices are limited (defaults to the category priority)
             
         Returns:
-            Sound ID for controlling the sound later, or None if failed
+            Sound ID for controlling the sound later, or None if failed or
+            dropped by the voice limits
         """
         if not self.audio_enabled:
             return None
             
-        # Check cooldown for this sound
-        if sound_name in self.sound_cooldowns and self.sound_cooldowns[sound_name] > 0:
-            return None
-            
         # Apply category volume
         if category in self.volume_settings:
             volume *= self.volume_settings[category]
@@ -242,31 +376,42 @@ class AudioManager:
         else:
             sound_path = sound_name
         
-        # Try to get from sound pool first
-        pool_key = f"{sound_path}_{positional}"
-        sound = None
+        # Decide whether this sound gets a voice, culling inaudible positional sounds
+        min_distance, max_distance = self._get_3d_distances(sound_name)
+        attenuation = self.voice_manager.get_attenuation(position, min_distance, max_distance)
+        if priority is None:
+            priority = self.voice_manager.get_priority(category)
+        importance = priority * volume * attenuation
         
-        if pool_key in self.sound_pools:
-            # Look for an available sound in the pool
-            for pooled_sound in self.sound_pools[pool_key]:
-                if not pooled_sound.status() == AudioSound.PLAYING:
-                    sound = pooled_sound
-                    break
+        allowed, victim = self.voice_manager.request_voice(sound_name, category, importance, attenuation)
+        if not allowed:
+            return None
         
-        # If not found in pool, load it
+        pool = self._get_sound_pool(sound_path, positional, category)
+        if pool is None:
+            return None
+        
+        # Take a free instance, or steal the weakest instance of this effect
+        sound = pool.acquire()
         if sound is None:
-            sound = self.load_sound(sound_path, positional)
-            
-            if sound is None:
-                return None
-                
-            # Add to pool if it doesn't exist yet
-            if pool_key not in self.sound_pools:
-                self.sound_pools[pool_key] = []
-            self.sound_pools[pool_key].append(sound)
+            pool_voices = [sid for sid, data in self.active_sounds.items() if data["pool"] is pool]
+            if victim in pool_voices:
+                pool_victim = victim
+            else:
+                pool_victim = self.voice_manager.find_weakest_voice(pool_voices)
+                if pool_victim is None or self.active_sounds[pool_victim]["importance"] >= importance:
+                    return None
+            self.voice_manager.mark_stolen()
+            self.stop_sound(pool_victim)
+            sound = pool.acquire()
+        
+        # Only steal the category voice once the new sound is certain to play
+        if victim is not None and victim in self.active_sounds:
+            self.voice_manager.mark_stolen()
+            self.stop_sound(victim)
         
         # Generate a unique ID for this sound instance
-        sound_id = f"{sound_name}_{id(sound)}_{len(self.active_sounds)}"
+        sound_id = f"{sound_name}_{id(sound)}_{next(self.sound_id_counter)}"
         
         # Configure the sound
         sound.setVolume(volume)
@@ -277,30 +422,23 @@ class AudioManager:
             sound.set3dAttributes(position[0], position[1], position[2], 0, 0, 0)
             
             # Set attenuation based on effect type
-            if "footstep" in sound_name:
-                sound.set3dMinDistance(self.audio_3d_settings["footstep_min_distance"])
-                sound.set3dMaxDistance(self.audio_3d_settings["footstep_max_distance"])
-            elif "ambient" in sound_name:
-                sound.set3dMinDistance(self.audio_3d_settings["ambient_min_distance"])
-                sound.set3dMaxDistance(self.audio_3d_settings["ambient_max_distance"])
-            else:
-                sound.set3dMinDistance(self.audio_3d_settings["default_min_distance"])
-                sound.set3dMaxDistance(self.audio_3d_settings["default_max_distance"])
+            sound.set3dMinDistance(min_distance)
+            sound.set3dMaxDistance(max_distance)
         
         # Play the sound
         sound.play()
         
         # Store in active sounds
-        self.active_sounds[sound_id] = {
+        self.voice_manager.add_voice(sound_id, {
             "sound": sound,
+            "sound_name": sound_name,
             "category": category,
             "positional": positional,
-            "base_volume": volume
-        }
-        
-        # Set cooldown for sound to prevent spamming (mainly for SFX)
-        if category == SoundCategory.SFX and not loop:
-            self.sound_cooldowns[sound_name] = 0.05  # 50ms cooldown
+            "base_volume": volume,
+            "loop": loop,
+            "pool": pool,
+            "importance": importance
+        }, sound.length())
         
         return sound_id
     
@@ -314,9 +452,9 @@ class AudioManager:
         if not self.audio_enabled or sound_id not in self.active_sounds:
             return
             
-        sound_data = self.active_sounds[sound_id]
+        sound_data = self.voice_manager.remove_voice(sound_id)
         sound_data["sound"].stop()
-        del self.active_sounds[sound_id]
+        sound_data["pool"].release(sound_data["sound"])
     
     def play_music(self, music_name: str, crossfade: bool = True):
         """
@@ -348,12 +486,13 @@ class AudioManager:
             # Start new music immediately
             self.current_music = self.play_sound(music_name, volume, True, None, SoundCategory.MUSIC)
     
-    def update_ambient_sounds(self):
-        """Update ambient sounds based on time of day and player location"""
-        if not self.audio_enabled:
-            return
-            
-        # Get current time of day
+    def _get_time_of_day(self) -> str:
+        """
+        Get the name of the current time of day
+        
+        Returns:
+            str: Time of day name such as "day" or "night"
+        """
         time_of_day = "day"  # Default
         if hasattr(self.game, 'day_night_cycle'):
             # Check which method is available
@@ -374,6 +513,10 @@ class AudioManager:
                 elif hasattr(self.game.day_night_cycle, 'time_of_day'):
                     numeric_time = self.game.day_night_cycle.time_of_day
                 
+                # DayNightCycle stores the TimeOfDay name itself
+                if isinstance(numeric_time, str):
+                    return numeric_time.lower()
+                
                 # Map numeric time to time of day name
                 if numeric_time < 0.25:
                     time_of_day = "night"
@@ -386,6 +529,16 @@ class AudioManager:
                 else:
                     time_of_day = "night"
         
+        return time_of_day
+    
+    def update_ambient_sounds(self):
+        """Update ambient sounds based on time of day and player location"""
+        if not self.audio_enabled:
+            return
+            
+        # Get current time of day
+        time_of_day = self._get_time_of_day()
+        
         # Check if we have ambient sounds for this time
         if time_of_day in self.time_ambient_sounds:
             # Get ambient sounds for this time
@@ -465,6 +618,7 @@ class AudioManager:
         # Update 3D listener position to match the camera
         if hasattr(self.game, 'camera'):
             cam_pos = self.game.camera.getPos()
+            self.voice_manager.listener_position = (cam_pos.x, cam_pos.y, cam_pos.z)
             cam_direction = self.game.camera.getQuat().getForward()
             
             # Try different method names and handle errors gracefully
@@ -517,20 +671,20 @@ class AudioManager:
                 self.next_music = None
                 self.is_crossfading = False
         
+        # Keep the sound banks of this time of day and the next one loaded
+        time_of_day = self._get_time_of_day()
+        if time_of_day != self.current_time_of_day:
+            self.current_time_of_day = time_of_day
+            self.sound_banks.set_time_of_day(time_of_day)
+        self.sound_banks.update()
+        
         # Update ambient sounds
         self.update_ambient_sounds()
         
-        # Clean up stopped sounds
-        for sound_id in list(self.active_sounds.keys()):
-            sound_data = self.active_sounds[sound_id]
-            if sound_data["sound"].status() != AudioSound.PLAYING:
-                del self.active_sounds[sound_id]
-        
-        # Decrease sound cooldowns
-        for sound_name in list(self.sound_cooldowns.keys()):
-            self.sound_cooldowns[sound_name] -= dt
-            if self.sound_cooldowns[sound_name] <= 0:
-                del self.sound_cooldowns[sound_name]
+        # Return finished one-shot sounds to their pools
+        for sound_id in self.voice_manager.update(dt):
+            sound_data = self.voice_manager.remove_voice(sound_id)
+            sound_data["pool"].release(sound_data["sound"])
     
     def set_volume(self, category: str, volume: float):
         """
@@ -557,6 +711,7 @@ class AudioManager:
     
     def cleanup(self):
         """Clean up audio resources"""
+        self.sound_banks.shutdown()
         if not self.audio_enabled:
             return
             
@@ -565,11 +720,11 @@ class AudioManager:
             self.active_sounds[sound_id]["sound"].stop()
         
         # Clear all sound pools
-        for sound_list in self.sound_pools.values():
-            for sound in sound_list:
-                sound.stop()
+        for pool in self.sound_pools.values():
+            if pool is not None:
+                pool.stop_all()
         
-        self.active_sounds.clear()
+        self.voice_manager.clear()
         self.sound_pools.clear()
         self.sound_cache.clear()
         
@@ -11,6 +11,7 @@ import math
 import random
 from game.enemy import Enemy
 from game.enemy_psychology import PsychologicalState
+from game.game_events import emit_event, DAMAGE_DEALT, BOSS_DEFEATED
 
 # Possible boss phases
 class BossPhase:
@@ -395,9 +396,8 @@ class Boss(Enemy):
             amount: Amount of damage to take
             source: Source of the damage (player, ability, etc.)
         """
-        # Record the damage in the performance tracker if available
-        if hasattr(self.game, 'performance_tracker'):
-            self.game.performance_tracker.record_combat_event('damage_dealt', amount)
+        # Report the damage dealt to the boss
+        emit_event(self.game, DAMAGE_DEALT, amount, source)
         
         # Apply the damage
         self.health -= amount
@@ -416,14 +416,8 @@ class Boss(Enemy):
         if self.health <= 0 and self.current_phase != BossPhase.DEFEATED:
             self._begin_phase_transition(BossPhase.DEFEATED)
             
-            # Record boss defeat in the performance tracker and adaptive difficulty system
-            if hasattr(self.game, 'performance_tracker'):
-                defeat_time = self.encounter_duration
-                self.game.performance_tracker.record_boss_event('victory', self.boss_type, defeat_time)
-                
-            if hasattr(self.game, 'adaptive_difficulty_system'):
-                defeat_time = self.encounter_duration
-                self.game.adaptive_difficulty_system.record_boss_event('defeat', defeat_time)
+            # Report the boss defeat with the encounter duration
+            emit_event(self.game, BOSS_DEFEATED, self.boss_type, self.encounter_duration)
                 
         # Trigger visual feedback
         if amount > 0:
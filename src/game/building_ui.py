@@ -11,6 +11,8 @@ from direct.gui.OnscreenText import OnscreenText
 from panda3d.core import TextNode, CardMaker, NodePath, Vec4, Vec3
 import math
 
+from engine.ui.retained import RetainedLayer, patch_widget
+
 class BuildingUI:
     """UI for constructing and managing buildings"""
     
@@ -109,7 +111,9 @@ class BuildingUI:
             horizontalScroll_frameColor=(0.2, 0.2, 0.3, 1.0)
         )
         
-        self.building_buttons = {}
+        # Selection buttons are kept per building type and pooled across categories
+        self.building_button_layer = RetainedLayer(self._create_building_button, self._patch_building_button)
+        self.building_buttons = self.building_button_layer.widgets
         
     def _create_building_info_panel(self):
         """Create the building information panel"""
@@ -224,7 +228,18 @@ class BuildingUI:
             fg=(1, 1, 0.7, 1)
         )
         
-        self.building_list_buttons = []
+        # Shown instead of the list when nothing is built
+        self.no_buildings_label = DirectLabel(
+            text="No buildings constructed",
+            text_scale=0.03,
+            frameColor=(0, 0, 0, 0),
+            pos=(-0.3, 0, -0.2),
+            parent=self.building_list_frame.getCanvas()
+        )
+        self.no_buildings_label.hide()
+        
+        # List buttons are kept per position in the list
+        self.building_list_layer = RetainedLayer(self._create_building_list_button)
         
     def _on_category_selected(self, category):
         """
@@ -250,11 +265,6 @@ class BuildingUI:
         Args:
             category: The building category to display
         """
-        # Clear existing buttons
-        for button in self.building_buttons.values():
-            button.destroy()
-        self.building_buttons = {}
-        
         # Get buildings of the current category
         buildings = [btype for btype, bdata in self.game.building_system.building_types.items() 
                     if bdata["category"] == category]
@@ -265,6 +275,7 @@ class BuildingUI:
         columns = 3
         
         # Calculate positions
+        models = {}
         for i, building_type in enumerate(buildings):
             col = i % columns
             row = i // columns
@@ -274,38 +285,76 @@ class BuildingUI:
             
             building_data = self.game.building_system.building_types[building_type]
             
-            # Button background
-            button = DirectButton(
-                frameColor=(0.25, 0.25, 0.35, 1.0),
-                frameSize=(0, button_width, -button_height, 0),
-                relief=DGG.FLAT,
-                pos=(x_pos, 0, y_pos),
-                parent=self.building_selection_frame.getCanvas(),
-                command=self._on_building_selected,
-                extraArgs=[building_type]
-            )
-            
-            # Building name
-            name_label = DirectLabel(
-                text=building_data["name"],
-                text_scale=0.03,
-                frameColor=(0, 0, 0, 0),
-                pos=(button_width/2, 0, -button_height+0.02),
-                parent=button
-            )
-            
             # Check if player can afford
             can_afford = self.game.building_system.can_build(building_type)
             
-            # Availability indicator
-            availability = DirectFrame(
-                frameColor=(0.2, 0.6, 0.2, 1.0) if can_afford else (0.6, 0.2, 0.2, 1.0),
-                frameSize=(0, 0.03, 0, 0.03),
-                pos=(button_width-0.05, 0, -0.05),
-                parent=button
-            )
+            models[building_type] = {
+                "pos": (x_pos, 0, y_pos),
+                "extraArgs": [building_type],
+                "name": building_data["name"],
+                "can_afford": can_afford
+            }
+        
+        # Only buttons whose building or affordability changed are patched
+        self.building_button_layer.update(models)
+        
+    def _create_building_button(self, building_type, props):
+        """
+        Create a building selection button
+        
+        Args:
+            building_type: Type of the building shown first
+            props: View model of the button
             
-            self.building_buttons[building_type] = button
+        Returns:
+            DirectButton: The button
+        """
+        button_width = 0.15
+        button_height = 0.15
+        
+        # Button background
+        button = DirectButton(
+            frameColor=(0.25, 0.25, 0.35, 1.0),
+            frameSize=(0, button_width, -button_height, 0),
+            relief=DGG.FLAT,
+            parent=self.building_selection_frame.getCanvas(),
+            command=self._on_building_selected
+        )
+        
+        # Building name
+        button.name_label = DirectLabel(
+            text="",
+            text_scale=0.03,
+            frameColor=(0, 0, 0, 0),
+            pos=(button_width/2, 0, -button_height+0.02),
+            parent=button
+        )
+        
+        # Availability indicator
+        button.availability = DirectFrame(
+            frameSize=(0, 0.03, 0, 0.03),
+            pos=(button_width-0.05, 0, -0.05),
+            parent=button
+        )
+        
+        self._patch_building_button(button, props)
+        return button
+        
+    def _patch_building_button(self, button, changed):
+        """
+        Apply the changed properties of a building selection button
+        
+        Args:
+            button: The button
+            changed: Changed properties
+        """
+        changed = dict(changed)
+        if "name" in changed:
+            button.name_label["text"] = changed.pop("name")
+        if "can_afford" in changed:
+            can_afford = changed.pop("can_afford")
+            button.availability["frameColor"] = (0.2, 0.6, 0.2, 1.0) if can_afford else (0.6, 0.2, 0.2, 1.0)
+        patch_widget(button, changed)
             
     def _on_building_selected(self, building_type):
         """
@@ -400,9 +449,10 @@ class BuildingUI:
         if not self.placement_mode or not self.placement_indicator:
             return task.done
             
-        # Get mouse position
-        if self.game.mouseWatcherNode.hasMouse():
-            mouse_pos = self.game.mouseWatcherNode.getMouse()
+        # Get mouse position (there is no mouse watcher without a window)
+        mouse_watcher = getattr(self.game, 'mouseWatcherNode', None)
+        if mouse_watcher is not None and mouse_watcher.hasMouse():
+            mouse_pos = mouse_watcher.getMouse()
             
             # Project mouse position onto ground plane
             pos3d = self.game.calculate_ground_point_at_mouse(mouse_pos)
@@ -519,48 +569,54 @@ class BuildingUI:
         
     def _update_building_list(self):
         """Update the list of constructed buildings"""
-        # Clear current list
-        for button in self.building_list_buttons:
-            button.destroy()
-        self.building_list_buttons = []
-        
         # Get constructed buildings
         buildings = self.game.building_system.constructed_buildings
         
         # No buildings scenario
         if not buildings:
-            no_buildings_label = DirectLabel(
-                text="No buildings constructed",
-                text_scale=0.03,
-                frameColor=(0, 0, 0, 0),
-                pos=(-0.3, 0, -0.2),
-                parent=self.building_list_frame.getCanvas()
-            )
-            self.building_list_buttons.append(no_buildings_label)
+            self.building_list_layer.clear()
+            self.no_buildings_label.show()
             return
+        self.no_buildings_label.hide()
             
-        # Create button for each building
+        # One button per building; only changed names and progress are patched
+        models = {}
         for i, building in enumerate(buildings):
             building_type = building["type"]
             building_data = self.game.building_system.building_types[building_type]
             
-            y_pos = -0.2 - (i * 0.08)
-            
-            # Building button
-            button = DirectButton(
-                text=f"{building_data['name']} ({int(building['construction_progress'])}%)",
-                text_scale=0.03,
-                text_align=TextNode.ALeft,
-                frameColor=(0.25, 0.25, 0.35, 1.0),
-                frameSize=(-0.2, 0.15, -0.03, 0.03),
-                relief=DGG.FLAT,
-                pos=(-0.3, 0, y_pos),
-                parent=self.building_list_frame.getCanvas(),
-                command=self._on_building_list_selected,
-                extraArgs=[i]
-            )
+            models[i] = {
+                "pos": (-0.3, 0, -0.2 - (i * 0.08)),
+                "extraArgs": [i],
+                "text": f"{building_data['name']} ({int(building['construction_progress'])}%)",
+                "frameColor": (0.25, 0.25, 0.35, 1.0)
+            }
+        self.building_list_layer.update(models)
+        
+    def _create_building_list_button(self, building_idx, props):
+        """
+        Create the button of a constructed building
+        
+        Args:
+            building_idx: Index of the building in the list
+            props: View model of the button
             
-            self.building_list_buttons.append(button)
+        Returns:
+            DirectButton: The button
+        """
+        # Building button
+        return DirectButton(
+            text=props["text"],
+            text_scale=0.03,
+            text_align=TextNode.ALeft,
+            frameColor=props["frameColor"],
+            frameSize=(-0.2, 0.15, -0.03, 0.03),
+            relief=DGG.FLAT,
+            pos=props["pos"],
+            parent=self.building_list_frame.getCanvas(),
+            command=self._on_building_list_selected,
+            extraArgs=props["extraArgs"]
+        )
         
     def _on_building_list_selected(self, building_idx):
         """
@@ -573,11 +629,11 @@ class BuildingUI:
         self.demolish_button["state"] = DGG.NORMAL
         
         # Update button colors in the list
-        for i, button in enumerate(self.building_list_buttons):
+        for i, button in self.building_list_layer.items():
             if i == building_idx:
-                button["frameColor"] = (0.4, 0.4, 0.6, 1.0)
+                self.building_list_layer.patch(i, {"frameColor": (0.4, 0.4, 0.6, 1.0)})
             else:
-                button["frameColor"] = (0.25, 0.25, 0.35, 1.0)
+                self.building_list_layer.patch(i, {"frameColor": (0.25, 0.25, 0.35, 1.0)})
                 
     def show(self):
         """Show the building UI"""
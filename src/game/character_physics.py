@@ -12,7 +12,7 @@ from typing import Dict, List, Tuple, Optional
 
 from panda3d.core import Vec3, Point3, NodePath, LineSegs
 
-from src.engine.physics.verlet import VerletSystem, VerletPoint, DistanceConstraint
+from engine.physics.verlet import VerletSystem, VerletPoint, DistanceConstraint
 
 class MovementState(Enum):
     """Character movement states"""
@@ -46,12 +46,13 @@ class CharacterPhysics:
     that controls a Verlet-based physics skeleton
     """
     
-    def __init__(self, verlet_system: VerletSystem):
+    def __init__(self, verlet_system: VerletSystem, terrain=None):
         """
         Initialize the character physics system
         
         Args:
             verlet_system: The Verlet physics system
+            terrain: Optional terrain with height_at(x, y) for ground contact
         """
         self.verlet_system = verlet_system
         
@@ -65,8 +66,9 @@ class CharacterPhysics:
         self.muscle_forces = {}  # Current force for each muscle
         self.balance_target = Vec3(0, 0, 0)  # Target for balance system
         
-        # Environment
+        # Environment; a terrain with height_at(x, y) overrides the fixed ground height
         self.ground_height = 0.0
+        self.terrain = terrain
         self.on_ground = False
         self.climbing = False
         self.climbing_surface = None
@@ -267,6 +269,10 @@ class CharacterPhysics:
     
     def _check_ground_contact(self):
         """Check if character is in contact with the ground"""
+        if self.terrain is not None:
+            center = self._get_character_center()
+            self.set_ground_height(self.terrain.height_at(center.x, center.y))
+        
         # Find the lowest point of the character (usually feet)
         lowest_point = float('inf')
         for point_name, point in self.points.items():
@@ -9,7 +9,9 @@ Manages city buildings, resources, and defense automation
 from enum import Enum
 import random
 import math
-from panda3d.core import Vec3, NodePath
+from panda3d.core import NodePath
+
+from game.tower_targeting import TowerTargeting, TargetMode
 
 class BuildingType(Enum):
     """Enumeration of different building types"""
@@ -94,6 +96,8 @@ class Building:
         self.defense_damage = 0.0
         self.defense_cooldown = 0.0
         self.defense_current_cooldown = 0.0
+        self.target_mode = TargetMode.NEAREST
+        self.targeting_registered = False
         
     def update(self, dt, city_manager):
         """
@@ -103,6 +107,8 @@ class Building:
             dt: Time delta
             city_manager: The city manager instance
         """
+        self.update_defense(dt, city_manager)
+        
         if self.state == BuildingState.UNDER_CONSTRUCTION:
             self._update_construction(dt, city_manager)
         elif self.state == BuildingState.OPERATIONAL:
@@ -111,6 +117,23 @@ class Building:
             self._update_damaged(dt, city_manager)
         elif self.state == BuildingState.UPGRADING:
             self._update_upgrading(dt, city_manager)
+    
+    def update_defense(self, dt, city_manager):
+        """
+        Update the per-frame defense of the building
+        
+        Cities whose economy runs on a CityEconomy tick call this every frame
+        instead of update.
+        
+        Args:
+            dt: Time delta
+            city_manager: The city manager instance
+        """
+        # Only operational buildings take part in targeting
+        if self.targeting_registered and self.state != BuildingState.OPERATIONAL:
+            self.release_targeting(city_manager)
+        
+        self._handle_defense(dt, city_manager)
             
     def _update_construction(self, dt, city_manager):
         """Update during construction phase"""
@@ -138,9 +161,6 @@ class Building:
         """Update during operational phase"""
         # Handle resource production and consumption
         self._process_resources(dt, city_manager)
-        
-        # Handle defense actions for defensive buildings
-        self._handle_defense(dt, city_manager)
     
     def _update_damaged(self, dt, city_manager):
         """Update during damaged phase"""
@@ -152,11 +172,7 @@ class Building:
         if self.health >= self.max_health:
             self.health = self.max_health
             self.state = BuildingState.OPERATIONAL
-            
-            # Remove damage effects
-            if self.damage_effect:
-                self.damage_effect.removeNode()
-                self.damage_effect = None
+            self._on_repair_complete(city_manager)
     
     def _update_upgrading(self, dt, city_manager):
         """Update during upgrading phase"""
@@ -198,45 +214,45 @@ class Building:
         # Only defensive buildings with defense_range > 0 can defend
         if self.defense_range <= 0 or self.state != BuildingState.OPERATIONAL:
             return
+        
+        # Register with the targeting service, which picks targets for all towers each tick
+        targeting = TowerTargeting.for_game(city_manager.game)
+        if not self.targeting_registered:
+            self._register_targeting(city_manager)
             
         # Update cooldown
         if self.defense_current_cooldown > 0:
             self.defense_current_cooldown -= dt
             return
             
-        # Find enemies in range
-        if hasattr(city_manager.game, 'entity_manager'):
-            enemies_in_range = self._get_enemies_in_range(city_manager)
-            
-            if enemies_in_range:
-                # Attack the closest enemy
-                self._attack_enemy(enemies_in_range[0], city_manager)
-                self.defense_current_cooldown = self.defense_cooldown
+        # Attack the current target
+        target = targeting.get_target(self)
+        if target:
+            self._attack_enemy(target, city_manager)
+            self.defense_current_cooldown = self.defense_cooldown
     
-    def _get_enemies_in_range(self, city_manager):
-        """Get enemies in defense range"""
-        enemies_in_range = []
-        
-        # Convert grid position to world position
-        world_pos = city_manager.grid_to_world(self.position)
-        
-        # Check all enemies
-        for enemy in city_manager.game.entity_manager.enemies.values():
-            distance = (enemy.position - Vec3(world_pos[0], world_pos[1], 0)).length()
-            if distance <= self.defense_range:
-                enemies_in_range.append((enemy, distance))
-                
-        # Sort by distance
-        enemies_in_range.sort(key=lambda x: x[1])
+    def _register_targeting(self, city_manager):
+        """Register the building's position and defense range for targeting"""
+        TowerTargeting.for_game(city_manager.game).register_tower(
+            self, city_manager.grid_to_world(self.position), self.defense_range, self.target_mode)
+        self.targeting_registered = True
+    
+    def release_targeting(self, city_manager):
+        """
+        Remove the building from tower targeting
         
-        # Return just the enemy objects
-        return [enemy for enemy, _ in enemies_in_range]
+        Args:
+            city_manager: The city manager instance
+        """
+        if self.targeting_registered:
+            TowerTargeting.for_game(city_manager.game).unregister_tower(self)
+            self.targeting_registered = False
     
     def _attack_enemy(self, enemy, city_manager):
         """Attack an enemy"""
         # Apply damage
         if hasattr(enemy, 'take_damage'):
-            enemy.take_damage(self.defense_damage, None)
+            enemy.take_damage(self.defense_damage)
             
         # Create attack effect
         if hasattr(city_manager.game, 'effect_manager'):
@@ -267,6 +283,13 @@ class Building:
         # Update city stats
         city_manager.on_building_completed(self)
     
+    def _on_repair_complete(self, city_manager):
+        """Handle repair completion"""
+        # Remove damage effects
+        if self.damage_effect:
+            self.damage_effect.removeNode()
+            self.damage_effect = None
+    
     def _on_upgrade_complete(self, city_manager):
         """Handle upgrade completion"""
         print(f"Building {self.name} upgraded to level {self.level}!")
@@ -285,6 +308,8 @@ class Building:
         # Scale defense stats
         self.defense_damage *= 1.3
         self.defense_range *= 1.1
+        if self.targeting_registered:
+            self._register_targeting(city_manager)
         
         # Update building appearance
         if self.node_path and hasattr(city_manager.game, 'model_manager'):
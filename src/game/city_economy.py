@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+City Economy for Nightfall Defenders
+Advances the resources and building work of a city on a coarse tick
+"""
+
+from game.city_automation import BuildingState
+
+# Rates of the building work phases, in percent or health per worker and second
+CONSTRUCTION_RATE = 0.1
+UPGRADE_RATE = 0.05
+REPAIR_RATE = 0.05
+
+# Amounts below this are treated as empty or full
+_EPSILON = 1e-9
+
+class CityEconomy:
+    """
+    Economy scheduler of a city
+    
+    Between two state changes every resource flow and every construction,
+    upgrade or repair progresses linearly, so the city is advanced from one
+    change to the next in closed form instead of integrating every frame.
+    A change is a building finishing its work or a resource reaching its
+    storage cap or running out. A resource that runs out throttles its
+    consumers to the share of the demand its producers can cover. The cost
+    of a tick or of a long catch-up only depends on the number of changes
+    in it, not on its length or on the frame rate.
+    """
+    
+    # Length of a simulation tick in seconds
+    TICK = 1.0
+    
+    # Maximum number of state changes processed in one advance
+    MAX_STEPS = 10000
+    
+    def __init__(self, city_manager, tick=TICK):
+        """
+        Initialize the economy
+        
+        Args:
+            city_manager: The city manager owning the buildings and resources
+            tick (float): Length of a simulation tick in seconds
+        """
+        self.city_manager = city_manager
+        self.tick = tick
+        
+        # Time not simulated yet
+        self.accumulator = 0.0
+        
+        # Total simulated time
+        self.time = 0.0
+    
+    def update(self, dt):
+        """
+        Advance the economy by whole ticks
+        
+        Args:
+            dt (float): Frame delta time
+        """
+        self.accumulator += dt
+        if self.accumulator < self.tick:
+            return
+        
+        ticks = int(self.accumulator / self.tick)
+        self.accumulator -= ticks * self.tick
+        self.advance(ticks * self.tick)
+    
+    def catch_up(self, elapsed):
+        """
+        Advance the economy over a long gap, such as a loaded save or skipped time
+        
+        Args:
+            elapsed (float): Time to simulate in seconds
+        """
+        self.advance(elapsed + self.accumulator)
+        self.accumulator = 0.0
+    
+    def advance(self, span):
+        """
+        Advance the economy from one state change to the next
+        
+        Args:
+            span (float): Time to simulate in seconds
+        
+        Returns:
+            int: Number of linear segments simulated
+        """
+        resource_manager = self.city_manager.resource_manager
+        remaining = span
+        steps = 0
+        while remaining > _EPSILON and steps < self.MAX_STEPS:
+            steps += 1
+            net = self._net_rates(resource_manager)
+            work = self._work_rates()
+            
+            # Time to the next state change
+            step = remaining
+            for resource_type, rate in net.items():
+                amount = resource_manager.resources.get(resource_type, 0)
+                if rate > 0:
+                    capacity = resource_manager.storage_capacity.get(resource_type, float('inf'))
+                    step = min(step, (capacity - amount) / rate)
+                elif rate < 0:
+                    step = min(step, amount / -rate)
+            for building, rate, target in work:
+                step = min(step, (target - self._work_value(building)) / rate)
+            step = max(step, 0.0)
+            
+            self._integrate(resource_manager, net, work, step)
+            remaining -= step
+            self.time += step
+        
+        if remaining > _EPSILON:
+            print(f"Warning: city economy stopped after {steps} state changes, {remaining:.1f}s left")
+        return steps
+    
+    def _net_rates(self, resource_manager):
+        """
+        Compute the net flow of every resource over the next segment
+        
+        Args:
+            resource_manager: The city resource manager
+        
+        Returns:
+            dict: ResourceType -> net amount per second
+        """
+        # Static rates and running buildings as (outputs, inputs) flows
+        flows = []
+        for resource_type, rate in resource_manager.resource_rates.items():
+            if rate > 0:
+                flows.append(({resource_type: rate}, {}))
+            elif rate < 0:
+                flows.append(({}, {resource_type: -rate}))
+        
+        for building in self.city_manager.buildings.values():
+            if building.state != BuildingState.OPERATIONAL or building.assigned_workers <= 0:
+                continue
+            capacity = getattr(building, 'worker_capacity', 0) or building.assigned_workers
+            efficiency = min(1.0, building.assigned_workers / capacity)
+            outputs = {r: amount * efficiency for r, amount in building.production.items()}
+            inputs = {r: amount * efficiency for r, amount in building.consumption.items()}
+            if outputs or inputs:
+                flows.append((outputs, inputs))
+        
+        # Empty resources can only feed their consumers as fast as they are produced,
+        # and a consumer runs at the share of its scarcest input; throttling a
+        # consumer lowers its own outputs, so repeat until stable
+        throttles = [1.0] * len(flows)
+        demand = self._totals(flows, throttles)[1]
+        for _ in range(len(resource_manager.resources) + 1):
+            production = self._totals(flows, throttles)[0]
+            changed = False
+            for resource_type, needed in demand.items():
+                if needed <= _EPSILON or resource_manager.resources.get(resource_type, 0) > _EPSILON:
+                    continue
+                supplied = production.get(resource_type, 0.0)
+                if supplied >= needed - _EPSILON:
+                    continue
+                share = supplied / needed
+                for index, (outputs, inputs) in enumerate(flows):
+                    if resource_type in inputs and share < throttles[index] - _EPSILON:
+                        throttles[index] = min(throttles[index], share)
+                        changed = True
+            if not changed:
+                break
+        
+        production, demand = self._totals(flows, throttles)
+        net = {}
+        for resource_type in set(production) | set(demand):
+            rate = production.get(resource_type, 0.0) - demand.get(resource_type, 0.0)
+            amount = resource_manager.resources.get(resource_type, 0)
+            capacity = resource_manager.storage_capacity.get(resource_type, float('inf'))
+            
+            # Full storage drops the surplus and empty storage has nothing left to give
+            if (rate > 0 and amount >= capacity - _EPSILON) or (rate < 0 and amount <= _EPSILON):
+                continue
+            if abs(rate) > _EPSILON:
+                net[resource_type] = rate
+        return net
+    
+    def _totals(self, flows, throttles):
+        """Sum the throttled production and demand of every resource"""
+        production = {}
+        demand = {}
+        for (outputs, inputs), throttle in zip(flows, throttles):
+            for resource_type, rate in outputs.items():
+                production[resource_type] = production.get(resource_type, 0.0) + rate * throttle
+            for resource_type, rate in inputs.items():
+                demand[resource_type] = demand.get(resource_type, 0.0) + rate * throttle
+        return production, demand
+    
+    def _work_rates(self):
+        """
+        Get the buildings under construction, upgrade or repair
+        
+        Returns:
+            list: (building, rate per second, target value) tuples
+        """
+        work = []
+        for building in self.city_manager.buildings.values():
+            if building.assigned_workers <= 0:
+                continue
+            if building.state == BuildingState.UNDER_CONSTRUCTION:
+                work.append((building, CONSTRUCTION_RATE * building.assigned_workers, 100.0))
+            elif building.state == BuildingState.UPGRADING:
+                work.append((building, UPGRADE_RATE * building.assigned_workers, 100.0))
+            elif building.state == BuildingState.DAMAGED:
+                work.append((building, REPAIR_RATE * building.assigned_workers, building.max_health))
+        return work
+    
+    def _work_value(self, building):
+        """Get the progressing value of a building's current work phase"""
+        if building.state == BuildingState.UNDER_CONSTRUCTION:
+            return building.construction_progress
+        if building.state == BuildingState.UPGRADING:
+            return building.upgrade_progress
+        return building.health
+    
+    def _integrate(self, resource_manager, net, work, step):
+        """
+        Apply a linear segment and fire the state changes at its end
+        
+        Args:
+            resource_manager: The city resource manager
+            net (dict): Net resource flows
+            work (list): Building work rates
+            step (float): Length of the segment in seconds
+        """
+        full = []
+        for resource_type, rate in net.items():
+            amount = resource_manager.resources.get(resource_type, 0) + rate * step
+            capacity = resource_manager.storage_capacity.get(resource_type, float('inf'))
+            if amount >= capacity - _EPSILON:
+                amount = capacity
+                full.append(resource_type)
+            elif amount <= _EPSILON:
+                amount = 0
+            resource_manager.resources[resource_type] = amount
+        
+        for building, rate, target in work:
+            if building.state == BuildingState.UNDER_CONSTRUCTION:
+                building.construction_progress = min(100.0, building.construction_progress + rate * step)
+                # Health follows construction progress
+                building.health = max(building.health, building.max_health * building.construction_progress / 100.0)
+                if building.construction_progress >= 100.0 - _EPSILON:
+                    building.construction_progress = 100.0
+                    building.state = BuildingState.OPERATIONAL
+                    building.health = building.max_health
+                    building._on_construction_complete(self.city_manager)
+            elif building.state == BuildingState.UPGRADING:
+                building.upgrade_progress = min(100.0, building.upgrade_progress + rate * step)
+                if building.upgrade_progress >= 100.0 - _EPSILON:
+                    building.upgrade_progress = 100.0
+                    building.level += 1
+                    building.state = BuildingState.OPERATIONAL
+                    building._on_upgrade_complete(self.city_manager)
+            else:
+                building.health = min(building.max_health, building.health + rate * step)
+                if building.health >= building.max_health - _EPSILON:
+                    building.health = building.max_health
+                    building.state = BuildingState.OPERATIONAL
+                    building._on_repair_complete(self.city_manager)
+        
+        for resource_type in full:
+            if hasattr(self.city_manager, 'on_storage_full'):
+                self.city_manager.on_storage_full(resource_type)
@@ -9,9 +9,15 @@ Manages overall city state and coordinates building placement
 from panda3d.core import Vec3, NodePath
 import math
 
+from game.game_events import emit_event, CITY_DAMAGED
+from game.tower_targeting import TowerTargeting
+
 class CityManager:
     """Manages the city state, resources, and defenses"""
     
+    # Interval of the food economy tick in seconds
+    FOOD_TICK = 1.0
+    
     def __init__(self, game):
         """
         Initialize the city manager
@@ -35,6 +41,7 @@ class CityManager:
         self.food_production = 0
         self.food_storage = 0
         self.food_consumption = 0
+        self.food_timer = 0.0
         self.healing_rate = 0
         
         # City level
@@ -130,19 +137,36 @@ class CityManager:
         Args:
             dt: Delta time in seconds
         """
+        # Food only changes on the economy tick
+        self.food_timer += dt
+        if self.food_timer >= self.FOOD_TICK:
+            self._advance_food(self.food_timer)
+            self.food_timer = 0.0
+    
+    def _advance_food(self, elapsed):
+        """
+        Apply food production and consumption over a span in closed form
+        
+        Args:
+            elapsed: Span in seconds
+        """
         # Food production (every 10 game seconds = 1 food unit)
-        production_rate = self.food_production / 10.0 * dt
-        self.food_storage += production_rate
+        # and consumption by defenders (every 15 game seconds per defender)
+        net_rate = self.food_production / 10.0 - self.current_defenders / 15.0
         
-        # Food consumption by defenders (every 15 game seconds per defender)
-        if self.current_defenders > 0:
-            consumption_rate = self.current_defenders / 15.0 * dt
-            self.food_storage -= consumption_rate
-            
-            # Ensure food doesn't go negative
-            if self.food_storage < 0:
-                self.food_storage = 0
-                # Defenders might leave if no food, but not implementing that now
+        # Ensure food doesn't go negative
+        # Defenders might leave if no food, but not implementing that now
+        self.food_storage = max(0, self.food_storage + net_rate * elapsed)
+    
+    def catch_up(self, elapsed):
+        """
+        Advance the city economy over a long gap, such as a loaded save or skipped time
+        
+        Args:
+            elapsed: Time to simulate in seconds
+        """
+        self._advance_food(self.food_timer + elapsed)
+        self.food_timer = 0.0
         
     def _update_defenders(self, dt):
         """
@@ -178,21 +202,18 @@ class CityManager:
         
     def _detect_nearby_enemies(self):
         """
-        Detect enemies within detection range
+        Detect enemies approaching the city
+        
+        The watch covers a ring from the city boundary out to the
+        detection range beyond it, using the enemy index the tower
+        targeting service builds each tick.
         
         Returns:
             bool: True if enemies detected, False otherwise
         """
-        # This is a placeholder for the actual detection logic
-        # In a real implementation, scan all enemies and check distance to city
-        
-        for entity in self.game.entity_manager.entities.values():
-            if hasattr(entity, 'enemy') and entity.enemy:
-                distance = (entity.position - self.city_center).length()
-                if distance < self.detection_range:
-                    return True
-                    
-        return False
+        targeting = TowerTargeting.for_game(self.game)
+        return targeting.count_in_ring(self.city_center, self.city_radius + self.detection_range,
+                                       self.city_radius) > 0
         
     def show_attack_warning(self):
         """Show a warning that enemies are approaching the city"""
@@ -404,6 +425,10 @@ class CityManager:
                     # Moderately damaged
                     section['marker'].setColor(0.8, 0.6, 0.2, 1.0)
                 
+        # Report the damage
+        if actual_damage > 0:
+            emit_event(self.game, CITY_DAMAGED, actual_damage, "fog")
+        
         # Show message if significant damage
         if actual_damage > 5:
             self.show_fog_damage_warning(actual_damage)
@@ -182,31 +182,36 @@ class CraftingSystem:
         
         recipe = self.recipes[recipe_id]
         player = self.game.player
+        if not hasattr(player, "stats"):
+            print(f"Warning: player has no stat engine, upgrade {recipe_id} has no effect")
+            return
+        
+        # Each upgrade is one source of the player's stat engine covering all its levels
+        level = self.crafted_upgrades.get(recipe_id, 0)
+        source = f"crafting:{recipe_id}"
         
         # Apply effects based on recipe type
         if recipe_id == "weapon_damage":
             damage_boost = recipe["effect"]["damage_boost"]
-            for projectile_type in player.projectile_types.values():
-                projectile_type["damage"] += damage_boost
+            player.stats.set_source(source, additive={"projectile_damage": damage_boost * level})
         
         elif recipe_id == "weapon_cooldown":
             cooldown_reduction = recipe["effect"]["cooldown_reduction"]
-            for projectile_type in player.projectile_types.values():
-                projectile_type["cooldown"] *= (1 - cooldown_reduction)
+            player.stats.set_source(source, multiplicative={"attack_cooldown": (1 - cooldown_reduction) ** level})
         
         elif recipe_id == "health_boost":
             health_boost = recipe["effect"]["health_boost"]
-            player.max_health += health_boost
+            player.stats.set_source(source, additive={"max_health": health_boost * level})
             player.health += health_boost
         
         elif recipe_id == "stamina_boost":
             stamina_boost = recipe["effect"]["stamina_boost"]
-            player.max_stamina += stamina_boost
+            player.stats.set_source(source, additive={"max_stamina": stamina_boost * level})
             player.stamina += stamina_boost
         
         elif recipe_id == "movement_speed":
             speed_boost = recipe["effect"]["speed_boost"]
-            player.speed *= (1 + speed_boost)
+            player.stats.set_source(source, multiplicative={"speed": (1 + speed_boost) ** level})
     
     def get_recipe_info(self, recipe_id):
         """
@@ -10,6 +10,8 @@ from direct.gui.DirectGui import DirectFrame, DirectButton, DirectLabel, DGG
 from direct.gui.OnscreenText import OnscreenText
 from panda3d.core import TextNode
 
+from engine.ui.retained import RetainedLayer, patch_widget
+
 class CraftingUI:
     """UI for interacting with the crafting system"""
     
@@ -49,9 +51,9 @@ class CraftingUI:
             shadow=(0, 0, 0, 1)
         )
         
-        # Create recipe buttons
-        self.recipe_buttons = {}
-        self.recipe_labels = {}
+        # Recipe buttons, kept per recipe and patched when a level changes
+        self.recipe_layer = RetainedLayer(self._create_recipe_button, self._patch_recipe_button)
+        self.recipe_buttons = self.recipe_layer.widgets
         
         # Add close button
         self.close_button = DirectButton(
@@ -153,45 +155,74 @@ class CraftingUI:
         )
     
     def _create_recipe_buttons(self):
-        """Create buttons for each recipe"""
-        # Clear existing buttons
-        for button in self.recipe_buttons.values():
-            button.destroy()
-        
-        self.recipe_buttons = {}
-        
+        """Show a button for each recipe"""
         # Get all recipes info
         recipes = self.game.crafting_system.get_all_recipes_info()
         
-        # Create a button for each recipe
+        models = {}
         for i, recipe in enumerate(recipes):
-            button = DirectButton(
-                text=recipe["name"],
-                scale=0.05,
-                frameSize=(-0.4, 0.4, -0.4, 0.4),
-                pad=(0.3, 0.1),
-                command=self._select_recipe,
-                extraArgs=[recipe["id"]],
-                frameColor=(0.3, 0.3, 0.3, 0.8),
-                text_fg=(1, 1, 1, 1),
-                relief=DGG.FLAT,
-                pressEffect=1,
-                parent=self.main_frame,
-                pos=(-0.4, 0, 0.3 - i * 0.12)
-            )
-            
-            # Add level indicator
-            level_text = f"Lv. {recipe['current_level']}/{recipe['max_level']}"
-            level_label = OnscreenText(
-                text=level_text,
-                parent=button,
-                pos=(0.25, -0.02),
-                scale=0.7,
-                fg=(0.2, 0.8, 0.2, 1) if recipe["current_level"] > 0 else (0.7, 0.7, 0.7, 1)
-            )
-            
-            self.recipe_buttons[recipe["id"]] = button
-            self.recipe_labels[recipe["id"]] = level_label
+            models[recipe["id"]] = {
+                "text": recipe["name"],
+                "extraArgs": [recipe["id"]],
+                "pos": (-0.4, 0, 0.3 - i * 0.12),
+                "level": f"Lv. {recipe['current_level']}/{recipe['max_level']}",
+                "level_fg": (0.2, 0.8, 0.2, 1) if recipe["current_level"] > 0 else (0.7, 0.7, 0.7, 1)
+            }
+        
+        # Only the recipes whose level changed are patched after crafting
+        self.recipe_layer.update(models)
+    
+    def _create_recipe_button(self, recipe_id, props):
+        """
+        Create the button of a recipe
+        
+        Args:
+            recipe_id (str): ID of the recipe shown first
+            props (dict): View model of the button
+        
+        Returns:
+            DirectButton: The button
+        """
+        button = DirectButton(
+            text=props["text"],
+            scale=0.05,
+            frameSize=(-0.4, 0.4, -0.4, 0.4),
+            pad=(0.3, 0.1),
+            command=self._select_recipe,
+            extraArgs=props["extraArgs"],
+            frameColor=(0.3, 0.3, 0.3, 0.8),
+            text_fg=(1, 1, 1, 1),
+            relief=DGG.FLAT,
+            pressEffect=1,
+            parent=self.main_frame,
+            pos=props["pos"]
+        )
+        
+        # Add level indicator
+        button.level_label = OnscreenText(
+            text=props["level"],
+            parent=button,
+            pos=(0.25, -0.02),
+            scale=0.7,
+            fg=props["level_fg"]
+        )
+        
+        return button
+    
+    def _patch_recipe_button(self, button, changed):
+        """
+        Apply the changed properties of a recipe button
+        
+        Args:
+            button (DirectButton): The button
+            changed (dict): Changed properties
+        """
+        changed = dict(changed)
+        if "level" in changed:
+            button.level_label.setText(changed.pop("level"))
+        if "level_fg" in changed:
+            button.level_label.setFg(changed.pop("level_fg"))
+        patch_widget(button, changed)
     
     def _select_recipe(self, recipe_id):
         """
@@ -0,0 +1,1871 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Definition Tables for Nightfall Defenders
+Source tables of the skills, abilities, relics, fusion recipes and harmonization effects
+
+The game does not import this module directly: the definitions compiler
+(game.definitions) serialises these tables into a versioned artefact that
+is loaded lazily, and this module is only read when that artefact is
+missing or older than the tables.
+"""
+
+from .skill_tree import SkillType
+from .ability_system import ElementType, AbilityType
+from .relic_system import RelicRarity
+
+# Dictionary of all skills in the game
+SKILLS = {
+    # ========== Warrior Skills ==========
+    "warrior_root": {
+        "id": "warrior_root",
+        "name": "Path of the Warrior",
+        "description": "Begin your journey as a Warrior, specializing in close combat and high survivability.",
+        "type": SkillType.PASSIVE,
+        "effects": {"passive_id": "warrior_base"},
+        "position": (0, 0),
+        "icon": "warrior_icon.png",
+        "cost": {"monster_essence": 0},  # Free root node
+        "required_class": "warrior"
+    },
+    
+    "strength_1": {
+        "id": "strength_1",
+        "name": "Strength I",
+        "description": "Increase your damage by 10%.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {"damage_multiplier": 0.1},
+        "position": (0, 5),
+        "icon": "strength_icon.png",
+        "cost": {"monster_essence": 15},
+        "required_class": "warrior"
+    },
+    
+    "toughness_1": {
+        "id": "toughness_1",
+        "name": "Toughness I",
+        "description": "Increase your maximum health by 15.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {"max_health": 15},
+        "position": (-4, 5),
+        "icon": "toughness_icon.png",
+        "cost": {"monster_essence": 15},
+        "required_class": "warrior"
+    },
+    
+    "whirlwind": {
+        "id": "whirlwind",
+        "name": "Whirlwind",
+        "description": "Unlock the Whirlwind ability, striking all enemies around you.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "whirlwind"},
+        "position": (0, 10),
+        "icon": "whirlwind_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "warrior"
+    },
+    
+    "axe_mastery": {
+        "id": "axe_mastery",
+        "name": "Axe Mastery",
+        "description": "Enhance your Axe Slash ability, increasing damage by 20% and reducing cooldown by 10%.",
+        "type": SkillType.ABILITY_MODIFIER,
+        "effects": {
+            "ability_id": "axe_slash",
+            "modifiers": {
+                "damage_multiplier": 1.2,
+                "cooldown_multiplier": 0.9
+            }
+        },
+        "position": (4, 5),
+        "icon": "axe_mastery_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "warrior"
+    },
+    
+    # ========== Mage Skills ==========
+    "mage_root": {
+        "id": "mage_root",
+        "name": "Path of the Mage",
+        "description": "Begin your journey as a Mage, wielding elemental magic from a distance.",
+        "type": SkillType.PASSIVE,
+        "effects": {"passive_id": "mage_base"},
+        "position": (15, 0),
+        "icon": "mage_icon.png",
+        "cost": {"monster_essence": 0},  # Free root node
+        "required_class": "mage"
+    },
+    
+    "fireball": {
+        "id": "fireball",
+        "name": "Fireball",
+        "description": "Unlock the Fireball ability, throwing a ball of fire that explodes on impact.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "fireball"},
+        "position": (15, 5),
+        "icon": "fireball_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "mage"
+    },
+    
+    "arcane_intellect": {
+        "id": "arcane_intellect",
+        "name": "Arcane Intellect",
+        "description": "Increase the damage of all magical abilities by 15%.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {"spell_damage_multiplier": 0.15},
+        "position": (11, 5),
+        "icon": "intellect_icon.png",
+        "cost": {"monster_essence": 15},
+        "required_class": "mage"
+    },
+    
+    "mana_shield": {
+        "id": "mana_shield",
+        "name": "Mana Shield",
+        "description": "Unlock the Mana Shield ability, absorbing damage at the cost of mana.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "mana_shield"},
+        "position": (19, 5),
+        "icon": "mana_shield_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "mage"
+    },
+    
+    "fireball_specialization": {
+        "id": "fireball_specialization",
+        "name": "Fireball Specialization",
+        "description": "Choose how to enhance your Fireball ability.",
+        "type": SkillType.SPECIALIZATION,
+        "effects": {"specialization_path": "fireball"},
+        "position": (15, 10),
+        "icon": "fireball_spec_icon.png",
+        "cost": {"monster_essence": 30, "fire_essence": 5},
+        "required_class": "mage"
+    },
+    
+    # ========== Cleric Skills ==========
+    "cleric_root": {
+        "id": "cleric_root",
+        "name": "Path of the Cleric",
+        "description": "Begin your journey as a Cleric, providing healing and support.",
+        "type": SkillType.PASSIVE,
+        "effects": {"passive_id": "cleric_base"},
+        "position": (30, 0),
+        "icon": "cleric_icon.png",
+        "cost": {"monster_essence": 0},  # Free root node
+        "required_class": "cleric"
+    },
+    
+    "healing_light": {
+        "id": "healing_light",
+        "name": "Healing Light",
+        "description": "Unlock the Healing Light ability, restoring health to yourself and nearby allies.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "healing_light"},
+        "position": (30, 5),
+        "icon": "healing_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "cleric"
+    },
+    
+    "divine_favor": {
+        "id": "divine_favor",
+        "name": "Divine Favor",
+        "description": "Increase the effectiveness of healing abilities by 20%.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {"healing_multiplier": 0.2},
+        "position": (26, 5),
+        "icon": "divine_favor_icon.png",
+        "cost": {"monster_essence": 15},
+        "required_class": "cleric"
+    },
+    
+    "holy_strike": {
+        "id": "holy_strike",
+        "name": "Holy Strike",
+        "description": "Enhance your Mace Hit ability with holy energy, dealing bonus damage to undead enemies.",
+        "type": SkillType.ABILITY_MODIFIER,
+        "effects": {
+            "ability_id": "mace_hit",
+            "modifiers": {
+                "damage_multiplier": 1.1,
+                "undead_damage_multiplier": 1.5
+            }
+        },
+        "position": (34, 5),
+        "icon": "holy_strike_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "cleric"
+    },
+    
+    "consecration": {
+        "id": "consecration",
+        "name": "Consecration",
+        "description": "Unlock the Consecration ability, creating a circle of holy energy that damages enemies and heals allies.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "consecration"},
+        "position": (30, 10),
+        "icon": "consecration_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "cleric"
+    },
+    
+    # ========== Ranger Skills ==========
+    "ranger_root": {
+        "id": "ranger_root",
+        "name": "Path of the Ranger",
+        "description": "Begin your journey as a Ranger, specializing in precision attacks and traps.",
+        "type": SkillType.PASSIVE,
+        "effects": {"passive_id": "ranger_base"},
+        "position": (45, 0),
+        "icon": "ranger_icon.png",
+        "cost": {"monster_essence": 0},  # Free root node
+        "required_class": "ranger"
+    },
+    
+    "precision_1": {
+        "id": "precision_1",
+        "name": "Precision I",
+        "description": "Increase critical strike chance by 10%.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {"crit_chance_bonus": 0.1},
+        "position": (45, 5),
+        "icon": "precision_icon.png",
+        "cost": {"monster_essence": 15},
+        "required_class": "ranger"
+    },
+    
+    "trap_efficiency": {
+        "id": "trap_efficiency",
+        "name": "Trap Efficiency",
+        "description": "Traps cost 25% less stamina to deploy and last 20% longer.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {
+            "trap_cost_multiplier": 0.75,
+            "trap_duration_multiplier": 1.2
+        },
+        "position": (41, 5),
+        "icon": "trap_efficiency_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "ranger"
+    },
+    
+    "multi_shot": {
+        "id": "multi_shot",
+        "name": "Multi Shot",
+        "description": "Unlock the Multi Shot ability, firing three arrows in a spread pattern.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "multi_shot"},
+        "position": (49, 5),
+        "icon": "multi_shot_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "ranger"
+    },
+    
+    "snare_trap": {
+        "id": "snare_trap",
+        "name": "Snare Trap",
+        "description": "Unlock the Snare Trap ability, placing a trap that slows enemies who step on it.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "snare_trap"},
+        "position": (41, 10),
+        "icon": "snare_trap_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "ranger"
+    },
+    
+    "evasion_roll": {
+        "id": "evasion_roll",
+        "name": "Evasion Roll",
+        "description": "Unlock the Evasion Roll ability, quickly dodging in any direction.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "evasion_roll"},
+        "position": (49, 10),
+        "icon": "evasion_roll_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "ranger"
+    },
+    
+    # ========== Fusion Skills ==========
+    "elemental_fusion": {
+        "id": "elemental_fusion",
+        "name": "Elemental Fusion",
+        "description": "Unlock the ability to combine elemental abilities into powerful hybrid spells.",
+        "type": SkillType.FUSION,
+        "effects": {"fusion_type": "elemental"},
+        "position": (15, 15),
+        "icon": "fusion_icon.png",
+        "cost": {"monster_essence": 40, "magical_essence": 10},
+        "required_class": "mage"
+    },
+    
+    "divine_weapon": {
+        "id": "divine_weapon",
+        "name": "Divine Weapon",
+        "description": "Unlock the ability to infuse weapons with holy energy.",
+        "type": SkillType.FUSION,
+        "effects": {"fusion_type": "divine_weapon"},
+        "position": (30, 15),
+        "icon": "divine_weapon_icon.png",
+        "cost": {"monster_essence": 40, "holy_essence": 10},
+        "required_class": "cleric"
+    },
+    
+    # ========== Alchemist Skills ==========
+    "alchemist_root": {
+        "id": "alchemist_root",
+        "name": "Path of the Alchemist",
+        "description": "Begin your journey as an Alchemist, creating potions and deploying turrets.",
+        "type": SkillType.PASSIVE,
+        "effects": {"passive_id": "alchemist_base"},
+        "position": (60, 0),
+        "icon": "alchemist_icon.png",
+        "cost": {"monster_essence": 0},  # Free root node
+        "required_class": "alchemist"
+    },
+    
+    "potion_mastery": {
+        "id": "potion_mastery",
+        "name": "Potion Mastery",
+        "description": "Potions are 20% more effective and have 15% larger area of effect.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {
+            "potion_effectiveness_multiplier": 1.2,
+            "potion_aoe_multiplier": 1.15
+        },
+        "position": (56, 5),
+        "icon": "potion_mastery_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "alchemist"
+    },
+    
+    "turret_specialization": {
+        "id": "turret_specialization",
+        "name": "Turret Specialization",
+        "description": "Turrets have 25% more health and deal 15% more damage.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {
+            "turret_health_multiplier": 1.25,
+            "turret_damage_multiplier": 1.15
+        },
+        "position": (64, 5),
+        "icon": "turret_spec_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "alchemist"
+    },
+    
+    "acid_flask": {
+        "id": "acid_flask",
+        "name": "Acid Flask",
+        "description": "Unlock the Acid Flask ability, throwing a potion that creates a damaging pool.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "acid_flask"},
+        "position": (56, 10),
+        "icon": "acid_flask_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "alchemist"
+    },
+    
+    "healing_elixir": {
+        "id": "healing_elixir",
+        "name": "Healing Elixir",
+        "description": "Unlock the Healing Elixir ability, creating a potion that restores health.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "healing_elixir"},
+        "position": (60, 10),
+        "icon": "healing_elixir_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "alchemist"
+    },
+    
+    "flame_turret": {
+        "id": "flame_turret",
+        "name": "Flame Turret",
+        "description": "Unlock the Flame Turret ability, deploying a turret that shoots fire projectiles.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "flame_turret"},
+        "position": (64, 10),
+        "icon": "flame_turret_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "alchemist"
+    },
+    
+    # ========== Summoner Skills ==========
+    "summoner_root": {
+        "id": "summoner_root",
+        "name": "Path of the Summoner",
+        "description": "Begin your journey as a Summoner, calling forth spirits to fight on your behalf.",
+        "type": SkillType.PASSIVE,
+        "effects": {"passive_id": "summoner_base"},
+        "position": (75, 0),
+        "icon": "summoner_icon.png",
+        "cost": {"monster_essence": 0},  # Free root node
+        "required_class": "summoner"
+    },
+    
+    "spirit_mastery": {
+        "id": "spirit_mastery",
+        "name": "Spirit Mastery",
+        "description": "Summoned spirits deal 20% more damage and have 15% more health.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {
+            "summon_damage_multiplier": 1.2,
+            "summon_health_multiplier": 1.15
+        },
+        "position": (71, 5),
+        "icon": "spirit_mastery_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "summoner"
+    },
+    
+    "multiple_summons": {
+        "id": "multiple_summons",
+        "name": "Multiple Summons",
+        "description": "Increase the maximum number of active summons by 1.",
+        "type": SkillType.STAT_BOOST,
+        "effects": {"max_summons_bonus": 1},
+        "position": (75, 5),
+        "icon": "multiple_summons_icon.png",
+        "cost": {"monster_essence": 25},
+        "required_class": "summoner"
+    },
+    
+    "elemental_binding": {
+        "id": "elemental_binding",
+        "name": "Elemental Binding",
+        "description": "Unlocks the ability to summon elemental spirits.",
+        "type": SkillType.PASSIVE,
+        "effects": {"elemental_summon_unlock": True},
+        "position": (79, 5),
+        "icon": "elemental_binding_icon.png",
+        "cost": {"monster_essence": 20},
+        "required_class": "summoner"
+    },
+    
+    "summon_fire_elemental": {
+        "id": "summon_fire_elemental",
+        "name": "Summon Fire Elemental",
+        "description": "Unlock the ability to summon a fire elemental that deals fire damage to enemies.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "summon_fire_elemental"},
+        "position": (71, 10),
+        "icon": "fire_elemental_icon.png",
+        "cost": {"monster_essence": 25, "fire_essence": 5},
+        "required_class": "summoner",
+        "required_nodes": ["elemental_binding"]
+    },
+    
+    "summon_frost_elemental": {
+        "id": "summon_frost_elemental",
+        "name": "Summon Frost Elemental",
+        "description": "Unlock the ability to summon a frost elemental that slows and damages enemies.",
+        "type": SkillType.ABILITY_UNLOCK,
+        "effects": {"ability_id": "summon_frost_elemental"},
+        "position": (79, 10),
+        "icon": "frost_elemental_icon.png",
+        "cost": {"monster_essence": 25, "frost_essence": 5},
+        "required_class": "summoner",
+        "required_nodes": ["elemental_binding"]
+    },
+    
+    "spirit_link": {
+        "id": "spirit_link",
+        "name": "Spirit Link",
+        "description": "When your summons deal damage, you recover health equal to 5% of the damage dealt.",
+        "type": SkillType.PASSIVE,
+        "effects": {"summon_damage_heal_percent": 0.05},
+        "position": (75, 15),
+        "icon": "spirit_link_icon.png",
+        "cost": {"monster_essence": 30},
+        "required_class": "summoner"
+    }
+}
+
+# Connection data (parent -> child relationships)
+SKILL_CONNECTIONS = [
+    # Warrior connections
+    {"parent": "warrior_root", "child": "strength_1"},
+    {"parent": "warrior_root", "child": "toughness_1"},
+    {"parent": "warrior_root", "child": "axe_mastery"},
+    {"parent": "strength_1", "child": "whirlwind"},
+    
+    # Mage connections
+    {"parent": "mage_root", "child": "fireball"},
+    {"parent": "mage_root", "child": "arcane_intellect"},
+    {"parent": "mage_root", "child": "mana_shield"},
+    {"parent": "fireball", "child": "fireball_specialization"},
+    {"parent": "fireball_specialization", "child": "elemental_fusion"},
+    
+    # Cleric connections
+    {"parent": "cleric_root", "child": "healing_light"},
+    {"parent": "cleric_root", "child": "divine_favor"},
+    {"parent": "cleric_root", "child": "holy_strike"},
+    {"parent": "healing_light", "child": "consecration"},
+    {"parent": "consecration", "child": "divine_weapon"},
+    
+    # Ranger connections
+    {"parent": "ranger_root", "child": "precision_1"},
+    {"parent": "ranger_root", "child": "trap_efficiency"},
+    {"parent": "ranger_root", "child": "multi_shot"},
+    {"parent": "ranger_root", "child": "snare_trap"},
+    {"parent": "ranger_root", "child": "evasion_roll"},
+    
+    # Alchemist connections
+    {"parent": "alchemist_root", "child": "potion_mastery"},
+    {"parent": "alchemist_root", "child": "turret_specialization"},
+    {"parent": "alchemist_root", "child": "acid_flask"},
+    {"parent": "alchemist_root", "child": "healing_elixir"},
+    {"parent": "alchemist_root", "child": "flame_turret"},
+    
+    # Summoner connections
+    {"parent": "summoner_root", "child": "spirit_mastery"},
+    {"parent": "summoner_root", "child": "multiple_summons"},
+    {"parent": "summoner_root", "child": "elemental_binding"},
+    {"parent": "spirit_mastery", "child": "summon_fire_elemental"},
+    {"parent": "spirit_mastery", "child": "summon_frost_elemental"},
+    {"parent": "spirit_mastery", "child": "spirit_link"}
+]
+
+# Warrior abilities
+WARRIOR_ABILITIES = {
+    "primary": {
+        "name": "Axe Slash",
+        "description": "A powerful slash with an axe that deals damage in a wide arc",
+        "damage": 25,
+        "cooldown": 1.0,
+        "range": 2.5,
+        "type": "melee",
+        "trajectory": "arc",
+        "effects": ["knockback_small"]
+    },
+    "secondary": {
+        "ground_slam": {
+            "name": "Ground Slam",
+            "description": "Slam your weapon into the ground, creating a shockwave that damages and stuns enemies",
+            "damage": 30,
+            "cooldown": 8.0,
+            "range": 5.0,
+            "type": "aoe",
+            "trajectory": "radial",
+            "effects": ["stun_short", "knockback_medium"]
+        },
+        "battle_cry": {
+            "name": "Battle Cry",
+            "description": "Release a powerful shout that intimidates enemies, reducing their damage",
+            "damage": 0,
+            "cooldown": 15.0,
+            "range": 8.0,
+            "type": "buff",
+            "trajectory": "radial",
+            "effects": ["enemy_damage_reduction", "enemy_psychology_fear"]
+        },
+        "whirlwind": {
+            "name": "Whirlwind",
+            "description": "Spin rapidly, dealing damage to all surrounding enemies",
+            "damage": 20,
+            "cooldown": 12.0,
+            "range": 3.5,
+            "type": "aoe",
+            "trajectory": "circular",
+            "effects": ["movement_speed_buff", "damage_over_time"]
+        },
+        "defensive_stance": {
+            "name": "Defensive Stance",
+            "description": "Adopt a defensive posture, significantly reducing incoming damage",
+            "damage": 0,
+            "cooldown": 20.0,
+            "range": 0,
+            "type": "buff",
+            "trajectory": "self",
+            "effects": ["damage_reduction_large", "movement_speed_penalty", "taunt"]
+        }
+    }
+}
+
+# Mage abilities
+MAGE_ABILITIES = {
+    "primary": {
+        "name": "Magic Bolt",
+        "description": "A bolt of arcane energy that deals damage to a single target",
+        "damage": 20,
+        "cooldown": 0.75,
+        "range": 12.0,
+        "type": "projectile",
+        "trajectory": "straight",
+        "effects": ["magic_damage"]
+    },
+    "secondary": {
+        "fireball": {
+            "name": "Fireball",
+            "description": "Launch a ball of fire that explodes on impact, dealing area damage",
+            "damage": 35,
+            "cooldown": 6.0,
+            "range": 10.0,
+            "type": "projectile",
+            "trajectory": "arcing",
+            "effects": ["fire_damage", "burn_dot", "aoe_explosion"]
+        },
+        "frost_nova": {
+            "name": "Frost Nova",
+            "description": "Release a wave of freezing energy that slows enemies and deals damage",
+            "damage": 25,
+            "cooldown": 9.0,
+            "range": 6.0,
+            "type": "aoe",
+            "trajectory": "radial",
+            "effects": ["ice_damage", "slow_movement", "slow_attack"]
+        },
+        "arcane_shield": {
+            "name": "Arcane Shield",
+            "description": "Create a shield of arcane energy that blocks incoming damage",
+            "damage": 0,
+            "cooldown": 12.0,
+            "range": 0,
+            "type": "buff",
+            "trajectory": "self",
+            "effects": ["damage_absorption", "reflect_projectiles"]
+        },
+        "lightning_chain": {
+            "name": "Lightning Chain",
+            "description": "Call down a bolt of lightning that jumps between nearby enemies",
+            "damage": 30,
+            "cooldown": 10.0,
+            "range": 14.0,
+            "type": "projectile",
+            "trajectory": "chain",
+            "effects": ["lightning_damage", "stun_short", "chain_reduction"]
+        }
+    }
+}
+
+# Cleric abilities
+CLERIC_ABILITIES = {
+    "primary": {
+        "name": "Mace Hit",
+        "description": "A powerful strike with a mace that deals damage to a single target",
+        "damage": 18,
+        "cooldown": 1.2,
+        "range": 2.0,
+        "type": "melee",
+        "trajectory": "direct",
+        "effects": ["holy_damage"]
+    },
+    "secondary": {
+        "healing_circle": {
+            "name": "Healing Circle",
+            "description": "Create a circle of healing energy that restores health to allies within it",
+            "damage": 0,
+            "cooldown": 15.0,
+            "range": 5.0,
+            "type": "heal",
+            "trajectory": "circular",
+            "effects": ["heal_over_time", "buff_regeneration"]
+        },
+        "divine_smite": {
+            "name": "Divine Smite",
+            "description": "Call down a beam of holy light that deals heavy damage to undead and corrupted enemies",
+            "damage": 40,
+            "cooldown": 8.0,
+            "range": 8.0,
+            "type": "projectile",
+            "trajectory": "direct",
+            "effects": ["holy_damage", "bonus_vs_undead", "light_aura"]
+        },
+        "protective_blessing": {
+            "name": "Protective Blessing",
+            "description": "Bless an ally, reducing damage taken and providing immunity to negative effects",
+            "damage": 0,
+            "cooldown": 20.0,
+            "range": 10.0,
+            "type": "buff",
+            "trajectory": "target",
+            "effects": ["damage_reduction", "status_immunity", "small_heal"]
+        },
+        "holy_nova": {
+            "name": "Holy Nova",
+            "description": "Release a wave of holy energy that damages enemies and heals allies",
+            "damage": 25,
+            "cooldown": 12.0,
+            "range": 7.0,
+            "type": "aoe",
+            "trajectory": "radial",
+            "effects": ["holy_damage", "heal_allies", "repel_undead"]
+        }
+    }
+}
+
+# Alchemist abilities
+ALCHEMIST_ABILITIES = {
+    "primary": {
+        "name": "Deploy Turret",
+        "description": "Deploy an alchemical turret that fires at nearby enemies",
+        "damage": 10,
+        "cooldown": 2.0,
+        "range": 5.0,
+        "type": "summon",
+        "trajectory": "place",
+        "effects": ["turret_summon"]
+    },
+    "secondary": {
+        "acid_bomb": {
+            "name": "Acid Bomb",
+            "description": "Throw a vial of corrosive acid that deals damage over time and reduces armor",
+            "damage": 15,
+            "cooldown": 7.0,
+            "range": 9.0,
+            "type": "projectile",
+            "trajectory": "arcing",
+            "effects": ["acid_damage", "armor_reduction", "dot_damage"]
+        },
+        "smoke_screen": {
+            "name": "Smoke Screen",
+            "description": "Create a cloud of smoke that obscures vision and causes enemies to miss",
+            "damage": 0,
+            "cooldown": 12.0,
+            "range": 8.0,
+            "type": "aoe",
+            "trajectory": "place",
+            "effects": ["vision_reduction", "miss_chance", "slow_movement"]
+        },
+        "healing_potion": {
+            "name": "Healing Potion",
+            "description": "Throw a healing potion that restores health to allies in the area",
+            "damage": 0,
+            "cooldown": 15.0,
+            "range": 7.0,
+            "type": "heal",
+            "trajectory": "arcing",
+            "effects": ["instant_heal", "regeneration_buff"]
+        },
+        "transmutation": {
+            "name": "Transmutation",
+            "description": "Temporarily transform an enemy into a harmless creature",
+            "damage": 0,
+            "cooldown": 25.0,
+            "range": 6.0,
+            "type": "control",
+            "trajectory": "direct",
+            "effects": ["polymorph", "disable", "damage_vulnerability"]
+        }
+    }
+}
+
+# Ranger abilities
+RANGER_ABILITIES = {
+    "primary": {
+        "name": "Precision Shot",
+        "description": "A carefully aimed shot that deals high damage to a single target",
+        "damage": 30,
+        "cooldown": 1.5,
+        "range": 15.0,
+        "type": "projectile",
+        "trajectory": "straight",
+        "effects": ["critical_chance", "penetration"]
+    },
+    "secondary": {
+        "multishot": {
+            "name": "Multishot",
+            "description": "Fire multiple arrows simultaneously in a spread pattern",
+            "damage": 15,
+            "cooldown": 8.0,
+            "range": 12.0,
+            "type": "projectile",
+            "trajectory": "spread",
+            "effects": ["multiple_projectiles", "reduced_accuracy"]
+        },
+        "trap": {
+            "name": "Snare Trap",
+            "description": "Place a trap that immobilizes enemies that step on it",
+            "damage": 10,
+            "cooldown": 10.0,
+            "range": 6.0,
+            "type": "trap",
+            "trajectory": "place",
+            "effects": ["root", "reveal", "dot_damage"]
+        },
+        "camouflage": {
+            "name": "Camouflage",
+            "description": "Blend into the environment, becoming invisible to enemies",
+            "damage": 0,
+            "cooldown": 20.0,
+            "range": 0,
+            "type": "buff",
+            "trajectory": "self",
+            "effects": ["invisibility", "movement_speed", "damage_bonus_first_hit"]
+        },
+        "poison_arrow": {
+            "name": "Poison Arrow",
+            "description": "Fire an arrow coated with potent toxins that deal damage over time",
+            "damage": 20,
+            "cooldown": 12.0,
+            "range": 14.0,
+            "type": "projectile",
+            "trajectory": "straight",
+            "effects": ["poison_damage", "slow", "healing_reduction"]
+        }
+    }
+}
+
+# Summoner abilities
+SUMMONER_ABILITIES = {
+    "primary": {
+        "name": "Spirit Summon",
+        "description": "Summon a spirit ally that attacks nearby enemies",
+        "damage": 15,
+        "cooldown": 2.5,
+        "range": 8.0,
+        "type": "summon",
+        "trajectory": "place",
+        "effects": ["spirit_summon"]
+    },
+    "secondary": {
+        "elemental_guardian": {
+            "name": "Elemental Guardian",
+            "description": "Summon a powerful elemental guardian that protects you and attacks enemies",
+            "damage": 25,
+            "cooldown": 30.0,
+            "range": 3.0,
+            "type": "summon",
+            "trajectory": "place",
+            "effects": ["guardian_summon", "element_adaptive", "taunt_enemies"]
+        },
+        "soul_link": {
+            "name": "Soul Link",
+            "description": "Create a link with your summons, healing them and boosting their damage",
+            "damage": 0,
+            "cooldown": 15.0,
+            "range": 12.0,
+            "type": "buff",
+            "trajectory": "target",
+            "effects": ["summon_heal", "summon_damage_boost", "summon_speed_boost"]
+        },
+        "spirit_swarm": {
+            "name": "Spirit Swarm",
+            "description": "Summon a swarm of small spirits that surround and damage nearby enemies",
+            "damage": 5,
+            "cooldown": 12.0,
+            "range": 10.0,
+            "type": "aoe",
+            "trajectory": "circular",
+            "effects": ["multiple_summons", "damage_over_time", "slow_enemies"]
+        },
+        "sacrificial_pact": {
+            "name": "Sacrificial Pact",
+            "description": "Sacrifice a summon to create a powerful explosion, healing you in the process",
+            "damage": 40,
+            "cooldown": 20.0,
+            "range": 8.0,
+            "type": "special",
+            "trajectory": "target_summon",
+            "effects": ["sacrifice_summon", "aoe_damage", "self_heal"]
+        }
+    }
+}
+
+# Create a dictionary of all classes and their abilities for easy access
+CLASS_ABILITIES = {
+    "warrior": WARRIOR_ABILITIES,
+    "mage": MAGE_ABILITIES,
+    "cleric": CLERIC_ABILITIES,
+    "alchemist": ALCHEMIST_ABILITIES,
+    "ranger": RANGER_ABILITIES,
+    "summoner": SUMMONER_ABILITIES
+}
+
+# Abilities created by id (ability_factory.create_ability)
+ABILITY_DEFINITIONS = {
+    # ========== Warrior Abilities ==========
+    "axe_slash": {
+        "name": "Axe Slash",
+        "description": "A powerful melee attack with your axe",
+        "type": "melee",
+        "damage": 20,
+        "range": 2.0,
+        "angle": 90.0,
+        "cooldown": 0.5,
+        "resource_cost": 5,
+        "icon": "axe_slash_icon.png"
+    },
+    "whirlwind": {
+        "name": "Whirlwind",
+        "description": "Spin around, damaging all enemies in a circle",
+        "type": "melee",
+        "damage": 15,
+        "range": 3.0,
+        "angle": 360.0,
+        "cooldown": 4.0,
+        "resource_cost": 15,
+        "icon": "whirlwind_icon.png"
+    },
+    
+    # ========== Mage Abilities ==========
+    "magic_bolt": {
+        "name": "Magic Bolt",
+        "description": "Hurl a bolt of arcane energy",
+        "type": "projectile",
+        "projectile_type": "straight",
+        "damage": 15,
+        "speed": 12.0,
+        "cooldown": 0.7,
+        "resource_cost": 5,
+        "icon": "magic_bolt_icon.png"
+    },
+    "fireball": {
+        "name": "Fireball",
+        "description": "Throw a ball of fire that explodes on impact",
+        "type": "projectile",
+        "projectile_type": "arcing",
+        "damage": 25,
+        "speed": 10.0,
+        "cooldown": 3.0,
+        "resource_cost": 15,
+        "icon": "fireball_icon.png",
+        "on_hit_effect": "explosion",
+        "explosion_radius": 3.0,
+        "explosion_damage": 10
+    },
+    "mana_shield": {
+        "name": "Mana Shield",
+        "description": "Create a protective barrier that absorbs damage at the cost of mana",
+        "type": "area",
+        "effect_type": "shield",
+        "value": 50,
+        "radius": 0,
+        "duration": 8.0,
+        "cooldown": 12.0,
+        "resource_cost": 25,
+        "icon": "mana_shield_icon.png"
+    },
+    
+    # ========== Cleric Abilities ==========
+    "mace_hit": {
+        "name": "Mace Hit",
+        "description": "Strike with your mace",
+        "type": "melee",
+        "damage": 18,
+        "range": 2.0,
+        "angle": 60.0,
+        "cooldown": 0.6,
+        "resource_cost": 5,
+        "icon": "mace_hit_icon.png"
+    },
+    "healing_light": {
+        "name": "Healing Light",
+        "description": "Create a burst of healing energy that restores health to you and nearby allies",
+        "type": "area",
+        "effect_type": "heal",
+        "value": 25,
+        "radius": 5.0,
+        "duration": 0,
+        "cooldown": 8.0,
+        "resource_cost": 20,
+        "icon": "healing_light_icon.png"
+    },
+    "consecration": {
+        "name": "Consecration",
+        "description": "Sanctify the ground, damaging enemies and healing allies in the area",
+        "type": "area",
+        "effect_type": "dual",
+        "damage_value": 5,
+        "heal_value": 3,
+        "radius": 4.0,
+        "duration": 6.0,
+        "cooldown": 10.0,
+        "resource_cost": 25,
+        "icon": "consecration_icon.png"
+    },
+    
+    # ========== Ranger Abilities ==========
+    "snipe_shot": {
+        "name": "Snipe Shot",
+        "description": "Fire a precise shot with your bow",
+        "type": "projectile",
+        "projectile_type": "straight",
+        "damage": 18,
+        "speed": 15.0,
+        "cooldown": 0.8,
+        "resource_cost": 5,
+        "icon": "snipe_shot_icon.png",
+        "crit_chance_bonus": 0.1
+    },
+    "multi_shot": {
+        "name": "Multi Shot",
+        "description": "Fire three arrows in a spread pattern",
+        "type": "projectile",
+        "projectile_type": "spread",
+        "projectile_count": 3,
+        "spread_angle": 30,
+        "damage": 12,
+        "speed": 12.0,
+        "cooldown": 3.0,
+        "resource_cost": 15,
+        "icon": "multi_shot_icon.png"
+    },
+    "snare_trap": {
+        "name": "Snare Trap",
+        "description": "Place a trap that slows enemies when triggered",
+        "type": "area",
+        "effect_type": "trap",
+        "value": 5,
+        "radius": 2.0,
+        "duration": 15.0,
+        "effect_duration": 5.0,
+        "slow_amount": 0.5,
+        "cooldown": 8.0,
+        "resource_cost": 15,
+        "icon": "snare_trap_icon.png"
+    },
+    "evasion_roll": {
+        "name": "Evasion Roll",
+        "description": "Quickly dodge in any direction, becoming briefly invulnerable",
+        "type": "movement",
+        "distance": 5.0,
+        "invulnerability_duration": 0.5,
+        "cooldown": 5.0,
+        "resource_cost": 10,
+        "icon": "evasion_roll_icon.png"
+    },
+    
+    # ========== Alchemist Abilities ==========
+    "deploy_turret": {
+        "name": "Deploy Turret",
+        "description": "Place an automated turret that fires at nearby enemies",
+        "type": "summon",
+        "summon_type": "turret",
+        "summon_health": 50,
+        "summon_damage": 8,
+        "summon_range": 8.0,
+        "attack_speed": 1.0,
+        "duration": 20.0,
+        "cooldown": 12.0,
+        "resource_cost": 20,
+        "icon": "deploy_turret_icon.png"
+    },
+    "acid_flask": {
+        "name": "Acid Flask",
+        "description": "Throw a flask of acid that creates a damaging pool",
+        "type": "projectile",
+        "projectile_type": "arcing",
+        "damage": 5,
+        "speed": 8.0,
+        "cooldown": 6.0,
+        "resource_cost": 15,
+        "on_hit_effect": "acid_pool",
+        "acid_pool_radius": 3.0,
+        "acid_pool_damage": 8,
+        "acid_pool_duration": 5.0,
+        "icon": "acid_flask_icon.png"
+    },
+    "healing_elixir": {
+        "name": "Healing Elixir",
+        "description": "Create a potion that restores health",
+        "type": "item",
+        "effect_type": "heal",
+        "value": 35,
+        "cooldown": 15.0,
+        "resource_cost": 20,
+        "icon": "healing_elixir_icon.png"
+    },
+    "flame_turret": {
+        "name": "Flame Turret",
+        "description": "Deploy a turret that fires flaming projectiles",
+        "type": "summon",
+        "summon_type": "flame_turret",
+        "summon_health": 40,
+        "summon_damage": 12,
+        "fire_damage_over_time": 3,
+        "fire_duration": 3.0,
+        "summon_range": 7.0,
+        "attack_speed": 1.2,
+        "duration": 15.0,
+        "cooldown": 15.0,
+        "resource_cost": 25,
+        "icon": "flame_turret_icon.png"
+    },
+    
+    # ========== Summoner Abilities ==========
+    "summon_spirit": {
+        "name": "Summon Spirit",
+        "description": "Call forth a spirit to fight for you",
+        "type": "summon",
+        "summon_type": "spirit",
+        "summon_health": 40,
+        "summon_damage": 10,
+        "summon_range": 5.0,
+        "attack_speed": 1.0,
+        "duration": 30.0,
+        "cooldown": 8.0,
+        "resource_cost": 20,
+        "icon": "summon_spirit_icon.png"
+    },
+    "summon_fire_elemental": {
+        "name": "Summon Fire Elemental",
+        "description": "Summon a fire elemental that burns enemies",
+        "type": "summon",
+        "summon_type": "fire_elemental",
+        "summon_health": 60,
+        "summon_damage": 15,
+        "fire_damage_over_time": 5,
+        "fire_duration": 3.0,
+        "summon_range": 4.0,
+        "attack_speed": 1.2,
+        "duration": 20.0,
+        "cooldown": 15.0,
+        "resource_cost": 30,
+        "icon": "fire_elemental_icon.png"
+    },
+    "summon_frost_elemental": {
+        "name": "Summon Frost Elemental",
+        "description": "Summon a frost elemental that slows enemies",
+        "type": "summon",
+        "summon_type": "frost_elemental",
+        "summon_health": 70,
+        "summon_damage": 12,
+        "slow_amount": 0.4,
+        "slow_duration": 2.0,
+        "summon_range": 4.0,
+        "attack_speed": 0.8,
+        "duration": 20.0,
+        "cooldown": 15.0,
+        "resource_cost": 30,
+        "icon": "frost_elemental_icon.png"
+    }
+}
+
+# Define standard abilities
+STANDARD_ABILITIES = {
+    # Warrior abilities
+    "axe_slash": {
+        "type": "melee",
+        "name": "Axe Slash",
+        "description": "A powerful slash with your axe.",
+        "damage": 20,
+        "range": 2.0,
+        "angle": 90.0,
+        "cooldown": 0.8,
+        "resource_cost": 0,
+        "element_type": ElementType.NONE,
+        "icon": "axe_slash_icon.png"
+    },
+    
+    "whirlwind": {
+        "type": "melee",
+        "name": "Whirlwind",
+        "description": "Spin in a circle, damaging all enemies around you.",
+        "damage": 15,
+        "range": 3.0,
+        "angle": 360.0,
+        "cooldown": 5.0,
+        "resource_cost": 20,
+        "element_type": ElementType.WIND,
+        "icon": "whirlwind_icon.png"
+    },
+    
+    # Mage abilities
+    "magic_bolt": {
+        "type": "projectile",
+        "name": "Magic Bolt",
+        "description": "Fire a bolt of arcane energy.",
+        "projectile_type": "straight",
+        "damage": 15,
+        "speed": 15.0,
+        "cooldown": 0.5,
+        "resource_cost": 5,
+        "element_type": ElementType.ARCANE,
+        "icon": "magic_bolt_icon.png"
+    },
+    
+    "fireball": {
+        "type": "projectile",
+        "name": "Fireball",
+        "description": "Launch a ball of fire that explodes on impact.",
+        "projectile_type": "arcing",
+        "damage": 30,
+        "speed": 10.0,
+        "cooldown": 3.0,
+        "resource_cost": 15,
+        "element_type": ElementType.FIRE,
+        "icon": "fireball_icon.png"
+    },
+    
+    # Cleric abilities
+    "mace_hit": {
+        "type": "melee",
+        "name": "Mace Hit",
+        "description": "Strike with your mace.",
+        "damage": 18,
+        "range": 1.8,
+        "angle": 60.0,
+        "cooldown": 0.7,
+        "resource_cost": 0,
+        "element_type": ElementType.NONE,
+        "icon": "mace_hit_icon.png"
+    },
+    
+    "healing_light": {
+        "type": "area",
+        "name": "Healing Light",
+        "description": "Create an area of healing energy.",
+        "effect_type": "heal",
+        "value": 20,
+        "radius": 4.0,
+        "duration": 3.0,
+        "cooldown": 6.0,
+        "resource_cost": 25,
+        "element_type": ElementType.HOLY,
+        "icon": "healing_light_icon.png"
+    },
+    
+    # Ranger abilities
+    "sniper_shot": {
+        "type": "projectile",
+        "name": "Sniper Shot",
+        "description": "Fire a high-damage arrow at a single target.",
+        "projectile_type": "straight",
+        "damage": 40,
+        "speed": 25.0,
+        "cooldown": 4.0,
+        "resource_cost": 15,
+        "element_type": ElementType.NONE,
+        "icon": "sniper_shot_icon.png"
+    },
+    
+    "multishot": {
+        "type": "projectile",
+        "name": "Multishot",
+        "description": "Fire multiple arrows in a spread.",
+        "projectile_type": "spread",
+        "damage": 12,
+        "speed": 15.0,
+        "cooldown": 2.5,
+        "resource_cost": 10,
+        "element_type": ElementType.NONE,
+        "icon": "multishot_icon.png"
+    },
+    
+    # Alchemist abilities
+    "deploy_turret": {
+        "type": "area",
+        "name": "Deploy Turret",
+        "description": "Deploy an automatic turret that shoots nearby enemies.",
+        "effect_type": "summon",
+        "value": 8,  # Damage per shot
+        "radius": 0.5,  # Turret size
+        "duration": 20.0,  # Turret lifetime
+        "cooldown": 10.0,
+        "resource_cost": 25,
+        "element_type": ElementType.NONE,
+        "icon": "turret_icon.png"
+    },
+    
+    "potion_throw": {
+        "type": "projectile",
+        "name": "Potion Throw",
+        "description": "Throw a volatile potion that explodes on impact, dealing area damage.",
+        "projectile_type": "arcing",
+        "damage": 25,
+        "speed": 12.0,
+        "cooldown": 3.0,
+        "resource_cost": 15,
+        "element_type": ElementType.ARCANE,
+        "icon": "potion_icon.png"
+    },
+    
+    "healing_potion": {
+        "type": "area",
+        "name": "Healing Potion",
+        "description": "Throw a healing potion that creates a mist, healing allies in the area over time.",
+        "effect_type": "heal",
+        "value": 5,  # Healing per second
+        "radius": 3.0,
+        "duration": 5.0,
+        "cooldown": 12.0,
+        "resource_cost": 30,
+        "element_type": ElementType.WATER,
+        "icon": "healing_potion_icon.png"
+    },
+    
+    "multi_turret": {
+        "type": "area",
+        "name": "Multi-Turret",
+        "description": "Deploy three smaller turrets in a triangle formation.",
+        "effect_type": "summon",
+        "value": 5,  # Damage per shot (per turret)
+        "radius": 0.3,  # Turret size
+        "duration": 15.0,  # Turret lifetime
+        "cooldown": 20.0,
+        "resource_cost": 40,
+        "element_type": ElementType.NONE,
+        "icon": "multi_turret_icon.png"
+    },
+    
+    # Summoner abilities
+    "spirit_summon": {
+        "type": "area",
+        "name": "Spirit Summon",
+        "description": "Summon a spirit to fight for you.",
+        "effect_type": "summon",
+        "value": 15,  # Spirit damage
+        "radius": 1.0,  # Spirit size
+        "duration": 30.0,  # Spirit lifetime
+        "cooldown": 8.0,
+        "resource_cost": 30,
+        "element_type": ElementType.ARCANE,
+        "icon": "spirit_icon.png"
+    },
+    
+    "spirit_command": {
+        "type": "area",
+        "name": "Spirit Command",
+        "description": "Order your spirits to focus on a target area, increasing their damage.",
+        "effect_type": "buff",
+        "value": 1.5,  # Damage multiplier
+        "radius": 5.0,
+        "element_type": ElementType.ARCANE,
+        "duration": 5.0,
+        "cooldown": 10.0,
+        "resource_cost": 15,
+        "icon": "command_icon.png"
+    },
+    
+    "spirit_shield": {
+        "type": "area",
+        "name": "Spirit Shield",
+        "description": "Create a protective barrier of spirits that absorbs damage.",
+        "effect_type": "buff",
+        "value": 50,  # Shield amount
+        "radius": 2.0,
+        "duration": 8.0,
+        "cooldown": 15.0,
+        "resource_cost": 25,
+        "element_type": ElementType.ARCANE,
+        "icon": "spirit_shield_icon.png"
+    },
+    
+    "spirit_fusion": {
+        "type": "area",
+        "name": "Spirit Fusion",
+        "description": "Fuse all active spirits into a powerful elemental that deals massive damage.",
+        "effect_type": "summon",
+        "value": 50,  # Elemental damage
+        "radius": 2.0,  # Elemental size
+        "duration": 10.0,  # Elemental lifetime
+        "cooldown": 30.0,
+        "resource_cost": 50,
+        "element_type": ElementType.ARCANE,
+        "icon": "fusion_spirit_icon.png"
+    }
+}
+
+# Available relics with their effects
+RELICS = {
+    # Original relics
+    "hunters_amulet": {
+        "name": "Hunter's Amulet",
+        "description": "Increases damage by 20% but reduces max health by 10%",
+        "rarity": RelicRarity.COMMON,
+        "effects": {
+            "damage_multiplier": 1.2,
+            "max_health_multiplier": 0.9
+        },
+        "visual": "hunters_amulet.png"
+    },
+    "arcane_catalyst": {
+        "name": "Arcane Catalyst",
+        "description": "Reduces cooldowns by 15% but increases stamina cost by 10%",
+        "rarity": RelicRarity.COMMON,
+        "effects": {
+            "cooldown_multiplier": 0.85,
+            "stamina_cost_multiplier": 1.1
+        },
+        "visual": "arcane_catalyst.png"
+    },
+    "iron_heart": {
+        "name": "Iron Heart",
+        "description": "Increases max health by 15% but reduces movement speed by 5%",
+        "rarity": RelicRarity.COMMON,
+        "effects": {
+            "max_health_multiplier": 1.15,
+            "speed_multiplier": 0.95
+        },
+        "visual": "iron_heart.png"
+    },
+    "swift_boots": {
+        "name": "Swift Boots",
+        "description": "Increases movement speed by 15% but reduces max stamina by 10%",
+        "rarity": RelicRarity.COMMON,
+        "effects": {
+            "speed_multiplier": 1.15,
+            "max_stamina_multiplier": 0.9
+        },
+        "visual": "swift_boots.png"
+    },
+    "crystal_focus": {
+        "name": "Crystal Focus",
+        "description": "Increases projectile velocity by 20% but reduces damage by 5%",
+        "rarity": RelicRarity.UNCOMMON,
+        "effects": {
+            "projectile_speed_multiplier": 1.2,
+            "damage_multiplier": 0.95
+        },
+        "visual": "crystal_focus.png"
+    },
+    "vampiric_emblem": {
+        "name": "Vampiric Emblem",
+        "description": "Restores 5% of damage dealt as health but reduces max stamina by 15%",
+        "rarity": RelicRarity.UNCOMMON,
+        "effects": {
+            "life_steal": 0.05,
+            "max_stamina_multiplier": 0.85
+        },
+        "visual": "vampiric_emblem.png"
+    },
+    "unstable_catalyst": {
+        "name": "Unstable Catalyst",
+        "description": "Increases damage by 30% but has a 10% chance to damage yourself",
+        "rarity": RelicRarity.RARE,
+        "effects": {
+            "damage_multiplier": 1.3,
+            "self_damage_chance": 0.1,
+            "self_damage_percent": 0.05
+        },
+        "visual": "unstable_catalyst.png"
+    },
+    "guardian_talisman": {
+        "name": "Guardian Talisman",
+        "description": "Reduces all incoming damage by 15% but decreases cooldown recovery by 10%",
+        "rarity": RelicRarity.RARE,
+        "effects": {
+            "damage_reduction": 0.15,
+            "cooldown_multiplier": 1.1
+        },
+        "visual": "guardian_talisman.png"
+    },
+    "celestial_prism": {
+        "name": "Celestial Prism",
+        "description": "Projectiles can pierce through one enemy but reduces projectile speed by 10%",
+        "rarity": RelicRarity.LEGENDARY,
+        "effects": {
+            "projectile_pierce": 1,
+            "projectile_speed_multiplier": 0.9
+        },
+        "visual": "celestial_prism.png"
+    },
+    "essence_of_chaos": {
+        "name": "Essence of Chaos",
+        "description": "All stats randomly fluctuate between -10% and +30% every 30 seconds",
+        "rarity": RelicRarity.LEGENDARY,
+        "effects": {
+            "random_stats": True,
+            "stat_min_multiplier": 0.9,
+            "stat_max_multiplier": 1.3,
+            "fluctuation_time": 30
+        },
+        "visual": "essence_of_chaos.png"
+    },
+    
+    # New relics with significant drawbacks (as per PRD)
+    "moonlight_mirror": {
+        "name": "Moonlight Mirror",
+        "description": "Increases all damage by 40% at night, but decreases damage by 20% during day",
+        "rarity": RelicRarity.EPIC,
+        "effects": {
+            "conditional_damage_multiplier": {
+                "night": 1.4,
+                "day": 0.8
+            }
+        },
+        "visual": "moonlight_mirror.png"
+    },
+    "wrath_of_the_elements": {
+        "name": "Wrath of the Elements",
+        "description": "Adds elemental damage to all attacks, but you take double damage from elemental sources",
+        "rarity": RelicRarity.EPIC,
+        "effects": {
+            "elemental_damage_bonus": 0.3,
+            "elemental_vulnerability": 2.0
+        },
+        "visual": "wrath_elements.png"
+    },
+    "glass_cannon": {
+        "name": "Glass Cannon",
+        "description": "Doubles your damage output, but halves your maximum health",
+        "rarity": RelicRarity.RARE,
+        "effects": {
+            "damage_multiplier": 2.0,
+            "max_health_multiplier": 0.5
+        },
+        "visual": "glass_cannon.png"
+    },
+    "nightweaver": {
+        "name": "Nightweaver",
+        "description": "Move 25% faster in fog but take 10% more damage",
+        "rarity": RelicRarity.UNCOMMON,
+        "effects": {
+            "fog_speed_bonus": 1.25,
+            "damage_vulnerability": 1.1
+        },
+        "visual": "nightweaver.png"
+    },
+    "berserker_totem": {
+        "name": "Berserker Totem",
+        "description": "Damage increases as health decreases, up to 100% more at 1 HP",
+        "rarity": RelicRarity.EPIC,
+        "effects": {
+            "health_based_damage": True,
+            "max_damage_boost": 2.0
+        },
+        "visual": "berserker_totem.png"
+    },
+    "crown_of_thorns": {
+        "name": "Crown of Thorns",
+        "description": "Reflect 30% of damage back to enemies, but you cannot regenerate health naturally",
+        "rarity": RelicRarity.RARE,
+        "effects": {
+            "damage_reflection": 0.3,
+            "disable_health_regen": True
+        },
+        "visual": "crown_thorns.png"
+    },
+    "timeworn_hourglass": {
+        "name": "Timeworn Hourglass",
+        "description": "All cooldowns reduced by 40%, but day/night cycle progresses 25% faster",
+        "rarity": RelicRarity.LEGENDARY,
+        "effects": {
+            "cooldown_multiplier": 0.6,
+            "time_flow_multiplier": 1.25
+        },
+        "visual": "timeworn_hourglass.png"
+    },
+    "shadow_bond": {
+        "name": "Shadow Bond",
+        "description": "Create a shadow clone that mimics 40% of your attacks, but you take 15% more damage",
+        "rarity": RelicRarity.LEGENDARY,
+        "effects": {
+            "shadow_clone": 0.4,
+            "damage_vulnerability": 1.15
+        },
+        "visual": "shadow_bond.png"
+    },
+    "heart_of_ice": {
+        "name": "Heart of Ice",
+        "description": "Immune to fire damage, but take double damage from cold attacks and move 10% slower",
+        "rarity": RelicRarity.RARE,
+        "effects": {
+            "fire_immunity": True,
+            "cold_vulnerability": 2.0,
+            "speed_multiplier": 0.9
+        },
+        "visual": "heart_of_ice.png"
+    },
+    "phoenix_feather": {
+        "name": "Phoenix Feather",
+        "description": "Upon death, revive once with 30% health, then the relic crumbles to ash",
+        "rarity": RelicRarity.MYTHICAL,
+        "effects": {
+            "resurrection": True,
+            "resurrection_health": 0.3,
+            "one_time_use": True
+        },
+        "visual": "phoenix_feather.png"
+    },
+    "obsidian_skull": {
+        "name": "Obsidian Skull",
+        "description": "Ignore 50% of enemy armor, but you lose 5% of your maximum health per minute",
+        "rarity": RelicRarity.EPIC,
+        "effects": {
+            "armor_penetration": 0.5,
+            "health_decay": 0.05,
+            "health_decay_interval": 60  # seconds
+        },
+        "visual": "obsidian_skull.png"
+    },
+    "void_tether": {
+        "name": "Void Tether",
+        "description": "Pull enemies toward you with attacks, but you also get pulled toward enemies when hit",
+        "rarity": RelicRarity.EPIC,
+        "effects": {
+            "enemy_pull": True,
+            "self_pull": True
+        },
+        "visual": "void_tether.png"
+    },
+    "eye_of_the_storm": {
+        "name": "Eye of the Storm",
+        "description": "Create lightning strikes that hit nearby enemies, but you attract more enemies at night",
+        "rarity": RelicRarity.LEGENDARY,
+        "effects": {
+            "lightning_strikes": True,
+            "lightning_damage": 20,
+            "lightning_frequency": 5,  # seconds
+            "enemy_attraction_multiplier": 1.5
+        },
+        "visual": "eye_storm.png"
+    }
+}
+
+# Fusion recipes, in matching priority order
+FUSION_RECIPES = [
+    # Fire + Ice = Steam (obscures vision, damage over time)
+    {
+        "input1": {"element_type": ElementType.FIRE},
+        "input2": {"element_type": ElementType.ICE},
+        "output": {
+            "element_type": ElementType.WATER,
+            "ability_type": AbilityType.AREA,
+            "effects": ["obscure_vision", "damage_over_time"]
+        },
+        "name": "Steam Cloud",
+        "description": "A cloud of steam that obscures vision and deals damage over time"
+    },
+    
+    # Lightning + Movement = Teleport
+    {
+        "input1": {"element_type": ElementType.LIGHTNING},
+        "input2": {"ability_type": AbilityType.MOVEMENT},
+        "output": {
+            "element_type": ElementType.LIGHTNING,
+            "ability_type": AbilityType.MOVEMENT,
+            "effects": ["teleport"]
+        },
+        "name": "Lightning Teleport",
+        "description": "Instantly teleport to a target location in a flash of lightning"
+    },
+    
+    # Shield + Projectile = Reflective Barrier
+    {
+        "input1": {"ability_type": AbilityType.BUFF, "effects": ["shield"]},
+        "input2": {"ability_type": AbilityType.PROJECTILE},
+        "output": {
+            "ability_type": AbilityType.BUFF,
+            "effects": ["reflect_projectiles", "shield"]
+        },
+        "name": "Reflective Barrier",
+        "description": "A barrier that reflects projectiles back at enemies"
+    },
+    
+    # Fire + Wind = Firestorm (area damage + push)
+    {
+        "input1": {"element_type": ElementType.FIRE},
+        "input2": {"element_type": ElementType.WIND},
+        "output": {
+            "element_type": ElementType.FIRE,
+            "ability_type": AbilityType.AREA,
+            "effects": ["area_damage", "push"]
+        },
+        "name": "Firestorm",
+        "description": "A raging storm of fire that damages enemies and pushes them away"
+    },
+    
+    # Earth + Water = Mud Slick (slow + trap)
+    {
+        "input1": {"element_type": ElementType.EARTH},
+        "input2": {"element_type": ElementType.WATER},
+        "output": {
+            "element_type": ElementType.EARTH,
+            "ability_type": AbilityType.AREA,
+            "effects": ["slow", "trap"]
+        },
+        "name": "Mud Slick",
+        "description": "Creates a muddy area that slows enemies and can trap them"
+    },
+    
+    # Lightning + Water = Electrified Water (area damage + stun)
+    {
+        "input1": {"element_type": ElementType.LIGHTNING},
+        "input2": {"element_type": ElementType.WATER},
+        "output": {
+            "element_type": ElementType.LIGHTNING,
+            "ability_type": AbilityType.AREA,
+            "effects": ["area_damage", "stun"]
+        },
+        "name": "Electrified Water",
+        "description": "Water charged with electricity that shocks and stuns enemies"
+    }
+]
+
+# Arcane + Any Element = Enhanced Element (increased damage/effect)
+FUSION_RECIPES.extend({
+    "input1": {"element_type": ElementType.ARCANE},
+    "input2": {"element_type": element},
+    "output": {
+        "element_type": element,
+        "effects": ["enhanced_damage", "enhanced_effect"]
+    },
+    "name": f"Enhanced {element.value.capitalize()}",
+    "description": f"An arcane-enhanced {element.value} ability with increased damage and effects"
+} for element in [ElementType.FIRE, ElementType.ICE, ElementType.LIGHTNING,
+                  ElementType.EARTH, ElementType.WATER, ElementType.WIND])
+
+# Harmonization effects, in matching priority order
+HARMONIZATION_EFFECTS = [
+    # Meteor harmonization - Multiple smaller meteors
+    {
+        "ability_type": AbilityType.PROJECTILE,
+        "element_type": ElementType.FIRE,
+        "effect_data": {
+            "projectile_count": 5,
+            "damage_multiplier": 0.7,
+            "spread_angle": 30,
+            "cooldown_multiplier": 1.2
+        },
+        "name": "Meteor Shower",
+        "description": "Creates multiple smaller meteors that rain down on an area"
+    },
+    
+    # Laser harmonization - Sustained beam with increasing damage
+    {
+        "ability_type": AbilityType.PROJECTILE,
+        "element_type": ElementType.FIRE,
+        "effect_data": {
+            "duration": 3.0,
+            "damage_ramp": 0.2,  # 20% more damage per second
+            "range_multiplier": 1.5,
+            "cooldown_multiplier": 1.3
+        },
+        "name": "Sustained Beam",
+        "description": "A powerful continuous beam that deals increasing damage the longer it hits"
+    },
+    
+    # Fire Nova harmonization - Pulsing waves of fire
+    {
+        "ability_type": AbilityType.AREA,
+        "element_type": ElementType.FIRE,
+        "effect_data": {
+            "pulse_count": 3,
+            "pulse_interval": 0.5,
+            "radius_growth": 1.5,  # Each pulse is 50% larger
+            "cooldown_multiplier": 1.4
+        },
+        "name": "Pulsing Nova",
+        "description": "Multiple waves of fire that expand outward in sequence"
+    },
+    
+    # Ice shard harmonization - Crystalline fragments
+    {
+        "ability_type": AbilityType.PROJECTILE,
+        "element_type": ElementType.ICE,
+        "effect_data": {
+            "shard_count": 7,
+            "shatter_on_impact": True,
+            "slow_effect": 0.3,  # 30% slow
+            "cooldown_multiplier": 1.2
+        },
+        "name": "Crystalline Shards",
+        "description": "Ice shards that shatter on impact, creating smaller fragments"
+    },
+    
+    # Lightning harmonization - Chain lightning
+    {
+        "ability_type": AbilityType.PROJECTILE,
+        "element_type": ElementType.LIGHTNING,
+        "effect_data": {
+            "chain_count": 4,
+            "chain_range": 5.0,
+            "damage_falloff": 0.8,  # 20% less damage per chain
+            "cooldown_multiplier": 1.3
+        },
+        "name": "Chain Lightning",
+        "description": "Lightning that jumps from one target to nearby enemies"
+    },
+    
+    # Earth harmonization - Upheaval
+    {
+        "ability_type": AbilityType.AREA,
+        "element_type": ElementType.EARTH,
+        "effect_data": {
+            "stun_duration": 1.0,
+            "damage_multiplier": 1.2,
+            "knockback": 3.0,
+            "cooldown_multiplier": 1.3
+        },
+        "name": "Tectonic Upheaval",
+        "description": "A violent earth eruption that knocks enemies up and stuns them"
+    },
+    
+    # Water harmonization - Tidal wave
+    {
+        "ability_type": AbilityType.AREA,
+        "element_type": ElementType.WATER,
+        "effect_data": {
+            "wave_speed": 8.0,
+            "wave_width": 10.0,
+            "push_force": 10.0,
+            "cooldown_multiplier": 1.3
+        },
+        "name": "Tidal Wave",
+        "description": "A massive wave that pushes enemies away and deals damage"
+    },
+    
+    # Wind harmonization - Tornado
+    {
+        "ability_type": AbilityType.AREA,
+        "element_type": ElementType.WIND,
+        "effect_data": {
+            "duration": 4.0,
+            "radius": 3.0,
+            "pull_force": 5.0,
+            "cooldown_multiplier": 1.4
+        },
+        "name": "Vortex",
+        "description": "A swirling tornado that pulls enemies in and damages them"
+    },
+    
+    # Arcane harmonization - Reality distortion
+    {
+        "ability_type": AbilityType.AREA,
+        "element_type": ElementType.ARCANE,
+        "effect_data": {
+            "slow_time": True,
+            "slow_factor": 0.5,
+            "damage_multiplier": 1.3,
+            "cooldown_multiplier": 1.5
+        },
+        "name": "Reality Distortion",
+        "description": "Warps reality in an area, slowing enemies and increasing damage"
+    },
+    
+    # Holy harmonization - Divine intervention
+    {
+        "ability_type": AbilityType.BUFF,
+        "element_type": ElementType.HOLY,
+        "effect_data": {
+            "duration": 5.0,
+            "heal_amount": 10,
+            "damage_reduction": 0.3,
+            "cooldown_multiplier": 1.4
+        },
+        "name": "Divine Shield",
+        "description": "A powerful shield that heals allies and reduces damage taken"
+    },
+    
+    # Melee harmonization - Sweeping strikes
+    {
+        "ability_type": AbilityType.MELEE,
+        "element_type": None,  # Any element type
+        "effect_data": {
+            "sweep_count": 3,
+            "sweep_interval": 0.2,
+            "angle_multiplier": 1.2,
+            "cooldown_multiplier": 1.3
+        },
+        "name": "Sweeping Strikes",
+        "description": "Multiple rapid strikes that hit in a wide arc"
+    },
+    
+    # Movement harmonization - Afterimage
+    {
+        "ability_type": AbilityType.MOVEMENT,
+        "element_type": None,  # Any element type
+        "effect_data": {
+            "creates_afterimage": True,
+            "afterimage_damage": 5,
+            "afterimage_duration": 1.0,
+            "cooldown_multiplier": 1.2
+        },
+        "name": "Phantom Rush",
+        "description": "Leaves behind a damaging afterimage when moving"
+    }
+]
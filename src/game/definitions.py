@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compiled Definitions for Nightfall Defenders
+Versioned store of the skill, ability, relic, fusion and harmonization tables
+
+The source tables live in game.definition_tables. compile_definitions()
+serialises them at build time into a JSON artefact together with hashed
+lookup indexes, and the game loads that artefact on first access, so
+importing a game module no longer builds any of the tables. When the
+artefact is missing, written by another format version or older than the
+source tables, the store falls back to importing the tables directly.
+"""
+
+import os
+import json
+import copy
+import hashlib
+import importlib
+from enum import Enum
+from itertools import combinations
+
+# Bumped whenever the artefact layout changes
+FORMAT_VERSION = 1
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(GAME_DIR, "definition_tables.py")
+DEFAULT_PATH = os.path.join(os.path.dirname(GAME_DIR), "assets", "generated", "definitions.json")
+
+# Table names and the definition_tables attributes they come from
+TABLES = {
+    "skills": "SKILLS",
+    "skill_connections": "SKILL_CONNECTIONS",
+    "class_abilities": "CLASS_ABILITIES",
+    "abilities": "ABILITY_DEFINITIONS",
+    "standard_abilities": "STANDARD_ABILITIES",
+    "relics": "RELICS",
+    "fusion_recipes": "FUSION_RECIPES",
+    "harmonization_effects": "HARMONIZATION_EFFECTS"
+}
+
+# Modules defining the enums that appear in the tables
+ENUM_MODULES = {
+    "SkillType": ".skill_tree",
+    "ElementType": ".ability_system",
+    "AbilityType": ".ability_system"
+}
+
+# Ability attributes a fusion recipe input can require
+FUSION_MATCH_KEYS = ("ability_id", "ability_type", "element_type")
+
+def encode_value(value):
+    """
+    Convert a table value to JSON, tagging enums and tuples
+    
+    Args:
+        value: Value from a definition table
+    
+    Returns:
+        JSON-compatible value
+    """
+    if isinstance(value, Enum):
+        return {"$enum": f"{type(value).__name__}.{value.name}"}
+    if isinstance(value, tuple):
+        return {"$tuple": [encode_value(item) for item in value]}
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Definition keys must be strings, got {key!r}")
+            encoded[key] = encode_value(item)
+        return encoded
+    return value
+
+def decode_value(value, enums=None):
+    """
+    Convert a JSON value back to its table value
+    
+    Args:
+        value: Value read from the artefact
+        enums (dict): Cache of enum classes by name
+    
+    Returns:
+        The table value with its enums and tuples restored
+    """
+    enums = {} if enums is None else enums
+    if isinstance(value, list):
+        return [decode_value(item, enums) for item in value]
+    if isinstance(value, dict):
+        if "$enum" in value:
+            class_name, member = value["$enum"].split(".")
+            if class_name not in enums:
+                module = importlib.import_module(ENUM_MODULES[class_name], __package__)
+                enums[class_name] = getattr(module, class_name)
+            return enums[class_name][member]
+        if "$tuple" in value:
+            return tuple(decode_value(item, enums) for item in value["$tuple"])
+        return {key: decode_value(item, enums) for key, item in value.items()}
+    return value
+
+def fusion_key(criteria):
+    """
+    Get the hashable key of a fusion recipe input
+    
+    Args:
+        criteria (dict): Recipe input criteria
+    
+    Returns:
+        tuple: (attribute, value) pairs in FUSION_MATCH_KEYS order
+    """
+    return tuple((key, criteria[key]) for key in FUSION_MATCH_KEYS if key in criteria)
+
+def ability_fusion_keys(ability):
+    """
+    Get every fusion key an ability satisfies
+    
+    An ability matches an input when it has all of the input's
+    attributes, so the keys are the subsets of its own attributes.
+    
+    Args:
+        ability: The ability to look up
+    
+    Returns:
+        list: Fusion keys, from the empty key to the most specific one
+    """
+    pairs = [(key, getattr(ability, key)) for key in FUSION_MATCH_KEYS if hasattr(ability, key)]
+    return [subset for size in range(len(pairs) + 1) for subset in combinations(pairs, size)]
+
+def harmonization_key(ability_type, element_type):
+    """
+    Get the hashable key of a harmonization effect
+    
+    Args:
+        ability_type: Ability type of the effect, falsy for any type
+        element_type: Element type of the effect, falsy for any element
+    
+    Returns:
+        tuple: (ability_type, element_type) with None for wildcards
+    """
+    return (ability_type or None, element_type or None)
+
+def build_indexes(tables):
+    """
+    Build the hashed lookup indexes of the tables
+    
+    Each index maps a key to the position of the first entry matching it,
+    which keeps the first-match priority of the original linear scans.
+    
+    Args:
+        tables (dict): Definition tables by name
+    
+    Returns:
+        dict: Indexes by name
+    """
+    fusion_index = {}
+    for position, recipe in enumerate(tables["fusion_recipes"]):
+        key1, key2 = fusion_key(recipe["input1"]), fusion_key(recipe["input2"])
+        fusion_index.setdefault((key1, key2), position)
+        fusion_index.setdefault((key2, key1), position)
+    
+    harmonization_index = {}
+    for position, effect in enumerate(tables["harmonization_effects"]):
+        key = harmonization_key(effect["ability_type"], effect["element_type"])
+        harmonization_index.setdefault(key, position)
+    
+    return {
+        "fusion_recipes": fusion_index,
+        "harmonization_effects": harmonization_index
+    }
+
+def build_tables():
+    """
+    Import the source tables
+    
+    Returns:
+        dict: Definition tables by name
+    """
+    module = importlib.import_module(".definition_tables", __package__)
+    return {name: getattr(module, attribute) for name, attribute in TABLES.items()}
+
+def source_fingerprint():
+    """
+    Hash the source tables so stale artefacts can be detected
+    
+    Returns:
+        str: Hex digest, or None when the sources are not shipped
+    """
+    if not os.path.exists(SOURCE_PATH):
+        return None
+    with open(SOURCE_PATH, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def compile_definitions(path=DEFAULT_PATH):
+    """
+    Serialise the definition tables and their indexes to an artefact
+    
+    Args:
+        path (str): Where to write the artefact
+    
+    Returns:
+        dict: Number of entries by table name
+    """
+    tables = build_tables()
+    indexes = build_indexes(tables)
+    artefact = {
+        "version": FORMAT_VERSION,
+        "fingerprint": source_fingerprint(),
+        "tables": encode_value(tables),
+        # Index keys are tuples, so indexes are stored as [key, position] pairs
+        "indexes": {name: [[encode_value(key), position] for key, position in index.items()]
+                    for name, index in indexes.items()}
+    }
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(artefact, f, separators=(",", ":"), sort_keys=True)
+    os.replace(temp_path, path)
+    return {name: len(table) for name, table in tables.items()}
+
+class DefinitionStore:
+    """
+    Lazily loaded definition tables and indexes
+    
+    Nothing is read until a table or index is first requested. Tables are
+    shared between callers and must be treated as read-only; callers that
+    modify their copy ask for a fresh one.
+    """
+    
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Initialize the definition store
+        
+        Args:
+            path (str): Path of the compiled artefact
+        """
+        self.path = path
+        self.tables = None
+        self.indexes = None
+        
+        # Whether the tables came from the artefact rather than the sources
+        self.compiled = False
+    
+    def load(self):
+        """Load the artefact, or the source tables when it cannot be used"""
+        if self.tables is not None:
+            return
+        
+        artefact = self._read_artefact()
+        if artefact is not None:
+            enums = {}
+            self.tables = decode_value(artefact["tables"], enums)
+            self.indexes = {name: {decode_value(key, enums): position for key, position in pairs}
+                            for name, pairs in artefact["indexes"].items()}
+            self.compiled = True
+        else:
+            self.tables = build_tables()
+            self.indexes = build_indexes(self.tables)
+            self.compiled = False
+    
+    def _read_artefact(self):
+        """
+        Read the artefact if it is current
+        
+        Returns:
+            dict: The artefact, or None if it is missing, stale or unreadable
+        """
+        if not os.path.exists(self.path):
+            return None
+        
+        try:
+            with open(self.path, 'r') as f:
+                artefact = json.load(f)
+        except Exception as e:
+            print(f"Error reading definitions from {self.path}: {e}")
+            return None
+        
+        if artefact.get("version") != FORMAT_VERSION:
+            print(f"Definitions in {self.path} use format {artefact.get('version')}, using the source tables")
+            return None
+        
+        fingerprint = source_fingerprint()
+        if fingerprint is not None and artefact.get("fingerprint") != fingerprint:
+            print(f"Definitions in {self.path} are older than the source tables, using the source tables")
+            return None
+        return artefact
+    
+    def get_table(self, name, fresh=False):
+        """
+        Get a definition table
+        
+        Args:
+            name (str): Table name (see TABLES)
+            fresh (bool): Return a deep copy the caller may modify
+        
+        Returns:
+            The table
+        """
+        self.load()
+        table = self.tables[name]
+        return copy.deepcopy(table) if fresh else table
+    
+    def get_index(self, name):
+        """
+        Get a lookup index
+        
+        Args:
+            name (str): Index name ("fusion_recipes" or "harmonization_effects")
+        
+        Returns:
+            dict: Positions in the matching table by key
+        """
+        self.load()
+        return self.indexes[name]
+
+# Store shared by the game systems
+_store = None
+
+def get_store():
+    """Get the shared definition store, creating it on first use"""
+    global _store
+    if _store is None:
+        _store = DefinitionStore()
+    return _store
+
+def get_table(name, fresh=False):
+    """
+    Get a table from the shared definition store
+    
+    Args:
+        name (str): Table name (see TABLES)
+        fresh (bool): Return a deep copy the caller may modify
+    
+    Returns:
+        The table
+    """
+    return get_store().get_table(name, fresh)
+
+def get_index(name):
+    """
+    Get a lookup index from the shared definition store
+    
+    Args:
+        name (str): Index name
+    
+    Returns:
+        dict: Positions in the matching table by key
+    """
+    return get_store().get_index(name)
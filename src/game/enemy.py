@@ -11,6 +11,7 @@ import random
 from game.enemy_healthbar import EnemyHealthBar
 from game.resource_drop import ResourceDrop
 from game.enemy_psychology import EnemyPsychology, PsychologicalState
+from game.game_events import emit_event, DAMAGE_TAKEN, PLAYER_DIED, ENEMY_KILLED, RESOURCE_COLLECTED
 
 class Enemy:
     """Base class for all enemies in the game"""
@@ -158,9 +159,15 @@ class Enemy:
         """Set up the enemy model"""
         # For now, just use a box as placeholder
         try:
-            self.model = self.game.loader.loadModel("models/box")
+            resource_manager = getattr(self.game, 'resource_manager', None)
+            if resource_manager is not None and hasattr(resource_manager, 'attach_model_async'):
+                # Load without stalling the frame; a placeholder shows until then
+                self.model = resource_manager.attach_model_async("models/box", self.root,
+                                                                 position=self.position)
+            else:
+                self.model = self.game.loader.loadModel("models/box")
+                self.model.reparentTo(self.root)
             self.model.setScale(0.5, 0.5, 1.0)  # Enemy dimensions
-            self.model.reparentTo(self.root)
             
             # Color the box for visibility
             self.model.setColor(0.8, 0.2, 0.2, 1)  # Red color for enemy
@@ -278,8 +285,9 @@ class Enemy:
             if self.rally_duration <= 0:
                 self.rally_active = False
         
-        # Update psychological system
-        self.psychology.update(dt)
+        # Update psychological system using the frame's shared threat context
+        entity_manager = getattr(self.game, 'entity_manager', None)
+        self.psychology.update(dt, getattr(entity_manager, 'threat_context', None))
         
         # Update based on state
         if self.psychology.state == PsychologicalState.SUBSERVIENT:
@@ -307,11 +315,7 @@ class Enemy:
         self.apply_movement(dt)
         
         # Update health bar
-        if hasattr(self.health_bar, 'update'):
-            if hasattr(self.health_bar.update, '__code__') and self.health_bar.update.__code__.co_argcount > 1:
-                self.health_bar.update(dt)
-            else:
-                self.health_bar.update()
+        self.health_bar.update(dt)
         
         # Update the state time
         self.state_time += dt
@@ -730,12 +734,26 @@ class Enemy:
     
     def apply_movement(self, dt):
         """Apply movement velocity to position with collision detection"""
-        # Simple movement without collision for now
-        self.position += self.velocity * dt
+        # Simple movement without collision for now, slowed by status effects
+        status_effects = getattr(self.game, 'status_effects', None)
+        if status_effects:
+            self.position += self.velocity * (dt * status_effects.get_speed_multiplier(self))
+        else:
+            self.position += self.velocity * dt
+        
+        # Follow the terrain
+        self.position.z = self.get_ground_height(self.position.x, self.position.y)
         
         # In a real implementation, we would check for collisions here
         # and adjust the position accordingly
     
+    def get_ground_height(self, x, y):
+        """Get the terrain height at a position, 0 without terrain"""
+        terrain = getattr(self.game, 'terrain', None)
+        if terrain is None:
+            return 0.0
+        return terrain.height_at(x, y)
+    
     def set_state(self, new_state):
         """Set a new AI state"""
         self.current_state = new_state
@@ -759,7 +777,7 @@ class Enemy:
             
             x = self.position.x + radius * math.cos(angle)
             y = self.position.y + radius * math.sin(angle)
-            z = 0  # Assuming flat terrain for now
+            z = self.get_ground_height(x, y)
             
             self.patrol_points.append(Vec3(x, y, z))
     
@@ -780,16 +798,15 @@ class Enemy:
         if distance < self.attack_range:
             self.game.player.take_damage(damage)
             
-            # Record damage in difficulty system if available
-            if hasattr(self.game, 'adaptive_difficulty_system'):
-                self.game.adaptive_difficulty_system.record_combat_event('damage_taken', damage)
+            # Report the damage to the systems tracking the player
+            emit_event(self.game, DAMAGE_TAKEN, damage, getattr(self, 'enemy_type', None))
             
             # Reset attack cooldown
             self.attack_cooldown = 1.0
             
-            # If player is killed, record in difficulty system
-            if self.game.player.health <= 0 and hasattr(self.game, 'adaptive_difficulty_system'):
-                self.game.adaptive_difficulty_system.record_combat_event('player_death')
+            # If player is killed, report the death
+            if self.game.player.health <= 0:
+                emit_event(self.game, PLAYER_DIED, getattr(self, 'enemy_type', None))
     
     def take_damage(self, amount):
         """Take damage from an attack"""
@@ -808,13 +825,8 @@ class Enemy:
             # Enemy died
             self.die()
             
-            # Record enemy death in performance tracker if available
-            if hasattr(self.game, 'performance_tracker'):
-                self.game.performance_tracker.record_combat_event('enemy_killed')
-            
-            # Record enemy death in difficulty system if available
-            if hasattr(self.game, 'adaptive_difficulty_system'):
-                self.game.adaptive_difficulty_system.record_combat_event('enemy_killed')
+            # Report the kill, with its score
+            emit_event(self.game, ENEMY_KILLED, getattr(self, 'enemy_type', None), 1)
     
     def react_to_damage(self):
         """React to being damaged"""
@@ -891,10 +903,8 @@ class Enemy:
                     self.game.entity_manager.create_resource_drop(
                         resource_type, amount, self.position)
                     
-                    # Record resource drop in performance tracker if available
-                    if hasattr(self.game, 'performance_tracker'):
-                        self.game.performance_tracker.record_resource_event(
-                            resource_type, amount, source="enemy_drop")
+                    # Report the resource drop
+                    emit_event(self.game, RESOURCE_COLLECTED, resource_type, amount, "enemy_drop")
     
     def drop_experience(self):
         """Drop experience points upon death"""
@@ -6,12 +6,333 @@ Enemy Healthbar for Nightfall Defenders
 Displays a health bar above enemies
 """
 
-from panda3d.core import NodePath, TextNode, Vec4
-from direct.gui.DirectGui import DirectWaitBar
+import os
+
+import numpy as np
+from panda3d.core import (
+    NodePath, GeomNode, Geom, GeomTriangles, GeomVertexData, GeomVertexFormat,
+    GeomVertexArrayFormat, InternalName, Shader, TransparencyAttrib,
+    OmniBoundingVolume, Vec2, Vec4
+)
+
+class HealthBarRenderer:
+    """
+    Draws every enemy health bar from one shared vertex buffer
+    
+    Each bar is a camera-facing quad expanded by the health bar shader. The
+    bar's fill and color are vertex attributes that are only rewritten when
+    the enemy's health changes; anchors and visibility are written in one
+    batch per frame for the bars that are shown and on screen.
+    """
+    
+    FRAME_COLOR = (0.2, 0.2, 0.2, 0.8)  # Dark gray frame
+    
+    # Quad corners around the anchor, in bar units
+    CORNERS = np.array([(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)], dtype=np.float32)
+    
+    def __init__(self, game, capacity=64, width=0.5, height=0.08):
+        """
+        Initialize the health bar renderer
+        
+        Args:
+            game: The main game instance
+            capacity (int): Initial number of bar slots
+            width (float): Width of a bar in world units
+            height (float): Height of a bar in world units
+        """
+        self.game = game
+        self.capacity = 0
+        self.bars = []
+        self.free_slots = []
+        self.shown_slots = set()
+        
+        # Last fill written per slot, used to skip redundant writes
+        self.fills = np.zeros(0, dtype=np.float32)
+        
+        # Off-screen bars are culled with this margin in clip space
+        self.cull_margin = 0.1
+        
+        # Vertex format: anchors and visibility change every frame, corners
+        # never change, fill and color change only with health
+        anchor_array = GeomVertexArrayFormat()
+        anchor_array.addColumn(InternalName.getVertex(), 3, Geom.NT_float32, Geom.C_point)
+        anchor_array.addColumn(InternalName.make("visible"), 1, Geom.NT_float32, Geom.C_other)
+        corner_array = GeomVertexArrayFormat()
+        corner_array.addColumn(InternalName.make("corner"), 2, Geom.NT_float32, Geom.C_other)
+        health_array = GeomVertexArrayFormat()
+        health_array.addColumn(InternalName.make("fill"), 1, Geom.NT_float32, Geom.C_other)
+        health_array.addColumn(InternalName.make("barcolor"), 4, Geom.NT_float32, Geom.C_color)
+        vertex_format = GeomVertexFormat()
+        vertex_format.addArray(anchor_array)
+        vertex_format.addArray(corner_array)
+        vertex_format.addArray(health_array)
+        self.vertex_format = GeomVertexFormat.registerFormat(vertex_format)
+        
+        self.vertex_data = GeomVertexData("health_bars", self.vertex_format, Geom.UH_dynamic)
+        self.triangles = GeomTriangles(Geom.UH_static)
+        geom = Geom(self.vertex_data)
+        geom.addPrimitive(self.triangles)
+        
+        geom_node = GeomNode("HealthBars")
+        geom_node.addGeom(geom)
+        
+        # The shader moves vertices away from their anchors; culling is done here
+        geom_node.setBounds(OmniBoundingVolume())
+        geom_node.setFinal(True)
+        
+        self.root = NodePath(geom_node)
+        self.root.reparentTo(game.render)
+        self.root.setTransparency(TransparencyAttrib.MAlpha)
+        self.root.setDepthWrite(False)
+        self.root.setLightOff()
+        self.root.setBin("fixed", 0)
+        self.root.setShaderInput("bar_size", Vec2(width, height))
+        self.root.setShaderInput("frame_color", Vec4(*self.FRAME_COLOR))
+        self._load_shader()
+        
+        self._grow(capacity)
+    
+    @classmethod
+    def for_game(cls, game):
+        """
+        Get the shared health bar renderer of a game, creating it if needed
+        
+        Args:
+            game: The main game instance
+        
+        Returns:
+            HealthBarRenderer: The shared renderer
+        """
+        renderer = getattr(game, 'health_bar_renderer', None)
+        if renderer is None:
+            renderer = cls(game)
+            game.health_bar_renderer = renderer
+        return renderer
+    
+    @staticmethod
+    def get_bar_color(health_percent):
+        """
+        Get the bar color for a health percentage
+        
+        Args:
+            health_percent (float): Health from 0 to 100
+        
+        Returns:
+            tuple: RGBA color
+        """
+        if health_percent > 60:
+            return (0.2, 0.8, 0.2, 1)  # Green
+        elif health_percent > 30:
+            return (0.8, 0.8, 0.2, 1)  # Yellow
+        else:
+            return (0.8, 0.2, 0.2, 1)  # Red
+    
+    def _load_shader(self):
+        """Load the billboard health bar shader"""
+        vertex_path = os.path.join("src", "assets", "shaders", "healthbar.vert")
+        fragment_path = os.path.join("src", "assets", "shaders", "healthbar.frag")
+        
+        if os.path.exists(vertex_path) and os.path.exists(fragment_path):
+            try:
+                shader = Shader.load(Shader.SL_GLSL, vertex=vertex_path, fragment=fragment_path)
+                self.root.setShader(shader)
+                return
+            except Exception as e:
+                print(f"Failed to load health bar shader: {e}")
+        else:
+            print("Health bar shader files not found, health bars disabled")
+        
+        # Without the shader the quads would collapse onto their anchors
+        self.root.hide()
+    
+    def _grow(self, capacity):
+        """
+        Grow the vertex buffer to hold at least the given number of bars
+        
+        Args:
+            capacity (int): Required number of bar slots
+        """
+        if capacity <= self.capacity:
+            return
+        
+        old_capacity = self.capacity
+        self.vertex_data.setNumRows(capacity * 4)
+        
+        corners = self._array_view(1, 2).reshape(-1, 4, 2)
+        corners[old_capacity:] = self.CORNERS
+        
+        anchors = self._array_view(0, 4).reshape(-1, 4, 4)
+        anchors[old_capacity:] = 0.0
+        
+        for slot in range(old_capacity, capacity):
+            first = slot * 4
+            self.triangles.addVertices(first, first + 1, first + 2)
+            self.triangles.addVertices(first, first + 2, first + 3)
+        
+        self.bars.extend([None] * (capacity - old_capacity))
+        self.free_slots.extend(reversed(range(old_capacity, capacity)))
+        self.fills = np.concatenate([self.fills, np.full(capacity - old_capacity, -1.0, dtype=np.float32)])
+        self.capacity = capacity
+    
+    def _array_view(self, array_index, columns):
+        """
+        Get a writable float view of one vertex array
+        
+        Args:
+            array_index (int): Index of the array in the vertex format
+            columns (int): Number of floats per vertex in that array
+        
+        Returns:
+            numpy.ndarray: Array of shape (rows, columns)
+        """
+        buffer = memoryview(self.vertex_data.modifyArray(array_index))
+        return np.frombuffer(buffer, dtype=np.float32).reshape(-1, columns)
+    
+    def register(self, health_bar):
+        """
+        Allocate a slot for a health bar
+        
+        Args:
+            health_bar (EnemyHealthBar): The health bar to draw
+        
+        Returns:
+            int: The slot index
+        """
+        if not self.free_slots:
+            self._grow(max(1, self.capacity * 2))
+        
+        slot = self.free_slots.pop()
+        self.bars[slot] = health_bar
+        self.fills[slot] = -1.0
+        return slot
+    
+    def release(self, slot):
+        """
+        Free a health bar slot
+        
+        Args:
+            slot (int): The slot index
+        """
+        if slot is None or self.bars[slot] is None:
+            return
+        
+        # The owner must not write to the slot once it is handed to another bar
+        owner = self.bars[slot]
+        owner.slot = None
+        owner.visible = False
+        
+        self.bars[slot] = None
+        self.shown_slots.discard(slot)
+        self.free_slots.append(slot)
+        
+        anchors = self._array_view(0, 4).reshape(-1, 4, 4)
+        anchors[slot, :, 3] = 0.0
+    
+    def set_health(self, slot, ratio):
+        """
+        Update the fill and color of a bar
+        
+        Args:
+            slot (int): The slot index
+            ratio (float): Health ratio from 0 to 1
+        """
+        ratio = max(0.0, min(1.0, ratio))
+        if self.fills[slot] == np.float32(ratio):
+            return
+        
+        self.fills[slot] = ratio
+        health = self._array_view(2, 5).reshape(-1, 4, 5)
+        health[slot, :, 0] = ratio
+        health[slot, :, 1:] = self.get_bar_color(ratio * 100)
+    
+    def set_shown(self, slot, shown):
+        """
+        Show or hide a bar
+        
+        Args:
+            slot (int): The slot index
+            shown (bool): Whether the bar should be drawn
+        """
+        if shown:
+            self.shown_slots.add(slot)
+        else:
+            self.shown_slots.discard(slot)
+    
+    def update(self):
+        """Write anchors for the shown bars and cull those off-screen"""
+        anchors = self._array_view(0, 4).reshape(-1, 4, 4)
+        anchors[:, :, 3] = 0.0
+        
+        # Drop bars whose enemy node was removed without releasing them
+        for slot in list(self.shown_slots):
+            enemy_root = getattr(self.bars[slot].enemy, 'root', None)
+            if enemy_root is None or enemy_root.isEmpty():
+                self.release(slot)
+        
+        if not self.shown_slots:
+            return
+        
+        slots = np.fromiter(self.shown_slots, dtype=np.int64, count=len(self.shown_slots))
+        positions = np.array([self._get_anchor(self.bars[slot]) for slot in slots], dtype=np.float32)
+        
+        on_screen = self._get_on_screen_mask(positions)
+        slots = slots[on_screen]
+        anchors[slots, :, :3] = positions[on_screen][:, np.newaxis, :]
+        anchors[slots, :, 3] = 1.0
+    
+    def _get_anchor(self, health_bar):
+        """
+        Get the world position above an enemy where its bar is drawn
+        
+        Args:
+            health_bar (EnemyHealthBar): The health bar
+        
+        Returns:
+            tuple: World position of the bar center
+        """
+        position = health_bar.enemy.position
+        return (position[0], position[1], position[2] + health_bar.y_offset)
+    
+    def _get_on_screen_mask(self, positions):
+        """
+        Test which bar anchors are inside the camera frustum
+        
+        Args:
+            positions (numpy.ndarray): Anchor positions of shape (n, 3)
+        
+        Returns:
+            numpy.ndarray: Boolean mask of the anchors to draw
+        """
+        camera = getattr(self.game, 'cam', None)
+        lens = getattr(self.game, 'camLens', None)
+        if camera is None or lens is None:
+            return np.ones(len(positions), dtype=bool)
+        
+        view_projection = np.array(self.game.render.getMat(camera) * lens.getProjectionMat())
+        homogeneous = np.hstack([positions, np.ones((len(positions), 1), dtype=np.float32)])
+        clip = homogeneous @ view_projection
+        
+        w = clip[:, 3]
+        limit = w * (1.0 + self.cull_margin)
+        return ((w > 0)
+                & (np.abs(clip[:, 0]) <= limit)
+                & (np.abs(clip[:, 1]) <= limit)
+                & (np.abs(clip[:, 2]) <= limit))
+    
+    def destroy(self):
+        """Clean up the renderer"""
+        self.root.removeNode()
+        self.bars = []
+        self.free_slots = []
+        self.shown_slots = set()
+        if getattr(self.game, 'health_bar_renderer', None) is self:
+            self.game.health_bar_renderer = None
 
 class EnemyHealthBar:
     """
     Displays a health bar above an enemy that follows its position in the world
+    
+    The bar is drawn by the game's shared HealthBarRenderer.
     """
     
     def __init__(self, game, enemy, y_offset=1.5, width=1.0):
@@ -29,26 +350,17 @@ class EnemyHealthBar:
         self.y_offset = y_offset
         self.width = width
         
-        # Create a node that will be positioned above the enemy
-        self.root = NodePath("HealthBarRoot")
-        self.root.setBillboardPointEye()  # Always face camera
-        self.root.reparentTo(self.enemy.root)
-        self.root.setPos(0, 0, self.y_offset)
-        self.root.setScale(0.5)  # Scale down for reasonable size
-        
-        # Create the health bar
-        self.health_bar = DirectWaitBar(
-            scale=(self.width, 1, 0.1),
-            value=100,
-            barColor=(0.2, 0.8, 0.2, 1),  # Green
-            frameColor=(0.2, 0.2, 0.2, 0.8),  # Dark gray frame
-            frameSize=(-0.5, 0.5, -0.08, 0.08),
-            pos=(0, 0, 0),
-            parent=self.root
-        )
+        # Allocate a slot in the shared renderer
+        self.renderer = HealthBarRenderer.for_game(game)
+        self.slot = self.renderer.register(self)
+        
+        # Last health ratio written to the renderer
+        self.health_ratio = None
+        if hasattr(self.enemy, 'health'):
+            self.health_ratio = self.enemy.health / self.enemy.max_health
+            self.renderer.set_health(self.slot, self.health_ratio)
         
         # Initially hide the health bar until the enemy takes damage
-        self.health_bar.hide()
         self.visible = False
         self.visibility_time = 0
         self.visibility_duration = 3.0  # Show for 3 seconds after taking damage
@@ -61,20 +373,13 @@ class EnemyHealthBar:
             dt (float): Delta time since the last update
         """
         # Don't update if the enemy is gone
-        if not self.enemy or not hasattr(self.enemy, 'health'):
+        if not self.enemy or not hasattr(self.enemy, 'health') or self.slot is None:
             return
         
-        # Update health percentage
-        health_percent = (self.enemy.health / self.enemy.max_health) * 100
-        self.health_bar["value"] = health_percent
-        
-        # Update bar color based on health percentage
-        if health_percent > 60:
-            self.health_bar["barColor"] = (0.2, 0.8, 0.2, 1)  # Green
-        elif health_percent > 30:
-            self.health_bar["barColor"] = (0.8, 0.8, 0.2, 1)  # Yellow
-        else:
-            self.health_bar["barColor"] = (0.8, 0.2, 0.2, 1)  # Red
+        # Only touch the renderer when health changed
+        health_ratio = self.enemy.health / self.enemy.max_health
+        if health_ratio != self.health_ratio:
+            self.update_health(health_ratio)
         
         # Update visibility
         if self.visible:
@@ -82,10 +387,24 @@ class EnemyHealthBar:
             if self.visibility_time <= 0:
                 self.hide()
     
+    def update_health(self, health_ratio):
+        """
+        Set the displayed health and show the bar
+        
+        Args:
+            health_ratio (float): Health ratio from 0 to 1
+        """
+        if self.slot is None:
+            return
+        
+        self.health_ratio = health_ratio
+        self.renderer.set_health(self.slot, health_ratio)
+        self.show()
+    
     def show(self):
         """Show the health bar"""
-        if not self.visible:
-            self.health_bar.show()
+        if not self.visible and self.slot is not None:
+            self.renderer.set_shown(self.slot, True)
             self.visible = True
         
         # Reset visibility timer
@@ -94,10 +413,16 @@ class EnemyHealthBar:
     def hide(self):
         """Hide the health bar"""
         if self.visible:
-            self.health_bar.hide()
+            self.renderer.set_shown(self.slot, False)
             self.visible = False
     
     def destroy(self):
         """Clean up the health bar"""
-        self.health_bar.destroy()
-        self.root.removeNode() 
\ No newline at end of file
+        if self.slot is not None:
+            self.renderer.release(self.slot)
+            self.slot = None
+        self.visible = False
+    
+    def remove(self):
+        """Remove the health bar (alias of destroy)"""
+        self.destroy()
@@ -9,6 +9,8 @@ Implements psychological states and responses to player power
 import math
 import random
 
+import numpy as np
+
 class PsychologicalState:
     """Enumerates the possible psychological states of enemies"""
     NORMAL = "normal"
@@ -99,6 +101,170 @@ class PsychologyTraits:
         """
         return self.intelligence
 
+class ThreatContext:
+    """
+    Player-side threat terms shared by every enemy psychology for one frame
+    
+    The player's power, the fog visibility at the player's position and the
+    city state are identical for every enemy, so they are computed once per
+    frame here. ``evaluate`` then derives the per-enemy terms (pack strength,
+    power ratio and proximity) for a whole group of enemies in one pass.
+    """
+    
+    # Units within which pack mentality applies
+    PACK_RANGE = 12.0
+    
+    def __init__(self, game):
+        """
+        Capture the player-side threat terms for the current frame
+        
+        Args:
+            game: The game instance
+        """
+        self.game = game
+        self.player = getattr(game, 'player', None)
+        self.player_position = getattr(self.player, 'position', None) if self.player else None
+        
+        # City state
+        self.inside_city = False
+        self.city_defense_bonus = 0.0
+        city_manager = getattr(game, 'city_manager', None)
+        if city_manager and self.player_position is not None and hasattr(city_manager, 'is_inside_city'):
+            if city_manager.is_inside_city(self.player_position):
+                self.inside_city = True
+                self.city_defense_bonus = city_manager.defense / 100.0
+        
+        # Fog visibility at the player's position (1.0 = full visibility)
+        night_fog = getattr(game, 'night_fog', None)
+        self.fog_active = bool(night_fog and night_fog.active)
+        self.player_visibility = 1.0
+        if night_fog and self.player_position is not None:
+            self.player_visibility = night_fog.get_visibility_factor(self.player_position)
+        
+        # Player power before per-enemy modifiers (grudge)
+        self.player_power = self._calculate_player_power()
+        
+        # Per-enemy results of the last evaluate() call, keyed by psychology
+        self._evaluations = {}
+    
+    def _calculate_player_power(self):
+        """
+        Calculate the player power term shared by all enemies
+        
+        Returns:
+            float: Player power including city and fog modifiers
+        """
+        player = self.player
+        if not player:
+            return 0.0
+        
+        # Basic measure of player power from level, health, and weapon damage
+        player_level = getattr(player, 'level', 1)
+        player_health_ratio = getattr(player, 'health', 100) / getattr(player, 'max_health', 100)
+        
+        # Get player's current weapon damage
+        projectile_type = getattr(player, 'projectile_type', 'straight')
+        projectile_types = getattr(player, 'projectile_types', {})
+        weapon_damage = 10  # Default value
+        if projectile_type in projectile_types:
+            weapon_damage = projectile_types[projectile_type].get('damage', 10)
+        
+        player_power = player_level * (1.0 + weapon_damage / 10.0) * (0.5 + player_health_ratio / 2.0)
+        player_power *= (1.0 + self.city_defense_bonus)
+        
+        # Reduce power by up to 50% in dense fog
+        player_power *= (0.5 + self.player_visibility * 0.5)
+        
+        return player_power
+    
+    def evaluate(self, enemies):
+        """
+        Evaluate the psychology inputs of a group of enemies in one pass
+        
+        Updates fog state and pack strength on each enemy's psychology and
+        stores the power ratio and proximity factor for ``lookup``.
+        
+        Args:
+            enemies (list): Enemies to evaluate; also used as the ally pool
+        """
+        enemies = [enemy for enemy in enemies
+                   if hasattr(enemy, 'psychology') and hasattr(enemy, 'position')]
+        self._evaluations = {}
+        if not enemies:
+            return
+        
+        psychologies = [enemy.psychology for enemy in enemies]
+        for psychology in psychologies:
+            psychology._check_fog_state()
+        
+        count = len(enemies)
+        positions = np.array([(e.position[0], e.position[1], e.position[2]) for e in enemies],
+                             dtype=np.float64).reshape(count, 3)
+        health = np.array([e.health for e in enemies], dtype=np.float64)
+        max_health = np.array([e.max_health for e in enemies], dtype=np.float64)
+        damage = np.array([e.damage for e in enemies], dtype=np.float64)
+        detection_range = np.array([getattr(e, 'detection_range', 10.0) for e in enemies],
+                                   dtype=np.float64)
+        pack_mentality = np.array([p.traits.pack_mentality for p in psychologies], dtype=np.float64)
+        is_alpha = np.array([p.traits.is_alpha for p in psychologies], dtype=bool)
+        fog_empowerment = np.array([p.fog_empowerment for p in psychologies], dtype=np.float64)
+        grudge = np.array([p.memory['grudge_factor'] for p in psychologies], dtype=np.float64)
+        
+        # Pack strength from pairwise distances between living allies
+        deltas = positions[:, np.newaxis, :] - positions[np.newaxis, :, :]
+        distances = np.sqrt(np.einsum('ijk,ijk->ij', deltas, deltas))
+        nearby = (distances <= self.PACK_RANGE) & (health > 0)[np.newaxis, :]
+        np.fill_diagonal(nearby, False)
+        ally_counts = nearby.sum(axis=1)
+        alpha_nearby = (nearby & is_alpha[np.newaxis, :]).any(axis=1)
+        pack_bonus = (np.minimum(0.5, ally_counts * 0.1) * pack_mentality
+                      + np.where(alpha_nearby, 0.2, 0.0))
+        pack_bonus[ally_counts == 0] = 0.0
+        
+        for index, psychology in enumerate(psychologies):
+            ally_indices = np.flatnonzero(nearby[index])
+            psychology.nearby_allies = [enemies[i] for i in ally_indices]
+            psychology.nearby_ally_count = int(ally_counts[index])
+            psychology.alpha_nearby = bool(alpha_nearby[index])
+            psychology.pack_strength_bonus = float(pack_bonus[index])
+        
+        # Player-to-enemy power ratio
+        health_ratio = health / max_health
+        enemy_power = damage * (0.5 + health_ratio / 2.0)
+        enemy_power *= (1.0 + fog_empowerment)
+        enemy_power *= (1.0 + pack_bonus)
+        enemy_power *= 1.0 + np.where(health_ratio < 0.25, (0.25 - health_ratio) * 2.0, 0.0)
+        enemy_power = np.where(enemy_power <= 0, 0.1, enemy_power)
+        if self.player:
+            power_ratio = self.player_power * (1.0 + grudge * 0.5) / enemy_power
+        else:
+            power_ratio = np.ones(count)
+        
+        # Proximity factor: 0 (at detection range) to 1 (very close)
+        if self.player_position is not None:
+            player_pos = np.array([self.player_position[0], self.player_position[1],
+                                   self.player_position[2]], dtype=np.float64)
+            player_distance = np.linalg.norm(positions - player_pos, axis=1)
+            proximity = np.where(player_distance < detection_range,
+                                 1.0 - player_distance / detection_range, 0.0)
+        else:
+            proximity = np.ones(count)
+        
+        for index, psychology in enumerate(psychologies):
+            self._evaluations[psychology] = (float(power_ratio[index]), float(proximity[index]))
+    
+    def lookup(self, psychology):
+        """
+        Get the evaluated inputs for a psychology
+        
+        Args:
+            psychology (EnemyPsychology): The psychology to look up
+        
+        Returns:
+            tuple or None: (power_ratio, proximity_factor) or None if not evaluated
+        """
+        return self._evaluations.get(psychology)
+
 class EnemyPsychology:
     """Manages enemy psychological state and responses to player power"""
     
@@ -338,55 +504,25 @@ class EnemyPsychology:
             if hasattr(self.enemy.game, 'camera'):
                 self.indicator_node.lookAt(self.enemy.game.camera)
 
-    def calculate_player_power_ratio(self):
+    def calculate_player_power_ratio(self, context=None):
         """
         Calculate the ratio between player power and enemy power
         
+        Args:
+            context (ThreatContext): Shared player-side terms for this frame.
+                Captured on demand when not provided.
+        
         Returns:
             float: Player power / enemy power ratio
         """
-        player = self.enemy.game.player
-        if not player:
+        if context is None:
+            context = ThreatContext(self.enemy.game)
+        if not context.player:
             return 1.0
         
-        # Basic measure of player power from level, health, and weapon damage
-        player_level = getattr(player, 'level', 1)
-        player_health_ratio = getattr(player, 'health', 100) / getattr(player, 'max_health', 100)
-        
-        # Get player's current weapon damage
-        projectile_type = getattr(player, 'projectile_type', 'straight')
-        projectile_types = getattr(player, 'projectile_types', {})
-        weapon_damage = 10  # Default value
-        if projectile_type in projectile_types:
-            weapon_damage = projectile_types[projectile_type].get('damage', 10)
-        
-        # City defense bonus if player is near city
-        city_defense_bonus = 0
-        if hasattr(self.enemy.game, 'city_manager'):
-            city_manager = self.enemy.game.city_manager
-            
-            # Check if player is inside city boundaries
-            player_pos = getattr(player, 'position', None)
-            if player_pos and hasattr(city_manager, 'is_inside_city'):
-                if city_manager.is_inside_city(player_pos):
-                    city_defense_bonus = city_manager.defense / 100.0
-        
-        # Calculate player power
-        player_power = player_level * (1.0 + weapon_damage / 10.0) * (0.5 + player_health_ratio / 2.0)
-        player_power *= (1.0 + city_defense_bonus)
-        
         # Increase player power based on memory/grudge factor
         memory_modifier = 1.0 + (self.memory['grudge_factor'] * 0.5)
-        player_power *= memory_modifier
-        
-        # Reduce player power based on fog visibility at player's position
-        if hasattr(self.enemy.game, 'night_fog'):
-            player_pos = getattr(player, 'position', None)
-            if player_pos:
-                # Get visibility factor (1.0 = full visibility, 0.3 = minimum visibility)
-                visibility = self.enemy.game.night_fog.get_visibility_factor(player_pos)
-                # Reduce power by up to 50% in dense fog
-                player_power *= (0.5 + visibility * 0.5)
+        player_power = context.player_power * memory_modifier
         
         # Enemy power based on health ratio and base damage
         enemy_health_ratio = self.enemy.health / self.enemy.max_health
@@ -511,45 +647,53 @@ class EnemyPsychology:
         if random.random() < 0.3:  # 30% chance
             self.confidence = max(0.0, self.confidence - 0.3)
     
-    def update(self, dt):
+    def update(self, dt, context=None):
         """
         Update psychological state based on player power and proximity
         
         Args:
             dt: Delta time in seconds
+            context (ThreatContext): Shared player-side terms for this frame.
+                If it already evaluated this enemy, the precomputed fog, pack,
+                power ratio and proximity results are used.
         """
-        # Check if enemy is in fog
-        self._check_fog_state()
-        
-        # Calculate pack strength from nearby allies
-        self.pack_strength_bonus = self.calculate_pack_strength()
-        
-        # Calculate player-to-enemy power ratio
-        power_ratio = self.calculate_player_power_ratio()
+        evaluation = context.lookup(self) if context else None
         
-        # Calculate proximity factor - closer player has stronger psychological effect
-        proximity_factor = 1.0
-        player = self.enemy.game.player
-        if player and hasattr(player, 'position') and hasattr(self.enemy, 'position'):
-            distance = (player.position - self.enemy.position).length()
-            detection_range = getattr(self.enemy, 'detection_range', 10.0)
+        if evaluation:
+            power_ratio, proximity_factor = evaluation
+        else:
+            if context is None:
+                context = ThreatContext(self.enemy.game)
             
-            # Normalize distance: 0 (at detection range) to 1 (very close)
-            if distance < detection_range:
-                proximity_factor = 1.0 - (distance / detection_range)
-                
-                # Record encounter if close enough - but only occasionally to avoid spam
-                if proximity_factor > 0.7 and random.random() < 0.05:
-                    self.record_player_encounter(encounter_type='spotted')
-            else:
-                proximity_factor = 0.0
+            # Check if enemy is in fog
+            self._check_fog_state()
+            
+            # Calculate pack strength from nearby allies
+            self.pack_strength_bonus = self.calculate_pack_strength()
+            
+            # Calculate player-to-enemy power ratio
+            power_ratio = self.calculate_player_power_ratio(context)
+            
+            # Calculate proximity factor - closer player has stronger psychological effect
+            proximity_factor = 1.0
+            if context.player_position is not None and hasattr(self.enemy, 'position'):
+                distance = (context.player_position - self.enemy.position).length()
+                detection_range = getattr(self.enemy, 'detection_range', 10.0)
                 
-            # Reduce proximity factor in fog based on visibility
-            if hasattr(self.enemy.game, 'night_fog') and self.enemy.game.night_fog.active:
-                # Get visibility factor at player position
-                visibility = self.enemy.game.night_fog.get_visibility_factor(player.position)
-                # Scale proximity factor by visibility
-                proximity_factor *= visibility
+                # Normalize distance: 0 (at detection range) to 1 (very close)
+                if distance < detection_range:
+                    proximity_factor = 1.0 - (distance / detection_range)
+                else:
+                    proximity_factor = 0.0
+        
+        if context.player_position is not None:
+            # Record encounter if close enough - but only occasionally to avoid spam
+            if proximity_factor > 0.7 and random.random() < 0.05:
+                self.record_player_encounter(encounter_type='spotted')
+            
+            # Reduce proximity factor in fog based on visibility at player position
+            if context.fog_active:
+                proximity_factor *= context.player_visibility
         
         # Special case: if enemy is empowered by fog, prioritize that state
         if self.fog_empowerment > 0.5:
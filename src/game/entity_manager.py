@@ -17,6 +17,8 @@ from game.projectile import Projectile, StraightProjectile, ArcingProjectile, Ho
 from game.resource_node import ResourceNode
 from game.resource_drop import ResourceDrop
 from game.crafting_bench import CraftingBench
+from game.enemy_psychology import ThreatContext
+from game.game_events import emit_event, ENEMY_SPAWNED
 
 class EntityManager:
     """Manages all game entities and their interactions"""
@@ -62,6 +64,9 @@ class EntityManager:
         # Track subservient enemies
         self.subservient_enemies = []
         
+        # Player-side threat terms shared by all enemies during an update
+        self.threat_context = None
+        
         # Debug information
         self.debug_info = {
             "enemy_count": 0,
@@ -111,6 +116,7 @@ class EntityManager:
         else:
             print(f"Unknown enemy type: {enemy_type}")
             return None
+        enemy.enemy_type = enemy_type
         
         # Add to entity lists
         self.entities[self.next_entity_id] = enemy
@@ -146,6 +152,13 @@ class EntityManager:
             oldest_projectile = self.projectiles[0]
             self.remove_entity(oldest_projectile)
         
+        # Keep the projectile clear of the terrain so it does not hit the ground at once
+        terrain = getattr(self.game, 'terrain', None)
+        if terrain is not None:
+            ground_height = terrain.height_at(origin.x, origin.y)
+            if origin.z < ground_height + 0.5:
+                origin = Vec3(origin.x, origin.y, ground_height + 0.5)
+        
         # Create projectile based on type
         projectile = None
         
@@ -404,6 +417,10 @@ class EntityManager:
             if not active:
                 entities_to_remove.append(projectile)
         
+        # Capture player-side threat terms once and evaluate all enemies together
+        self.threat_context = ThreatContext(self.game)
+        self.threat_context.evaluate(self.enemies)
+        
         # Update enemies
         for enemy in self.enemies[:]:
             enemy.update(dt)
@@ -419,6 +436,18 @@ class EntityManager:
                 elif enemy.psychology.state != PsychologicalState.SUBSERVIENT and enemy in self.subservient_enemies:
                     self.subservient_enemies.remove(enemy)
         
+        self.threat_context = None
+        
+        # Refresh the tower targets against this frame's enemy positions
+        tower_targeting = getattr(self.game, 'tower_targeting', None)
+        if tower_targeting:
+            tower_targeting.update()
+        
+        # Tick every status effect in one pass
+        status_effects = getattr(self.game, 'status_effects', None)
+        if status_effects:
+            status_effects.update(dt)
+        
         # Update player(s)
         for player in self.players:
             player.update(dt)
@@ -449,6 +478,11 @@ class EntityManager:
         for entity in entities_to_remove:
             self.remove_entity(entity)
         
+        # Upload the shared enemy health bar buffer once for all enemies
+        health_bar_renderer = getattr(self.game, 'health_bar_renderer', None)
+        if health_bar_renderer:
+            health_bar_renderer.update()
+        
         # Update debug information
         self.debug_info["enemy_count"] = len(self.enemies)
         self.debug_info["projectile_count"] = len(self.projectiles)
@@ -637,9 +671,9 @@ class EntityManager:
                 except:
                     pass
         
-        # Record spawn in performance tracker if available
-        if enemy and hasattr(self.game, 'performance_tracker'):
-            self.game.performance_tracker.record_combat_event('enemy_spawned', source=enemy_type)
+        # Report the spawn
+        if enemy:
+            emit_event(self.game, ENEMY_SPAWNED, enemy_type)
         
         return enemy
     
@@ -875,6 +909,11 @@ class EntityManager:
         # Remove from spatial grid
         self.remove_from_spatial_grid(entity)
         
+        # Drop its status effects
+        status_effects = getattr(self.game, 'status_effects', None)
+        if status_effects:
+            status_effects.clear(entity)
+        
         # If entity is a NodePath, remove it from the scene graph
         if hasattr(entity, 'removeNode'):
             entity.removeNode()
@@ -6,7 +6,7 @@ Fusion Recipe Manager for Nightfall Defenders
 Manages recipes for ability fusion combinations
 """
 
-from .ability_system import ElementType, AbilityType
+from .definitions import get_table, get_index, fusion_key, ability_fusion_keys
 
 class FusionRecipe:
     """Represents a recipe for fusing two abilities"""
@@ -73,6 +73,9 @@ class FusionRecipeManager:
     def __init__(self):
         """Initialize the fusion recipe manager"""
         self.recipes = []
+        
+        # Position of the first recipe for each pair of input keys
+        self.recipe_index = {}
         self._initialize_default_recipes()
     
     def add_recipe(self, recipe):
@@ -85,7 +88,13 @@ class FusionRecipeManager:
         Returns:
             bool: True if added successfully
         """
+        position = len(self.recipes)
         self.recipes.append(recipe)
+        
+        # Earlier recipes keep priority for the same inputs
+        key1, key2 = fusion_key(recipe.input1), fusion_key(recipe.input2)
+        self.recipe_index.setdefault((key1, key2), position)
+        self.recipe_index.setdefault((key2, key1), position)
         return True
     
     def find_recipe(self, ability1, ability2):
@@ -99,100 +108,19 @@ class FusionRecipeManager:
         Returns:
             FusionRecipe or None: The matching recipe, or None if no match found
         """
-        for recipe in self.recipes:
-            if recipe.matches(ability1, ability2):
-                return recipe
-        return None
+        # Each ability can only match the inputs made of its own attributes,
+        # so a bounded number of index lookups replaces the scan over recipes
+        best = None
+        for key1 in ability_fusion_keys(ability1):
+            for key2 in ability_fusion_keys(ability2):
+                position = self.recipe_index.get((key1, key2))
+                if position is not None and (best is None or position < best):
+                    best = position
+        return self.recipes[best] if best is not None else None
     
     def _initialize_default_recipes(self):
-        """Initialize default fusion recipes"""
-        # Fire + Ice = Steam (obscures vision, damage over time)
-        self.add_recipe(FusionRecipe(
-            {'element_type': ElementType.FIRE},
-            {'element_type': ElementType.ICE},
-            {
-                'element_type': ElementType.WATER,
-                'ability_type': AbilityType.AREA,
-                'effects': ['obscure_vision', 'damage_over_time']
-            },
-            "Steam Cloud",
-            "A cloud of steam that obscures vision and deals damage over time"
-        ))
-        
-        # Lightning + Movement = Teleport
-        self.add_recipe(FusionRecipe(
-            {'element_type': ElementType.LIGHTNING},
-            {'ability_type': AbilityType.MOVEMENT},
-            {
-                'element_type': ElementType.LIGHTNING,
-                'ability_type': AbilityType.MOVEMENT,
-                'effects': ['teleport']
-            },
-            "Lightning Teleport",
-            "Instantly teleport to a target location in a flash of lightning"
-        ))
-        
-        # Shield + Projectile = Reflective Barrier
-        self.add_recipe(FusionRecipe(
-            {'ability_type': AbilityType.BUFF, 'effects': ['shield']},
-            {'ability_type': AbilityType.PROJECTILE},
-            {
-                'ability_type': AbilityType.BUFF,
-                'effects': ['reflect_projectiles', 'shield']
-            },
-            "Reflective Barrier",
-            "A barrier that reflects projectiles back at enemies"
-        ))
-        
-        # Fire + Wind = Firestorm (area damage + push)
-        self.add_recipe(FusionRecipe(
-            {'element_type': ElementType.FIRE},
-            {'element_type': ElementType.WIND},
-            {
-                'element_type': ElementType.FIRE,
-                'ability_type': AbilityType.AREA,
-                'effects': ['area_damage', 'push']
-            },
-            "Firestorm",
-            "A raging storm of fire that damages enemies and pushes them away"
-        ))
-        
-        # Earth + Water = Mud Slick (slow + trap)
-        self.add_recipe(FusionRecipe(
-            {'element_type': ElementType.EARTH},
-            {'element_type': ElementType.WATER},
-            {
-                'element_type': ElementType.EARTH,
-                'ability_type': AbilityType.AREA,
-                'effects': ['slow', 'trap']
-            },
-            "Mud Slick",
-            "Creates a muddy area that slows enemies and can trap them"
-        ))
-        
-        # Lightning + Water = Electrified Water (area damage + stun)
-        self.add_recipe(FusionRecipe(
-            {'element_type': ElementType.LIGHTNING},
-            {'element_type': ElementType.WATER},
-            {
-                'element_type': ElementType.LIGHTNING,
-                'ability_type': AbilityType.AREA,
-                'effects': ['area_damage', 'stun']
-            },
-            "Electrified Water",
-            "Water charged with electricity that shocks and stuns enemies"
-        ))
-        
-        # Arcane + Any Element = Enhanced Element (increased damage/effect)
-        for element in [ElementType.FIRE, ElementType.ICE, ElementType.LIGHTNING, 
-                     ElementType.EARTH, ElementType.WATER, ElementType.WIND]:
-            self.add_recipe(FusionRecipe(
-                {'element_type': ElementType.ARCANE},
-                {'element_type': element},
-                {
-                    'element_type': element,
-                    'effects': ['enhanced_damage', 'enhanced_effect']
-                },
-                f"Enhanced {element.value.capitalize()}",
-                f"An arcane-enhanced {element.value} ability with increased damage and effects"
-            )) 
\ No newline at end of file
+        """Load the default fusion recipes from the definitions store"""
+        for data in get_table("fusion_recipes"):
+            self.recipes.append(FusionRecipe(data["input1"], data["input2"], data["output"],
+                                             data["name"], data["description"]))
+        self.recipe_index.update(get_index("fusion_recipes"))
@@ -12,6 +12,7 @@ from direct.gui.OnscreenImage import OnscreenImage
 from panda3d.core import TextNode, TransparencyAttrib, Vec4
 
 from game.ability_system import ElementType, AbilityType
+from engine.ui.retained import RetainedLayer, patch_widget
 
 class FusionUI:
     """UI for selecting and fusing abilities"""
@@ -27,6 +28,9 @@ class FusionUI:
         self.visible = False
         self.selection = [None, None]  # Selected abilities
         self.ability_buttons = []
+        
+        # Ability buttons, kept per ability id and pooled between openings
+        self.ability_layer = None
         self.player = None
         
         # Create UI components
@@ -199,17 +203,17 @@ class FusionUI:
     def cleanup(self):
         """Clean up UI components"""
         self.main_frame.destroy()
-        for button in self.ability_buttons:
-            button.destroy()
+        if self.ability_layer:
+            self.ability_layer.destroy()
     
     def _update_ability_buttons(self):
         """Update the ability selection buttons based on player's unlocked abilities"""
-        # Clear existing buttons
-        for button in self.ability_buttons:
-            button.destroy()
-        self.ability_buttons = []
+        if self.ability_layer is None:
+            self.ability_layer = RetainedLayer(self._create_ability_button, self._patch_ability_button)
         
         if not hasattr(self.player, 'ability_manager'):
+            self.ability_layer.clear()
+            self.ability_buttons = []
             return
         
         # Get unlocked abilities
@@ -221,15 +225,14 @@ class FusionUI:
             if ability and not ability.is_fused:  # Only show non-fusion abilities
                 unlocked_abilities.append(ability)
         
-        # Create buttons
-        button_width = 0.15
-        button_height = 0.15
+        # Lay out buttons
         buttons_per_row = 5
         spacing_x = 0.17
         spacing_y = 0.17
         start_x = -0.7
         start_y = -0.15
         
+        models = {}
         for i, ability in enumerate(unlocked_abilities):
             row = i // buttons_per_row
             col = i % buttons_per_row
@@ -237,27 +240,7 @@ class FusionUI:
             x = start_x + col * spacing_x
             y = start_y - row * spacing_y
             
-            # Create button
-            button = DirectButton(
-                parent=self.ability_scroll_frame,
-                frameSize=(-button_width/2, button_width/2, -button_height/2, button_height/2),
-                pos=(x, 0, y),
-                relief=1,
-                frameColor=(0.2, 0.2, 0.3, 0.8),
-                command=self._select_ability,
-                extraArgs=[ability, i]
-            )
-            
-            # Add ability name
-            name = OnscreenText(
-                text=ability.name,
-                parent=button,
-                scale=0.04,
-                pos=(0, -button_height/2 - 0.03),
-                fg=(0.9, 0.9, 0.9, 1.0)
-            )
-            
-            # Add icon (placeholder text for now)
+            # Icon color (placeholder for now)
             element_color = (0.8, 0.8, 0.8, 1.0)  # Default color
             if ability.element_type.value == "fire":
                 element_color = (1.0, 0.4, 0.2, 1.0)
@@ -274,23 +257,86 @@ class FusionUI:
             elif ability.element_type.value == "arcane":
                 element_color = (0.8, 0.2, 0.8, 1.0)
             
-            icon = DirectFrame(
-                parent=button,
-                frameSize=(-button_width/2 + 0.02, button_width/2 - 0.02, 
-                           -button_height/2 + 0.02, button_height/2 - 0.02),
-                frameColor=element_color,
-                relief=1
-            )
-            
-            element_text = OnscreenText(
-                text=ability.element_type.value.capitalize(),
-                parent=icon,
-                scale=0.035,
-                pos=(0, -0.03),
-                fg=(0.2, 0.2, 0.2, 1.0)
-            )
+            models[ability.ability_id] = {
+                "pos": (x, 0, y),
+                "extraArgs": [ability, i],
+                "name": ability.name,
+                "element_color": element_color,
+                "element": ability.element_type.value.capitalize()
+            }
+        
+        # Reopening the UI only patches the buttons whose ability changed
+        self.ability_layer.update(models)
+        self.ability_buttons = list(self.ability_layer.widgets.values())
+    
+    def _create_ability_button(self, ability_id, props):
+        """
+        Create the button of an ability
+        
+        Args:
+            ability_id: ID of the ability shown first
+            props: View model of the button
             
-            self.ability_buttons.append(button)
+        Returns:
+            DirectButton: The button
+        """
+        button_width = 0.15
+        button_height = 0.15
+        
+        # Create button
+        button = DirectButton(
+            parent=self.ability_scroll_frame,
+            frameSize=(-button_width/2, button_width/2, -button_height/2, button_height/2),
+            pos=props["pos"],
+            relief=1,
+            frameColor=(0.2, 0.2, 0.3, 0.8),
+            command=self._select_ability,
+            extraArgs=props["extraArgs"]
+        )
+        
+        # Add ability name
+        button.name_text = OnscreenText(
+            text=props["name"],
+            parent=button,
+            scale=0.04,
+            pos=(0, -button_height/2 - 0.03),
+            fg=(0.9, 0.9, 0.9, 1.0)
+        )
+        
+        button.icon = DirectFrame(
+            parent=button,
+            frameSize=(-button_width/2 + 0.02, button_width/2 - 0.02, 
+                       -button_height/2 + 0.02, button_height/2 - 0.02),
+            frameColor=props["element_color"],
+            relief=1
+        )
+        
+        button.element_text = OnscreenText(
+            text=props["element"],
+            parent=button.icon,
+            scale=0.035,
+            pos=(0, -0.03),
+            fg=(0.2, 0.2, 0.2, 1.0)
+        )
+        
+        return button
+    
+    def _patch_ability_button(self, button, changed):
+        """
+        Apply the changed properties of an ability button
+        
+        Args:
+            button: The button
+            changed: Changed properties
+        """
+        changed = dict(changed)
+        if "name" in changed:
+            button.name_text.setText(changed.pop("name"))
+        if "element_color" in changed:
+            button.icon["frameColor"] = changed.pop("element_color")
+        if "element" in changed:
+            button.element_text.setText(changed.pop("element"))
+        patch_widget(button, changed)
     
     def _select_ability(self, ability, button_index):
         """
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Game Events for Nightfall Defenders
+Combat, resource and city event types and the systems that consume them
+"""
+
+from collections import Counter
+
+from engine.event_bus import EventType
+
+# Combat events
+DAMAGE_DEALT = EventType.intern("damage_dealt", ("amount", "source"))
+DAMAGE_TAKEN = EventType.intern("damage_taken", ("amount", "source"))
+ENEMY_SPAWNED = EventType.intern("enemy_spawned", ("enemy_type",))
+ENEMY_KILLED = EventType.intern("enemy_killed", ("enemy_type", "score"))
+PLAYER_DIED = EventType.intern("player_died", ("source",))
+BOSS_DEFEATED = EventType.intern("boss_defeated", ("boss_type", "defeat_time"))
+
+# Resource events
+RESOURCE_COLLECTED = EventType.intern("resource_collected", ("resource_type", "amount", "source"))
+
+# City events
+CITY_DAMAGED = EventType.intern("city_damaged", ("amount", "source"))
+
+def emit_event(game, event_type, *values):
+    """
+    Emit a game event if the game has an event bus
+    
+    Args:
+        game: The game instance
+        event_type (EventType): Event type
+        *values: Event values
+    """
+    if hasattr(game, 'event_bus'):
+        game.event_bus.emit(event_type, *values)
+
+def _total(events, index=0):
+    """Sum one value over a batch of events"""
+    return sum(values[index] for values in events)
+
+def _count_by(events, index=0, weight=None):
+    """Count (or sum a weight of) a batch of events by one of their values"""
+    counts = Counter()
+    for values in events:
+        counts[values[index]] += 1 if weight is None else values[weight]
+    return counts
+
+def _amounts_by_resource(events):
+    """Sum the amounts of resource events by (resource type, source)"""
+    amounts = Counter()
+    for resource_type, amount, source in events:
+        amounts[(resource_type, source)] += amount
+    return amounts
+
+def connect_tracking_events(game):
+    """
+    Subscribe the performance tracker and the adaptive difficulty system
+    
+    Each subscriber gets the events of a frame as one batch and folds it
+    into a few calls, whatever the number of events.
+    
+    Args:
+        game: The game instance with its event bus and systems
+    """
+    bus = game.event_bus
+    
+    tracker = getattr(game, 'performance_tracker', None)
+    if tracker:
+        bus.subscribe(DAMAGE_DEALT, lambda events: tracker.record_combat_event('damage_dealt', _total(events)))
+        bus.subscribe(DAMAGE_TAKEN, lambda events: tracker.record_combat_event('damage_taken', _total(events)))
+        
+        def track_spawns(events):
+            for enemy_type, count in _count_by(events).items():
+                tracker.record_combat_event('enemy_spawned', count, enemy_type)
+        bus.subscribe(ENEMY_SPAWNED, track_spawns)
+        
+        def track_kills(events):
+            for enemy_type, count in _count_by(events).items():
+                tracker.record_combat_event('enemy_killed', count, enemy_type)
+        bus.subscribe(ENEMY_KILLED, track_kills)
+        
+        def track_deaths(events):
+            for _ in events:
+                tracker.record_combat_event('death')
+        bus.subscribe(PLAYER_DIED, track_deaths)
+        
+        def track_bosses(events):
+            for boss_type, defeat_time in events:
+                tracker.record_boss_event('victory', boss_type, defeat_time)
+        bus.subscribe(BOSS_DEFEATED, track_bosses)
+        
+        def track_resources(events):
+            for (resource_type, source), amount in _amounts_by_resource(events).items():
+                tracker.record_resource_event(resource_type, amount, source)
+        bus.subscribe(RESOURCE_COLLECTED, track_resources)
+        
+        bus.subscribe(CITY_DAMAGED, lambda events: tracker.record_city_event('damage', _total(events)))
+    
+    difficulty = getattr(game, 'adaptive_difficulty_system', None)
+    if difficulty:
+        bus.subscribe(DAMAGE_DEALT, lambda events: difficulty.record_combat_event('damage_dealt', _total(events)))
+        bus.subscribe(DAMAGE_TAKEN, lambda events: difficulty.record_combat_event('damage_taken', _total(events)))
+        bus.subscribe(ENEMY_KILLED, lambda events: difficulty.record_combat_event('enemy_killed', len(events)))
+        
+        def track_player_deaths(events):
+            # Each death counts toward the anti-frustration threshold
+            for _ in events:
+                difficulty.record_combat_event('player_death')
+        bus.subscribe(PLAYER_DIED, track_player_deaths)
+        
+        def track_boss_defeats(events):
+            for _, defeat_time in events:
+                difficulty.record_boss_event('defeat', defeat_time)
+        bus.subscribe(BOSS_DEFEATED, track_boss_defeats)
+        
+        def track_collected(events):
+            for (resource_type, _), amount in _amounts_by_resource(events).items():
+                difficulty.record_resource_event('collected', resource_type, amount)
+        bus.subscribe(RESOURCE_COLLECTED, track_collected)
+        
+        bus.subscribe(CITY_DAMAGED, lambda events: difficulty.record_city_event('damage', _total(events)))
+
+def connect_progress_events(game):
+    """
+    Subscribe the quest manager and the challenge system to kills
+    
+    Args:
+        game: The game instance with its event bus and systems
+    """
+    # Subscribing twice would count every kill twice
+    if getattr(game, 'progress_events_connected', False):
+        return
+    game.progress_events_connected = True
+    bus = game.event_bus
+    
+    quests = getattr(game, 'quest_manager', None)
+    if quests:
+        def update_kill_quests(events):
+            for enemy_type, count in _count_by(events).items():
+                quests.on_kill(enemy_type, count)
+        bus.subscribe(ENEMY_KILLED, update_kill_quests)
+        
+        def update_boss_quests(events):
+            for boss_type, count in _count_by(events).items():
+                quests.on_kill(boss_type, count)
+        bus.subscribe(BOSS_DEFEATED, update_boss_quests)
+    
+    challenges = getattr(game, 'challenge_system', None)
+    if challenges:
+        def score_kills(events):
+            for enemy_type, score in _count_by(events, weight=1).items():
+                challenges.on_enemy_killed(enemy_type, score)
+        bus.subscribe(ENEMY_KILLED, score_kills)
+        
+        def score_bosses(events):
+            # Each boss kill can complete a boss rush, so they are scored one by one
+            for boss_type, _ in events:
+                challenges.on_boss_killed(boss_type)
+        bus.subscribe(BOSS_DEFEATED, score_bosses)
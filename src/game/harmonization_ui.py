@@ -12,6 +12,7 @@ from direct.gui.OnscreenImage import OnscreenImage
 from panda3d.core import TextNode, TransparencyAttrib, Vec4
 
 from game.ability_system import ElementType, AbilityType
+from engine.ui.retained import RetainedLayer, patch_widget
 
 class HarmonizationUI:
     """UI for harmonizing abilities"""
@@ -27,6 +28,9 @@ class HarmonizationUI:
         self.visible = False
         self.selected_ability = None
         self.ability_buttons = []
+        
+        # Ability buttons, kept per ability id and pooled between openings
+        self.ability_layer = None
         self.player = None
         
         # Create UI components
@@ -200,17 +204,17 @@ class HarmonizationUI:
     def cleanup(self):
         """Clean up UI components"""
         self.main_frame.destroy()
-        for button in self.ability_buttons:
-            button.destroy()
+        if self.ability_layer:
+            self.ability_layer.destroy()
     
     def _update_ability_buttons(self):
         """Update the ability selection buttons based on player's unlocked abilities"""
-        # Clear existing buttons
-        for button in self.ability_buttons:
-            button.destroy()
-        self.ability_buttons = []
+        if self.ability_layer is None:
+            self.ability_layer = RetainedLayer(self._create_ability_button, self._patch_ability_button)
         
         if not hasattr(self.player, 'ability_manager'):
+            self.ability_layer.clear()
+            self.ability_buttons = []
             return
         
         # Get unlocked abilities
@@ -223,15 +227,14 @@ class HarmonizationUI:
             if ability and not ability.is_harmonized and not ability.is_fused:
                 harmonizable_abilities.append(ability)
         
-        # Create buttons
-        button_width = 0.15
-        button_height = 0.15
+        # Lay out buttons
         buttons_per_row = 5
         spacing_x = 0.17
         spacing_y = 0.17
         start_x = -0.6
         start_y = -0.15
         
+        models = {}
         for i, ability in enumerate(harmonizable_abilities):
             row = i // buttons_per_row
             col = i % buttons_per_row
@@ -239,46 +242,89 @@ class HarmonizationUI:
             x = start_x + col * spacing_x
             y = start_y - row * spacing_y
             
-            # Create button
-            button = DirectButton(
-                parent=self.ability_scroll_frame,
-                frameSize=(-button_width/2, button_width/2, -button_height/2, button_height/2),
-                pos=(x, 0, y),
-                relief=1,
-                frameColor=(0.2, 0.3, 0.4, 0.8),
-                command=self._select_ability,
-                extraArgs=[ability]
-            )
-            
-            # Add ability name
-            name = OnscreenText(
-                text=ability.name,
-                parent=button,
-                scale=0.04,
-                pos=(0, -button_height/2 - 0.03),
-                fg=(0.9, 0.9, 0.9, 1.0)
-            )
-            
-            # Add icon (placeholder with element color)
+            # Icon color (placeholder with element color)
             element_color = self._get_element_color(ability.element_type)
             
-            icon = DirectFrame(
-                parent=button,
-                frameSize=(-button_width/2 + 0.02, button_width/2 - 0.02, 
-                           -button_height/2 + 0.02, button_height/2 - 0.02),
-                frameColor=element_color,
-                relief=1
-            )
-            
-            element_text = OnscreenText(
-                text=ability.element_type.value.capitalize(),
-                parent=icon,
-                scale=0.035,
-                pos=(0, -0.03),
-                fg=(0.2, 0.2, 0.2, 1.0)
-            )
+            models[ability.ability_id] = {
+                "pos": (x, 0, y),
+                "extraArgs": [ability],
+                "name": ability.name,
+                "element_color": element_color,
+                "element": ability.element_type.value.capitalize()
+            }
+        
+        # Reopening the UI only patches the buttons whose ability changed
+        self.ability_layer.update(models)
+        self.ability_buttons = list(self.ability_layer.widgets.values())
+    
+    def _create_ability_button(self, ability_id, props):
+        """
+        Create the button of an ability
+        
+        Args:
+            ability_id: ID of the ability shown first
+            props: View model of the button
             
-            self.ability_buttons.append(button)
+        Returns:
+            DirectButton: The button
+        """
+        button_width = 0.15
+        button_height = 0.15
+        
+        # Create button
+        button = DirectButton(
+            parent=self.ability_scroll_frame,
+            frameSize=(-button_width/2, button_width/2, -button_height/2, button_height/2),
+            pos=props["pos"],
+            relief=1,
+            frameColor=(0.2, 0.3, 0.4, 0.8),
+            command=self._select_ability,
+            extraArgs=props["extraArgs"]
+        )
+        
+        # Add ability name
+        button.name_text = OnscreenText(
+            text=props["name"],
+            parent=button,
+            scale=0.04,
+            pos=(0, -button_height/2 - 0.03),
+            fg=(0.9, 0.9, 0.9, 1.0)
+        )
+        
+        button.icon = DirectFrame(
+            parent=button,
+            frameSize=(-button_width/2 + 0.02, button_width/2 - 0.02, 
+                       -button_height/2 + 0.02, button_height/2 - 0.02),
+            frameColor=props["element_color"],
+            relief=1
+        )
+        
+        button.element_text = OnscreenText(
+            text=props["element"],
+            parent=button.icon,
+            scale=0.035,
+            pos=(0, -0.03),
+            fg=(0.2, 0.2, 0.2, 1.0)
+        )
+        
+        return button
+    
+    def _patch_ability_button(self, button, changed):
+        """
+        Apply the changed properties of an ability button
+        
+        Args:
+            button: The button
+            changed: Changed properties
+        """
+        changed = dict(changed)
+        if "name" in changed:
+            button.name_text.setText(changed.pop("name"))
+        if "element_color" in changed:
+            button.icon["frameColor"] = changed.pop("element_color")
+        if "element" in changed:
+            button.element_text.setText(changed.pop("element"))
+        patch_widget(button, changed)
     
     def _get_element_color(self, element_type):
         """Get a color based on element type"""
@@ -9,6 +9,7 @@ Implements the core game loop and initializes game systems
 import os
 import sys
 import argparse
+import random
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import loadPrcFileData, WindowProperties, Vec3, ConfigVariableBool
 
@@ -27,6 +28,8 @@ from engine.renderer import Renderer
 from engine.input_manager import InputManager
 from engine.scene_manager import SceneManager
 from engine.save_manager import SaveManager
+from engine.event_bus import EventBus, EventRecorder
+from engine.replay import SessionRecorder, SessionReplay
 from engine.ui.ui_manager import UIManager
 
 # Import game modules
@@ -43,26 +46,48 @@ from game.city_manager import CityManager
 from game.night_fog import NightFog
 from game.adaptive_difficulty import AdaptiveDifficultySystem, DifficultyPreset
 from game.performance_tracker import PerformanceTracker
+from game.game_events import connect_tracking_events, connect_progress_events
+from game.quest_system import QuestManager
+from game.challenge_mode import ChallengeSystem
+from game.world_chunks import WorldChunkManager
+from game.terrain import TerrainManager
 from game.difficulty_settings import DifficultySettings
 from game.class_selection_ui import ClassSelectionUI
 from game.secondary_abilities import SecondaryAbilityManager
+import game.skill_definitions as skill_definitions
 
 class NightfallDefenders(ShowBase):
     """Main game class that extends Panda3D's ShowBase"""
     
-    def __init__(self, enable_adaptive_difficulty=False):
+    def __init__(self, enable_adaptive_difficulty=False, event_log=None,
+                 session_log=None, replay_log=None, headless=False, frame_times_path=None):
         """
         Initialize the game
         
         Args:
             enable_adaptive_difficulty: Whether to enable adaptive difficulty system
+            event_log: Optional path of a binary log to record the game events to
+            session_log: Optional path of a log to record the inputs and frame times to
+            replay_log: Optional path of a recorded session to replay instead of live input
+            headless: Whether to run without a window (replays only)
+            frame_times_path: Optional CSV path for the frame times measured during a replay
         """
+        self.headless = headless
+        self.frame_times_path = frame_times_path
+        
         # Configure Panda3D settings first
         self._configure_panda3d()
         
         # Initialize ShowBase
         super().__init__()
         
+        # Seed the shared random generator before any system draws from it,
+        # so that enemy spawns, fog, events and relics replay identically
+        self.session_replay = SessionReplay(replay_log) if replay_log else None
+        self.session_seed = self.session_replay.seed if self.session_replay else random.randrange(2 ** 32)
+        random.seed(self.session_seed)
+        self.session_recorder = SessionRecorder(session_log, self.session_seed) if session_log else None
+        
         # Load our custom game configuration
         self.game_config = GameConfig()
         
@@ -83,12 +108,14 @@ class NightfallDefenders(ShowBase):
         
         # Initialize game-specific systems
         self.game_time = 0
+        self.event_bus = EventBus(recorder=EventRecorder(event_log) if event_log else None)
         self.entity_manager = EntityManager(self)
         self.day_night_cycle = DayNightCycle(self)
         self.camera_controller = CameraController(self)
         
         # Initialize the class system
         self.class_manager = ClassManager()
+        self.skill_definitions = skill_definitions
         
         # Create player
         self.player = None
@@ -110,6 +137,11 @@ class NightfallDefenders(ShowBase):
         # Create the night fog system
         self.night_fog = NightFog(self)
         
+        # Create the quest and challenge systems, fed with kills by the event bus
+        self.quest_manager = QuestManager(self)
+        self.challenge_system = ChallengeSystem(self)
+        connect_progress_events(self)
+        
         # Create the class selection UI
         self.class_selection_ui = ClassSelectionUI(self)
         
@@ -121,6 +153,7 @@ class NightfallDefenders(ShowBase):
             self.adaptive_difficulty_system = AdaptiveDifficultySystem(self)
             self.performance_tracker = PerformanceTracker(self)
             self.difficulty_settings = DifficultySettings(self)
+            connect_tracking_events(self)
             print("Adaptive Difficulty System enabled.")
         
         # Track play time
@@ -148,6 +181,10 @@ class NightfallDefenders(ShowBase):
         # Register our custom scenes
         self._register_scenes()
         
+        # Hand the input and the clock to the replay
+        if self.session_replay:
+            self.session_replay.start(self)
+        
         # Add the update task
         self.task_mgr.add(self._update, "update_task")
         
@@ -172,9 +209,23 @@ class NightfallDefenders(ShowBase):
         loadPrcFileData("", "texture-magfilter linear")
         loadPrcFileData("", "model-cache-dir cache")
         loadPrcFileData("", "audio-library-name p3openal_audio")
+        
+        # Replays can run without a window or audio device
+        if self.headless:
+            loadPrcFileData("", "window-type none")
+            loadPrcFileData("", "audio-library-name null")
     
     def _setup_window(self):
         """Set up the game window properties"""
+        if self.win is None:
+            # Without a window, the camera the game follows and picks from is a bare node
+            from panda3d.core import Camera, PerspectiveLens
+            self.camNode = Camera("cam", PerspectiveLens())
+            self.camera = self.render.attachNewNode("camera")
+            self.cam = self.camera.attachNewNode(self.camNode)
+            self.camLens = self.camNode.getLens()
+            return
+        
         # Get window properties and configure
         wp = WindowProperties()
         wp.setTitle("Nightfall Defenders")
@@ -228,8 +279,7 @@ class NightfallDefenders(ShowBase):
     
     def _populate_world(self):
         """Populate the world with entities and objects"""
-        # Populate resource nodes
-        self.entity_manager.populate_resource_nodes(count=30, area_size=50)
+        # Resource nodes are created by the world chunks
         
         # Create initial enemies
         self.entity_manager.spawn_random_enemies(5)
@@ -245,73 +295,15 @@ class NightfallDefenders(ShowBase):
         self.city_manager.set_city_center(Vec3(0, 0, 0))
     
     def _create_ground(self):
-        """Create the ground plane for the game world"""
-        ground = self.loader.loadModel("models/box")
-        ground.setScale(100, 100, 0.1)
-        ground.setPos(0, 0, -0.1)
-        ground.setColor((0.3, 0.5, 0.2, 1))  # Green grass color
-        ground.reparentTo(self.render)
-        
-        # Set up collision with ground
-        from panda3d.core import CollisionNode, CollisionPlane, Plane, Point3, Vec3
-        collision_node = CollisionNode("ground_collision")
-        collision_node.addSolid(CollisionPlane(Plane(Vec3(0, 0, 1), Point3(0, 0, 0))))
-        collision_node_path = ground.attachNewNode(collision_node)
+        """Create the heightfield terrain for the game world"""
+        # The terrain geometry is also what ground picking rays hit
+        self.terrain = TerrainManager(self)
     
     def _create_environment(self):
         """Create environmental objects like trees, rocks, etc."""
-        # Add some trees
-        import random
-        
-        # Tree positions
-        tree_positions = []
-        for _ in range(15):
-            x = random.uniform(-40, 40)
-            y = random.uniform(-40, 40)
-            # Keep trees away from center (player spawn)
-            if abs(x) < 15 and abs(y) < 15:
-                continue
-            tree_positions.append((x, y))
-            
-        # Create trees
-        for x, y in tree_positions:
-            try:
-                tree = self.loader.loadModel("models/box")  # Placeholder for tree model
-                tree.setScale(1, 1, 3)
-                tree.setPos(x, y, 1.5)
-                tree.setColor((0.5, 0.3, 0.1, 1))  # Brown trunk color
-                
-                # Add tree top
-                tree_top = self.loader.loadModel("models/box")
-                tree_top.setScale(2, 2, 2)
-                tree_top.setPos(0, 0, 1.5)
-                tree_top.setColor((0.1, 0.6, 0.1, 1))  # Green leaves color
-                tree_top.reparentTo(tree)
-                
-                tree.reparentTo(self.render)
-            except Exception as e:
-                print(f"Error creating tree: {e}")
-                
-        # Add some rocks
-        rock_positions = []
-        for _ in range(10):
-            x = random.uniform(-40, 40)
-            y = random.uniform(-40, 40)
-            # Keep rocks away from center (player spawn)
-            if abs(x) < 10 and abs(y) < 10:
-                continue
-            rock_positions.append((x, y))
-            
-        # Create rocks
-        for x, y in rock_positions:
-            try:
-                rock = self.loader.loadModel("models/box")  # Placeholder for rock model
-                rock.setScale(1.5, 1.5, 0.8)
-                rock.setPos(x, y, 0.4)
-                rock.setColor((0.5, 0.5, 0.5, 1))  # Gray rock color
-                rock.reparentTo(self.render)
-            except Exception as e:
-                print(f"Error creating rock: {e}")
+        # Trees, rocks and resource nodes are streamed in chunks around the camera
+        self.world_chunks = WorldChunkManager(self)
+        self.world_chunks.update(Vec3(0, 0, 0))
                 
     def _setup_lighting(self):
         """Set up the lighting for the game world"""
@@ -382,10 +374,26 @@ class NightfallDefenders(ShowBase):
         # Get delta time
         dt = globalClock.getDt()
         
+        # Take the frame from the replayed session, or record it
+        if self.session_replay and self.session_replay.playing:
+            replay_dt = self.session_replay.begin_frame(self)
+            if replay_dt is None:
+                self._finish_replay()
+            else:
+                dt = replay_dt
+        elif self.session_recorder:
+            self.session_recorder.begin_frame(self, dt)
+        
+        # Sample the mouse for this frame
+        self.input_manager.update(dt)
+        
         # Update play time if not paused and in the game scene
         if not self.paused and self.scene_manager.current_scene_name == "game":
             self.play_time += dt
         
+        # Finish and start asynchronous asset loads
+        self.resource_manager.update()
+        
         # Update game systems
         if not self.paused:
             # Update the scene manager
@@ -402,6 +410,20 @@ class NightfallDefenders(ShowBase):
                 # Update camera
                 self.camera_controller.update(dt)
                 
+                # Stream world chunks around the camera
+                self.world_chunks.update(self.camera.getPos(self.render))
+                
+                # Swap in rebuilt terrain blocks and update the terrain LOD
+                self.terrain.update()
+                
+                # Deliver the events of the frame to their subscribers
+                self.event_bus.flush()
+                
+                # Refresh the performance ratings on their cadence
+                if hasattr(self, 'adaptive_difficulty_system'):
+                    self.adaptive_difficulty_system.update(dt)
+                    self.performance_tracker.update(dt)
+                
                 # Check for autosave trigger (e.g., at dawn)
                 if hasattr(self, 'day_night_cycle') and self.day_night_cycle.time_of_day == 'dawn':
                     # Only autosave once per day
@@ -413,8 +435,30 @@ class NightfallDefenders(ShowBase):
         if self.debug_display_enabled:
             self._update_debug_info()
         
+        if self.session_replay and self.session_replay.playing:
+            self.session_replay.end_frame()
+        
         return task.cont
     
+    def _finish_replay(self):
+        """Report the frame times of a finished replay and give control back"""
+        replay = self.session_replay
+        replay.stop(self)
+        
+        summary = replay.get_summary()
+        print(f"Replay of {replay.path} finished: {summary['frames']} frames")
+        if summary['frames']:
+            print(f"Frame update time: mean {summary['mean_ms']:.2f} ms, p50 {summary['p50_ms']:.2f} ms, "
+                  f"p95 {summary['p95_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms, max {summary['max_ms']:.2f} ms")
+        
+        if self.frame_times_path:
+            replay.write_frame_times(self.frame_times_path)
+            print(f"Frame times written to {self.frame_times_path}")
+        
+        # Without a window there is nothing left to play
+        if self.headless:
+            self.cleanup_and_exit()
+    
     def _trigger_autosave(self):
         """Trigger an autosave"""
         if hasattr(self, 'save_manager'):
@@ -484,6 +528,8 @@ class NightfallDefenders(ShowBase):
             f"Difficulty: {difficulty_preset} (HP={enemy_hp_mult}, DMG={enemy_dmg_mult})\n"
             f"FPS: {fps:.1f}"
         )
+        if self.session_replay and self.session_replay.playing:
+            debug_text += f"\nReplay: frame {self.session_replay.frame}/{len(self.session_replay.frames)}"
         
         # Update the text
         self.debug_text.setText(debug_text)
@@ -696,6 +742,18 @@ class NightfallDefenders(ShowBase):
         # Clean up other resources
         # (existing code)
         
+        # Stop the asset loader threads
+        if hasattr(self, 'resource_manager'):
+            self.resource_manager.shutdown()
+        if hasattr(self, 'terrain'):
+            self.terrain.shutdown()
+        
+        # Close the event and session logs
+        if self.event_bus.recorder:
+            self.event_bus.recorder.close()
+        if self.session_recorder:
+            self.session_recorder.close()
+        
         # Exit the game
         self.userExit()
         
@@ -818,10 +876,20 @@ def main():
     """Main entry point for the game"""
     parser = argparse.ArgumentParser(description="Nightfall Defenders Game")
     parser.add_argument("--adaptive-difficulty", action="store_true", help="Enable adaptive difficulty system")
+    parser.add_argument("--record-events", metavar="PATH", help="Record the game events to a binary log")
+    parser.add_argument("--record-session", metavar="PATH", help="Record the inputs and frame times to a session log")
+    parser.add_argument("--replay", metavar="PATH", help="Replay a recorded session log")
+    parser.add_argument("--headless", action="store_true", help="Replay without opening a window")
+    parser.add_argument("--frame-times", metavar="PATH", help="Write the frame times of a replay as CSV")
     args = parser.parse_args()
     
+    if args.headless and not args.replay:
+        parser.error("--headless requires --replay")
+    
     # Create and run the game
-    app = NightfallDefenders(enable_adaptive_difficulty=args.adaptive_difficulty)
+    app = NightfallDefenders(enable_adaptive_difficulty=args.adaptive_difficulty, event_log=args.record_events,
+                             session_log=args.record_session, replay_log=args.replay,
+                             headless=args.headless, frame_times_path=args.frame_times)
     app.run()
 
 if __name__ == "__main__":
@@ -793,4 +793,22 @@ class MainMenuScene:
         self._hide_all_menu_elements()
         
         # Hide the root node to ensure everything is hidden
-        self.root.hide() 
\ No newline at end of file
+        self.root.hide()
+    
+    def enter(self):
+        """Show the main menu when the scene manager switches to it"""
+        self.root.show()
+        self.show_menu("main")
+    
+    def exit(self):
+        """Hide the main menu when the scene manager leaves it"""
+        self.hide()
+    
+    def update(self, dt):
+        """
+        Update the menu scene
+        
+        Args:
+            dt: Time delta
+        """
+        pass 
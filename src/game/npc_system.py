@@ -10,6 +10,8 @@ from enum import Enum
 import random
 from panda3d.core import Vec3, NodePath, TextNode
 
+from game.spatial_index import SpatialGrid
+
 class NPCType(Enum):
     """Enumeration of different NPC types"""
     MERCHANT = "merchant"
@@ -440,17 +442,32 @@ class NPC:
 class NPCManager:
     """Manages all NPCs in the game world"""
     
+    # Cell size of the NPC index used by interaction and nearest queries
+    INDEX_CELL_SIZE = 20.0
+    
     def __init__(self, game):
         """Initialize the NPC manager"""
         self.game = game
         self.npcs = {}
+        self.npc_index = SpatialGrid(self.INDEX_CELL_SIZE)
     
     def create_npc(self, npc_id, name, npc_type, position, model_path=None):
         """Create a new NPC"""
         npc = NPC(npc_id, name, npc_type, position, model_path)
         self.npcs[npc_id] = npc
+        self.npc_index.insert(npc, npc.position)
         return npc
     
+    def move_npc(self, npc_id, position):
+        """Move an NPC and keep the spatial index in sync"""
+        npc = self.npcs.get(npc_id)
+        if npc is None:
+            return
+        npc.position = position
+        if npc.node_path:
+            npc.node_path.setPos(position)
+        self.npc_index.insert(npc, position)
+    
     def update(self, dt, player_position):
         """Update all NPCs"""
         for npc_id, npc in self.npcs.items():
@@ -458,23 +475,12 @@ class NPCManager:
     
     def get_npc_at_position(self, position, interaction_range=3.0):
         """Get an NPC at the given position within interaction range"""
-        for npc_id, npc in self.npcs.items():
-            if (npc.position - position).length() <= interaction_range:
-                return npc
-        return None
+        in_range = self.npc_index.query_radius(position, interaction_range)
+        return in_range[0] if in_range else None
     
     def get_nearest_npc(self, position, max_distance=float('inf')):
         """Get the nearest NPC to the given position"""
-        nearest_npc = None
-        nearest_distance = max_distance
-        
-        for npc_id, npc in self.npcs.items():
-            distance = (npc.position - position).length()
-            if distance < nearest_distance:
-                nearest_npc = npc
-                nearest_distance = distance
-        
-        return nearest_npc
+        return self.npc_index.nearest(position, max_distance)
     
     def save_data(self):
         """Create serializable data for all NPCs"""
@@ -494,8 +500,10 @@ class NPCManager:
             
         # Clear existing NPCs
         self.npcs = {}
+        self.npc_index.clear()
         
         # Load NPCs
         for npc_id, npc_data in data["npcs"].items():
             npc = NPC.from_data(npc_data)
-            self.npcs[npc_id] = npc 
\ No newline at end of file
+            self.npcs[npc_id] = npc
+            self.npc_index.insert(npc, npc.position) 
\ No newline at end of file
@@ -8,8 +8,11 @@ Monitors and analyzes player performance metrics for adaptive difficulty adjustm
 
 import time
 import math
+import copy
 import collections
 
+from game.streaming_stats import RunningStats, WindowedCounter, WindowedQuantile
+
 class PerformanceTracker:
     """Tracks and analyzes player performance for adaptive difficulty adjustments"""
     
@@ -82,12 +85,29 @@ class PerformanceTracker:
         }
         
         # Performance metrics history
-        self.short_term_metrics = dict(self.base_metrics)
-        self.long_term_metrics = dict(self.base_metrics)
+        self.short_term_metrics = copy.deepcopy(self.base_metrics)
+        self.long_term_metrics = copy.deepcopy(self.base_metrics)
         self.metrics_history = collections.deque(maxlen=24)  # Keep a day's worth of hourly metrics
+        self.last_history_time = None
         
         # Last serialized metrics
         self.last_metrics_record = {}
+        
+        # Cumulative metrics by category, filled as events are recorded
+        self.metrics = {}
+        
+        # Sliding windows feeding the short-term and long-term metrics;
+        # each holds a fixed number of buckets however long the session
+        self.short_term_windows = {}
+        self.long_term_windows = {}
+        self.time_to_kill_median = WindowedQuantile(0.5, self.short_term_window)
+        self.time_to_kill_p90 = WindowedQuantile(0.9, self.short_term_window)
+        
+        # Ratings are recomputed on this cadence when events came in,
+        # rather than on every event
+        self.rating_interval = 5.0  # seconds
+        self.metrics_dirty = False
+        self.performance_rating = 0.0
     
     def update(self, dt):
         """
@@ -98,15 +118,38 @@ class PerformanceTracker:
         """
         current_time = time.time()
         
-        # Update rate-based metrics (every minute)
-        if current_time - self.last_update_time >= 60:
+        # Update derived metrics and the rating on their cadence after new
+        # events, and every minute so that old events leave the windows
+        interval = self.rating_interval if self.metrics_dirty else 60
+        if current_time - self.last_update_time >= interval:
             self._update_derived_metrics()
+            self.performance_rating = self.calculate_overall_performance()
+            self.metrics_dirty = False
             self.last_update_time = current_time
             
         # Periodically record metrics history (hourly)
-        elapsed_session_time = current_time - self.session_start_time
-        if len(self.metrics_history) == 0 or elapsed_session_time >= len(self.metrics_history) * 3600:
+        if self.last_history_time is None or current_time - self.last_history_time >= 3600:
             self._record_metrics_history()
+            self.last_history_time = current_time
+    
+    def _record_window(self, name, value):
+        """
+        Add an event to the short-term and long-term windows of a metric
+        
+        Args:
+            name (str): Metric name in the short-term and long-term metrics
+            value (float): Event value
+        """
+        if name not in self.short_term_windows:
+            self.short_term_windows[name] = WindowedCounter(self.short_term_window)
+            self.long_term_windows[name] = WindowedCounter(self.long_term_window)
+        now = time.time()
+        self.short_term_windows[name].add(value, now)
+        self.long_term_windows[name].add(value, now)
+    
+    def _schedule_metrics_update(self):
+        """Mark the derived metrics and the rating as out of date"""
+        self.metrics_dirty = True
     
     def record_combat_event(self, event_type, value=1, source=None):
         """
@@ -124,8 +167,8 @@ class PerformanceTracker:
                 'damage_taken': 0,
                 'kills': 0,
                 'deaths': 0,
-                'time_to_kill': [],
-                'accuracy': [],
+                'time_to_kill': RunningStats(),
+                'accuracy': RunningStats(),
                 'enemy_types_killed': {},
                 'enemy_types_spawned': {}
             }
@@ -133,37 +176,45 @@ class PerformanceTracker:
         # Update metrics based on event type
         if event_type == 'damage_dealt':
             self.metrics['combat']['damage_dealt'] += value
+            self._record_window('damage_dealt', value)
             
         elif event_type == 'damage_taken':
             self.metrics['combat']['damage_taken'] += value
+            self._record_window('damage_taken', value)
             
-        elif event_type == 'kill':
-            self.metrics['combat']['kills'] += 1
+        elif event_type in ('kill', 'enemy_killed'):
+            # A 'kill' carries its time to kill, 'enemy_killed' a number of kills
+            kills = value if event_type == 'enemy_killed' else 1
+            self.metrics['combat']['kills'] += kills
+            self._record_window('enemies_killed', kills)
             
             # Track enemy type
             if source:
                 if source not in self.metrics['combat']['enemy_types_killed']:
                     self.metrics['combat']['enemy_types_killed'][source] = 0
-                self.metrics['combat']['enemy_types_killed'][source] += 1
+                self.metrics['combat']['enemy_types_killed'][source] += kills
                 
             # Track time to kill if provided
-            if isinstance(value, (int, float)) and value > 0:
-                self.metrics['combat']['time_to_kill'].append(value)
+            if event_type == 'kill' and isinstance(value, (int, float)) and value > 0:
+                self.metrics['combat']['time_to_kill'].update(value)
+                self.time_to_kill_median.update(value)
+                self.time_to_kill_p90.update(value)
                 
         elif event_type == 'enemy_spawned':
             # Track enemy type spawned
             if source:
                 if source not in self.metrics['combat']['enemy_types_spawned']:
                     self.metrics['combat']['enemy_types_spawned'][source] = 0
-                self.metrics['combat']['enemy_types_spawned'][source] += 1
+                self.metrics['combat']['enemy_types_spawned'][source] += value
                 
         elif event_type == 'death':
             self.metrics['combat']['deaths'] += 1
+            self._record_window('deaths', 1)
             
         elif event_type == 'accuracy':
             # Record shot accuracy (0-1)
             if 0 <= value <= 1:
-                self.metrics['combat']['accuracy'].append(value)
+                self.metrics['combat']['accuracy'].update(value)
         
         # Schedule metrics update
         self._schedule_metrics_update()
@@ -198,6 +249,8 @@ class PerformanceTracker:
                 self.metrics['resources']['sources'][source][resource_type] = 0
             self.metrics['resources']['sources'][source][resource_type] += amount
         
+        self._record_window(('resources_collected', resource_type), amount)
+        
         # Schedule metrics update
         self._schedule_metrics_update()
     
@@ -218,12 +271,13 @@ class PerformanceTracker:
                 'buildings_lost': 0,
                 'resources_spent': 0,
                 'defense_events': 0,
-                'defense_success_rate': []
+                'defense_success_rate': RunningStats()
             }
         
         # Update metrics based on event type
         if event_type == 'damage':
             self.metrics['city']['damage_taken'] += value
+            self._record_window('city_damage_taken', value)
             
         elif event_type == 'building_constructed':
             self.metrics['city']['buildings_constructed'] += 1
@@ -240,7 +294,7 @@ class PerformanceTracker:
         elif event_type == 'defense_success':
             # Record defense success (0-1)
             if 0 <= value <= 1:
-                self.metrics['city']['defense_success_rate'].append(value)
+                self.metrics['city']['defense_success_rate'].update(value)
         
         # Schedule metrics update
         self._schedule_metrics_update()
@@ -261,13 +315,14 @@ class PerformanceTracker:
                 'victories': 0,
                 'defeats': 0,
                 'average_time': None,
-                'times': [],
+                'times': RunningStats(),
                 'boss_types': {}
             }
         
         # Update metrics based on event type
         if event_type == 'encounter':
             self.metrics['bosses']['encounters'] += 1
+            self._record_window('boss_encounters', 1)
             
             # Track boss type
             if boss_type:
@@ -281,6 +336,7 @@ class PerformanceTracker:
                 
         elif event_type == 'victory':
             self.metrics['bosses']['victories'] += 1
+            self._record_window('boss_victories', 1)
             
             # Track boss type
             if boss_type:
@@ -294,9 +350,9 @@ class PerformanceTracker:
             
             # Track defeat time
             if defeat_time is not None:
-                self.metrics['bosses']['times'].append(defeat_time)
+                self.metrics['bosses']['times'].update(defeat_time)
                 # Update average time
-                self.metrics['bosses']['average_time'] = sum(self.metrics['bosses']['times']) / len(self.metrics['bosses']['times'])
+                self.metrics['bosses']['average_time'] = self.metrics['bosses']['times'].mean
                 
         elif event_type == 'defeat':
             self.metrics['bosses']['defeats'] += 1
@@ -380,15 +436,15 @@ class PerformanceTracker:
         
         # Calculate average time to kill if available
         ttk_efficiency = 0.5  # Default middle value
-        if len(combat['time_to_kill']) > 0:
-            avg_ttk = sum(combat['time_to_kill']) / len(combat['time_to_kill'])
+        if combat['time_to_kill'].count > 0:
+            avg_ttk = combat['time_to_kill'].mean
             # Lower time is better (5s is excellent, 20s is poor)
             ttk_efficiency = 1.0 - min(max((avg_ttk - 5) / 15, 0), 1)
         
         # Calculate accuracy if available
         accuracy = 0.5  # Default middle value
-        if len(combat['accuracy']) > 0:
-            accuracy = sum(combat['accuracy']) / len(combat['accuracy'])
+        if combat['accuracy'].count > 0:
+            accuracy = combat['accuracy'].mean
         
         # Weight the components
         weighted_score = (
@@ -468,8 +524,8 @@ class PerformanceTracker:
         
         # Calculate defense success rate if available
         defense_rate = 0.5  # Default middle value
-        if len(city['defense_success_rate']) > 0:
-            defense_rate = sum(city['defense_success_rate']) / len(city['defense_success_rate'])
+        if city['defense_success_rate'].count > 0:
+            defense_rate = city['defense_success_rate'].mean
         
         # Calculate damage resilience (lower damage is better)
         damage_factor = 0.5  # Default middle value
@@ -597,36 +653,37 @@ class PerformanceTracker:
         return weighted_score
     
     def _update_derived_metrics(self):
-        """Update rate-based and derived metrics"""
+        """Update the windowed totals, rates and derived metrics"""
         current_time = time.time()
         
         # Calculate time windows
         short_term_elapsed = min(current_time - self.session_start_time, self.short_term_window)
         long_term_elapsed = min(current_time - self.session_start_time, self.long_term_window)
         
-        if short_term_elapsed > 0:
-            # Short-term metrics (per minute rates)
-            minutes_short = short_term_elapsed / 60.0
-            
-            self.short_term_metrics['damage_dealt_per_minute'] = self.short_term_metrics['damage_dealt'] / minutes_short
-            self.short_term_metrics['damage_taken_per_minute'] = self.short_term_metrics['damage_taken'] / minutes_short
-            self.short_term_metrics['kills_per_minute'] = self.short_term_metrics['enemies_killed'] / minutes_short
+        for metrics, windows, elapsed in ((self.short_term_metrics, self.short_term_windows, short_term_elapsed),
+                                          (self.long_term_metrics, self.long_term_windows, long_term_elapsed)):
+            # Totals of the events still inside the window
+            for name, window in windows.items():
+                if isinstance(name, tuple):
+                    metrics[name[0]][name[1]] = window.total(current_time)
+                else:
+                    metrics[name] = window.total(current_time)
             
-            # Resource rates
-            for resource_type, amount in self.short_term_metrics['resources_collected'].items():
-                self.short_term_metrics['resources_per_minute'][resource_type] = amount / minutes_short
+            if elapsed > 0:
+                # Per minute rates
+                minutes = elapsed / 60.0
+                
+                metrics['damage_dealt_per_minute'] = metrics['damage_dealt'] / minutes
+                metrics['damage_taken_per_minute'] = metrics['damage_taken'] / minutes
+                metrics['kills_per_minute'] = metrics['enemies_killed'] / minutes
+                
+                # Resource rates
+                for resource_type, amount in metrics['resources_collected'].items():
+                    metrics['resources_per_minute'][resource_type] = amount / minutes
         
-        if long_term_elapsed > 0:
-            # Long-term metrics (per minute rates)
-            minutes_long = long_term_elapsed / 60.0
-            
-            self.long_term_metrics['damage_dealt_per_minute'] = self.long_term_metrics['damage_dealt'] / minutes_long
-            self.long_term_metrics['damage_taken_per_minute'] = self.long_term_metrics['damage_taken'] / minutes_long
-            self.long_term_metrics['kills_per_minute'] = self.long_term_metrics['enemies_killed'] / minutes_long
-            
-            # Resource rates
-            for resource_type, amount in self.long_term_metrics['resources_collected'].items():
-                self.long_term_metrics['resources_per_minute'][resource_type] = amount / minutes_long
+        # Recent time to kill distribution
+        self.short_term_metrics['time_to_kill_median'] = self.time_to_kill_median.get()
+        self.short_term_metrics['time_to_kill_p90'] = self.time_to_kill_p90.get()
     
     def _record_metrics_history(self):
         """Record current metrics for historical tracking"""
@@ -634,8 +691,8 @@ class PerformanceTracker:
         snapshot = {
             'timestamp': time.time(),
             'elapsed_time': time.time() - self.session_start_time,
-            'short_term': dict(self.short_term_metrics),
-            'long_term': dict(self.long_term_metrics)
+            'short_term': copy.deepcopy(self.short_term_metrics),
+            'long_term': copy.deepcopy(self.long_term_metrics)
         }
         
         # Add to history
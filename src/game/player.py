@@ -5,7 +5,7 @@
 Player entity module for Nightfall Defenders
 """
 
-from panda3d.core import NodePath, Vec3, KeyboardButton, MouseButton
+from panda3d.core import NodePath, Vec3, Point2, KeyboardButton, MouseButton
 from direct.actor.Actor import Actor
 import math
 import random
@@ -14,11 +14,43 @@ import random
 from game.ability_system import AbilityManager
 from game.character_class import ClassType
 from game.skill_tree import SkillTree
+from game.stat_engine import StatEngine
 import game.skill_definitions
 
+# Stats derived by the player's stat engine, with their base values
+PLAYER_BASE_STATS = {
+    "max_health": 100,
+    "max_stamina": 100,
+    "max_mana": 100,
+    "speed": 5.0,
+    "damage_multiplier": 1.0,
+    "damage_taken": 1.0,        # Share of incoming damage, 1 - damage reduction
+    "attack_cooldown": 1.0,     # Multiplier of projectile cooldowns
+    "projectile_damage": 0.0,   # Flat bonus to projectile damage
+    "projectile_speed": 1.0     # Multiplier of projectile speed
+}
+
+def _stat_property(name, doc):
+    """Create a player attribute backed by the stat engine"""
+    def getter(self):
+        return self.stats.get(name)
+    
+    def setter(self, value):
+        self.stats.set_value(name, value)
+    
+    return property(getter, setter, doc=doc)
+
 class Player:
     """Player entity with movement, combat, and inventory systems"""
     
+    # Stats read from the stat engine; assigning one sets its base value
+    # so that the derived value matches, keeping every modifier in place
+    max_health = _stat_property("max_health", "Maximum health")
+    max_stamina = _stat_property("max_stamina", "Maximum stamina")
+    max_mana = _stat_property("max_mana", "Maximum mana")
+    speed = _stat_property("speed", "Movement speed in units per second")
+    damage_multiplier = _stat_property("damage_multiplier", "Multiplier of dealt damage")
+    
     def __init__(self, game):
         """Initialize the player entity"""
         self.game = game
@@ -33,14 +65,12 @@ class Player:
         self.facing_angle = 0  # In degrees
         self.direction = Vec3(0, 1, 0)  # Forward direction vector
         
-        # Player stats
-        self.max_health = 100
+        # Player stats, derived from base values and the modifiers of relics,
+        # skills and crafted upgrades
+        self.stats = StatEngine(PLAYER_BASE_STATS)
         self.health = 100
-        self.max_stamina = 100
         self.stamina = 100
-        self.max_mana = 100  # New resource for abilities
-        self.mana = 100
-        self.speed = 5.0  # Units per second
+        self.mana = 100  # New resource for abilities
         self.dodge_speed = 12.0  # Dodge boost
         
         # Experience and level system
@@ -79,6 +109,7 @@ class Player:
         
         # Passives
         self.passives = {}
+        self.passive_effects = None  # Combined effects, None when outdated
         
         # Fusion and Harmonization flags
         self.can_create_fusions = False
@@ -107,12 +138,45 @@ class Player:
         }
         
         # Relic system properties
-        self.damage_reduction = 0.0
         self.last_damage_dealt = 0
         
         # Movement input state
         self.movement_keys = [False, False, False, False]  # W, S, A, D
     
+    @property
+    def damage_reduction(self):
+        """Share of incoming damage that is prevented"""
+        return 1.0 - self.stats.get("damage_taken")
+    
+    @damage_reduction.setter
+    def damage_reduction(self, value):
+        self.stats.set_value("damage_taken", 1.0 - value)
+    
+    def get_projectile_damage(self, projectile_type):
+        """
+        Get the damage of a projectile type with all modifiers
+        
+        Args:
+            projectile_type (str): Projectile type
+        
+        Returns:
+            float: Damage per projectile
+        """
+        base_damage = self.projectile_types[projectile_type].get("damage", 10)
+        return (base_damage + self.stats.get("projectile_damage")) * self.stats.get("damage_multiplier")
+    
+    def get_projectile_cooldown(self, projectile_type):
+        """
+        Get the cooldown of a projectile type with all modifiers
+        
+        Args:
+            projectile_type (str): Projectile type
+        
+        Returns:
+            float: Cooldown in seconds
+        """
+        return self.projectile_types[projectile_type]["cooldown"] * self.stats.get("attack_cooldown")
+    
     def setup_model(self):
         """Set up the player model"""
         # For now, just use a box as placeholder
@@ -314,6 +378,11 @@ class Player:
         # Move the player
         self.position += self.velocity * dt
         
+        # Follow the terrain
+        terrain = getattr(self.game, 'terrain', None)
+        if terrain is not None:
+            self.position.z = terrain.height_at(self.position.x, self.position.y)
+        
         # TODO: Add collision detection and response
     
     def setup_projectile_types(self):
@@ -648,6 +717,7 @@ class Player:
             bool: True if added successfully
         """
         self.passives[passive_id] = passive_data
+        self.passive_effects = None
         return True
     
     def get_passive_effects(self):
@@ -657,6 +727,10 @@ class Player:
         Returns:
             dict: Combined effects
         """
+        # Combined once per change, since movement and combat read them every frame
+        if self.passive_effects is not None:
+            return self.passive_effects
+        
         effects = {}
         
         # Combine all passive effects
@@ -673,6 +747,7 @@ class Player:
                     else:
                         effects[effect_key] = effect_value
         
+        self.passive_effects = effects
         return effects
     
     def unlock_ability(self, ability_id):
@@ -931,7 +1006,7 @@ class Player:
         self.is_attacking = True
         
         # Set cooldown based on projectile type
-        self.attack_cooldown = self.projectile_types[self.projectile_type]["cooldown"]
+        self.attack_cooldown = self.get_projectile_cooldown(self.projectile_type)
         
         # Get direction based on player facing
         direction = Vec3(
@@ -941,11 +1016,17 @@ class Player:
         )
         
         # Alternatively, if we have a mouse position, shoot toward mouse
-        if self.game.mouseWatcherNode.hasMouse():
+        # (read through the input manager when there is one, so replays drive it)
+        mouse_pos = None
+        input_manager = getattr(self.game, 'input_manager', None)
+        if input_manager:
+            if input_manager.has_mouse():
+                mouse_pos = Point2(*input_manager.get_mouse_position())
+        elif self.game.mouseWatcherNode and self.game.mouseWatcherNode.hasMouse():
+            mouse_pos = self.game.mouseWatcherNode.getMouse()
+        
+        if mouse_pos is not None:
             try:
-                # Get 2D mouse position
-                mouse_pos = self.game.mouseWatcherNode.getMouse()
-                
                 # Convert to 3D position using the ground plane
                 ground_pos = self.game.calculate_ground_point_at_mouse(mouse_pos)
                 
@@ -960,20 +1041,13 @@ class Player:
         
         # Create the projectile
         if hasattr(self.game, 'entity_manager'):
-            # Get projectile parameters
-            projectile_params = self.projectile_types[self.projectile_type].copy()
-            
-            # Damage modification from relics
-            if hasattr(self, 'damage_multiplier') and self.damage_multiplier != 1.0:
-                projectile_params["damage"] *= self.damage_multiplier
-            
             # Calculate starting position (slightly in front of player)
             start_pos = self.position + direction * 0.7
-            start_pos.z = 0.5  # Adjust height
+            start_pos.z = self.position.z + 0.5  # Adjust height
             
             # Create projectile through entity manager
             projectile_type = self.projectile_type
-            damage = projectile_params.get("damage", 10)
+            damage = self.get_projectile_damage(projectile_type)
             
             self.game.entity_manager.create_projectile(
                 projectile_type, 
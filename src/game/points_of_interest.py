@@ -12,6 +12,8 @@ import math
 from panda3d.core import Vec3, NodePath, TextNode
 from direct.gui.OnscreenText import OnscreenText
 
+from game.spatial_index import SpatialGrid
+
 class POIType(Enum):
     """Enumeration of different point of interest types"""
     DUNGEON = "dungeon"
@@ -33,6 +35,18 @@ class POIState(Enum):
 class PointOfInterest:
     """Individual point of interest in the game world"""
     
+    # Model of each POI type
+    MODEL_PATHS = {
+        POIType.DUNGEON: "models/dungeon_entrance",
+        POIType.RESOURCE_CACHE: "models/treasure_chest",
+        POIType.MERCHANT_CAMP: "models/tent",
+        POIType.PUZZLE_AREA: "models/stone_circle",
+        POIType.BOSS_ARENA: "models/boss_gate",
+        POIType.SHRINE: "models/shrine",
+        POIType.ABANDONED_SETTLEMENT: "models/ruins",
+        POIType.UNIQUE_LANDMARK: "models/landmark"
+    }
+    
     def __init__(self, poi_id, name, poi_type, position, description="", difficulty=1):
         """
         Initialize a point of interest
@@ -67,12 +81,14 @@ class PointOfInterest:
         self.map_icon = None
         self.world_marker = None
         
-    def create_world_representation(self, render):
+    def create_world_representation(self, render, resource_manager=None):
         """
         Create the visual representation of this POI in the world
         
         Args:
             render: The render node to attach to
+            resource_manager: Optional ResourceManager used to load the model
+                without stalling the frame
         """
         # Create a node for this POI
         self.node_path = NodePath(f"POI_{self.poi_id}")
@@ -80,26 +96,15 @@ class PointOfInterest:
         self.node_path.setPos(self.position)
         
         # The visual representation depends on the POI type
+        model_path = self.MODEL_PATHS.get(self.poi_type, "models/box")  # Fallback for unknown types
         try:
-            if self.poi_type == POIType.DUNGEON:
-                model = render.getParent().loader.loadModel("models/dungeon_entrance")
-            elif self.poi_type == POIType.RESOURCE_CACHE:
-                model = render.getParent().loader.loadModel("models/treasure_chest")
-            elif self.poi_type == POIType.MERCHANT_CAMP:
-                model = render.getParent().loader.loadModel("models/tent")
-            elif self.poi_type == POIType.PUZZLE_AREA:
-                model = render.getParent().loader.loadModel("models/stone_circle")
-            elif self.poi_type == POIType.BOSS_ARENA:
-                model = render.getParent().loader.loadModel("models/boss_gate")
-            elif self.poi_type == POIType.SHRINE:
-                model = render.getParent().loader.loadModel("models/shrine")
-            elif self.poi_type == POIType.ABANDONED_SETTLEMENT:
-                model = render.getParent().loader.loadModel("models/ruins")
-            elif self.poi_type == POIType.UNIQUE_LANDMARK:
-                model = render.getParent().loader.loadModel("models/landmark")
+            if resource_manager is not None:
+                # A placeholder shows until the model has loaded
+                model = resource_manager.attach_model_async(model_path, self.node_path,
+                                                            position=self.position,
+                                                            fallback=self._on_model_failed)
             else:
-                # Fallback for unknown types
-                model = render.getParent().loader.loadModel("models/box")
+                model = render.getParent().loader.loadModel(model_path)
                 
             # Apply model-specific scaling and offset
             if self.poi_type == POIType.DUNGEON:
@@ -115,13 +120,7 @@ class PointOfInterest:
                 
         except Exception as e:
             print(f"Error loading model for POI {self.name}: {e}")
-            # Use a default cube if model loading fails
-            from panda3d.core import CardMaker
-            cm = CardMaker("poi_marker")
-            cm.setFrame(-1, 1, 0, 2)
-            marker = self.node_path.attachNewNode(cm.generate())
-            marker.setColor(0.8, 0.1, 0.1, 1)  # Red marker
-            marker.setBillboardPointEye()
+            self._create_fallback_marker(self.node_path)
         
         # Add name text above the POI (only visible when nearby or discovered)
         if self.state != POIState.UNDISCOVERED:
@@ -133,6 +132,32 @@ class PointOfInterest:
             self.node_path.hide()
         
         return self.node_path
+    
+    def _on_model_failed(self, holder):
+        """
+        Replace a model that failed to load asynchronously with the marker
+        
+        Args:
+            holder: Node that was meant to hold the model
+        """
+        print(f"Error loading model for POI {self.name}: {self.MODEL_PATHS.get(self.poi_type)}")
+        # The marker ignores the scale and offset set for the model
+        holder.clearTransform()
+        self._create_fallback_marker(holder)
+    
+    def _create_fallback_marker(self, parent):
+        """
+        Show a red marker when the POI model fails to load
+        
+        Args:
+            parent: Node to attach the marker to
+        """
+        from panda3d.core import CardMaker
+        cm = CardMaker("poi_marker")
+        cm.setFrame(-1, 1, 0, 2)
+        marker = parent.attachNewNode(cm.generate())
+        marker.setColor(0.8, 0.1, 0.1, 1)  # Red marker
+        marker.setBillboardPointEye()
             
     def _create_name_display(self):
         """Create a floating name display above the POI"""
@@ -232,6 +257,9 @@ class PointOfInterest:
 class PointOfInterestManager:
     """Manages all points of interest in the game world"""
     
+    # Cell size of the POI index used by radius and nearest queries
+    INDEX_CELL_SIZE = 100.0
+    
     def __init__(self, game):
         """
         Initialize the POI manager
@@ -245,6 +273,14 @@ class PointOfInterestManager:
         self.poi_density = 0.01  # POIs per square unit of world area
         self.minimum_poi_distance = 100.0  # Minimum distance between POIs
         
+        # Spatial index of all POIs, and of the undiscovered ones by discovery range cells
+        self.poi_index = SpatialGrid(self.INDEX_CELL_SIZE)
+        self.undiscovered_index = SpatialGrid(self._discovery_cell_size())
+        
+        # Player cell of the last discovery check and the POIs that can be discovered from it
+        self.discovery_cell = None
+        self.discovery_candidates = []
+        
         # Discovery effects
         self.discovery_sfx = None
         try:
@@ -269,8 +305,31 @@ class PointOfInterestManager:
         """
         poi = PointOfInterest(poi_id, name, poi_type, position, description, difficulty)
         self.points_of_interest[poi_id] = poi
+        self._index_poi(poi)
         return poi
     
+    def _index_poi(self, poi):
+        """Add a POI to the spatial indexes"""
+        self.poi_index.insert(poi, poi.position)
+        if poi.state == POIState.UNDISCOVERED:
+            self.undiscovered_index.insert(poi, poi.position)
+            
+            # The candidates of the current cell may have to include it
+            self.discovery_cell = None
+    
+    def _discovery_cell_size(self):
+        """Get the cell size of the discovery index, at least the discovery range"""
+        return max(self.discovery_range, 1.0)
+    
+    def rebuild_index(self):
+        """Rebuild the spatial indexes from the POIs, after a load or a change of discovery range"""
+        self.poi_index.clear()
+        self.undiscovered_index = SpatialGrid(self._discovery_cell_size())
+        self.discovery_cell = None
+        self.discovery_candidates = []
+        for poi in self.points_of_interest.values():
+            self._index_poi(poi)
+    
     def generate_pois_for_region(self, region_min, region_max, world_seed=None):
         """
         Generate points of interest in a region
@@ -296,6 +355,9 @@ class PointOfInterestManager:
         
         generated_pois = []
         
+        # Index of this region's POIs for the minimum distance checks
+        placed = SpatialGrid(max(self.minimum_poi_distance, 1.0))
+        
         # Generate POIs
         for i in range(num_pois):
             # Attempt to place POI with minimum distance from others
@@ -309,11 +371,7 @@ class PointOfInterestManager:
                 position = Vec3(x, y, z)
                 
                 # Check distance from other POIs
-                too_close = False
-                for poi in generated_pois:
-                    if (poi.position - position).length() < self.minimum_poi_distance:
-                        too_close = True
-                        break
+                too_close = placed.nearest(position, self.minimum_poi_distance) is not None
                 
                 if not too_close:
                     # Position is acceptable, create the POI
@@ -329,6 +387,7 @@ class PointOfInterestManager:
                     # Create and add the POI
                     poi = self.create_poi(poi_id, name, poi_type, position, difficulty=difficulty)
                     generated_pois.append(poi)
+                    placed.insert(poi, position)
                     break
         
         return generated_pois
@@ -385,11 +444,30 @@ class PointOfInterestManager:
         Args:
             player_position: Current player position
         """
+        if self.undiscovered_index.cell_size != self._discovery_cell_size():
+            self.rebuild_index()
+        
+        # Only gather the POIs around the player when it enters a new cell; cells are
+        # at least as large as the discovery range, so the surrounding block covers it
+        cell = self.undiscovered_index.cell_of(player_position)
+        if cell != self.discovery_cell:
+            self.discovery_cell = cell
+            self.discovery_candidates = self.undiscovered_index.query_cells(cell, 1)
+        
         # Check for POI discoveries based on player proximity
-        for poi_id, poi in self.points_of_interest.items():
-            if poi.state == POIState.UNDISCOVERED:
-                if poi.is_within_range(player_position, self.discovery_range):
-                    self._discover_poi(poi)
+        for poi in self.discovery_candidates[:]:
+            if poi.state != POIState.UNDISCOVERED:
+                # Discovered some other way
+                self._forget_discovered(poi)
+            elif poi.is_within_range(player_position, self.discovery_range):
+                self._discover_poi(poi)
+                self._forget_discovered(poi)
+    
+    def _forget_discovered(self, poi):
+        """Stop checking a discovered POI"""
+        self.undiscovered_index.remove(poi)
+        if poi in self.discovery_candidates:
+            self.discovery_candidates.remove(poi)
     
     def _discover_poi(self, poi):
         """Handle POI discovery logic and effects"""
@@ -445,24 +523,8 @@ class PointOfInterestManager:
         Returns:
             PointOfInterest or None: The nearest POI, or None if none found
         """
-        nearest_poi = None
-        nearest_distance = max_distance
-        
-        for poi_id, poi in self.points_of_interest.items():
-            # Apply filters
-            if filter_type and poi.poi_type != filter_type:
-                continue
-                
-            if filter_state and poi.state != filter_state:
-                continue
-            
-            # Check distance
-            distance = poi.get_distance_to(position)
-            if distance < nearest_distance:
-                nearest_poi = poi
-                nearest_distance = distance
-        
-        return nearest_poi
+        return self.poi_index.nearest(position, max_distance,
+                                      self._poi_filter(filter_type, filter_state))
     
     def get_pois_in_radius(self, position, radius, filter_type=None, filter_state=None):
         """
@@ -477,21 +539,26 @@ class PointOfInterestManager:
         Returns:
             list: List of POIs within the radius
         """
-        result = []
+        return self.poi_index.query_radius(position, radius,
+                                           self._poi_filter(filter_type, filter_state))
+    
+    def _poi_filter(self, filter_type, filter_state):
+        """
+        Build the predicate of the optional type and state filters
         
-        for poi_id, poi in self.points_of_interest.items():
-            # Apply filters
+        Returns:
+            function or None: Predicate, or None without filters
+        """
+        if not filter_type and not filter_state:
+            return None
+        
+        def matches(poi):
             if filter_type and poi.poi_type != filter_type:
-                continue
-                
+                return False
             if filter_state and poi.state != filter_state:
-                continue
-            
-            # Check distance
-            if poi.is_within_range(position, radius):
-                result.append(poi)
-        
-        return result
+                return False
+            return True
+        return matches
     
     def show_all_pois(self):
         """Force all POIs to be visible (for debugging or special abilities)"""
@@ -501,7 +568,12 @@ class PointOfInterestManager:
                 
             # Ensure world representation exists
             if not poi.node_path and hasattr(self.game, 'render'):
-                poi.create_world_representation(self.game.render)
+                poi.create_world_representation(self.game.render,
+                                                getattr(self.game, 'resource_manager', None))
+                
+                # Hide the POI with its world chunk
+                if hasattr(self.game, 'world_chunks'):
+                    self.game.world_chunks.attach_prop(poi.node_path, poi.position)
     
     def save_data(self):
         """
@@ -572,4 +644,6 @@ class PointOfInterestManager:
             poi.associated_npcs = poi_data["associated_npcs"]
             
             # Add to manager
-            self.points_of_interest[poi_id] = poi 
\ No newline at end of file
+            self.points_of_interest[poi_id] = poi 
+        
+        self.rebuild_index()
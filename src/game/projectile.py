@@ -8,6 +8,7 @@ Implements different trajectory types for abilities
 
 import math
 from panda3d.core import Vec3, Point3, LineSegs, NodePath
+from game.status_effects import StatusEffectSystem
 
 class Projectile:
     """Class for ability projectiles with different trajectory types"""
@@ -113,6 +114,12 @@ class Projectile:
         # Check for collisions
         self._check_collisions()
         
+        # Check for hitting the ground
+        terrain = getattr(self.game, 'terrain', None)
+        if terrain is not None and self.position.z < terrain.height_at(self.position.x, self.position.y):
+            self._on_hit_ground()
+            return False
+        
         # Check for max range
         if self.distance_traveled >= self.range:
             self._on_max_range()
@@ -302,6 +309,12 @@ class Projectile:
         if self.aoe_radius > 0:
             self._create_explosion()
     
+    def _on_hit_ground(self):
+        """Handle hitting the terrain"""
+        # Explosion if AoE
+        if self.aoe_radius > 0:
+            self._create_explosion()
+    
     def _on_max_range(self):
         """Handle reaching maximum range"""
         # Explosion if AoE
@@ -404,8 +417,7 @@ class Projectile:
     
     def _apply_effect(self, entity, effect):
         """Apply a status effect to an entity"""
-        if hasattr(entity, 'add_effect'):
-            entity.add_effect(effect)
+        StatusEffectSystem.for_game(self.game).apply(entity, effect)
     
     def create_visual_representation(self):
         """Create visual representation of the projectile"""
@@ -9,6 +9,21 @@ Implements special items that modify abilities and stats
 import random
 import math
 
+from .definitions import get_table
+
+# Relic effects that scale a player stat, by stat engine name
+RELIC_STAT_MULTIPLIERS = {
+    "damage_multiplier": "damage_multiplier",
+    "cooldown_multiplier": "attack_cooldown",
+    "max_health_multiplier": "max_health",
+    "max_stamina_multiplier": "max_stamina",
+    "speed_multiplier": "speed",
+    "projectile_speed_multiplier": "projectile_speed"
+}
+
+# Stats scaled by random stat fluctuations
+RELIC_FLUCTUATING_STATS = ("damage_multiplier", "max_health", "max_stamina", "speed", "attack_cooldown")
+
 class RelicRarity:
     """Enumeration of relic rarities"""
     COMMON = "common"
@@ -53,253 +68,8 @@ class RelicSystem:
     
     def _create_relics(self):
         """Define all available relics"""
-        relics = {
-            # Original relics
-            "hunters_amulet": {
-                "name": "Hunter's Amulet",
-                "description": "Increases damage by 20% but reduces max health by 10%",
-                "rarity": RelicRarity.COMMON,
-                "effects": {
-                    "damage_multiplier": 1.2,
-                    "max_health_multiplier": 0.9
-                },
-                "visual": "hunters_amulet.png"
-            },
-            "arcane_catalyst": {
-                "name": "Arcane Catalyst",
-                "description": "Reduces cooldowns by 15% but increases stamina cost by 10%",
-                "rarity": RelicRarity.COMMON,
-                "effects": {
-                    "cooldown_multiplier": 0.85,
-                    "stamina_cost_multiplier": 1.1
-                },
-                "visual": "arcane_catalyst.png"
-            },
-            "iron_heart": {
-                "name": "Iron Heart",
-                "description": "Increases max health by 15% but reduces movement speed by 5%",
-                "rarity": RelicRarity.COMMON,
-                "effects": {
-                    "max_health_multiplier": 1.15,
-                    "speed_multiplier": 0.95
-                },
-                "visual": "iron_heart.png"
-            },
-            "swift_boots": {
-                "name": "Swift Boots",
-                "description": "Increases movement speed by 15% but reduces max stamina by 10%",
-                "rarity": RelicRarity.COMMON,
-                "effects": {
-                    "speed_multiplier": 1.15,
-                    "max_stamina_multiplier": 0.9
-                },
-                "visual": "swift_boots.png"
-            },
-            "crystal_focus": {
-                "name": "Crystal Focus",
-                "description": "Increases projectile velocity by 20% but reduces damage by 5%",
-                "rarity": RelicRarity.UNCOMMON,
-                "effects": {
-                    "projectile_speed_multiplier": 1.2,
-                    "damage_multiplier": 0.95
-                },
-                "visual": "crystal_focus.png"
-            },
-            "vampiric_emblem": {
-                "name": "Vampiric Emblem",
-                "description": "Restores 5% of damage dealt as health but reduces max stamina by 15%",
-                "rarity": RelicRarity.UNCOMMON,
-                "effects": {
-                    "life_steal": 0.05,
-                    "max_stamina_multiplier": 0.85
-                },
-                "visual": "vampiric_emblem.png"
-            },
-            "unstable_catalyst": {
-                "name": "Unstable Catalyst",
-                "description": "Increases damage by 30% but has a 10% chance to damage yourself",
-                "rarity": RelicRarity.RARE,
-                "effects": {
-                    "damage_multiplier": 1.3,
-                    "self_damage_chance": 0.1,
-                    "self_damage_percent": 0.05
-                },
-                "visual": "unstable_catalyst.png"
-            },
-            "guardian_talisman": {
-                "name": "Guardian Talisman",
-                "description": "Reduces all incoming damage by 15% but decreases cooldown recovery by 10%",
-                "rarity": RelicRarity.RARE,
-                "effects": {
-                    "damage_reduction": 0.15,
-                    "cooldown_multiplier": 1.1
-                },
-                "visual": "guardian_talisman.png"
-            },
-            "celestial_prism": {
-                "name": "Celestial Prism",
-                "description": "Projectiles can pierce through one enemy but reduces projectile speed by 10%",
-                "rarity": RelicRarity.LEGENDARY,
-                "effects": {
-                    "projectile_pierce": 1,
-                    "projectile_speed_multiplier": 0.9
-                },
-                "visual": "celestial_prism.png"
-            },
-            "essence_of_chaos": {
-                "name": "Essence of Chaos",
-                "description": "All stats randomly fluctuate between -10% and +30% every 30 seconds",
-                "rarity": RelicRarity.LEGENDARY,
-                "effects": {
-                    "random_stats": True,
-                    "stat_min_multiplier": 0.9,
-                    "stat_max_multiplier": 1.3,
-                    "fluctuation_time": 30
-                },
-                "visual": "essence_of_chaos.png"
-            },
-            
-            # New relics with significant drawbacks (as per PRD)
-            "moonlight_mirror": {
-                "name": "Moonlight Mirror",
-                "description": "Increases all damage by 40% at night, but decreases damage by 20% during day",
-                "rarity": RelicRarity.EPIC,
-                "effects": {
-                    "conditional_damage_multiplier": {
-                        "night": 1.4,
-                        "day": 0.8
-                    }
-                },
-                "visual": "moonlight_mirror.png"
-            },
-            "wrath_of_the_elements": {
-                "name": "Wrath of the Elements",
-                "description": "Adds elemental damage to all attacks, but you take double damage from elemental sources",
-                "rarity": RelicRarity.EPIC,
-                "effects": {
-                    "elemental_damage_bonus": 0.3,
-                    "elemental_vulnerability": 2.0
-                },
-                "visual": "wrath_elements.png"
-            },
-            "glass_cannon": {
-                "name": "Glass Cannon",
-                "description": "Doubles your damage output, but halves your maximum health",
-                "rarity": RelicRarity.RARE,
-                "effects": {
-                    "damage_multiplier": 2.0,
-                    "max_health_multiplier": 0.5
-                },
-                "visual": "glass_cannon.png"
-            },
-            "nightweaver": {
-                "name": "Nightweaver",
-                "description": "Move 25% faster in fog but take 10% more damage",
-                "rarity": RelicRarity.UNCOMMON,
-                "effects": {
-                    "fog_speed_bonus": 1.25,
-                    "damage_vulnerability": 1.1
-                },
-                "visual": "nightweaver.png"
-            },
-            "berserker_totem": {
-                "name": "Berserker Totem",
-                "description": "Damage increases as health decreases, up to 100% more at 1 HP",
-                "rarity": RelicRarity.EPIC,
-                "effects": {
-                    "health_based_damage": True,
-                    "max_damage_boost": 2.0
-                },
-                "visual": "berserker_totem.png"
-            },
-            "crown_of_thorns": {
-                "name": "Crown of Thorns",
-                "description": "Reflect 30% of damage back to enemies, but you cannot regenerate health naturally",
-                "rarity": RelicRarity.RARE,
-                "effects": {
-                    "damage_reflection": 0.3,
-                    "disable_health_regen": True
-                },
-                "visual": "crown_thorns.png"
-            },
-            "timeworn_hourglass": {
-                "name": "Timeworn Hourglass",
-                "description": "All cooldowns reduced by 40%, but day/night cycle progresses 25% faster",
-                "rarity": RelicRarity.LEGENDARY,
-                "effects": {
-                    "cooldown_multiplier": 0.6,
-                    "time_flow_multiplier": 1.25
-                },
-                "visual": "timeworn_hourglass.png"
-            },
-            "shadow_bond": {
-                "name": "Shadow Bond",
-                "description": "Create a shadow clone that mimics 40% of your attacks, but you take 15% more damage",
-                "rarity": RelicRarity.LEGENDARY,
-                "effects": {
-                    "shadow_clone": 0.4,
-                    "damage_vulnerability": 1.15
-                },
-                "visual": "shadow_bond.png"
-            },
-            "heart_of_ice": {
-                "name": "Heart of Ice",
-                "description": "Immune to fire damage, but take double damage from cold attacks and move 10% slower",
-                "rarity": RelicRarity.RARE,
-                "effects": {
-                    "fire_immunity": True,
-                    "cold_vulnerability": 2.0,
-                    "speed_multiplier": 0.9
-                },
-                "visual": "heart_of_ice.png"
-            },
-            "phoenix_feather": {
-                "name": "Phoenix Feather",
-                "description": "Upon death, revive once with 30% health, then the relic crumbles to ash",
-                "rarity": RelicRarity.MYTHICAL,
-                "effects": {
-                    "resurrection": True,
-                    "resurrection_health": 0.3,
-                    "one_time_use": True
-                },
-                "visual": "phoenix_feather.png"
-            },
-            "obsidian_skull": {
-                "name": "Obsidian Skull",
-                "description": "Ignore 50% of enemy armor, but you lose 5% of your maximum health per minute",
-                "rarity": RelicRarity.EPIC,
-                "effects": {
-                    "armor_penetration": 0.5,
-                    "health_decay": 0.05,
-                    "health_decay_interval": 60  # seconds
-                },
-                "visual": "obsidian_skull.png"
-            },
-            "void_tether": {
-                "name": "Void Tether",
-                "description": "Pull enemies toward you with attacks, but you also get pulled toward enemies when hit",
-                "rarity": RelicRarity.EPIC,
-                "effects": {
-                    "enemy_pull": True,
-                    "self_pull": True
-                },
-                "visual": "void_tether.png"
-            },
-            "eye_of_the_storm": {
-                "name": "Eye of the Storm",
-                "description": "Create lightning strikes that hit nearby enemies, but you attract more enemies at night",
-                "rarity": RelicRarity.LEGENDARY,
-                "effects": {
-                    "lightning_strikes": True,
-                    "lightning_damage": 20,
-                    "lightning_frequency": 5,  # seconds
-                    "enemy_attraction_multiplier": 1.5
-                },
-                "visual": "eye_storm.png"
-            }
-        }
-        
-        return relics
+        # Each relic system gets its own copy, since active relics are modified
+        return get_table("relics", fresh=True)
     
     def get_random_relic(self, exclude_active=True, rarity_weights=None):
         """
@@ -579,51 +349,24 @@ class RelicSystem:
             return
         
         player = self.game.player
+        if not hasattr(player, 'stats'):
+            print(f"Warning: player has no stat engine, relic {relic_id} has no stat effects")
+            return
+        
         relic = self.active_relics[relic_id]
         effects = relic["effects"]
         
-        # Apply each effect
+        # All stat effects of the relic form one source of the stat engine
+        # (special effects are handled elsewhere)
+        multipliers = {}
         for effect, value in effects.items():
-            # Skip special effects that are handled elsewhere
-            if effect in ["random_stats", "life_steal", "self_damage_chance", "projectile_pierce"]:
-                continue
-                
-            # Apply stat multipliers
-            if effect == "damage_multiplier":
-                for projectile_type in player.projectile_types.values():
-                    projectile_type["damage"] *= value
-            
-            elif effect == "cooldown_multiplier":
-                for projectile_type in player.projectile_types.values():
-                    projectile_type["cooldown"] *= value
-            
-            elif effect == "max_health_multiplier":
-                old_max_health = player.max_health
-                player.max_health *= value
-                # Adjust current health proportionally
-                player.health = (player.health / old_max_health) * player.max_health
-                if player.health < 1:
-                    player.health = 1
-            
-            elif effect == "max_stamina_multiplier":
-                old_max_stamina = player.max_stamina
-                player.max_stamina *= value
-                # Adjust current stamina proportionally
-                player.stamina = (player.stamina / old_max_stamina) * player.max_stamina
-            
-            elif effect == "speed_multiplier":
-                player.speed *= value
-            
-            elif effect == "projectile_speed_multiplier":
-                for projectile_type in player.projectile_types.values():
-                    if "speed" in projectile_type:
-                        projectile_type["speed"] *= value
-            
+            if effect in RELIC_STAT_MULTIPLIERS:
+                multipliers[RELIC_STAT_MULTIPLIERS[effect]] = value
             elif effect == "damage_reduction":
-                if hasattr(player, "damage_reduction"):
-                    player.damage_reduction = player.damage_reduction + value - (player.damage_reduction * value)
-                else:
-                    player.damage_reduction = value
+                multipliers["damage_taken"] = 1.0 - value
+        
+        if multipliers:
+            self._set_player_source(player, f"relic:{relic_id}", multipliers)
     
     def _remove_relic_effects(self, relic_id):
         """
@@ -637,50 +380,39 @@ class RelicSystem:
             return
         
         player = self.game.player
-        relic = self.available_relics[relic_id]
-        effects = relic["effects"]
+        if not hasattr(player, 'stats'):
+            return
         
-        # Remove each effect (invert the multiplier)
-        for effect, value in effects.items():
-            # Skip special effects that are handled elsewhere
-            if effect in ["random_stats", "life_steal", "self_damage_chance", "projectile_pierce"]:
-                continue
-                
-            # Apply inverse stat multipliers
-            if effect == "damage_multiplier":
-                for projectile_type in player.projectile_types.values():
-                    projectile_type["damage"] /= value
-            
-            elif effect == "cooldown_multiplier":
-                for projectile_type in player.projectile_types.values():
-                    projectile_type["cooldown"] /= value
-            
-            elif effect == "max_health_multiplier":
-                old_max_health = player.max_health
-                player.max_health /= value
-                # Adjust current health proportionally
-                player.health = (player.health / old_max_health) * player.max_health
-            
-            elif effect == "max_stamina_multiplier":
-                old_max_stamina = player.max_stamina
-                player.max_stamina /= value
-                # Adjust current stamina proportionally
-                player.stamina = (player.stamina / old_max_stamina) * player.max_stamina
-            
-            elif effect == "speed_multiplier":
-                player.speed /= value
-            
-            elif effect == "projectile_speed_multiplier":
-                for projectile_type in player.projectile_types.values():
-                    if "speed" in projectile_type:
-                        projectile_type["speed"] /= value
-            
-            elif effect == "damage_reduction":
-                if hasattr(player, "damage_reduction"):
-                    # Invert damage reduction formula
-                    player.damage_reduction = (player.damage_reduction - value) / (1 - value)
-                    if player.damage_reduction < 0:
-                        player.damage_reduction = 0
+        # Drop the relic's sources, including its stat fluctuations
+        old_max_health = player.max_health
+        old_max_stamina = player.max_stamina
+        player.stats.remove_source(f"relic:{relic_id}")
+        player.stats.remove_source(f"relic:{relic_id}:fluctuation")
+        self._rescale_pools(player, old_max_health, old_max_stamina)
+        
+        if "random_stats" in self.available_relics[relic_id]["effects"] and hasattr(self, '_fluctuation_timer'):
+            del self._fluctuation_timer
+    
+    def _set_player_source(self, player, source, multipliers):
+        """
+        Set the stat multipliers of a source, keeping health and stamina proportional
+        
+        Args:
+            player: The player
+            source (str): Stat engine source
+            multipliers (dict): Stat name -> multiplier
+        """
+        old_max_health = player.max_health
+        old_max_stamina = player.max_stamina
+        player.stats.set_source(source, multiplicative=multipliers)
+        self._rescale_pools(player, old_max_health, old_max_stamina)
+    
+    def _rescale_pools(self, player, old_max_health, old_max_stamina):
+        """Adjust current health and stamina to changed maximums"""
+        if player.max_health != old_max_health and old_max_health > 0:
+            player.health = max(1, (player.health / old_max_health) * player.max_health)
+        if player.max_stamina != old_max_stamina and old_max_stamina > 0:
+            player.stamina = (player.stamina / old_max_stamina) * player.max_stamina
     
     def update(self, dt):
         """
@@ -742,52 +474,15 @@ class RelicSystem:
             relic_id (str): ID of the relic to apply fluctuations for
         """
         player = self.game.player
+        if not hasattr(player, 'stats'):
+            return
         effects = self.active_relics[relic_id]["effects"]
         
-        # Generate random multipliers for each stat
-        multipliers = {
-            "damage": random.uniform(effects["stat_min_multiplier"], effects["stat_max_multiplier"]),
-            "health": random.uniform(effects["stat_min_multiplier"], effects["stat_max_multiplier"]),
-            "stamina": random.uniform(effects["stat_min_multiplier"], effects["stat_max_multiplier"]),
-            "speed": random.uniform(effects["stat_min_multiplier"], effects["stat_max_multiplier"]),
-            "cooldown": random.uniform(effects["stat_min_multiplier"], effects["stat_max_multiplier"])
-        }
-        
-        # Store the base stats if not already stored
-        if not hasattr(self, '_base_stats'):
-            self._base_stats = {
-                "damage": {type_id: type_info["damage"] for type_id, type_info in player.projectile_types.items()},
-                "health": player.max_health,
-                "stamina": player.max_stamina,
-                "speed": player.speed,
-                "cooldown": {type_id: type_info["cooldown"] for type_id, type_info in player.projectile_types.items()}
-            }
-        
-        # Apply the new multipliers
-        # Damage
-        for type_id, base_damage in self._base_stats["damage"].items():
-            player.projectile_types[type_id]["damage"] = base_damage * multipliers["damage"]
-        
-        # Health
-        old_max_health = player.max_health
-        player.max_health = self._base_stats["health"] * multipliers["health"]
-        # Adjust current health proportionally
-        player.health = (player.health / old_max_health) * player.max_health
-        if player.health < 1:
-            player.health = 1
-        
-        # Stamina
-        old_max_stamina = player.max_stamina
-        player.max_stamina = self._base_stats["stamina"] * multipliers["stamina"]
-        # Adjust current stamina proportionally
-        player.stamina = (player.stamina / old_max_stamina) * player.max_stamina
-        
-        # Speed
-        player.speed = self._base_stats["speed"] * multipliers["speed"]
-        
-        # Cooldown
-        for type_id, base_cooldown in self._base_stats["cooldown"].items():
-            player.projectile_types[type_id]["cooldown"] = base_cooldown * multipliers["cooldown"]
+        # Draw a random multiplier for each stat, replacing the previous draw
+        stat_min = effects["stat_min_multiplier"]
+        stat_max = effects["stat_max_multiplier"]
+        multipliers = {stat: random.uniform(stat_min, stat_max) for stat in RELIC_FLUCTUATING_STATS}
+        self._set_player_source(player, f"relic:{relic_id}:fluctuation", multipliers)
         
         # Show a message about the fluctuation
         if hasattr(self.game, 'show_message'):
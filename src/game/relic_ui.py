@@ -10,6 +10,8 @@ from direct.gui.DirectGui import DirectFrame, DirectButton, DirectLabel, DGG
 from direct.gui.OnscreenText import OnscreenText
 from panda3d.core import TextNode, CardMaker, NodePath
 
+from engine.ui.retained import RetainedLayer, patch_widget
+
 class RelicUI:
     """UI for displaying and managing relics"""
     
@@ -168,6 +170,9 @@ class RelicUI:
             
             self.relic_texts.append(relic_text)
             relic_text.hide()
+        
+        # The slots are patched only where the active relics changed
+        self.slot_layer = RetainedLayer(self._get_relic_slot, self._patch_relic_slot)
     
     def _add_random_relic(self):
         """Add a random relic for testing"""
@@ -212,55 +217,82 @@ class RelicUI:
         # Get active relics
         active_relics = list(self.game.relic_system.active_relics.keys())
         
-        # Update each slot
-        for i, slot in enumerate(self.relic_slots):
+        # Rarity colors of the text and the slot background; other
+        # rarities keep the colors the slot already shows
+        rarity_colors = {
+            "common": (0.7, 0.7, 0.7, 1),  # Light gray
+            "uncommon": (0.2, 0.7, 0.2, 1),  # Green
+            "rare": (0.2, 0.2, 0.8, 1),  # Blue
+            "legendary": (0.8, 0.6, 0.0, 1)  # Gold
+        }
+        slot_colors = {
+            "common": (0.2, 0.2, 0.2, 1.0),
+            "uncommon": (0.1, 0.3, 0.1, 1.0),
+            "rare": (0.1, 0.1, 0.3, 1.0),
+            "legendary": (0.3, 0.2, 0.0, 1.0)
+        }
+        
+        models = {}
+        for i in range(len(self.relic_slots)):
             # Check if this slot has a relic
             if i < len(active_relics):
                 relic_id = active_relics[i]
                 relic_info = self.game.relic_system.get_relic_info(relic_id)
-                
-                # Hide the empty text
-                slot.empty_text.hide()
-                
-                # Show the remove button
-                slot.remove_button.show()
-                
-                # Update and show the relic text
-                relic_text = self.relic_texts[i]
-                relic_text.name_text.setText(relic_info["name"])
-                relic_text.desc_text.setText(relic_info["description"])
-                
-                # Set the rarity text and color
-                rarity_text = relic_info["rarity"].capitalize()
-                relic_text.rarity_text.setText(rarity_text)
-                
-                # Set rarity color
-                if relic_info["rarity"] == "common":
-                    relic_text.rarity_text.setFg((0.7, 0.7, 0.7, 1))  # Light gray
-                elif relic_info["rarity"] == "uncommon":
-                    relic_text.rarity_text.setFg((0.2, 0.7, 0.2, 1))  # Green
-                elif relic_info["rarity"] == "rare":
-                    relic_text.rarity_text.setFg((0.2, 0.2, 0.8, 1))  # Blue
-                elif relic_info["rarity"] == "legendary":
-                    relic_text.rarity_text.setFg((0.8, 0.6, 0.0, 1))  # Gold
-                
-                relic_text.show()
-                
-                # Change the background color based on rarity
-                if relic_info["rarity"] == "common":
-                    slot["frameColor"] = (0.2, 0.2, 0.2, 1.0)
-                elif relic_info["rarity"] == "uncommon":
-                    slot["frameColor"] = (0.1, 0.3, 0.1, 1.0)
-                elif relic_info["rarity"] == "rare":
-                    slot["frameColor"] = (0.1, 0.1, 0.3, 1.0)
-                elif relic_info["rarity"] == "legendary":
-                    slot["frameColor"] = (0.3, 0.2, 0.0, 1.0)
+                models[i] = {
+                    "relic": relic_id,
+                    "name": relic_info["name"],
+                    "description": relic_info["description"],
+                    "rarity": relic_info["rarity"].capitalize(),
+                    "rarity_fg": rarity_colors.get(relic_info["rarity"]),
+                    "frameColor": slot_colors.get(relic_info["rarity"])
+                }
             else:
                 # No relic in this slot
+                models[i] = {
+                    "relic": None,
+                    "name": "",
+                    "description": "",
+                    "rarity": "",
+                    "rarity_fg": None,
+                    "frameColor": (0.15, 0.15, 0.15, 1.0)
+                }
+        self.slot_layer.update(models)
+    
+    def _get_relic_slot(self, slot_index, props):
+        """Get the slot frame for a slot index, showing its first properties"""
+        slot = self.relic_slots[slot_index]
+        self._patch_relic_slot(slot, props)
+        return slot
+    
+    def _patch_relic_slot(self, slot, changed):
+        """Apply the changed properties of a relic slot"""
+        changed = dict(changed)
+        relic_text = self.relic_texts[slot.slot_index]
+        
+        if "relic" in changed:
+            if changed.pop("relic") is None:
                 slot.empty_text.show()
                 slot.remove_button.hide()
-                self.relic_texts[i].hide()
-                slot["frameColor"] = (0.15, 0.15, 0.15, 1.0)
+                relic_text.hide()
+            else:
+                slot.empty_text.hide()
+                slot.remove_button.show()
+                relic_text.show()
+        
+        if "name" in changed:
+            relic_text.name_text.setText(changed.pop("name"))
+        if "description" in changed:
+            relic_text.desc_text.setText(changed.pop("description"))
+        if "rarity" in changed:
+            relic_text.rarity_text.setText(changed.pop("rarity"))
+        
+        rarity_fg = changed.pop("rarity_fg", None)
+        if rarity_fg is not None:
+            relic_text.rarity_text.setFg(rarity_fg)
+        if changed.get("frameColor", 0) is None:
+            del changed["frameColor"]
+        
+        patch_widget(slot, changed)
     
     def show(self):
         """Show the relic UI"""
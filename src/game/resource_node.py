@@ -10,6 +10,8 @@ from panda3d.core import NodePath, Vec3, Point3
 import random
 import math
 
+from game.game_events import emit_event, RESOURCE_COLLECTED
+
 class ResourceNode:
     """Resource node that can be harvested for materials"""
     
@@ -41,6 +43,9 @@ class ResourceNode:
         self.base_regeneration_time = self.regeneration_time
         self.base_resources_per_harvest = self.resources_per_harvest
         
+        # World chunk holding this node, if the world is streamed in chunks
+        self.chunk = None
+        
         # Create a visual representation
         self.root = NodePath("ResourceNode")
         self.root.reparentTo(game.render)
@@ -98,7 +103,15 @@ class ResourceNode:
         color = color_maps.get(self.resource_type, (0.5, 0.5, 0.5, 1))
         
         try:
-            self.model = self.game.loader.loadModel(model_path)
+            resource_manager = getattr(self.game, 'resource_manager', None)
+            if resource_manager is not None and hasattr(resource_manager, 'attach_model_async'):
+                # Load without stalling the frame; a placeholder shows until then
+                self.model = resource_manager.attach_model_async(model_path, self.root,
+                                                                 lambda model: self._mark_chunk_dirty(),
+                                                                 position=self.position)
+            else:
+                self.model = self.game.loader.loadModel(model_path)
+                self.model.reparentTo(self.root)
             scale = 0.5
             if self.resource_type == "wood":
                 scale = 0.7
@@ -106,7 +119,6 @@ class ResourceNode:
                 scale = 0.4
             self.model.setScale(scale, scale, scale)
             self.model.setColor(*color)
-            self.model.reparentTo(self.root)
         except Exception as e:
             print(f"Error loading resource node model: {e}")
     
@@ -177,15 +189,8 @@ class ResourceNode:
         # Handle model scaling based on remaining resources
         self._update_model_scale()
         
-        # Record resource collection in performance tracker if available
-        if hasattr(self.game, 'performance_tracker'):
-            self.game.performance_tracker.record_resource_event(
-                self.resource_type, amount, source="node")
-            
-        # Record in adaptive difficulty system if available
-        if hasattr(self.game, 'adaptive_difficulty_system'):
-            self.game.adaptive_difficulty_system.record_resource_event(
-                'collected', self.resource_type, amount)
+        # Report the resource collection
+        emit_event(self.game, RESOURCE_COLLECTED, self.resource_type, amount, "node")
         
         return (self.resource_type, amount)
     
@@ -206,6 +211,7 @@ class ResourceNode:
         if hasattr(self, 'model'):
             self.model.setColor(0.3, 0.3, 0.3, 0.5)  # Grayed out
             self.model.setScale(0.3, 0.3, 0.3)  # Smaller
+        self._mark_chunk_dirty()
     
     def regenerate(self):
         """Regenerate the resource node"""
@@ -225,6 +231,12 @@ class ResourceNode:
             color = color_maps.get(self.resource_type, (0.5, 0.5, 0.5, 1))
             self.model.setColor(*color)
             self.model.setScale(1.0, 1.0, 1.0)
+        self._mark_chunk_dirty()
+    
+    def _mark_chunk_dirty(self):
+        """Have the chunk's combined geometry pick up a change of appearance"""
+        if self.chunk is not None:
+            self.chunk.mark_dirty()
     
     def cleanup(self):
         """Clean up resources"""
@@ -166,15 +166,14 @@ class SkillNode:
         
         # Apply effects based on skill type
         if self.skill_type == SkillType.STAT_BOOST:
-            for stat, value in self.effects.items():
-                if stat == "max_health":
-                    player.max_health += value
-                    player.health = min(player.health + value, player.max_health)
-                elif stat == "speed":
-                    player.speed += value
-                elif stat == "damage_multiplier":
-                    player.damage_multiplier += value
-                # Add other stats as needed
+            # The node is one additive source of the player's stat engine,
+            # so applying it again does not stack
+            bonuses = {stat: value for stat, value in self.effects.items()
+                       if stat in ("max_health", "speed", "damage_multiplier")}
+            if hasattr(player, "stats"):
+                is_new = player.stats.set_source(f"skill:{self.node_id}", additive=bonuses)
+                if is_new and "max_health" in bonuses:
+                    player.health = min(player.health + bonuses["max_health"], player.max_health)
         
         elif self.skill_type == SkillType.ABILITY_UNLOCK:
             ability_id = self.effects.get("ability_id")
@@ -16,6 +16,8 @@ from panda3d.core import (
 )
 import math
 
+from engine.ui.retained import RetainedLayer, patch_widget
+
 class SkillTreeUI:
     """UI for displaying and interacting with the skill tree"""
     
@@ -48,6 +50,10 @@ class SkillTreeUI:
         self.reset_view_button = None
         self.node_frames = {}  # Mapping of node_id to UI elements
         self.connection_lines = None
+        
+        # Retained widgets of the nodes and connections, patched on refresh
+        self.node_layer = None
+        self.connection_layer = None
         self.tooltip = None
         
         # Node visualization 
@@ -191,6 +197,14 @@ class SkillTreeUI:
         # Hide tooltip initially
         self.tooltip.hide()
         
+        # Connection lines are drawn below the node frames
+        self.connection_lines = NodePath("connection_lines")
+        self.connection_lines.reparentTo(self.content_frame)
+        
+        self.node_layer = RetainedLayer(self.create_node_frame, self.patch_node_frame)
+        self.connection_layer = RetainedLayer(self.create_connection, self.patch_connection)
+        self.node_frames = self.node_layer.widgets
+        
         # Set up drag handling
         self.content_frame.bind(DGG.B1PRESS, self.start_drag)
         self.content_frame.bind(DGG.B1RELEASE, self.end_drag)
@@ -250,143 +264,129 @@ class SkillTreeUI:
             self.game.ignore("escape")
     
     def refresh(self):
-        """Refresh the skill tree display"""
-        # Clear existing nodes
-        for node_id, node_ui in self.node_frames.items():
-            node_ui.destroy()
-        self.node_frames = {}
+        """Refresh the skill tree display, patching only what changed"""
+        visible_nodes = self.skill_tree.get_visible_nodes(self.player)
+        node_models = {node.node_id: self.get_node_props(node) for node in visible_nodes}
         
-        # Remove connection lines
-        if self.connection_lines:
-            self.connection_lines.removeNode()
+        connection_models = {}
+        for node in visible_nodes:
+            for child in node.children:
+                if child.is_visible:
+                    connection_models[(node.node_id, child.node_id)] = self.get_connection_props(node, child)
         
-        # Create connection lines
-        self.connection_lines = self.create_connection_lines()
-        self.connection_lines.reparentTo(self.content_frame)
+        self.connection_layer.update(connection_models)
+        self.node_layer.update(node_models)
         
-        # Create node frames for each visible node
-        visible_nodes = self.skill_tree.get_visible_nodes(self.player)
-        for node in visible_nodes:
-            self.create_node_frame(node)
-            
         # Reset animation time
         self.animation_time = 0.0
         self.pulse_animations = {}
+        for node_id, props in node_models.items():
+            if props["fusion"]:
+                self.pulse_animations[node_id] = {
+                    'overlay': self.node_frames[node_id].fusion_overlay,
+                    'base_scale': 1.0,
+                    'phase': 0.0
+                }
     
-    def create_connection_lines(self):
-        """Create connection lines between nodes with enhanced visuals"""
-        lines = LineSegs()
-        lines.setThickness(3.0)
-        
-        # First pass - draw connection background lines (wider, darker)
-        for node_id, node in self.skill_tree.nodes.items():
-            if not node.is_visible:
-                continue
-                
-            for child in node.children:
-                if not child.is_visible:
-                    continue
-                
-                # Draw background line (wider, darker)
-                lines.setColor(0.1, 0.1, 0.1, 0.7)
-                lines.setThickness(5.0)
-                
-                # Calculate positions
-                start_x, start_y = node.position
-                end_x, end_y = child.position
-                
-                lines.moveTo(start_x, 0, start_y)
-                lines.drawTo(end_x, 0, end_y)
-        
-        # Create the background lines node
-        background_node = NodePath(lines.create())
-        
-        # Reset for foreground lines
-        lines = LineSegs()
-        lines.setThickness(3.0)
-        
-        # Second pass - draw foreground lines with appropriate colors
-        for node_id, node in self.skill_tree.nodes.items():
-            if not node.is_visible:
-                continue
-                
-            for child in node.children:
-                if not child.is_visible:
-                    continue
-                
-                # Set color based on unlock status
-                if node.is_unlocked and child.is_unlocked:
-                    # Both nodes unlocked - bright green
-                    lines.setColor(0.4, 1.0, 0.4, 0.9)
-                elif node.is_unlocked:
-                    # Parent unlocked, child locked - yellow (available)
-                    lines.setColor(1.0, 0.9, 0.2, 0.8)
-                else:
-                    # Both locked - gray (unavailable)
-                    lines.setColor(0.5, 0.5, 0.5, 0.5)
-                
-                # Fusion paths get special visual treatment
-                if hasattr(child, 'skill_type') and str(child.skill_type).endswith('FUSION'):
-                    # Fusion paths get a pulsing effect (implemented in update)
-                    lines.setColor(0.7, 0.4, 1.0, 0.8)  # Purple for fusion paths
-                
-                # Calculate positions
-                start_x, start_y = node.position
-                end_x, end_y = child.position
-                
-                lines.moveTo(start_x, 0, start_y)
-                lines.drawTo(end_x, 0, end_y)
-        
-        # Create a node for the foreground lines
-        foreground_node = NodePath(lines.create())
+    def get_connection_props(self, node, child):
+        """Build the view model of the connection line between two nodes"""
+        # Set color based on unlock status
+        if node.is_unlocked and child.is_unlocked:
+            # Both nodes unlocked - bright green
+            color = (0.4, 1.0, 0.4, 0.9)
+        elif node.is_unlocked:
+            # Parent unlocked, child locked - yellow (available)
+            color = (1.0, 0.9, 0.2, 0.8)
+        else:
+            # Both locked - gray (unavailable)
+            color = (0.5, 0.5, 0.5, 0.5)
         
-        # Create a parent node for both line sets
-        combined_node = NodePath("connection_lines")
-        background_node.reparentTo(combined_node)
-        foreground_node.reparentTo(combined_node)
+        # Fusion paths get special visual treatment
+        if hasattr(child, 'skill_type') and str(child.skill_type).endswith('FUSION'):
+            # Fusion paths get a pulsing effect (implemented in update)
+            color = (0.7, 0.4, 1.0, 0.8)  # Purple for fusion paths
         
-        return combined_node
+        return {"points": (tuple(node.position), tuple(child.position)), "color": color}
+    
+    def create_connection(self, key, props):
+        """Create the line of a connection"""
+        connection = NodePath("connection")
+        connection.reparentTo(self.connection_lines)
+        self.patch_connection(connection, props)
+        return connection
     
-    def create_node_frame(self, node):
-        """Create a UI element for a skill tree node with enhanced visuals"""
+    def patch_connection(self, connection, changed):
+        """Apply the changed properties of a connection"""
+        changed = dict(changed)
+        points = changed.pop("points", None)
+        if points is not None:
+            connection.getChildren().detach()
+            (start_x, start_y), (end_x, end_y) = points
+            
+            # Background line (wider, darker), keeping its own color
+            lines = LineSegs()
+            lines.setThickness(5.0)
+            lines.setColor(0.1, 0.1, 0.1, 0.7)
+            lines.moveTo(start_x, 0, start_y)
+            lines.drawTo(end_x, 0, end_y)
+            background = connection.attachNewNode(lines.create())
+            background.setColor(0.1, 0.1, 0.1, 0.7, 1)
+            
+            # Foreground line, colored by the connection color
+            lines = LineSegs()
+            lines.setThickness(3.0)
+            lines.moveTo(start_x, 0, start_y)
+            lines.drawTo(end_x, 0, end_y)
+            connection.attachNewNode(lines.create())
+        
+        patch_widget(connection, changed)
+    
+    def get_node_props(self, node):
+        """Build the view model of a skill tree node"""
+        default_icon = "src/assets/generated/ui/default_node.png"
+        can_unlock = not node.is_unlocked and self.can_unlock_node(node)
+        
         # Determine the node's appearance based on its state and type
         if node.is_unlocked:
             # Unlocked node - show normal icon
-            icon_path = node.icon if node.icon else "src/assets/generated/ui/default_node.png"
+            icon_path = node.icon if node.icon else default_icon
             frame_color = (0.3, 0.7, 0.3, 0.9)  # Green for unlocked
-        elif self.can_unlock_node(node):
+        elif can_unlock:
             # Can be unlocked - show normal icon with yellow frame
-            icon_path = node.icon if node.icon else "src/assets/generated/ui/default_node.png"
+            icon_path = node.icon if node.icon else default_icon
             frame_color = (0.9, 0.8, 0.2, 0.9)  # Yellow for available
         elif node.is_visible:
             # Visible but not unlockable - show normal icon with locked overlay
-            icon_path = node.icon if node.icon else "src/assets/generated/ui/default_node.png"
+            icon_path = node.icon if node.icon else default_icon
             frame_color = (0.5, 0.5, 0.5, 0.8)  # Gray for visible but locked
         else:
             # Not yet visible - show question mark
             icon_path = self.question_mark_icon
             frame_color = (0.4, 0.4, 0.5, 0.7)  # Dark gray for unknown
         
-        # Create frame
         x, y = node.position
+        return {
+            "node": node,
+            "pos": (x, 0, y),
+            "frameColor": frame_color,
+            "frameTexture": icon_path,
+            "label": node.name if node.is_visible else "???",
+            "fusion": hasattr(node, 'skill_type') and str(node.skill_type).endswith('FUSION'),
+            "locked": not node.is_unlocked and node.is_visible and not can_unlock
+        }
+    
+    def create_node_frame(self, key, props):
+        """Create the UI elements of a skill tree node"""
         node_frame = DirectButton(
             frameSize=(-0.05, 0.05, -0.05, 0.05),
-            frameColor=frame_color,
-            frameTexture=icon_path,
             relief=DGG.FLAT,
-            pos=(x, 0, y),
             parent=self.content_frame,
-            command=self.on_node_click,
-            extraArgs=[node]
+            command=self.on_node_click
         )
         
-        # Handle hover events
-        node_frame.bind(DGG.ENTER, self.on_node_hover, [node])
-        node_frame.bind(DGG.EXIT, self.on_node_hover_exit)
-        
         # Add node name label
-        node_label = DirectLabel(
-            text=node.name if node.is_visible else "???",
+        node_frame.label = DirectLabel(
+            text="",
             text_fg=(1, 1, 1, 1),
             text_scale=0.02,
             frameColor=(0.1, 0.1, 0.1, 0.7),
@@ -394,37 +394,48 @@ class SkillTreeUI:
             parent=node_frame
         )
         
-        # Add fusion overlay for fusion nodes
-        if hasattr(node, 'skill_type') and str(node.skill_type).endswith('FUSION'):
-            fusion_overlay = DirectFrame(
-                frameSize=(-0.05, 0.05, -0.05, 0.05),
-                frameColor=(1, 1, 1, 0.8),
-                frameTexture=self.fusion_icon_overlay,
-                parent=node_frame,
-                pos=(0, 0, 0)
-            )
-            # Store reference to animate the overlay
-            self.pulse_animations[node.node_id] = {
-                'overlay': fusion_overlay,
-                'base_scale': 1.0,
-                'phase': 0.0
-            }
-        
-        # Add locked overlay for visible but locked nodes
-        if not node.is_unlocked and node.is_visible and not self.can_unlock_node(node):
-            locked_overlay = DirectFrame(
-                frameSize=(-0.05, 0.05, -0.05, 0.05),
-                frameColor=(1, 1, 1, 0.5),
-                frameTexture=self.locked_icon,
-                parent=node_frame,
-                pos=(0, 0, 0)
-            )
-        
-        # Store frame reference
-        self.node_frames[node.node_id] = node_frame
+        # Fusion and locked overlays, shown when the node needs them
+        node_frame.fusion_overlay = DirectFrame(
+            frameSize=(-0.05, 0.05, -0.05, 0.05),
+            frameColor=(1, 1, 1, 0.8),
+            frameTexture=self.fusion_icon_overlay,
+            parent=node_frame,
+            pos=(0, 0, 0)
+        )
+        node_frame.locked_overlay = DirectFrame(
+            frameSize=(-0.05, 0.05, -0.05, 0.05),
+            frameColor=(1, 1, 1, 0.5),
+            frameTexture=self.locked_icon,
+            parent=node_frame,
+            pos=(0, 0, 0)
+        )
         
+        self.patch_node_frame(node_frame, props)
         return node_frame
     
+    def patch_node_frame(self, node_frame, changed):
+        """Apply the changed properties of a skill tree node"""
+        changed = dict(changed)
+        if "node" in changed:
+            node = changed.pop("node")
+            node_frame['extraArgs'] = [node]
+            
+            # Handle hover events
+            node_frame.bind(DGG.ENTER, self.on_node_hover, [node])
+            node_frame.bind(DGG.EXIT, self.on_node_hover_exit, [node])
+        
+        if "label" in changed:
+            node_frame.label['text'] = changed.pop("label")
+        
+        for name, overlay in (("fusion", node_frame.fusion_overlay), ("locked", node_frame.locked_overlay)):
+            if name in changed:
+                if changed.pop(name):
+                    overlay.show()
+                else:
+                    overlay.hide()
+        
+        patch_widget(node_frame, changed)
+    
     def can_unlock_node(self, node):
         """Check if a node can be unlocked by the player"""
         can_unlock, _ = node.can_unlock(self.player)
@@ -462,15 +473,14 @@ class SkillTreeUI:
         
         # Highlight the node
         if node.node_id in self.node_frames:
-            frame = self.node_frames[node.node_id]
-            original_color = frame['frameColor']
+            original_color = self.node_layer.props[node.node_id]['frameColor']
             # Brighten the frame color
-            frame['frameColor'] = (
+            self.node_layer.patch(node.node_id, {'frameColor': (
                 min(original_color[0] + 0.2, 1.0),
                 min(original_color[1] + 0.2, 1.0),
                 min(original_color[2] + 0.2, 1.0),
                 original_color[3]
-            )
+            )})
     
     def show_tooltip(self, node, extra_info=None):
         """Show tooltip with node information"""
@@ -479,10 +489,10 @@ class SkillTreeUI:
             self.tooltip.hide()
             return
             
-        # Set tooltip position near the mouse
-        mouse_x = self.game.mouseWatcherNode.getMouseX()
-        mouse_y = self.game.mouseWatcherNode.getMouseY()
-        self.tooltip.setPos(mouse_x + 0.3, 0, mouse_y)
+        # Set tooltip position near the mouse, when there is one
+        mouse_watcher = getattr(self.game, 'mouseWatcherNode', None)
+        if mouse_watcher is not None and mouse_watcher.hasMouse():
+            self.tooltip.setPos(mouse_watcher.getMouseX() + 0.3, 0, mouse_watcher.getMouseY())
         
         # Set tooltip content
         if node.is_visible:
@@ -508,12 +518,15 @@ class SkillTreeUI:
         # Show the tooltip
         self.tooltip.show()
     
-    def on_node_hover_exit(self, event=None):
+    def on_node_hover_exit(self, node=None, event=None):
         """Handle node hover exit events"""
         self.tooltip.hide()
         
-        # Reset frame colors for all nodes
-        self.refresh()
+        # Reset the frame color of the node that was highlighted
+        if node is not None and node.node_id in self.node_frames:
+            self.node_layer.patch(node.node_id, self.get_node_props(node))
+        else:
+            self.refresh()
     
     def zoom_in(self):
         """Zoom in the skill tree view"""
@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Sound Banks for Nightfall Defenders
+Resolves sound files once and preloads them in banks ahead of the time of day
+"""
+
+import os
+import json
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+class SoundBankManager:
+    """
+    Manifest of the sound assets grouped into banks
+    
+    The sound directories are scanned once to build a manifest, so sound
+    lookups never probe the disk. Banks are loaded on a background thread
+    ahead of the time of day that needs them (dusk preloads the night
+    combat banks), long music and ambient tracks are streamed instead of
+    decoded up front, and banks are evicted least recently used first when
+    the estimated memory use exceeds the budget.
+    """
+    
+    TIME_OF_DAY_ORDER = ["dawn", "day", "dusk", "night", "midnight"]
+    EXTENSIONS = (".wav", ".ogg", ".mp3")
+    
+    # Categories whose tracks are streamed from disk
+    STREAMED_CATEGORIES = ("music", "ambient")
+    
+    # Estimated memory per open stream
+    STREAM_BUFFER_BYTES = 64 * 1024
+    
+    # Compressed files take roughly this much more memory once decoded
+    COMPRESSED_DECODE_RATIO = 10
+    
+    # Sounds at least this long (in seconds) are streamed whatever their category
+    STREAM_MIN_DURATION = 10.0
+    
+    # Durations and loudness written by the sound generator's bank builder
+    BANK_MANIFEST = "bank_manifest.json"
+    
+    def __init__(self, audio_manager, sound_dir: str = os.path.join("src", "assets", "sounds")):
+        """
+        Initialize the sound bank manager
+        
+        Args:
+            audio_manager: The game's AudioManager
+            sound_dir: Root directory of the sound assets
+        """
+        self.audio_manager = audio_manager
+        self.sound_dir = sound_dir
+        
+        # Manifest entries by "category/name" key
+        self.manifest = {}
+        
+        # Sound keys by bank name, and bank names by sound key
+        self.banks = {}
+        self.sound_banks = {}
+        
+        # Banks to preload for each time of day, and banks never evicted
+        self.time_of_day_banks = {}
+        self.resident_banks = set()
+        
+        # Loaded banks in least recently used order, with their memory estimate
+        self.loaded_banks = OrderedDict()
+        self.pending_banks = set()
+        self.memory_budget = 32 * 1024 * 1024
+        
+        # Current time of day and the banks it keeps resident
+        self.time_of_day = None
+        self.required_banks = set()
+        
+        # Background reading; the sound pools are created on the main thread
+        self.async_loading = True
+        self.executor = None
+        self.completed = queue.Queue()
+    
+    def build_manifest(self, config: Optional[Dict] = None):
+        """
+        Scan the sound directories and build the banks
+        
+        Args:
+            config: The audio configuration
+        """
+        config = config or {}
+        self.manifest = {}
+        if os.path.isdir(self.sound_dir):
+            for category in sorted(os.listdir(self.sound_dir)):
+                category_dir = os.path.join(self.sound_dir, category)
+                if not os.path.isdir(category_dir):
+                    continue
+                for entry in sorted(os.scandir(category_dir), key=lambda e: e.name):
+                    name, extension = os.path.splitext(entry.name)
+                    key = f"{category}/{name}"
+                    if not entry.is_file() or extension.lower() not in self.EXTENSIONS:
+                        continue
+                    
+                    # Prefer the first extension in EXTENSIONS when several exist
+                    existing = self.manifest.get(key)
+                    if existing and self.EXTENSIONS.index(existing["extension"]) <= self.EXTENSIONS.index(extension.lower()):
+                        continue
+                    
+                    self.manifest[key] = {
+                        "path": entry.path,
+                        "category": category,
+                        "extension": extension.lower(),
+                        "stream": category in self.STREAMED_CATEGORIES,
+                        "size": entry.stat().st_size
+                    }
+        self._apply_bank_manifest()
+        
+        bank_config = config.get("sound_banks", {})
+        self.memory_budget = int(bank_config.get("memory_budget_mb", 32) * 1024 * 1024)
+        self.resident_banks = set(bank_config.get("resident", []))
+        
+        self.banks = {}
+        for bank_name, sounds in bank_config.get("banks", {}).items():
+            self.banks[bank_name] = [sound for sound in sounds if sound in self.manifest]
+        
+        # Each time of day also gets a bank with its ambient loops
+        self.time_of_day_banks = {}
+        ambient_sounds = config.get("ambient_sounds", {})
+        for time_of_day in self.TIME_OF_DAY_ORDER:
+            banks = list(bank_config.get("time_of_day", {}).get(time_of_day, []))
+            ambient_bank = f"ambient_{time_of_day}"
+            self.banks[ambient_bank] = [f"ambient/{name}" for name in ambient_sounds.get(time_of_day, [])
+                                        if f"ambient/{name}" in self.manifest]
+            banks.append(ambient_bank)
+            self.time_of_day_banks[time_of_day] = banks
+        
+        self.sound_banks = {}
+        for bank_name, sounds in self.banks.items():
+            for sound in sounds:
+                self.sound_banks.setdefault(sound, bank_name)
+    
+    def _apply_bank_manifest(self):
+        """Add the durations and loudness of generated sounds to their entries"""
+        manifest_path = os.path.join(self.sound_dir, self.BANK_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return
+        
+        try:
+            with open(manifest_path, 'r') as f:
+                sounds = json.load(f).get("sounds", {})
+        except Exception as e:
+            print(f"Error reading sound bank manifest: {e}")
+            return
+        
+        for key, info in sounds.items():
+            entry = self.manifest.get(key)
+            if entry is None or "duration" not in info:
+                continue
+            entry["duration"] = info["duration"]
+            entry["sample_rate"] = info.get("sample_rate", 44100)
+            entry["loudness_db"] = info.get("loudness_db")
+            
+            # Long effects are streamed too rather than decoded up front
+            if entry["duration"] >= self.STREAM_MIN_DURATION:
+                entry["stream"] = True
+    
+    def resolve(self, sound_path: str) -> Optional[Dict]:
+        """
+        Look up the manifest entry of a sound
+        
+        Args:
+            sound_path: Path relative to the sound directory, with or without
+                extension (e.g. "music/combat.ogg" finds "music/combat.wav")
+        
+        Returns:
+            dict: Manifest entry or None if the sound is not in the manifest
+        """
+        key = os.path.splitext(sound_path.replace("\\", "/"))[0]
+        return self.manifest.get(key)
+    
+    def get_bank_memory(self, bank_name: str) -> int:
+        """
+        Estimate the memory used by a loaded bank
+        
+        Args:
+            bank_name: Name of the bank
+        
+        Returns:
+            int: Estimated bytes
+        """
+        total = 0
+        for sound in self.banks.get(bank_name, []):
+            entry = self.manifest[sound]
+            if entry["stream"]:
+                total += self.STREAM_BUFFER_BYTES
+            elif "duration" in entry:
+                # Exact decoded size of a generated sound (16-bit mono)
+                total += int(entry["duration"] * entry["sample_rate"]) * 2
+            elif entry["extension"] == ".wav":
+                total += entry["size"]
+            else:
+                total += entry["size"] * self.COMPRESSED_DECODE_RATIO
+        return total
+    
+    def get_memory_usage(self) -> int:
+        """Get the estimated memory used by all loaded banks"""
+        return sum(self.loaded_banks.values())
+    
+    def touch(self, sound_path: str):
+        """
+        Mark the bank of a sound as recently used
+        
+        Args:
+            sound_path: Path of the sound relative to the sound directory
+        """
+        bank_name = self.sound_banks.get(os.path.splitext(sound_path.replace("\\", "/"))[0])
+        if bank_name in self.loaded_banks:
+            self.loaded_banks.move_to_end(bank_name)
+    
+    def set_time_of_day(self, time_of_day: str):
+        """
+        Keep the banks of the current time of day and preload the next one's
+        
+        Args:
+            time_of_day: Name of the current time of day
+        """
+        if time_of_day == self.time_of_day or time_of_day not in self.TIME_OF_DAY_ORDER:
+            return
+        
+        self.time_of_day = time_of_day
+        index = self.TIME_OF_DAY_ORDER.index(time_of_day)
+        next_time = self.TIME_OF_DAY_ORDER[(index + 1) % len(self.TIME_OF_DAY_ORDER)]
+        
+        self.required_banks = set(self.resident_banks)
+        self.required_banks.update(self.time_of_day_banks.get(time_of_day, []))
+        self.required_banks.update(self.time_of_day_banks.get(next_time, []))
+        
+        for bank_name in self.time_of_day_banks.get(time_of_day, []) + self.time_of_day_banks.get(next_time, []):
+            self.preload_bank(bank_name)
+        
+        self.evict_over_budget()
+    
+    def preload_bank(self, bank_name: str):
+        """
+        Load every sound of a bank, in the background when enabled
+        
+        Args:
+            bank_name: Name of the bank
+        """
+        if bank_name in self.loaded_banks:
+            self.loaded_banks.move_to_end(bank_name)
+            return
+        if bank_name in self.pending_banks or bank_name not in self.banks:
+            return
+        
+        self.pending_banks.add(bank_name)
+        if self.async_loading:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SoundBank")
+            self.executor.submit(self._load_bank, bank_name)
+        else:
+            self._load_bank(bank_name)
+            self.update()
+    
+    def _load_bank(self, bank_name: str):
+        """
+        Read the sound files of a bank (runs on the loader thread)
+        
+        Only the files are touched here: reading them warms the file cache
+        so creating the sounds on the main thread does not wait on the disk.
+        
+        Args:
+            bank_name: Name of the bank
+        """
+        requests = []
+        for sound in self.banks[bank_name]:
+            entry = self.manifest[sound]
+            if not entry["stream"]:
+                try:
+                    with open(entry["path"], 'rb') as f:
+                        f.read()
+                except OSError as e:
+                    print(f"Error preloading sound {entry['path']}: {e}")
+                    continue
+            
+            # Combat effects are usually positional, everything else is not
+            variants = (False, True) if entry["category"] == "sfx" else (False,)
+            for positional in variants:
+                requests.append((self.audio_manager.get_pool_key(entry["path"], positional),
+                                 entry, positional))
+        self.completed.put((bank_name, requests))
+    
+    def update(self):
+        """Create the sound pools of banks that finished reading and enforce the memory budget"""
+        installed = False
+        while True:
+            try:
+                bank_name, requests = self.completed.get_nowait()
+            except queue.Empty:
+                break
+            
+            for pool_key, entry, positional in requests:
+                # A pool created on demand in the meantime wins
+                if pool_key in self.audio_manager.sound_pools:
+                    continue
+                try:
+                    pool = self.audio_manager.create_sound_pool(entry["path"], positional,
+                                                                entry["category"], entry["stream"])
+                except Exception as e:
+                    print(f"Error preloading sound {entry['path']}: {e}")
+                    pool = None
+                if pool is not None:
+                    self.audio_manager.sound_pools[pool_key] = pool
+            self.pending_banks.discard(bank_name)
+            self.loaded_banks[bank_name] = self.get_bank_memory(bank_name)
+            installed = True
+        
+        if installed:
+            self.evict_over_budget()
+    
+    def evict_over_budget(self):
+        """Evict least recently used banks until memory fits the budget"""
+        for bank_name in list(self.loaded_banks):
+            if self.get_memory_usage() <= self.memory_budget:
+                break
+            if bank_name in self.required_banks:
+                continue
+            self.evict_bank(bank_name)
+    
+    def evict_bank(self, bank_name: str):
+        """
+        Drop the idle sound pools of a bank
+        
+        Args:
+            bank_name: Name of the bank
+        """
+        for sound in self.banks.get(bank_name, []):
+            path = self.manifest[sound]["path"]
+            for positional in (False, True):
+                pool_key = self.audio_manager.get_pool_key(path, positional)
+                pool = self.audio_manager.sound_pools.get(pool_key)
+                if pool is not None and not pool.busy:
+                    del self.audio_manager.sound_pools[pool_key]
+        self.loaded_banks.pop(bank_name, None)
+    
+    def shutdown(self):
+        """Stop the background loader"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
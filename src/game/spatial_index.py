@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Spatial Index for Nightfall Defenders
+Uniform grid of static world objects for radius and nearest queries
+"""
+
+import math
+
+class SpatialGrid:
+    """
+    Hash grid of mostly static objects such as points of interest and NPCs
+    
+    Objects are bucketed by the ground cell of their position. A radius
+    query only looks at the cells overlapping the query circle, and a
+    nearest query walks rings of cells outwards from the query point,
+    stopping as soon as no unvisited cell can hold anything closer. The
+    results keep the insertion order of the objects, like a scan of the
+    dictionaries they come from.
+    """
+    
+    def __init__(self, cell_size):
+        """
+        Initialize the grid
+        
+        Args:
+            cell_size (float): Side of a grid cell in world units
+        """
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        
+        # Object -> (cell key, x, y, z, insertion order)
+        self.items = {}
+        self.next_order = 0
+        
+        # Bounds of the occupied cells, for nearest queries without a limit
+        self.min_cell = None
+        self.max_cell = None
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __contains__(self, item):
+        return item in self.items
+    
+    def cell_of(self, position):
+        """
+        Get the key of the cell holding a position
+        
+        Args:
+            position: World position
+        
+        Returns:
+            tuple: (cell x, cell y)
+        """
+        return (math.floor(position.x / self.cell_size), math.floor(position.y / self.cell_size))
+    
+    def insert(self, item, position):
+        """
+        Add an object, or move it if it is already indexed
+        
+        Args:
+            item: The object
+            position: Its world position
+        """
+        order = self.next_order
+        if item in self.items:
+            order = self.items[item][4]
+            self.remove(item)
+        else:
+            self.next_order += 1
+        
+        key = self.cell_of(position)
+        self.cells.setdefault(key, []).append(item)
+        self.items[item] = (key, position.x, position.y, position.z, order)
+        
+        if self.min_cell is None:
+            self.min_cell = key
+            self.max_cell = key
+        else:
+            self.min_cell = (min(self.min_cell[0], key[0]), min(self.min_cell[1], key[1]))
+            self.max_cell = (max(self.max_cell[0], key[0]), max(self.max_cell[1], key[1]))
+    
+    def remove(self, item):
+        """
+        Remove an object
+        
+        Args:
+            item: The object
+        
+        Returns:
+            bool: True if the object was indexed
+        """
+        entry = self.items.pop(item, None)
+        if entry is None:
+            return False
+        cell = self.cells[entry[0]]
+        cell.remove(item)
+        if not cell:
+            del self.cells[entry[0]]
+        return True
+    
+    def clear(self):
+        """Remove every object"""
+        self.cells = {}
+        self.items = {}
+        self.next_order = 0
+        self.min_cell = None
+        self.max_cell = None
+    
+    def _distance(self, item, position):
+        """Get the distance from an object to a position"""
+        entry = self.items[item]
+        return math.sqrt((entry[1] - position.x) ** 2 + (entry[2] - position.y) ** 2 +
+                         (entry[3] - position.z) ** 2)
+    
+    def _order(self, item):
+        """Get the insertion order of an object"""
+        return self.items[item][4]
+    
+    def query_cells(self, center_cell, cell_radius):
+        """
+        Get the objects of a square block of cells
+        
+        Args:
+            center_cell (tuple): Key of the center cell
+            cell_radius (int): Number of cells on each side of the center
+        
+        Returns:
+            list: Objects in insertion order
+        """
+        result = []
+        cx, cy = center_cell
+        for x in range(cx - cell_radius, cx + cell_radius + 1):
+            for y in range(cy - cell_radius, cy + cell_radius + 1):
+                cell = self.cells.get((x, y))
+                if cell:
+                    result.extend(cell)
+        result.sort(key=self._order)
+        return result
+    
+    def query_radius(self, position, radius, predicate=None):
+        """
+        Get the objects within a radius of a position
+        
+        Args:
+            position: Query position
+            radius (float): Query radius
+            predicate: Optional filter called with each candidate
+        
+        Returns:
+            list: Objects in insertion order
+        """
+        if not self.items or radius < 0:
+            return []
+        
+        # Cells overlapping the query circle, clamped to the occupied ones
+        size = self.cell_size
+        low_x = max(math.floor((position.x - radius) / size), self.min_cell[0])
+        low_y = max(math.floor((position.y - radius) / size), self.min_cell[1])
+        high_x = min(math.floor((position.x + radius) / size), self.max_cell[0])
+        high_y = min(math.floor((position.y + radius) / size), self.max_cell[1])
+        
+        result = []
+        for x in range(low_x, high_x + 1):
+            for y in range(low_y, high_y + 1):
+                for item in self.cells.get((x, y), ()):
+                    if self._distance(item, position) <= radius and (predicate is None or predicate(item)):
+                        result.append(item)
+        result.sort(key=self._order)
+        return result
+    
+    def nearest(self, position, max_distance=float('inf'), predicate=None):
+        """
+        Get the closest object to a position
+        
+        Args:
+            position: Query position
+            max_distance (float): Only consider objects closer than this
+            predicate: Optional filter called with each candidate
+        
+        Returns:
+            object or None: The closest object, the first inserted on ties
+        """
+        if not self.items:
+            return None
+        
+        cx, cy = self.cell_of(position)
+        best = None
+        best_key = (max_distance, 0)
+        
+        # Rings needed to cover the occupied cells from the query cell
+        max_ring = max(abs(cx - self.min_cell[0]), abs(cx - self.max_cell[0]),
+                       abs(cy - self.min_cell[1]), abs(cy - self.max_cell[1]))
+        if max_distance != float('inf'):
+            max_ring = min(max_ring, int(max_distance / self.cell_size) + 1)
+        
+        for ring in range(max_ring + 1):
+            # Every cell of this ring is at least (ring - 1) cells away on the ground
+            if best is not None and (ring - 1) * self.cell_size > best_key[0]:
+                break
+            for x in range(cx - ring, cx + ring + 1):
+                step = 1 if abs(x - cx) == ring else 2 * ring
+                for y in range(cy - ring, cy + ring + 1, step):
+                    for item in self.cells.get((x, y), ()):
+                        key = (self._distance(item, position), self._order(item))
+                        if key < best_key and (predicate is None or predicate(item)):
+                            best = item
+                            best_key = key
+        return best
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Stat Engine for Nightfall Defenders
+Derives entity stats from base values and per-source modifier stacks
+"""
+
+import numpy as np
+
+class StatEngine:
+    """
+    Base stats with additive and multiplicative modifiers per source
+    
+    Every source (a relic, a skill node, a crafted upgrade...) owns one row
+    of an additive and a multiplicative array, with one column per stat.
+    A derived stat is (base + sum of additives) * product of multipliers.
+    Changes only mark the engine dirty; the derived values are recomputed
+    for all stats at once on the next read, and reads of a clean engine
+    are a list lookup. Removing a source drops its whole row, so nothing
+    has to be undone by hand.
+    """
+    
+    def __init__(self, base_stats=None):
+        """
+        Initialize the stat engine
+        
+        Args:
+            base_stats (dict): Stat name -> base value
+        """
+        # Stat columns
+        self.stat_index = {}
+        self.base = np.zeros(0)
+        
+        # Source rows
+        self.source_index = {}
+        self.sources = []
+        self.additive = np.zeros((0, 0))
+        self.multiplicative = np.ones((0, 0))
+        
+        # Derived values and totals of the last recompute
+        self.values = []
+        self.additive_totals = np.zeros(0)
+        self.multiplier_totals = np.ones(0)
+        self.dirty = True
+        
+        # Incremented on every change, for caches built on top of the stats
+        self.revision = 0
+        
+        for name, value in (base_stats or {}).items():
+            self.define(name, value)
+    
+    def define(self, name, base_value=0.0):
+        """
+        Add a stat, or set its base value if it exists
+        
+        Args:
+            name (str): Stat name
+            base_value (float): Base value
+        """
+        if name in self.stat_index:
+            self.set_base(name, base_value)
+            return
+        
+        self.stat_index[name] = len(self.base)
+        self.base = np.append(self.base, float(base_value))
+        self.additive = np.hstack((self.additive, np.zeros((len(self.sources), 1))))
+        self.multiplicative = np.hstack((self.multiplicative, np.ones((len(self.sources), 1))))
+        self._mark_dirty()
+    
+    def _mark_dirty(self):
+        """Invalidate the derived values"""
+        self.dirty = True
+        self.revision += 1
+    
+    def _refresh(self):
+        """Recompute every derived stat"""
+        self.additive_totals = self.additive.sum(axis=0)
+        self.multiplier_totals = self.multiplicative.prod(axis=0)
+        self.values = ((self.base + self.additive_totals) * self.multiplier_totals).tolist()
+        self.dirty = False
+    
+    def get(self, name):
+        """
+        Get a derived stat
+        
+        Args:
+            name (str): Stat name
+        
+        Returns:
+            float: Base value with every modifier applied
+        """
+        if self.dirty:
+            self._refresh()
+        return self.values[self.stat_index[name]]
+    
+    def get_base(self, name):
+        """
+        Get the base value of a stat
+        
+        Args:
+            name (str): Stat name
+        
+        Returns:
+            float: Base value
+        """
+        return float(self.base[self.stat_index[name]])
+    
+    def set_base(self, name, value):
+        """
+        Set the base value of a stat
+        
+        Args:
+            name (str): Stat name
+            value (float): New base value
+        """
+        self.base[self.stat_index[name]] = value
+        self._mark_dirty()
+    
+    def set_value(self, name, value):
+        """
+        Set the base value of a stat so that its derived value becomes a target
+        
+        Lets code that assigns or scales a stat directly keep working while
+        the modifiers of every source stay in place.
+        
+        Args:
+            name (str): Stat name
+            value (float): Target derived value
+        """
+        if self.dirty:
+            self._refresh()
+        index = self.stat_index[name]
+        multiplier = self.multiplier_totals[index]
+        if multiplier == 0:
+            print(f"Warning: cannot set stat {name} while a source zeroes it")
+            return
+        self.set_base(name, value / multiplier - self.additive_totals[index])
+    
+    def set_source(self, source, additive=None, multiplicative=None):
+        """
+        Set all the modifiers of a source, replacing its previous ones
+        
+        Args:
+            source: Source identifier, such as "relic:phoenix_feather"
+            additive (dict): Stat name -> value added to the base
+            multiplicative (dict): Stat name -> factor applied to the total
+        
+        Returns:
+            bool: True if the source is new
+        """
+        row = self.source_index.get(source)
+        is_new = row is None
+        if is_new:
+            row = len(self.sources)
+            self.source_index[source] = row
+            self.sources.append(source)
+            self.additive = np.vstack((self.additive, np.zeros((1, len(self.base)))))
+            self.multiplicative = np.vstack((self.multiplicative, np.ones((1, len(self.base)))))
+        else:
+            self.additive[row] = 0.0
+            self.multiplicative[row] = 1.0
+        
+        for name, value in (additive or {}).items():
+            if name not in self.stat_index:
+                self.define(name)
+            self.additive[row, self.stat_index[name]] = value
+        for name, value in (multiplicative or {}).items():
+            if name not in self.stat_index:
+                self.define(name)
+            self.multiplicative[row, self.stat_index[name]] = value
+        
+        self._mark_dirty()
+        return is_new
+    
+    def remove_source(self, source):
+        """
+        Remove every modifier of a source
+        
+        Args:
+            source: Source identifier
+        
+        Returns:
+            bool: True if the source existed
+        """
+        row = self.source_index.pop(source, None)
+        if row is None:
+            return False
+        
+        # Move the last row into the freed one
+        last = len(self.sources) - 1
+        if row != last:
+            moved = self.sources[last]
+            self.sources[row] = moved
+            self.source_index[moved] = row
+            self.additive[row] = self.additive[last]
+            self.multiplicative[row] = self.multiplicative[last]
+        self.sources.pop()
+        self.additive = self.additive[:last]
+        self.multiplicative = self.multiplicative[:last]
+        
+        self._mark_dirty()
+        return True
+    
+    def has_source(self, source):
+        """
+        Check whether a source has modifiers
+        
+        Args:
+            source: Source identifier
+        
+        Returns:
+            bool: True if the source is set
+        """
+        return source in self.source_index
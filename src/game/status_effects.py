@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Status Effects for Nightfall Defenders
+Buffs, debuffs and damage over time for every entity in shared arrays
+"""
+
+from enum import Enum
+
+import numpy as np
+
+from game.game_events import emit_event, DAMAGE_DEALT
+
+class EffectKind(Enum):
+    """What an active effect does to its entity"""
+    DAMAGE_OVER_TIME = "damage_over_time"
+    HEAL_OVER_TIME = "heal_over_time"
+    SLOW = "slow"
+    STUN = "stun"
+
+class StackRule(Enum):
+    """How a new application merges with an active effect of the same type"""
+    REFRESH = "refresh"          # Keep the stronger magnitude and the longer duration
+    STACK = "stack"              # Add the magnitudes up to a cap and refresh the duration
+    INDEPENDENT = "independent"  # Every application runs on its own
+
+class EffectRule:
+    """Definition of a status effect type"""
+    
+    __slots__ = ('effect_id', 'name', 'kind', 'stacking', 'magnitude', 'duration', 'interval', 'max_magnitude')
+    
+    def __init__(self, effect_id, name, kind, stacking, magnitude, duration, interval=0.0, max_magnitude=None):
+        self.effect_id = effect_id
+        self.name = name
+        self.kind = kind
+        self.stacking = stacking
+        self.magnitude = magnitude
+        self.duration = duration
+        self.interval = interval
+        self.max_magnitude = max_magnitude
+
+# Status effect types: kind, stack rule, magnitude, duration, tick interval, magnitude cap.
+# Magnitudes are damage or healing per tick, or the share of speed removed by a slow.
+STATUS_EFFECTS = {
+    "burn": (EffectKind.DAMAGE_OVER_TIME, StackRule.REFRESH, 4.0, 4.0, 1.0, None),
+    "poison": (EffectKind.DAMAGE_OVER_TIME, StackRule.STACK, 2.0, 6.0, 1.0, 10.0),
+    "bleed": (EffectKind.DAMAGE_OVER_TIME, StackRule.INDEPENDENT, 3.0, 3.0, 0.5, None),
+    "regeneration": (EffectKind.HEAL_OVER_TIME, StackRule.REFRESH, 3.0, 5.0, 1.0, None),
+    "slow": (EffectKind.SLOW, StackRule.REFRESH, 0.4, 3.0, 0.0, None),
+    "stun": (EffectKind.STUN, StackRule.REFRESH, 1.0, 1.0, 0.0, None)
+}
+
+# Ability effect names that map to a status effect type
+EFFECT_ALIASES = {
+    "burn_dot": "burn",
+    "dot_damage": "poison",
+    "damage_over_time": "poison",
+    "heal_over_time": "regeneration",
+    "regeneration_buff": "regeneration",
+    "buff_regeneration": "regeneration",
+    "slow_movement": "slow",
+    "stun_short": "stun"
+}
+
+class StatusEffectSystem:
+    """
+    Active status effects of every entity of a game
+    
+    Each active effect is one row of a set of parallel arrays holding its
+    entity slot, effect type, magnitude, remaining time, tick interval and
+    time to the next tick. A frame advances every row in one vectorised
+    pass: ticks are counted per row, summed per entity, and each damaged
+    or healed entity gets a single call whatever its number of effects.
+    Slows and stuns are folded into one speed multiplier per entity.
+    """
+    
+    # Initial number of effect rows
+    CAPACITY = 64
+    
+    def __init__(self, game, capacity=CAPACITY):
+        """
+        Initialize the status effect system
+        
+        Args:
+            game: The main game instance
+            capacity (int): Initial number of effect rows
+        """
+        self.game = game
+        
+        # Effect types by name and by id
+        self.rules = {}
+        self.rules_by_id = []
+        for name, (kind, stacking, magnitude, duration, interval, max_magnitude) in STATUS_EFFECTS.items():
+            self.define_effect(name, kind, stacking, magnitude, duration, interval, max_magnitude)
+        
+        # Entity slots
+        self.entities = []
+        self.entity_slots = {}
+        self.free_slots = []
+        
+        # Active effect rows
+        self.count = 0
+        self.entity = np.zeros(capacity, dtype=np.int32)
+        self.effect = np.zeros(capacity, dtype=np.int16)
+        self.magnitude = np.zeros(capacity)
+        self.remaining = np.zeros(capacity)
+        self.interval = np.zeros(capacity)
+        self.timer = np.zeros(capacity)
+        
+        # Speed multiplier per entity slot, rebuilt when the effects change
+        self.speed_multipliers = np.ones(0)
+        self.modifiers_dirty = False
+    
+    @classmethod
+    def for_game(cls, game):
+        """
+        Get the shared status effect system of a game, creating it if needed
+        
+        Args:
+            game: The main game instance
+        
+        Returns:
+            StatusEffectSystem: The shared system
+        """
+        system = getattr(game, 'status_effects', None)
+        if system is None:
+            system = cls(game)
+            game.status_effects = system
+        return system
+    
+    def define_effect(self, name, kind, stacking, magnitude, duration, interval=0.0, max_magnitude=None):
+        """
+        Add a status effect type
+        
+        Args:
+            name (str): Effect name
+            kind (EffectKind): What the effect does
+            stacking (StackRule): How applications merge
+            magnitude (float): Default magnitude
+            duration (float): Default duration in seconds
+            interval (float): Tick interval for effects over time
+            max_magnitude (float): Magnitude cap for stacking effects
+        
+        Returns:
+            EffectRule: The new effect type
+        """
+        rule = EffectRule(len(self.rules_by_id), name, kind, stacking, magnitude, duration, interval, max_magnitude)
+        self.rules[name] = rule
+        self.rules_by_id.append(rule)
+        
+        # Per-type sign of the tick amounts: damage is positive, healing negative
+        self.tick_signs = np.array([1.0 if r.kind == EffectKind.DAMAGE_OVER_TIME else
+                                    -1.0 if r.kind == EffectKind.HEAL_OVER_TIME else 0.0
+                                    for r in self.rules_by_id])
+        return rule
+    
+    def _slot(self, entity):
+        """Get the slot of an entity, assigning one if needed"""
+        slot = self.entity_slots.get(entity)
+        if slot is None:
+            if self.free_slots:
+                slot = self.free_slots.pop()
+                self.entities[slot] = entity
+            else:
+                slot = len(self.entities)
+                self.entities.append(entity)
+                self.speed_multipliers = np.append(self.speed_multipliers, 1.0)
+            self.entity_slots[entity] = slot
+        return slot
+    
+    def _resolve(self, effect):
+        """
+        Read an effect given as a name or a dict
+        
+        Returns:
+            tuple: (rule, magnitude, duration), or None for unknown effects
+        """
+        if isinstance(effect, dict):
+            name = effect.get('type') or effect.get('id') or effect.get('name')
+        else:
+            name = effect
+        rule = self.rules.get(EFFECT_ALIASES.get(name, name))
+        if rule is None:
+            return None
+        
+        if isinstance(effect, dict):
+            magnitude = effect.get('magnitude', effect.get('damage', rule.magnitude))
+            duration = effect.get('duration', rule.duration)
+        else:
+            magnitude, duration = rule.magnitude, rule.duration
+        return rule, float(magnitude), float(duration)
+    
+    def apply(self, entity, effect):
+        """
+        Apply a status effect to an entity
+        
+        Args:
+            entity: The affected entity
+            effect: Effect name, or dict with a 'type' and optional
+                'magnitude' and 'duration'
+        
+        Returns:
+            bool: True if the effect is known and was applied
+        """
+        resolved = self._resolve(effect)
+        if resolved is None:
+            return False
+        rule, magnitude, duration = resolved
+        slot = self._slot(entity)
+        
+        # Merge with the active effect of the same type
+        if rule.stacking != StackRule.INDEPENDENT:
+            n = self.count
+            rows = np.flatnonzero((self.entity[:n] == slot) & (self.effect[:n] == rule.effect_id))
+            if len(rows):
+                row = rows[0]
+                if rule.stacking == StackRule.STACK:
+                    magnitude = self.magnitude[row] + magnitude
+                    if rule.max_magnitude is not None:
+                        magnitude = min(magnitude, rule.max_magnitude)
+                    self.remaining[row] = duration
+                else:
+                    magnitude = max(self.magnitude[row], magnitude)
+                    self.remaining[row] = max(self.remaining[row], duration)
+                self.magnitude[row] = magnitude
+                self.modifiers_dirty = True
+                return True
+        
+        if self.count == len(self.entity):
+            self._grow()
+        row = self.count
+        self.entity[row] = slot
+        self.effect[row] = rule.effect_id
+        self.magnitude[row] = magnitude
+        self.remaining[row] = duration
+        self.interval[row] = rule.interval
+        self.timer[row] = rule.interval
+        self.count += 1
+        self.modifiers_dirty = True
+        return True
+    
+    def _grow(self):
+        """Double the capacity of the effect rows"""
+        for name in ('entity', 'effect', 'magnitude', 'remaining', 'interval', 'timer'):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+    
+    def _keep_rows(self, keep):
+        """Compact the effect rows to the ones selected by a mask"""
+        kept = int(np.count_nonzero(keep))
+        for name in ('entity', 'effect', 'magnitude', 'remaining', 'interval', 'timer'):
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][keep]
+        self.count = kept
+        self.modifiers_dirty = True
+    
+    def clear(self, entity):
+        """
+        Remove every effect of an entity and release its slot
+        
+        Args:
+            entity: The entity
+        """
+        slot = self.entity_slots.pop(entity, None)
+        if slot is None:
+            return
+        self._keep_rows(self.entity[:self.count] != slot)
+        self.entities[slot] = None
+        self.speed_multipliers[slot] = 1.0
+        self.free_slots.append(slot)
+    
+    def update(self, dt):
+        """
+        Advance every active effect by one frame
+        
+        Args:
+            dt (float): Frame delta time
+        """
+        n = self.count
+        if n == 0:
+            return
+        
+        remaining = self.remaining[:n]
+        timer = self.timer[:n]
+        interval = self.interval[:n]
+        
+        # Ticks that fall within the part of the frame the effect is alive
+        alive = np.minimum(dt, remaining)
+        due = (interval > 0) & (timer <= alive)
+        ticks = np.zeros(n)
+        ticks[due] = np.floor((alive[due] - timer[due]) / interval[due]) + 1
+        timer -= dt
+        timer += ticks * interval
+        remaining -= dt
+        
+        amounts = ticks * self.magnitude[:n] * self.tick_signs[self.effect[:n]]
+        slots = self.entity[:n]
+        damage = np.bincount(slots, weights=np.maximum(amounts, 0.0), minlength=len(self.entities))
+        healing = np.bincount(slots, weights=np.maximum(-amounts, 0.0), minlength=len(self.entities))
+        damage_by_effect = np.bincount(self.effect[:n], weights=np.maximum(amounts, 0.0),
+                                       minlength=len(self.rules_by_id))
+        
+        expired = remaining <= 0
+        if expired.any():
+            self._keep_rows(~expired)
+        
+        # One call per affected entity; a death clears the entity's slot
+        entities = self.entities
+        for slot in np.flatnonzero(healing).tolist():
+            entity = entities[slot]
+            if entity is not None and hasattr(entity, 'heal'):
+                entity.heal(healing[slot])
+        for slot in np.flatnonzero(damage).tolist():
+            entity = entities[slot]
+            if entity is not None and getattr(entity, 'health', 0) > 0 and hasattr(entity, 'take_damage'):
+                entity.take_damage(damage[slot])
+        
+        # One damage event per effect type and frame
+        for effect_id in np.flatnonzero(damage_by_effect).tolist():
+            emit_event(self.game, DAMAGE_DEALT, float(damage_by_effect[effect_id]), self.rules_by_id[effect_id].name)
+    
+    def _refresh_modifiers(self):
+        """Rebuild the speed multiplier of every entity"""
+        self.speed_multipliers[:] = 1.0
+        n = self.count
+        kinds = np.array([rule.kind == EffectKind.SLOW for rule in self.rules_by_id])[self.effect[:n]]
+        if kinds.any():
+            np.minimum.at(self.speed_multipliers, self.entity[:n][kinds], 1.0 - self.magnitude[:n][kinds])
+        stuns = np.array([rule.kind == EffectKind.STUN for rule in self.rules_by_id])[self.effect[:n]]
+        self.speed_multipliers[self.entity[:n][stuns]] = 0.0
+        np.clip(self.speed_multipliers, 0.0, 1.0, out=self.speed_multipliers)
+        self.modifiers_dirty = False
+    
+    def get_speed_multiplier(self, entity):
+        """
+        Get the movement speed multiplier of an entity from slows and stuns
+        
+        Args:
+            entity: The entity
+        
+        Returns:
+            float: Speed multiplier between 0 and 1
+        """
+        slot = self.entity_slots.get(entity)
+        if slot is None:
+            return 1.0
+        if self.modifiers_dirty:
+            self._refresh_modifiers()
+        return float(self.speed_multipliers[slot])
+    
+    def get_effects(self, entity):
+        """
+        Get the active effects of an entity
+        
+        Args:
+            entity: The entity
+        
+        Returns:
+            list: (effect name, magnitude, remaining time) tuples
+        """
+        slot = self.entity_slots.get(entity)
+        if slot is None:
+            return []
+        rows = np.flatnonzero(self.entity[:self.count] == slot)
+        return [(self.rules_by_id[self.effect[row]].name, float(self.magnitude[row]), float(self.remaining[row]))
+                for row in rows]
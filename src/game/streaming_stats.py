@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming Statistics for Nightfall Defenders
+Constant-memory estimators for the performance metrics of long sessions
+"""
+
+import time
+import math
+from bisect import insort
+
+class EWMA:
+    """Exponentially weighted moving average"""
+    
+    def __init__(self, alpha=0.2):
+        """
+        Initialize the average
+        
+        Args:
+            alpha (float): Weight of each new sample (0-1); higher reacts faster
+        """
+        self.alpha = alpha
+        self.value = None
+        self.count = 0
+    
+    def update(self, x):
+        """
+        Add a sample
+        
+        Args:
+            x (float): The sample
+        
+        Returns:
+            float: The updated average
+        """
+        self.count += 1
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+    
+    def get(self, default=None):
+        """Get the average, or the default before the first sample"""
+        return default if self.value is None else self.value
+
+class RunningStats:
+    """Count, mean, variance and range of a stream (Welford's algorithm)"""
+    
+    def __init__(self):
+        """Initialize empty statistics"""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+    
+    def update(self, x):
+        """
+        Add a sample
+        
+        Args:
+            x (float): The sample
+        """
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+    
+    @property
+    def variance(self):
+        """Sample variance, 0 with fewer than two samples"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def stddev(self):
+        """Sample standard deviation"""
+        return math.sqrt(self.variance)
+    
+    def __len__(self):
+        return self.count
+
+class P2Quantile:
+    """
+    Quantile of a stream estimated with the P² algorithm
+    
+    Five markers track the minimum, the maximum, the quantile and the
+    quantiles halfway to each end. Each sample moves the markers with a
+    piecewise-parabolic step, so memory stays constant (Jain & Chlamtac).
+    """
+    
+    def __init__(self, q=0.5):
+        """
+        Initialize the estimator
+        
+        Args:
+            q (float): Quantile to estimate (0-1)
+        """
+        self.q = q
+        self.count = 0
+        
+        # Marker heights, actual positions, desired positions and increments
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+    
+    def update(self, x):
+        """
+        Add a sample
+        
+        Args:
+            x (float): The sample
+        """
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            insort(heights, x)
+            return
+        
+        # Find the cell of the sample, stretching the ends if needed
+        if x < heights[0]:
+            heights[0] = x
+            cell = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            cell = 3
+        else:
+            cell = 0
+            while x >= heights[cell + 1]:
+                cell += 1
+        
+        positions = self.positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        
+        # Move the middle markers toward their desired positions
+        for i in range(1, 4):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+    
+    def _parabolic(self, i, step):
+        """Piecewise-parabolic prediction of a marker height"""
+        h, n = self.heights, self.positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+    
+    def get(self, default=None):
+        """
+        Get the estimated quantile
+        
+        Args:
+            default: Value returned before the first sample
+        
+        Returns:
+            float: The quantile estimate
+        """
+        if self.count == 0:
+            return default
+        if self.count <= 5:
+            # Exact quantile of the few samples seen so far
+            return self.heights[min(len(self.heights) - 1, int(round(self.q * (len(self.heights) - 1))))]
+        return self.heights[2]
+
+class WindowedCounter:
+    """
+    Sum and count of the samples of a sliding time window
+    
+    The window is split into a fixed number of buckets; samples older
+    than the window leave it a bucket at a time.
+    """
+    
+    def __init__(self, window, buckets=30):
+        """
+        Initialize the counter
+        
+        Args:
+            window (float): Window length in seconds
+            buckets (int): Number of buckets the window is split into
+        """
+        self.window = window
+        self.bucket_width = window / buckets
+        self.totals = [0.0] * buckets
+        self.counts = [0] * buckets
+        
+        # Absolute index of the period each bucket currently holds
+        self.periods = [None] * buckets
+    
+    def _bucket(self, now):
+        """Get the bucket for a time, clearing it if it holds an old period"""
+        period = int(now // self.bucket_width)
+        index = period % len(self.totals)
+        if self.periods[index] != period:
+            self.periods[index] = period
+            self.totals[index] = 0.0
+            self.counts[index] = 0
+        return index
+    
+    def add(self, value=1, now=None):
+        """
+        Add a sample
+        
+        Args:
+            value (float): Sample value
+            now (float): Time of the sample, defaults to the current time
+        """
+        index = self._bucket(time.time() if now is None else now)
+        self.totals[index] += value
+        self.counts[index] += 1
+    
+    def _live(self, now):
+        """Get the indexes of the buckets inside the window"""
+        current = int((time.time() if now is None else now) // self.bucket_width)
+        oldest = current - len(self.totals)
+        return [i for i, period in enumerate(self.periods) if period is not None and oldest < period <= current]
+    
+    def total(self, now=None):
+        """
+        Get the sum of the samples in the window
+        
+        Args:
+            now (float): End of the window, defaults to the current time
+        
+        Returns:
+            float: Sum of the sample values
+        """
+        return sum(self.totals[i] for i in self._live(now))
+    
+    def count(self, now=None):
+        """
+        Get the number of samples in the window
+        
+        Args:
+            now (float): End of the window, defaults to the current time
+        
+        Returns:
+            int: Number of samples
+        """
+        return sum(self.counts[i] for i in self._live(now))
+    
+    def rate(self, now=None, per=60.0, elapsed=None):
+        """
+        Get the sum of the window per time unit
+        
+        Args:
+            now (float): End of the window, defaults to the current time
+            per (float): Time unit in seconds (a minute by default)
+            elapsed (float): Time covered when shorter than the window
+        
+        Returns:
+            float: Rate of the sample values
+        """
+        span = self.window if elapsed is None else min(elapsed, self.window)
+        return self.total(now) / (span / per) if span > 0 else 0.0
+
+class WindowedQuantile:
+    """
+    Quantile of the recent samples of a stream
+    
+    P² markers cannot forget samples, so the stream is cut into tumbling
+    windows: one estimator fills while the estimate of the last complete
+    window is served until the current one has enough samples.
+    """
+    
+    def __init__(self, q, window):
+        """
+        Initialize the estimator
+        
+        Args:
+            q (float): Quantile to estimate (0-1)
+            window (float): Window length in seconds
+        """
+        self.q = q
+        self.window = window
+        self.current = P2Quantile(q)
+        self.previous = None
+        self.window_start = None
+    
+    def update(self, x, now=None):
+        """
+        Add a sample
+        
+        Args:
+            x (float): The sample
+            now (float): Time of the sample, defaults to the current time
+        """
+        now = time.time() if now is None else now
+        if self.window_start is None:
+            self.window_start = now
+        elif now - self.window_start >= self.window:
+            # Keep the last window only if it is recent enough to describe the player
+            self.previous = self.current if now - self.window_start < 2 * self.window else None
+            self.current = P2Quantile(self.q)
+            self.window_start = now
+        self.current.update(x)
+    
+    def get(self, default=None):
+        """
+        Get the estimated quantile of the recent samples
+        
+        Args:
+            default: Value returned when there is no recent sample
+        
+        Returns:
+            float: The quantile estimate
+        """
+        if self.current.count >= 5 or self.previous is None:
+            return self.current.get(default)
+        return self.previous.get(default)
@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Terrain for Nightfall Defenders
+Noise-generated heightfield rendered as chunked GeoMipTerrain blocks
+"""
+
+import queue
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from panda3d.core import GeoMipTerrain, PNMImage, StringStream
+
+# Perlin gradient directions selected by corner hashes
+_GRADIENTS = np.array([(1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.float64)
+
+def perlin_grid(xs, ys, seed=0, octaves=4, persistence=0.5):
+    """
+    Evaluate 2D Perlin noise on a grid of sample coordinates in one array pass
+    
+    Args:
+        xs (numpy.ndarray): Noise-space X coordinate of each column
+        ys (numpy.ndarray): Noise-space Y coordinate of each row
+        seed (int): Seed of the permutation table
+        octaves (int): Number of noise octaves
+        persistence (float): Amplitude falloff between octaves
+    
+    Returns:
+        numpy.ndarray: Noise of shape (len(ys), len(xs)), roughly in -1..1
+    """
+    # Permutation table doubled to avoid wrapping indices
+    permutation = np.random.RandomState(seed % (2 ** 32)).permutation(256)
+    permutation = np.concatenate([permutation, permutation])
+    
+    total = np.zeros((len(ys), len(xs)))
+    frequency = 1.0
+    amplitude = 1.0
+    max_amplitude = 0.0
+    for _ in range(octaves):
+        total += _perlin_octave(np.asarray(xs) * frequency, np.asarray(ys) * frequency, permutation) * amplitude
+        max_amplitude += amplitude
+        amplitude *= persistence
+        frequency *= 2.0
+    return total / max_amplitude
+
+def _perlin_octave(xs, ys, permutation):
+    """Evaluate one octave of Perlin noise on the grid spanned by xs and ys"""
+    x0 = np.floor(xs)
+    y0 = np.floor(ys)
+    xf = (xs - x0)[np.newaxis, :]
+    yf = (ys - y0)[:, np.newaxis]
+    xi = (x0.astype(np.int64) & 255)[np.newaxis, :]
+    yi = (y0.astype(np.int64) & 255)[:, np.newaxis]
+    
+    # Hash the four cell corners
+    a = permutation[xi] + yi
+    b = permutation[xi + 1] + yi
+    
+    u = xf * xf * xf * (xf * (xf * 6 - 15) + 10)
+    v = yf * yf * yf * (yf * (yf * 6 - 15) + 10)
+    
+    bottom = _lerp(_gradient(permutation[a], xf, yf), _gradient(permutation[b], xf - 1, yf), u)
+    top = _lerp(_gradient(permutation[a + 1], xf, yf - 1), _gradient(permutation[b + 1], xf - 1, yf - 1), u)
+    return _lerp(bottom, top, v)
+
+def _gradient(hashes, x, y):
+    """Dot the corner gradients with the offsets from the corners"""
+    index = hashes & 7
+    return _GRADIENTS[:, 0].take(index) * x + _GRADIENTS[:, 1].take(index) * y
+
+def _lerp(a, b, t):
+    """Linear interpolation between arrays"""
+    return a + (b - a) * t
+
+class HeightField:
+    """
+    Square grid of terrain heights
+    
+    Heights are sampled every cell_size world units and the grid is centered
+    on the world origin. Lookups index the grid directly and interpolate the
+    four surrounding samples, so height_at costs the same anywhere; positions
+    outside the grid use the nearest edge sample.
+    """
+    
+    def __init__(self, size=256, cell_size=1.0):
+        """
+        Initialize a flat heightfield
+        
+        Args:
+            size (int): Number of cells along each side
+            cell_size (float): World units between samples
+        """
+        self.size = size
+        self.cell_size = cell_size
+        self.origin_x = -size * cell_size / 2.0
+        self.origin_y = -size * cell_size / 2.0
+        
+        # Heights indexed [row (y), column (x)]
+        self.heights = np.zeros((size + 1, size + 1), dtype=np.float32)
+    
+    def generate(self, seed=0, scale=96.0, octaves=4, persistence=0.5, amplitude=3.0, flat_radius=20.0):
+        """
+        Fill the heightfield with Perlin noise, computed for the whole grid at once
+        
+        Args:
+            seed (int): Noise seed
+            scale (float): World units per noise period
+            octaves (int): Number of noise octaves
+            persistence (float): Amplitude falloff between octaves
+            amplitude (float): Maximum height above or below zero
+            flat_radius (float): Radius around the origin kept flat for the city
+        """
+        samples = np.arange(self.size + 1) * self.cell_size
+        columns = (self.origin_x + samples) / scale
+        rows = (self.origin_y + samples) / scale
+        self.heights[:] = perlin_grid(columns, rows, seed, octaves, persistence)
+        
+        # Blend from flat ground at the city to full height over one more radius
+        self.heights *= amplitude * self._get_falloff(flat_radius)
+    
+    def _get_falloff(self, flat_radius):
+        """Get a per-sample weight that is 0 within flat_radius and 1 beyond twice it"""
+        coords = self.origin_x + np.arange(self.size + 1) * self.cell_size
+        distance = np.hypot(coords[np.newaxis, :], coords[:, np.newaxis])
+        if flat_radius <= 0:
+            return np.ones_like(distance, dtype=np.float32)
+        t = np.clip((distance - flat_radius) / flat_radius, 0.0, 1.0)
+        return (t * t * (3.0 - 2.0 * t)).astype(np.float32)
+    
+    def height_at(self, x, y):
+        """
+        Get the terrain height at a world position
+        
+        Args:
+            x (float): World X coordinate
+            y (float): World Y coordinate
+        
+        Returns:
+            float: Interpolated ground height
+        """
+        fx = min(max((x - self.origin_x) / self.cell_size, 0.0), self.size)
+        fy = min(max((y - self.origin_y) / self.cell_size, 0.0), self.size)
+        column = min(int(fx), self.size - 1)
+        row = min(int(fy), self.size - 1)
+        tx = fx - column
+        ty = fy - row
+        
+        heights = self.heights
+        bottom = heights[row, column] + (heights[row, column + 1] - heights[row, column]) * tx
+        top = heights[row + 1, column] + (heights[row + 1, column + 1] - heights[row + 1, column]) * tx
+        return float(bottom + (top - bottom) * ty)
+    
+    def get_cell(self, x, y):
+        """
+        Get the grid sample nearest to a world position
+        
+        Args:
+            x (float): World X coordinate
+            y (float): World Y coordinate
+        
+        Returns:
+            tuple: (column, row), clamped to the grid
+        """
+        column = int(round((x - self.origin_x) / self.cell_size))
+        row = int(round((y - self.origin_y) / self.cell_size))
+        return (min(max(column, 0), self.size), min(max(row, 0), self.size))
+    
+    def modify(self, x, y, radius, delta):
+        """
+        Raise or lower the terrain around a point
+        
+        Args:
+            x (float): World X coordinate of the center
+            y (float): World Y coordinate of the center
+            radius (float): Radius of the change in world units
+            delta (float): Height change at the center, fading to 0 at the radius
+        
+        Returns:
+            tuple: Changed sample range (column0, row0, column1, row1), inclusive
+        """
+        column0, row0 = self.get_cell(x - radius, y - radius)
+        column1, row1 = self.get_cell(x + radius, y + radius)
+        
+        columns = self.origin_x + np.arange(column0, column1 + 1) * self.cell_size
+        rows = self.origin_y + np.arange(row0, row1 + 1) * self.cell_size
+        distance = np.hypot(columns[np.newaxis, :] - x, rows[:, np.newaxis] - y)
+        weight = np.clip(1.0 - distance / max(radius, 1e-6), 0.0, 1.0)
+        self.heights[row0:row1 + 1, column0:column1 + 1] += delta * weight
+        return column0, row0, column1, row1
+
+class TerrainBlock:
+    """One GeoMipTerrain covering a square of the heightfield"""
+    
+    def __init__(self, coords, column, row):
+        """
+        Initialize the block
+        
+        Args:
+            coords (tuple): Block coordinates (bx, by)
+            column (int): First heightfield column of the block
+            row (int): First heightfield row of the block
+        """
+        self.coords = coords
+        self.column = column
+        self.row = row
+        self.terrain = None
+        
+        # Incremented by every modification; the rendered terrain is current
+        # when built_version matches
+        self.version = 0
+        self.built_version = -1
+        self.rebuilding = False
+
+class TerrainManager:
+    """
+    Renders the heightfield and answers ground height queries
+    
+    The heightfield is split into square blocks, each rendered by its own
+    GeoMipTerrain. Within a block, geometry loses detail with distance from
+    the camera; block borders stay at full detail so neighbouring blocks,
+    which share their edge samples, meet without cracks. Modifying the
+    terrain updates the heights immediately and rebuilds the affected
+    blocks on a background thread, swapping them in once they are ready.
+    """
+    
+    # Heightfield cells per block; GeoMipTerrain needs a power of two
+    BLOCK_CELLS = 64
+    
+    # GeoMipTerrain sub-block size within a block
+    MIP_BLOCK_SIZE = 16
+    
+    # Distances over which sub-blocks drop from full to lowest detail
+    LOD_NEAR = 40.0
+    LOD_FAR = 160.0
+    
+    GROUND_COLOR = (0.3, 0.5, 0.2, 1)
+    
+    def __init__(self, game, size=256, cell_size=1.0, seed=None, amplitude=3.0, flat_radius=20.0):
+        """
+        Initialize the terrain
+        
+        Args:
+            game: The main game instance
+            size (int): Cells along each side, a multiple of BLOCK_CELLS
+            cell_size (float): World units between height samples
+            seed (int): Noise seed, random if None
+            amplitude (float): Maximum height above or below zero
+            flat_radius (float): Radius around the origin kept flat for the city
+        """
+        self.game = game
+        self.seed = seed if seed is not None else random.randrange(1024)
+        self.heightfield = HeightField(size, cell_size)
+        self.heightfield.generate(self.seed, amplitude=amplitude, flat_radius=flat_radius)
+        
+        self.blocks = {}
+        blocks_per_side = max(1, size // self.BLOCK_CELLS)
+        for bx in range(blocks_per_side):
+            for by in range(blocks_per_side):
+                self.blocks[(bx, by)] = TerrainBlock((bx, by), bx * self.BLOCK_CELLS, by * self.BLOCK_CELLS)
+        
+        # Rebuilds run in the background; finished blocks are swapped in on
+        # the main thread
+        self.dirty_blocks = set()
+        self.async_loading = True
+        self.executor = None
+        self.completed = queue.Queue()
+        
+        self.root = game.render.attachNewNode("Terrain")
+        self.root.setColor(self.GROUND_COLOR)
+        for block in self.blocks.values():
+            self._install_block(block, self._build_block(block.coords, block.version,
+                                                         self._get_block_heights(block)))
+    
+    def height_at(self, x, y):
+        """
+        Get the ground height at a world position
+        
+        Args:
+            x (float): World X coordinate
+            y (float): World Y coordinate
+        
+        Returns:
+            float: Ground height
+        """
+        return self.heightfield.height_at(x, y)
+    
+    def _get_block_heights(self, block):
+        """Copy the heights of a block, including its shared edge samples"""
+        return self.heightfield.heights[block.row:block.row + self.BLOCK_CELLS + 1,
+                                        block.column:block.column + self.BLOCK_CELLS + 1].copy()
+    
+    def _build_block(self, coords, version, heights):
+        """
+        Build the GeoMipTerrain of a block (may run on the loader thread)
+        
+        Args:
+            coords (tuple): Block coordinates
+            version (int): Block version the heights belong to
+            heights: Height samples of the block
+        
+        Returns:
+            tuple: (coords, version, GeoMipTerrain)
+        """
+        low = float(heights.min())
+        span = max(float(heights.max()) - low, 1e-3)
+        samples = heights.shape[0]
+        
+        # GeoMipTerrain reads image rows from the top, so row 0 is the far edge;
+        # the samples are handed over as a 16-bit binary PGM in one read
+        normalized = np.flipud((heights - low) / span)
+        pixels = np.round(normalized * 65535).astype('>u2')
+        header = f"P5 {samples} {samples} 65535\n".encode("ascii")
+        image = PNMImage()
+        image.read(StringStream(header + pixels.tobytes()), "block.pgm")
+        
+        terrain = GeoMipTerrain(f"TerrainBlock_{coords[0]}_{coords[1]}")
+        terrain.setHeightfield(image)
+        terrain.setBlockSize(self.MIP_BLOCK_SIZE)
+        terrain.setNear(self.LOD_NEAR)
+        terrain.setFar(self.LOD_FAR)
+        terrain.setBorderStitching(True)
+        
+        camera = getattr(self.game, 'camera', None)
+        if camera is not None:
+            terrain.setFocalPoint(camera)
+        
+        root = terrain.getRoot()
+        cell_size = self.heightfield.cell_size
+        block = self.blocks[coords]
+        root.setPos(self.heightfield.origin_x + block.column * cell_size,
+                    self.heightfield.origin_y + block.row * cell_size, low)
+        root.setScale(cell_size, cell_size, span)
+        terrain.generate()
+        return coords, version, terrain
+    
+    def _install_block(self, block, result):
+        """Replace the rendered terrain of a block with a rebuilt one"""
+        _, version, terrain = result
+        if block.terrain is not None:
+            block.terrain.getRoot().removeNode()
+        block.terrain = terrain
+        block.built_version = version
+        terrain.getRoot().reparentTo(self.root)
+    
+    def modify(self, x, y, radius, delta):
+        """
+        Raise or lower the terrain around a point
+        
+        Heights change at once; the affected blocks are redrawn once their
+        rebuild finishes.
+        
+        Args:
+            x (float): World X coordinate of the center
+            y (float): World Y coordinate of the center
+            radius (float): Radius of the change in world units
+            delta (float): Height change at the center
+        """
+        column0, row0, column1, row1 = self.heightfield.modify(x, y, radius, delta)
+        
+        # Edge samples are shared, so a change on a border touches both blocks
+        for block in self.blocks.values():
+            if (block.column <= column1 and column0 <= block.column + self.BLOCK_CELLS and
+                    block.row <= row1 and row0 <= block.row + self.BLOCK_CELLS):
+                block.version += 1
+                self.dirty_blocks.add(block.coords)
+    
+    def update(self):
+        """Start pending rebuilds, swap in finished ones and update the LOD"""
+        for coords in list(self.dirty_blocks):
+            block = self.blocks[coords]
+            if block.rebuilding:
+                continue
+            
+            self.dirty_blocks.discard(coords)
+            block.rebuilding = True
+            heights = self._get_block_heights(block)
+            if self.async_loading:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Terrain")
+                self.executor.submit(self._rebuild_in_background, coords, block.version, heights)
+            else:
+                self.completed.put(self._build_block(coords, block.version, heights))
+        
+        while True:
+            try:
+                result = self.completed.get_nowait()
+            except queue.Empty:
+                break
+            
+            block = self.blocks[result[0]]
+            block.rebuilding = False
+            if result[2] is not None:
+                self._install_block(block, result)
+        
+        for block in self.blocks.values():
+            if block.terrain is not None:
+                block.terrain.update()
+    
+    def _rebuild_in_background(self, coords, version, heights):
+        """Build a block on the loader thread and queue the result"""
+        try:
+            result = self._build_block(coords, version, heights)
+        except Exception as e:
+            print(f"Error rebuilding terrain block {coords}: {e}")
+            result = (coords, version, None)
+        self.completed.put(result)
+    
+    def shutdown(self):
+        """Stop the background rebuilds"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+    
+    def cleanup(self):
+        """Remove the terrain"""
+        self.shutdown()
+        self.root.removeNode()
+        self.blocks = {}
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tower Targeting for Nightfall Defenders
+Shared target selection for defensive buildings and city early warning
+"""
+
+from enum import Enum
+import math
+
+import numpy as np
+
+class TargetMode(Enum):
+    """How a tower picks among the enemies in its range"""
+    NEAREST = "nearest"
+    LOWEST_HEALTH = "lowest_health"
+
+class _TowerRecord:
+    """Registration of a defensive building"""
+    
+    __slots__ = ('tower', 'x', 'y', 'radius', 'mode', 'cells', 'target')
+    
+    def __init__(self, tower, x, y, radius, mode, cells):
+        self.tower = tower
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.mode = mode
+        self.cells = cells
+        self.target = None
+
+class TowerTargeting:
+    """
+    Target selection for every defensive building of a game
+    
+    Towers register their position and range once; the cells of a uniform
+    grid their range overlaps are computed at registration. Each tick the
+    living enemies are bucketed into the same grid, and every tower that
+    has lost its target looks only at the enemies of its own cells. A
+    tower keeps its target while it stays alive and in range, so most
+    towers do not query at all.
+    """
+    
+    # Size of the grid cells in world units
+    CELL_SIZE = 10.0
+    
+    def __init__(self, game, cell_size=CELL_SIZE):
+        """
+        Initialize the targeting service
+        
+        Args:
+            game: The main game instance
+            cell_size (float): Size of the grid cells in world units
+        """
+        self.game = game
+        self.cell_size = cell_size
+        
+        # Registered towers by building
+        self.towers = {}
+        
+        # Enemy index of the current tick
+        self.enemies = []
+        self.enemy_indices = {}
+        self.positions = np.zeros((0, 2))
+        self.health = np.zeros(0)
+        self.grid = {}
+        
+        # Number of target searches in the last tick
+        self.queries = 0
+    
+    @classmethod
+    def for_game(cls, game):
+        """
+        Get the shared targeting service of a game, creating it if needed
+        
+        Args:
+            game: The main game instance
+        
+        Returns:
+            TowerTargeting: The shared service
+        """
+        targeting = getattr(game, 'tower_targeting', None)
+        if targeting is None:
+            targeting = cls(game)
+            game.tower_targeting = targeting
+        return targeting
+    
+    def _cell(self, x, y):
+        """Get the grid cell of a position"""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+    
+    def register_tower(self, tower, position, radius, mode=TargetMode.NEAREST):
+        """
+        Register a defensive building, or update its range
+        
+        Args:
+            tower: The building
+            position (tuple): World position of the building
+            radius (float): Defense range
+            mode (TargetMode): Target selection rule
+        """
+        x, y = position[0], position[1]
+        min_x, min_y = self._cell(x - radius, y - radius)
+        max_x, max_y = self._cell(x + radius, y + radius)
+        cells = [(cx, cy) for cx in range(min_x, max_x + 1) for cy in range(min_y, max_y + 1)]
+        
+        previous = self.towers.get(tower)
+        record = _TowerRecord(tower, x, y, radius, mode, cells)
+        if previous:
+            record.target = previous.target
+        self.towers[tower] = record
+    
+    def unregister_tower(self, tower):
+        """
+        Stop targeting for a building
+        
+        Args:
+            tower: The building
+        """
+        self.towers.pop(tower, None)
+    
+    def update(self):
+        """Index the enemies of this tick and refresh the targets of all towers"""
+        self._index_enemies()
+        self.queries = 0
+        if not self.towers:
+            return
+        
+        records = list(self.towers.values())
+        if not self.enemies:
+            for record in records:
+                record.target = None
+            return
+        
+        # Check the sticky targets of all towers in one pass
+        indices = np.array([self.enemy_indices.get(record.target, -1) for record in records])
+        tracked = indices >= 0
+        valid = np.zeros(len(records), dtype=bool)
+        if tracked.any():
+            tower_positions = np.array([(record.x, record.y) for record in records])
+            radii = np.array([record.radius for record in records])
+            offsets = self.positions[indices[tracked]] - tower_positions[tracked]
+            in_range = np.einsum('ij,ij->i', offsets, offsets) <= radii[tracked] ** 2
+            valid[tracked] = in_range & (self.health[indices[tracked]] > 0)
+        
+        for record, keep in zip(records, valid):
+            if not keep:
+                record.target = self._find_target(record)
+                self.queries += 1
+    
+    def _index_enemies(self):
+        """Bucket the living hostile enemies into the grid"""
+        entity_manager = getattr(self.game, 'entity_manager', None)
+        enemies = getattr(entity_manager, 'enemies', []) if entity_manager else []
+        allies = set(getattr(entity_manager, 'subservient_enemies', ())) if entity_manager else set()
+        
+        self.enemies = [enemy for enemy in enemies
+                        if enemy not in allies and getattr(enemy, 'health', 0) > 0 and hasattr(enemy, 'position')]
+        self.enemy_indices = {enemy: index for index, enemy in enumerate(self.enemies)}
+        count = len(self.enemies)
+        self.positions = np.array([(enemy.position[0], enemy.position[1]) for enemy in self.enemies],
+                                  dtype=np.float64).reshape(count, 2)
+        self.health = np.array([enemy.health for enemy in self.enemies], dtype=np.float64)
+        
+        self.grid = {}
+        if count:
+            cells = np.floor(self.positions / self.cell_size).astype(np.int64)
+            for index, (cx, cy) in enumerate(cells.tolist()):
+                self.grid.setdefault((cx, cy), []).append(index)
+    
+    def _find_target(self, record):
+        """
+        Pick a target among the enemies of a tower's cells
+        
+        Args:
+            record (_TowerRecord): The tower registration
+        
+        Returns:
+            The target enemy, or None if none is in range
+        """
+        candidates = [index for cell in record.cells for index in self.grid.get(cell, ())]
+        if not candidates:
+            return None
+        
+        candidates = np.array(candidates)
+        offsets = self.positions[candidates] - (record.x, record.y)
+        distances = np.einsum('ij,ij->i', offsets, offsets)
+        inside = distances <= record.radius ** 2
+        if not inside.any():
+            return None
+        candidates = candidates[inside]
+        distances = distances[inside]
+        
+        if record.mode == TargetMode.LOWEST_HEALTH:
+            # Lowest health first, the closest one on ties
+            best = np.lexsort((distances, self.health[candidates]))[0]
+        else:
+            best = np.argmin(distances)
+        return self.enemies[candidates[best]]
+    
+    def get_target(self, tower):
+        """
+        Get the current target of a tower
+        
+        Args:
+            tower: The building
+        
+        Returns:
+            The target enemy, or None
+        """
+        record = self.towers.get(tower)
+        if record is None or record.target is None:
+            return None
+        if getattr(record.target, 'health', 0) <= 0:
+            # Killed since the last tick
+            record.target = None
+            return None
+        return record.target
+    
+    def count_in_ring(self, center, outer_radius, inner_radius=0.0):
+        """
+        Count the enemies between two distances of a point
+        
+        Args:
+            center: Center position (x, y, ...)
+            outer_radius (float): Outer distance
+            inner_radius (float): Inner distance, 0 for a disc
+        
+        Returns:
+            int: Number of enemies in the ring
+        """
+        if not self.enemies:
+            return 0
+        
+        # Only the occupied cells overlapping the outer square can hold enemies
+        x, y = center[0], center[1]
+        min_x, min_y = self._cell(x - outer_radius, y - outer_radius)
+        max_x, max_y = self._cell(x + outer_radius, y + outer_radius)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) <= len(self.grid):
+            cells = [(cx, cy) for cx in range(min_x, max_x + 1) for cy in range(min_y, max_y + 1)]
+        else:
+            cells = [(cx, cy) for cx, cy in self.grid if min_x <= cx <= max_x and min_y <= cy <= max_y]
+        candidates = [index for cell in cells for index in self.grid.get(cell, ())]
+        if not candidates:
+            return 0
+        
+        offsets = self.positions[candidates] - (x, y)
+        distances = np.einsum('ij,ij->i', offsets, offsets)
+        inside = (distances <= outer_radius ** 2) & (distances >= inner_radius ** 2)
+        return int(np.count_nonzero(inside))
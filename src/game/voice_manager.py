@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Voice Manager for Nightfall Defenders
+Limits how many sounds play at once and decides which ones to keep
+"""
+
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from panda3d.core import AudioSound
+
+class SoundPool:
+    """Pre-created sound instances of one effect, allowing overlapping playback"""
+    
+    def __init__(self, sounds: List):
+        """
+        Initialize the pool
+        
+        Args:
+            sounds: Pre-created sound instances of the same file
+        """
+        self.sounds = list(sounds)
+        self.free = list(self.sounds)
+        self.busy = set()
+    
+    def acquire(self):
+        """
+        Take a free sound instance
+        
+        Returns:
+            A sound instance or None if all instances are playing
+        """
+        if not self.free:
+            return None
+        sound = self.free.pop()
+        self.busy.add(id(sound))
+        return sound
+    
+    def release(self, sound):
+        """
+        Return a sound instance to the pool
+        
+        Args:
+            sound: The sound instance to return
+        """
+        if id(sound) in self.busy:
+            self.busy.discard(id(sound))
+            self.free.append(sound)
+    
+    def stop_all(self):
+        """Stop every sound instance in the pool"""
+        for sound in self.sounds:
+            sound.stop()
+        self.free = list(self.sounds)
+        self.busy.clear()
+
+class VoiceManager:
+    """
+    Tracks active voices and enforces voice limits
+    
+    Voices are counted per sound category. When a category is full, the
+    least important voice is stolen if the new sound matters more, where
+    importance is priority scaled by volume and distance attenuation.
+    Identical sounds started within the same frame are capped, and finished
+    one-shot voices are reclaimed from their expected end time rather than
+    by polling every sound each frame.
+    """
+    
+    DEFAULT_LIMITS = {"music": 2, "sfx": 24, "ambient": 6, "ui": 4, "voice": 4}
+    DEFAULT_PRIORITIES = {"music": 100, "voice": 80, "ui": 70, "sfx": 50, "ambient": 30}
+    DEFAULT_POOL_SIZES = {"music": 2, "sfx": 4, "ambient": 1, "ui": 2, "voice": 1}
+    
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize the voice manager
+        
+        Args:
+            config: Optional "voices" section of the audio configuration
+        """
+        self.limits = dict(self.DEFAULT_LIMITS)
+        self.priorities = dict(self.DEFAULT_PRIORITIES)
+        self.pool_sizes = dict(self.DEFAULT_POOL_SIZES)
+        self.max_identical_per_frame = 3
+        
+        # Voices by sound ID, and sound IDs by category
+        self.voices = {}
+        self.category_voices = {}
+        
+        # Finished-voice detection: (end_time, sequence, sound_id)
+        self.end_times = []
+        self.sequence = itertools.count()
+        self.time = 0.0
+        
+        # Identical sound starts in the current frame
+        self.frame_starts = {}
+        
+        # Listener position for distance culling and stealing
+        self.listener_position = None
+        
+        # Statistics for the debug overlay
+        self.stats = {"started": 0, "stolen": 0, "culled": 0, "rate_limited": 0, "rejected": 0}
+        
+        if config:
+            self.configure(config)
+    
+    def configure(self, config: Dict):
+        """
+        Apply a "voices" configuration section
+        
+        Args:
+            config: Dictionary with optional limits, priorities, pool_sizes
+                and max_identical_per_frame entries
+        """
+        self.limits.update(config.get("limits", {}))
+        self.priorities.update(config.get("priorities", {}))
+        self.pool_sizes.update(config.get("pool_sizes", {}))
+        self.max_identical_per_frame = config.get("max_identical_per_frame", self.max_identical_per_frame)
+    
+    def get_pool_size(self, category: str) -> int:
+        """Get the number of instances to pre-create for a sound of a category"""
+        return self.pool_sizes.get(category, 1)
+    
+    def get_priority(self, category: str) -> float:
+        """Get the default priority of a category"""
+        return self.priorities.get(category, 50)
+    
+    def get_attenuation(self, position: Optional[Tuple[float, float, float]],
+                        min_distance: float, max_distance: float) -> float:
+        """
+        Estimate how loud a sound is at the listener from its distance
+        
+        Args:
+            position: World position of the sound or None for non-positional
+            min_distance: Distance within which the sound is at full volume
+            max_distance: Distance beyond which the sound is inaudible
+        
+        Returns:
+            float: Attenuation from 0.0 (inaudible) to 1.0
+        """
+        if position is None or self.listener_position is None:
+            return 1.0
+        
+        dx = position[0] - self.listener_position[0]
+        dy = position[1] - self.listener_position[1]
+        dz = position[2] - self.listener_position[2]
+        distance = (dx * dx + dy * dy + dz * dz) ** 0.5
+        
+        if distance <= min_distance:
+            return 1.0
+        if distance >= max_distance:
+            return 0.0
+        return 1.0 - (distance - min_distance) / (max_distance - min_distance)
+    
+    def request_voice(self, sound_name: str, category: str, importance: float, attenuation: float):
+        """
+        Decide whether a new sound may start
+        
+        Args:
+            sound_name: Name of the sound
+            category: Sound category
+            importance: Priority scaled by volume and attenuation
+            attenuation: Distance attenuation of the sound
+        
+        Returns:
+            tuple: (allowed, sound ID of the voice to steal or None)
+        """
+        if attenuation <= 0.0:
+            self.stats["culled"] += 1
+            return False, None
+        
+        if self.frame_starts.get(sound_name, 0) >= self.max_identical_per_frame:
+            self.stats["rate_limited"] += 1
+            return False, None
+        
+        active = self.category_voices.get(category, ())
+        if len(active) < self.limits.get(category, len(active) + 1):
+            return True, None
+        
+        victim = self.find_weakest_voice(active)
+        if victim is not None and self.voices[victim]["importance"] < importance:
+            return True, victim
+        
+        self.stats["rejected"] += 1
+        return False, None
+    
+    def find_weakest_voice(self, sound_ids) -> Optional[str]:
+        """
+        Find the least important voice among some sound IDs
+        
+        Args:
+            sound_ids: Candidate sound IDs
+        
+        Returns:
+            str: Sound ID of the least important voice or None
+        """
+        weakest = None
+        weakest_importance = None
+        for sound_id in sound_ids:
+            importance = self.voices[sound_id]["importance"]
+            if weakest is None or importance < weakest_importance:
+                weakest = sound_id
+                weakest_importance = importance
+        return weakest
+    
+    def add_voice(self, sound_id: str, voice: Dict, duration: float = 0.0):
+        """
+        Register a started voice
+        
+        Args:
+            sound_id: ID of the sound instance
+            voice: Voice data; needs "sound", "sound_name", "category",
+                "importance" and "loop" entries
+            duration: Length of the sound in seconds (0 if unknown)
+        """
+        self.voices[sound_id] = voice
+        self.category_voices.setdefault(voice["category"], set()).add(sound_id)
+        self.frame_starts[voice["sound_name"]] = self.frame_starts.get(voice["sound_name"], 0) + 1
+        self.stats["started"] += 1
+        
+        if not voice["loop"]:
+            # Unknown lengths are checked again shortly after starting
+            end_time = self.time + (duration if duration > 0 else 0.5)
+            heapq.heappush(self.end_times, (end_time, next(self.sequence), sound_id))
+    
+    def remove_voice(self, sound_id: str) -> Optional[Dict]:
+        """
+        Unregister a voice
+        
+        Args:
+            sound_id: ID of the sound instance
+        
+        Returns:
+            dict: The removed voice data or None
+        """
+        voice = self.voices.pop(sound_id, None)
+        if voice is not None:
+            self.category_voices.get(voice["category"], set()).discard(sound_id)
+        return voice
+    
+    def mark_stolen(self):
+        """Count a voice that was stopped to make room for another"""
+        self.stats["stolen"] += 1
+    
+    def update(self, dt: float) -> List[str]:
+        """
+        Advance the voice clock and start a new frame
+        
+        Args:
+            dt: Delta time in seconds
+        
+        Returns:
+            list: Sound IDs of voices that finished playing
+        """
+        self.time += dt
+        self.frame_starts.clear()
+        
+        finished = []
+        while self.end_times and self.end_times[0][0] <= self.time:
+            _, _, sound_id = heapq.heappop(self.end_times)
+            voice = self.voices.get(sound_id)
+            if voice is None:
+                continue
+            
+            # Sounds that outlast their estimated length are checked again later
+            if voice["sound"].status() == AudioSound.PLAYING:
+                heapq.heappush(self.end_times, (self.time + 0.25, next(self.sequence), sound_id))
+            else:
+                finished.append(sound_id)
+        
+        return finished
+    
+    def clear(self):
+        """Forget all voices"""
+        self.voices.clear()
+        self.category_voices.clear()
+        self.end_times = []
+        self.frame_starts.clear()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+World Chunks for Nightfall Defenders
+Streams the static world in fixed-size chunks around the camera
+"""
+
+import math
+import random
+from panda3d.core import RigidBodyCombiner, Vec3
+
+class WorldChunk:
+    """One square of the world, generated from its own seed"""
+    
+    def __init__(self, coords, seed):
+        """
+        Initialize the chunk
+        
+        Args:
+            coords (tuple): Chunk coordinates (cx, cy)
+            seed (int): Seed the chunk layout is generated from
+        """
+        self.coords = coords
+        self.seed = seed
+        self.loaded = False
+        
+        # Scene graph: static decoration is flattened, resource nodes sit
+        # under a combiner, props belong to other systems and are only hidden
+        self.root = None
+        self.static_node = None
+        self.combiner = None
+        self.props_node = None
+        self.combiner_dirty = False
+        
+        # Resource nodes by layout index, and their saved state while unloaded
+        self.resource_nodes = {}
+        self.saved_resource_state = {}
+    
+    def mark_dirty(self):
+        """Recollect the combined geometry at the next update"""
+        self.combiner_dirty = True
+
+class WorldChunkManager:
+    """
+    Loads and unloads world chunks around the camera
+    
+    Each chunk's trees, rocks and resource nodes are generated from a seed
+    derived from the world seed and the chunk coordinates, so an unloaded
+    chunk is regenerated exactly when it is loaded again. Static decoration
+    is flattened into a few Geoms per chunk and the resource nodes of a
+    chunk share a RigidBodyCombiner, so the draw cost depends on the number
+    of loaded chunks rather than the number of objects. Chunks load within
+    load_radius of the camera and unload beyond unload_radius, so moving
+    back and forth across a chunk border does not reload it.
+    """
+    
+    CHUNK_SIZE = 32.0
+    
+    # Decoration and resource counts per chunk (min, max)
+    TREES_PER_CHUNK = (1, 4)
+    ROCKS_PER_CHUNK = (0, 3)
+    RESOURCE_NODES_PER_CHUNK = (2, 4)
+    
+    # Keep the player spawn area clear
+    SPAWN_CLEARANCE = 12.0
+    
+    RESOURCE_TYPES = ["wood", "stone", "crystal", "herb"]
+    RESOURCE_WEIGHTS = [0.5, 0.3, 0.1, 0.1]
+    
+    def __init__(self, game, world_seed=None, load_radius=2, unload_radius=3):
+        """
+        Initialize the chunk manager
+        
+        Args:
+            game: The main game instance
+            world_seed (int): Seed of the world, random if None
+            load_radius (int): Chunks within this many chunks of the camera are loaded
+            unload_radius (int): Chunks further than this are unloaded
+        """
+        self.game = game
+        self.world_seed = world_seed if world_seed is not None else random.randrange(2 ** 31)
+        self.load_radius = load_radius
+        self.unload_radius = max(unload_radius, load_radius + 1)
+        
+        # Chunks load a few per update so crossing a border never stalls a frame
+        self.max_loads_per_update = 2
+        
+        self.chunks = {}
+        self.center_chunk = None
+        
+        self.root = game.render.attachNewNode("WorldChunks")
+        self.prototypes = {}
+    
+    def get_chunk_coords(self, position):
+        """
+        Get the coordinates of the chunk containing a world position
+        
+        Args:
+            position: World position (Vec3 or x, y tuple)
+        
+        Returns:
+            tuple: Chunk coordinates (cx, cy)
+        """
+        return (int(math.floor(position[0] / self.CHUNK_SIZE)),
+                int(math.floor(position[1] / self.CHUNK_SIZE)))
+    
+    def get_chunk_seed(self, coords):
+        """
+        Get the generation seed of a chunk
+        
+        Args:
+            coords (tuple): Chunk coordinates (cx, cy)
+        
+        Returns:
+            int: Seed, stable across runs for the same world seed
+        """
+        cx, cy = coords
+        return (self.world_seed * 73856093 ^ cx * 19349663 ^ cy * 83492791) & 0x7FFFFFFF
+    
+    def get_chunk(self, coords):
+        """Get a chunk, creating its record if needed"""
+        chunk = self.chunks.get(coords)
+        if chunk is None:
+            chunk = WorldChunk(coords, self.get_chunk_seed(coords))
+            self.chunks[coords] = chunk
+        return chunk
+    
+    def generate_layout(self, coords):
+        """
+        Generate the contents of a chunk from its seed
+        
+        Args:
+            coords (tuple): Chunk coordinates (cx, cy)
+        
+        Returns:
+            dict: Lists of "trees", "rocks" and "resource_nodes" placements
+        """
+        rng = random.Random(self.get_chunk_seed(coords))
+        origin_x = coords[0] * self.CHUNK_SIZE
+        origin_y = coords[1] * self.CHUNK_SIZE
+        
+        def random_position():
+            x = origin_x + rng.uniform(0, self.CHUNK_SIZE)
+            y = origin_y + rng.uniform(0, self.CHUNK_SIZE)
+            if abs(x) < self.SPAWN_CLEARANCE and abs(y) < self.SPAWN_CLEARANCE:
+                return None
+            return x, y
+        
+        layout = {"trees": [], "rocks": [], "resource_nodes": []}
+        for _ in range(rng.randint(*self.TREES_PER_CHUNK)):
+            position = random_position()
+            if position:
+                layout["trees"].append(position)
+        
+        for _ in range(rng.randint(*self.ROCKS_PER_CHUNK)):
+            position = random_position()
+            scale = rng.uniform(0.8, 1.2)
+            if position:
+                layout["rocks"].append((position[0], position[1], scale))
+        
+        for _ in range(rng.randint(*self.RESOURCE_NODES_PER_CHUNK)):
+            position = random_position()
+            resource_type = rng.choices(self.RESOURCE_TYPES, weights=self.RESOURCE_WEIGHTS)[0]
+            if position:
+                layout["resource_nodes"].append((position[0], position[1], resource_type))
+        
+        return layout
+    
+    def get_ground_height(self, x, y):
+        """Get the terrain height at a position, 0 without terrain"""
+        terrain = getattr(self.game, 'terrain', None)
+        if terrain is None:
+            return 0.0
+        return terrain.height_at(x, y)
+    
+    def _get_prototype(self, model_path):
+        """Load a decoration model once and share it between chunks"""
+        if model_path not in self.prototypes:
+            self.prototypes[model_path] = self.game.loader.loadModel(model_path)
+        return self.prototypes[model_path]
+    
+    def _build_static_geometry(self, chunk, layout):
+        """
+        Build the flattened trees and rocks of a chunk
+        
+        Args:
+            chunk (WorldChunk): The chunk being loaded
+            layout (dict): The chunk layout
+        """
+        chunk.static_node = chunk.root.attachNewNode("Static")
+        box = self._get_prototype("models/box")
+        
+        for x, y in layout["trees"]:
+            tree = box.copyTo(chunk.static_node)
+            tree.setScale(1, 1, 3)
+            tree.setPos(x, y, self.get_ground_height(x, y) + 1.5)
+            tree.setColor((0.5, 0.3, 0.1, 1))  # Brown trunk color
+            
+            tree_top = box.copyTo(tree)
+            tree_top.setScale(2, 2, 2)
+            tree_top.setPos(0, 0, 1.5)
+            tree_top.setColor((0.1, 0.6, 0.1, 1))  # Green leaves color
+        
+        for x, y, scale in layout["rocks"]:
+            rock = box.copyTo(chunk.static_node)
+            rock.setScale(1.5 * scale, 1.5 * scale, 0.8 * scale)
+            rock.setPos(x, y, self.get_ground_height(x, y) + 0.4 * scale)
+            rock.setColor((0.5, 0.5, 0.5, 1))  # Gray rock color
+        
+        # Bake transforms and colors into a few Geoms for the whole chunk
+        chunk.static_node.flattenStrong()
+    
+    def _create_resource_nodes(self, chunk, layout):
+        """
+        Create the resource nodes of a chunk, restoring any saved state
+        
+        Args:
+            chunk (WorldChunk): The chunk being loaded
+            layout (dict): The chunk layout
+        """
+        chunk.combiner = chunk.root.attachNewNode(RigidBodyCombiner(f"Resources_{chunk.coords}"))
+        entity_manager = getattr(self.game, 'entity_manager', None)
+        if entity_manager is None:
+            return
+        
+        for index, (x, y, resource_type) in enumerate(layout["resource_nodes"]):
+            entity_manager.create_resource_node(Vec3(x, y, self.get_ground_height(x, y)), resource_type)
+            node = entity_manager.resource_nodes[-1]
+            node.root.wrtReparentTo(chunk.combiner)
+            node.chunk = chunk
+            
+            saved = chunk.saved_resource_state.get(index)
+            if saved is not None:
+                resources, is_depleted, regeneration_timer = saved
+                if is_depleted:
+                    node.deplete()
+                node.resources = resources
+                node.regeneration_timer = regeneration_timer
+                node._update_model_scale()
+            
+            chunk.resource_nodes[index] = node
+        
+        chunk.combiner.node().collect()
+    
+    def load_chunk(self, coords):
+        """
+        Load a chunk, generating its contents from its seed
+        
+        Args:
+            coords (tuple): Chunk coordinates (cx, cy)
+        """
+        chunk = self.get_chunk(coords)
+        if chunk.loaded:
+            return
+        
+        if chunk.root is None:
+            chunk.root = self.root.attachNewNode(f"Chunk_{coords[0]}_{coords[1]}")
+            chunk.props_node = chunk.root.attachNewNode("Props")
+        
+        layout = self.generate_layout(coords)
+        try:
+            self._build_static_geometry(chunk, layout)
+        except Exception as e:
+            print(f"Error creating decoration for chunk {coords}: {e}")
+        self._create_resource_nodes(chunk, layout)
+        
+        chunk.props_node.unstash()
+        chunk.loaded = True
+    
+    def unload_chunk(self, coords):
+        """
+        Unload a chunk, keeping what is needed to restore it
+        
+        Args:
+            coords (tuple): Chunk coordinates (cx, cy)
+        """
+        chunk = self.chunks.get(coords)
+        if chunk is None or not chunk.loaded:
+            return
+        
+        # Remember harvested and depleted resource nodes
+        entity_manager = getattr(self.game, 'entity_manager', None)
+        for index, node in chunk.resource_nodes.items():
+            if node.resources != node.initial_resources or node.is_depleted:
+                chunk.saved_resource_state[index] = (node.resources, node.is_depleted,
+                                                     node.regeneration_timer)
+            else:
+                chunk.saved_resource_state.pop(index, None)
+            if entity_manager is not None:
+                entity_manager.remove_entity(node)
+            node.cleanup()
+        chunk.resource_nodes = {}
+        
+        for node_path in (chunk.static_node, chunk.combiner):
+            if node_path is not None:
+                node_path.removeNode()
+        chunk.static_node = None
+        chunk.combiner = None
+        
+        # Props belong to other systems; hide them with the chunk
+        chunk.props_node.stash()
+        chunk.loaded = False
+    
+    def attach_prop(self, node_path, position):
+        """
+        Put a node owned by another system (such as a POI) into its chunk
+        
+        The prop is hidden while its chunk is unloaded.
+        
+        Args:
+            node_path (NodePath): The prop's node
+            position: World position of the prop
+        """
+        coords = self.get_chunk_coords(position)
+        chunk = self.get_chunk(coords)
+        if chunk.root is None:
+            chunk.root = self.root.attachNewNode(f"Chunk_{coords[0]}_{coords[1]}")
+            chunk.props_node = chunk.root.attachNewNode("Props")
+            chunk.props_node.stash()
+        node_path.wrtReparentTo(chunk.props_node)
+    
+    def get_loaded_chunks(self):
+        """Get the coordinates of all loaded chunks"""
+        return [coords for coords, chunk in self.chunks.items() if chunk.loaded]
+    
+    def update(self, position):
+        """
+        Stream chunks around a position
+        
+        Args:
+            position: Camera (or player) world position
+        """
+        center = self.get_chunk_coords(position)
+        
+        # Unload chunks beyond the unload radius
+        for coords in self.get_loaded_chunks():
+            if max(abs(coords[0] - center[0]), abs(coords[1] - center[1])) > self.unload_radius:
+                self.unload_chunk(coords)
+        
+        # Load missing chunks within the load radius, nearest first
+        missing = []
+        for dx in range(-self.load_radius, self.load_radius + 1):
+            for dy in range(-self.load_radius, self.load_radius + 1):
+                coords = (center[0] + dx, center[1] + dy)
+                chunk = self.chunks.get(coords)
+                if chunk is None or not chunk.loaded:
+                    missing.append((dx * dx + dy * dy, coords))
+        
+        limit = len(missing) if self.center_chunk is None else self.max_loads_per_update
+        for _, coords in sorted(missing)[:limit]:
+            self.load_chunk(coords)
+        self.center_chunk = center
+        
+        # Recollect combiners whose resource nodes changed appearance
+        for chunk in self.chunks.values():
+            if chunk.loaded and chunk.combiner_dirty:
+                chunk.combiner.node().collect()
+                chunk.combiner_dirty = False
+    
+    def cleanup(self):
+        """Unload every chunk and remove the chunk nodes"""
+        for coords in self.get_loaded_chunks():
+            self.unload_chunk(coords)
+        self.root.removeNode()
+        self.chunks = {}
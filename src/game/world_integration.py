@@ -13,9 +13,11 @@ from game.npc_system import NPCManager, NPCType, DialogueType
 from game.quest_system import QuestManager, QuestType, QuestObjective, ObjectiveType
 from game.boss_patterns import BossPatternSystem, PatternType, BossPhase
 from game.challenge_mode import ChallengeSystem
+from game.game_events import connect_progress_events
 # Import city automation system
 from game.city_automation import CityGrid, ResourceManager, BuildingType, ResourceType
 from game.city_buildings import create_building
+from game.city_economy import CityEconomy
 
 class WorldIntegration:
     """Handles the integration of world systems into the main game"""
@@ -41,6 +43,10 @@ class WorldIntegration:
             
         if not hasattr(game, 'challenge_system'):
             game.challenge_system = ChallengeSystem(game)
+        
+        # Feed kills to the quests and challenges
+        if hasattr(game, 'event_bus'):
+            connect_progress_events(game)
             
         # Initialize city automation system
         if not hasattr(game, 'city_manager'):
@@ -55,6 +61,7 @@ class WorldIntegration:
                 self.grid = CityGrid(50, 50)  # 50x50 grid for the city
                 self.resource_manager = ResourceManager()
                 self.buildings = {}
+                self.economy = CityEconomy(self)
                 self.next_building_id = 1
                 
                 # Building placement information
@@ -74,12 +81,17 @@ class WorldIntegration:
             
             def update(self, dt):
                 """Update city state"""
-                # Update resource manager
-                self.resource_manager.update(dt)
+                # Resources and building work advance on the economy tick
+                self.economy.update(dt)
                 
-                # Update all buildings
+                # Defense still runs every frame
                 for building in self.buildings.values():
-                    building.update(dt, self)
+                    if building.defense_range > 0 or building.targeting_registered:
+                        building.update_defense(dt, self)
+            
+            def catch_up(self, elapsed):
+                """Simulate the city over time spent away in one pass"""
+                self.economy.catch_up(elapsed)
             
             def create_building(self, building_type, position):
                 """Create a new building"""
@@ -104,6 +116,7 @@ class WorldIntegration:
                 """Destroy a building"""
                 if building_id in self.buildings:
                     building = self.buildings[building_id]
+                    building.release_targeting(self)
                     
                     # Remove visual representation
                     if building.node_path:
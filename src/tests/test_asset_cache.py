@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test the content-addressed asset cache
+"""
+
+import sys
+import os
+import importlib
+import tempfile
+import unittest
+from enum import Enum
+
+import numpy as np
+
+# Add the repository root to Python path (the asset tools import through src)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from src.tools.asset_generator import asset_cache
+from src.tools.asset_generator.asset_cache import AssetCache, generate_cached, generate_cached_batch
+from src.tools.asset_generator.terrain_generator import TerrainGenerator
+
+class MockShape(Enum):
+    """Mock parameter enum"""
+    ROUND = "round"
+
+class MockGenerator:
+    """Mock generator counting its generations"""
+    def __init__(self, cache):
+        self.cache = cache
+        self.calls = 0
+    
+    def generate(self, asset_id, params, seed):
+        self.calls += 1
+        return {"asset_id": asset_id, "params": params, "seed": seed}
+    
+    def generate_batch(self, requests):
+        return [self.generate(*request) for request in requests]
+
+class TestAssetCache(unittest.TestCase):
+    """Test cache keys, persistence and eviction"""
+    
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.cache_dir.cleanup()
+    
+    def test_keys_are_canonical(self):
+        """Equal requests share a key whatever their spelling"""
+        cache = AssetCache(self.cache_dir.name)
+        first = cache.make_key("gen", "1", "rock", {"size": 2, "shape": MockShape.ROUND, "tint": (1, 2)}, 5)
+        second = cache.make_key("gen", "1", "rock", {"tint": [1, 2], "shape": MockShape.ROUND, "size": np.int64(2)}, 5)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, cache.make_key("gen", "1", "rock", {"size": 3, "shape": MockShape.ROUND, "tint": (1, 2)}, 5))
+        self.assertNotEqual(first, cache.make_key("gen", "2", "rock", {"size": 2, "shape": MockShape.ROUND, "tint": (1, 2)}, 5))
+    
+    def test_entries_persist(self):
+        """A new cache instance finds the entries of an earlier one"""
+        generator = MockGenerator(AssetCache(self.cache_dir.name))
+        asset = generate_cached(generator, "rock", {"size": 2}, 5)
+        
+        generator = MockGenerator(AssetCache(self.cache_dir.name))
+        self.assertEqual(generate_cached(generator, "rock", {"size": 2}, 5), asset)
+        self.assertEqual(generator.calls, 0)
+        
+        # Unseeded requests are never cached
+        generate_cached(generator, "rock", {"size": 2}, None)
+        self.assertEqual(generator.calls, 1)
+    
+    def test_batch_generates_missing_only(self):
+        """Batched generation only sends uncached requests to the generator"""
+        generator = MockGenerator(AssetCache(self.cache_dir.name))
+        generate_cached(generator, "rock", {"size": 2}, 5)
+        
+        requests = [("rock", {"size": 2}, 5), ("tree", {"size": 1}, 6), ("bush", {}, None)]
+        assets = generate_cached_batch(generator, requests, generator.generate_batch)
+        self.assertEqual([asset["asset_id"] for asset in assets], ["rock", "tree", "bush"])
+        self.assertEqual(generator.calls, 3)
+    
+    def test_lru_eviction(self):
+        """The least recently used entries go first when the cache is full"""
+        cache = AssetCache(self.cache_dir.name, max_size_mb=0.01)
+        payload = bytes(4000)
+        cache.put("a" * 64, payload)
+        cache.put("b" * 64, payload)
+        cache.get("a" * 64)
+        cache.put("c" * 64, payload)
+        
+        self.assertEqual(set(cache.entries), {"a" * 64, "c" * 64})
+        self.assertFalse(os.path.exists(cache.get_entry_path("b" * 64)))
+        self.assertEqual(cache.stats["evictions"], 1)
+    
+    def test_recipe_change_regenerates_one_type(self):
+        """Changing one terrain recipe only resynthesizes the tiles using it"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            generator = TerrainGenerator(output_dir, cache=AssetCache(self.cache_dir.name))
+            first = generator.generate_all_terrain_types(variations_per_type=2, seed=42)
+            
+            generator = TerrainGenerator(output_dir, cache=AssetCache(self.cache_dir.name))
+            generator.tile_recipes["desert"]["noise"]["scale"] = 16.0
+            second = generator.generate_all_terrain_types(variations_per_type=2, seed=42)
+        
+        self.assertEqual(generator.cache.stats["misses"], 2)
+        self.assertEqual(generator.cache.stats["hits"], 2 * (len(first) - 1))
+        self.assertTrue(np.array_equal(np.array(first["grass"][0]), np.array(second["grass"][0])))
+    
+    def test_base_palette_and_size_change_keys(self):
+        """Tiles built on another terrain miss when its palette or the tile size changes"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            cache = AssetCache(self.cache_dir.name)
+            generator = TerrainGenerator(output_dir, cache=cache)
+            generator.generate_tileset("forest", variations=2, seed=3)
+            
+            generator.terrain_palettes["grass"]["variation"] = [(0, 0, 0), (10, 10, 10)]
+            generator.generate_tileset("forest", variations=2, seed=3)
+            self.assertEqual(cache.stats["misses"], 4)
+            
+            generator.pixel_scale = 2
+            tiles = generator.generate_tileset("forest", variations=2, seed=3)
+            generator.tile_size = 32
+            generator.generate_tileset("forest", variations=2, seed=3)
+            self.assertEqual(cache.stats["misses"], 8)
+            self.assertEqual(tiles[0].size, (128, 128))
+    
+    def test_tileset_writes_manifest_once(self):
+        """A tileset of new tiles writes the manifest a single time"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            cache = AssetCache(self.cache_dir.name)
+            writes = []
+            flush = cache.flush
+            cache.flush = lambda force=False: (writes.append(cache.manifest_dirty), flush(force))
+            TerrainGenerator(output_dir, cache=cache).generate_tileset("grass", variations=4, seed=1)
+            
+            self.assertEqual(writes, [True])
+            self.assertEqual(len(AssetCache(self.cache_dir.name).entries), 4)
+
+class TestGeneratorVersion(unittest.TestCase):
+    """Test that generator versions follow their helper modules"""
+    
+    def setUp(self):
+        self.package_dir = tempfile.TemporaryDirectory()
+        package = os.path.join(self.package_dir.name, "versioned_tools")
+        os.mkdir(package)
+        open(os.path.join(package, "__init__.py"), "w").close()
+        self.write(package, "helper.py", "def shade(x):\n    return x\n")
+        self.write(package, "generator.py", "from versioned_tools.helper import shade\n\n"
+                                            "class Generator:\n    pass\n")
+        self.package = package
+        sys.path.insert(0, self.package_dir.name)
+    
+    def tearDown(self):
+        sys.path.remove(self.package_dir.name)
+        for name in ("versioned_tools", "versioned_tools.helper", "versioned_tools.generator"):
+            sys.modules.pop(name, None)
+        self.package_dir.cleanup()
+    
+    def write(self, package, name, source):
+        with open(os.path.join(package, name), "w") as f:
+            f.write(source)
+    
+    def get_version(self):
+        asset_cache._generator_versions.clear()
+        importlib.invalidate_caches()
+        for name in ("versioned_tools.helper", "versioned_tools.generator"):
+            sys.modules.pop(name, None)
+        generator = importlib.import_module("versioned_tools.generator")
+        return asset_cache.get_generator_version(generator.Generator())
+    
+    def test_helper_edit_changes_version(self):
+        """Editing a helper module of a generator invalidates its cached assets"""
+        before = self.get_version()
+        self.assertEqual(self.get_version(), before)
+        self.write(self.package, "helper.py", "def shade(x):\n    return x * 2\n")
+        self.assertNotEqual(self.get_version(), before)
+    
+    def test_animation_helpers_are_hashed(self):
+        """The animation generator's version covers the rig and the rasterizer"""
+        from src.tools.asset_generator import animation_generator
+        names = [module.__name__.rpartition(".")[2]
+                 for module in asset_cache._get_source_modules(animation_generator)]
+        self.assertIn("verlet_rig", names)
+        self.assertIn("particle_rasterizer", names)
+        self.assertNotIn("asset_cache", names)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the tick-based city economy
+"""
+
+import sys
+import os
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.city_economy import CityEconomy
+from game.city_automation import Building, BuildingType, BuildingState, ResourceManager, ResourceType
+
+class MockGame:
+    """Mock game without effects or models"""
+    pass
+
+class MockCityManager:
+    """Mock city manager recording the economy events"""
+    def __init__(self):
+        self.game = MockGame()
+        self.resource_manager = ResourceManager()
+        self.buildings = {}
+        self.events = []
+    
+    def add(self, building):
+        self.buildings[building.building_id] = building
+        return building
+    
+    def grid_to_world(self, grid_pos):
+        return (grid_pos[0], grid_pos[1], 0)
+    
+    def on_building_completed(self, building):
+        self.events.append(('completed', building.building_id))
+    
+    def on_building_upgraded(self, building):
+        self.events.append(('upgraded', building.building_id))
+    
+    def on_storage_full(self, resource_type):
+        self.events.append(('full', resource_type))
+
+def make_building(building_id, production=None, consumption=None, workers=1,
+                  state=BuildingState.OPERATIONAL):
+    """Create a building with flows and workers"""
+    building = Building(building_id, building_id, BuildingType.WORKSHOP, (0, 0))
+    building.production = dict(production or {})
+    building.consumption = dict(consumption or {})
+    building.worker_capacity = workers
+    building.assigned_workers = workers
+    building.state = state
+    return building
+
+def make_city():
+    """Create a city with a farm, a sawmill under construction and a forge"""
+    city = MockCityManager()
+    city.add(make_building("farm", {ResourceType.FOOD: 0.5}))
+    city.add(make_building("sawmill", {ResourceType.WOOD: 2.0}, workers=2,
+                           state=BuildingState.UNDER_CONSTRUCTION))
+    city.add(make_building("forge", {ResourceType.IRON: 0.2}, {ResourceType.WOOD: 0.3}))
+    city.resource_manager.resources[ResourceType.WOOD] = 20
+    return city
+
+class TestCityEconomy(unittest.TestCase):
+    """Test the economy ticks, state changes and catch-up"""
+    
+    def test_ticks_match_catch_up(self):
+        """Frame updates and a single catch-up reach the same city"""
+        ticked = make_city()
+        economy = CityEconomy(ticked)
+        for _ in range(24000):
+            economy.update(0.025)
+        
+        caught_up = make_city()
+        CityEconomy(caught_up).catch_up(600.0)
+        
+        for resource_type in ResourceType:
+            self.assertAlmostEqual(ticked.resource_manager.get_resource(resource_type),
+                                   caught_up.resource_manager.get_resource(resource_type), places=6)
+        self.assertEqual(ticked.events, caught_up.events)
+        self.assertEqual(ticked.buildings["sawmill"].state, BuildingState.OPERATIONAL)
+        
+        # Food fills up after 200s, the sawmill finishes after 500s and then fills the wood store
+        self.assertEqual(caught_up.events, [('full', ResourceType.FOOD), ('completed', 'sawmill'),
+                                            ('full', ResourceType.WOOD)])
+        self.assertEqual(caught_up.resource_manager.get_resource(ResourceType.WOOD), 100)
+        self.assertAlmostEqual(caught_up.resource_manager.get_resource(ResourceType.FOOD), 100)
+    
+    def test_matches_frame_integration(self):
+        """The closed form agrees with the per-frame building update"""
+        economy_city = make_city()
+        CityEconomy(economy_city).catch_up(60.0)
+        
+        frame_city = make_city()
+        for _ in range(6000):
+            for building in frame_city.buildings.values():
+                building.update(0.01, frame_city)
+        
+        for resource_type in (ResourceType.FOOD, ResourceType.WOOD, ResourceType.IRON):
+            self.assertAlmostEqual(economy_city.resource_manager.get_resource(resource_type),
+                                   frame_city.resource_manager.get_resource(resource_type), places=4)
+        self.assertAlmostEqual(economy_city.buildings["sawmill"].construction_progress,
+                               frame_city.buildings["sawmill"].construction_progress, places=4)
+    
+    def test_empty_input_throttles_consumers(self):
+        """A consumer of an empty resource runs at the rate of its producers"""
+        city = MockCityManager()
+        city.add(make_building("woodcutter", {ResourceType.WOOD: 1.0}))
+        city.add(make_building("smelter", {ResourceType.IRON: 1.0}, {ResourceType.WOOD: 2.0}))
+        city.resource_manager.resources[ResourceType.WOOD] = 10
+        
+        CityEconomy(city).catch_up(30.0)
+        self.assertAlmostEqual(city.resource_manager.get_resource(ResourceType.WOOD), 0)
+        self.assertAlmostEqual(city.resource_manager.get_resource(ResourceType.IRON), 20)
+    
+    def test_scarcest_input_throttles_consumers(self):
+        """A consumer of two empty resources runs at the share of the scarcest one"""
+        city = MockCityManager()
+        city.add(make_building("woodcutter", {ResourceType.WOOD: 1.0}))
+        city.add(make_building("quarry", {ResourceType.STONE: 0.5}))
+        city.add(make_building("foundry", {ResourceType.IRON: 1.0},
+                               {ResourceType.WOOD: 2.0, ResourceType.STONE: 2.0}))
+        
+        CityEconomy(city).catch_up(40.0)
+        self.assertAlmostEqual(city.resource_manager.get_resource(ResourceType.IRON), 10)
+        self.assertAlmostEqual(city.resource_manager.get_resource(ResourceType.WOOD), 20)
+        self.assertAlmostEqual(city.resource_manager.get_resource(ResourceType.STONE), 0)
+    
+    def test_upgrade_and_repair_complete(self):
+        """Upgrades and repairs finish at their exact time"""
+        city = MockCityManager()
+        smithy = city.add(make_building("smithy", {ResourceType.IRON: 1.0}, workers=4,
+                                        state=BuildingState.UPGRADING))
+        wall = city.add(make_building("wall", workers=2, state=BuildingState.DAMAGED))
+        wall.health = 95.0
+        economy = CityEconomy(city)
+        
+        economy.catch_up(99.0)
+        self.assertEqual(wall.state, BuildingState.OPERATIONAL)
+        self.assertEqual(wall.health, wall.max_health)
+        self.assertEqual(smithy.state, BuildingState.UPGRADING)
+        
+        economy.catch_up(411.0)
+        self.assertEqual(smithy.level, 2)
+        self.assertEqual(city.events, [('upgraded', 'smithy')])
+        self.assertAlmostEqual(city.resource_manager.get_resource(ResourceType.IRON), 10 * 1.3)
+
+if __name__ == "__main__":
+    unittest.main()
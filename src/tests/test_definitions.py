@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the compiled definitions store and the indexed recipe lookups
+"""
+
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.ability_system import AbilityType, ElementType
+from game import definitions
+from game.definitions import DefinitionStore, compile_definitions, build_tables
+from game.fusion_recipe_manager import FusionRecipeManager, FusionRecipe
+from game.harmonization_manager import HarmonizationManager
+
+class MockAbility:
+    """Mock ability with the attributes recipes match on"""
+    def __init__(self, ability_id, ability_type, element_type):
+        self.ability_id = ability_id
+        self.ability_type = ability_type
+        self.element_type = element_type
+        self.is_harmonized = False
+
+class TestDefinitionStore(unittest.TestCase):
+    """Test compiling and loading the definitions"""
+    
+    def setUp(self):
+        """Compile the definitions to a temporary artefact"""
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.output_dir.name, "definitions.json")
+        compile_definitions(self.path)
+    
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.output_dir.cleanup()
+    
+    def test_round_trip(self):
+        """The compiled tables load back equal to the source tables"""
+        store = DefinitionStore(self.path)
+        store.load()
+        
+        self.assertTrue(store.compiled)
+        self.assertEqual(store.tables, build_tables())
+        self.assertIs(store.get_table("skills")["warrior_root"]["type"], build_tables()["skills"]["warrior_root"]["type"])
+        self.assertIsInstance(store.get_table("skills")["warrior_root"]["position"], tuple)
+        self.assertEqual(store.get_index("fusion_recipes"), definitions.build_indexes(build_tables())["fusion_recipes"])
+    
+    def test_fresh_tables_are_copies(self):
+        """Fresh tables can be modified without changing the store"""
+        store = DefinitionStore(self.path)
+        relics = store.get_table("relics", fresh=True)
+        relics["hunters_amulet"]["effects"]["damage_multiplier"] = 5.0
+        self.assertEqual(store.get_table("relics")["hunters_amulet"]["effects"]["damage_multiplier"], 1.2)
+    
+    def test_stale_artefact_falls_back(self):
+        """An artefact from other sources or another format is not used"""
+        with open(self.path) as f:
+            artefact = json.load(f)
+        artefact["fingerprint"] = "outdated"
+        with open(self.path, 'w') as f:
+            json.dump(artefact, f)
+        
+        store = DefinitionStore(self.path)
+        store.load()
+        self.assertFalse(store.compiled)
+        self.assertEqual(len(store.get_table("fusion_recipes")), 12)
+
+class TestIndexedLookups(unittest.TestCase):
+    """Test that indexed lookups agree with matching every entry in order"""
+    
+    def test_find_recipe_matches_scan(self):
+        """The indexed recipe lookup returns the first matching recipe"""
+        manager = FusionRecipeManager()
+        manager.add_recipe(FusionRecipe({'ability_id': 'fire_bolt'}, {}, {}, "Custom", "Matches anything with a fire bolt"))
+        
+        abilities = [MockAbility(ability_id, ability_type, element_type)
+                     for ability_id in ("fire_bolt", "dash")
+                     for ability_type in (AbilityType.PROJECTILE, AbilityType.MOVEMENT, AbilityType.BUFF)
+                     for element_type in ElementType]
+        for ability1 in abilities:
+            for ability2 in abilities:
+                expected = next((recipe for recipe in manager.recipes if recipe.matches(ability1, ability2)), None)
+                self.assertIs(manager.find_recipe(ability1, ability2), expected)
+    
+    def test_find_effect_matches_scan(self):
+        """The indexed harmonization lookup keeps the effect priority"""
+        manager = HarmonizationManager()
+        
+        for ability_type in AbilityType:
+            for element_type in list(ElementType) + [None]:
+                ability = MockAbility("test", ability_type, element_type)
+                expected = next((effect for effect in manager.effects if effect.matches(ability)), None)
+                self.assertIs(manager.find_effect(ability), expected)
+        
+        fire_projectile = MockAbility("meteor", AbilityType.PROJECTILE, ElementType.FIRE)
+        self.assertEqual(manager.find_effect(fire_projectile).name, "Meteor Shower")
+        fire_projectile.is_harmonized = True
+        self.assertIsNone(manager.find_effect(fire_projectile))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test the shared enemy health bar renderer
+"""
+
+import sys
+import os
+import unittest
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+
+import numpy as np
+from panda3d.core import NodePath, PerspectiveLens, Vec3
+
+from game.enemy_healthbar import EnemyHealthBar, HealthBarRenderer
+
+class MockGame:
+    """Mock game with a scene graph and a camera"""
+    def __init__(self):
+        self.render = NodePath("render")
+        self.camLens = PerspectiveLens()
+        self.cam = self.render.attachNewNode("cam")
+        self.cam.setPos(0, -20, 0)
+
+class MockEnemy:
+    """Mock enemy for testing"""
+    def __init__(self, game, position):
+        self.root = game.render.attachNewNode("Enemy")
+        self.position = Vec3(position)
+        self.health = 50
+        self.max_health = 50
+
+class TestEnemyHealthBar(unittest.TestCase):
+    """Test the enemy health bars"""
+    
+    def setUp(self):
+        """Set up a game with a shared renderer"""
+        self.game = MockGame()
+        self.renderer = HealthBarRenderer.for_game(self.game)
+    
+    def get_visible_slots(self):
+        anchors = self.renderer._array_view(0, 4).reshape(-1, 4, 4)
+        return set(np.flatnonzero(anchors[:, 0, 3] > 0.5))
+    
+    def test_shared_renderer(self):
+        """All bars of a game share one renderer"""
+        bars = [EnemyHealthBar(self.game, MockEnemy(self.game, (i, 0, 0))) for i in range(100)]
+        self.assertIs(HealthBarRenderer.for_game(self.game), self.renderer)
+        self.assertEqual(len({bar.slot for bar in bars}), 100)
+        self.assertGreaterEqual(self.renderer.capacity, 100)
+    
+    def test_health_changes_update_vertex_attributes(self):
+        """Fill and color are written when health changes"""
+        enemy = MockEnemy(self.game, (0, 0, 0))
+        bar = EnemyHealthBar(self.game, enemy)
+        self.assertFalse(bar.visible)
+        
+        enemy.health = 10
+        bar.update(0.1)
+        self.assertTrue(bar.visible)
+        
+        health = self.renderer._array_view(2, 5).reshape(-1, 4, 5)
+        self.assertAlmostEqual(float(health[bar.slot, 0, 0]), 0.2)
+        np.testing.assert_allclose(health[bar.slot, :, 1:], [HealthBarRenderer.get_bar_color(20)] * 4)
+        
+        # Bars hide again once the visibility time runs out
+        bar.update(bar.visibility_duration)
+        self.assertFalse(bar.visible)
+    
+    def test_culling(self):
+        """Only shown, on-screen bars are drawn"""
+        on_screen = EnemyHealthBar(self.game, MockEnemy(self.game, (0, 0, 0)))
+        behind = EnemyHealthBar(self.game, MockEnemy(self.game, (0, -40, 0)))
+        hidden = EnemyHealthBar(self.game, MockEnemy(self.game, (1, 0, 0)))
+        
+        on_screen.show()
+        behind.show()
+        self.renderer.update()
+        
+        self.assertEqual(self.get_visible_slots(), {on_screen.slot})
+        self.assertNotIn(hidden.slot, self.get_visible_slots())
+    
+    def test_remove_releases_slot(self):
+        """Removed bars give their slot back"""
+        enemy = MockEnemy(self.game, (0, 0, 0))
+        bar = EnemyHealthBar(self.game, enemy)
+        slot = bar.slot
+        bar.show()
+        bar.remove()
+        self.renderer.update()
+        
+        self.assertNotIn(slot, self.get_visible_slots())
+        self.assertEqual(EnemyHealthBar(self.game, enemy).slot, slot)
+    
+    def test_removed_enemy_node(self):
+        """Bars of enemies whose node was removed are released"""
+        enemy = MockEnemy(self.game, (0, 0, 0))
+        bar = EnemyHealthBar(self.game, enemy)
+        slot = bar.slot
+        bar.show()
+        enemy.root.removeNode()
+        self.renderer.update()
+        self.assertIn(slot, self.renderer.free_slots)
+        self.assertIsNone(bar.slot)
+        self.assertFalse(bar.visible)
+    
+    def test_released_slot_is_not_shared(self):
+        """A bar whose slot was reused cannot draw over the new owner"""
+        enemy = MockEnemy(self.game, (0, 0, 0))
+        old_bar = EnemyHealthBar(self.game, enemy)
+        slot = old_bar.slot
+        old_bar.show()
+        enemy.root.removeNode()
+        self.renderer.update()
+        
+        new_bar = EnemyHealthBar(self.game, MockEnemy(self.game, (0, 0, 0)))
+        self.assertEqual(new_bar.slot, slot)
+        new_bar.show()
+        
+        # The old bar's updates no longer reach the renderer
+        enemy.health = 5
+        old_bar.update(0.1)
+        old_bar.update_health(0.1)
+        old_bar.hide()
+        old_bar.destroy()
+        self.renderer.update()
+        
+        health = self.renderer._array_view(2, 5).reshape(-1, 4, 5)
+        self.assertAlmostEqual(float(health[slot, 0, 0]), 1.0)
+        self.assertIs(self.renderer.bars[slot], new_bar)
+        self.assertEqual(self.get_visible_slots(), {slot})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the batched event bus and the game event subscriptions
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.event_bus import EventType, EventBus, EventRecorder, read_event_log
+from game.game_events import (connect_tracking_events, connect_progress_events, emit_event,
+                              DAMAGE_TAKEN, ENEMY_KILLED, RESOURCE_COLLECTED)
+from game.quest_system import QuestManager, QuestObjective, QuestType, ObjectiveType
+from game.challenge_mode import ChallengeSystem, ChallengeStatus
+
+HIT = EventType.intern("test_hit", ("amount", "target"))
+HEAL = EventType.intern("test_heal", ("amount",))
+
+class MockSystem:
+    """Mock system recording the calls it receives"""
+    def __init__(self):
+        self.calls = []
+    
+    def record_combat_event(self, *args):
+        self.calls.append(('combat',) + args)
+    
+    def record_resource_event(self, *args):
+        self.calls.append(('resource',) + args)
+    
+    def on_kill(self, *args):
+        self.calls.append(('kill',) + args)
+    
+    def on_enemy_killed(self, *args):
+        self.calls.append(('score',) + args)
+
+class MockGame:
+    """Mock game with an event bus and mock systems"""
+    def __init__(self):
+        self.event_bus = EventBus(capacity=2)
+        self.performance_tracker = MockSystem()
+        self.adaptive_difficulty_system = MockSystem()
+        self.quest_manager = MockSystem()
+        self.challenge_system = MockSystem()
+
+class MockPlayer:
+    """Mock player able to accept any quest"""
+    level = 1
+
+class MockProgressGame:
+    """Mock game with the event bus, quest manager and challenge system of the real game"""
+    def __init__(self):
+        self.player = MockPlayer()
+        self.event_bus = EventBus()
+        self.quest_manager = QuestManager(self)
+        self.challenge_system = ChallengeSystem(self)
+
+class TestEventBus(unittest.TestCase):
+    """Test the buffering and delivery of events"""
+    
+    def test_interning(self):
+        """A name always maps to the same event type"""
+        self.assertIs(EventType.intern("test_hit", ("amount", "target")), HIT)
+        self.assertIs(EventType.get(HIT.id), HIT)
+        with self.assertRaises(ValueError):
+            EventType.intern("test_hit", ("amount",))
+    
+    def test_events_are_delivered_in_batches(self):
+        """Each subscriber gets one call per type and frame, buffers grow as needed"""
+        bus = EventBus(capacity=2)
+        batches = []
+        bus.subscribe(HIT, batches.append)
+        bus.subscribe(HEAL, batches.append)
+        
+        for i in range(5):
+            bus.emit(HIT, i, "player")
+        bus.emit(HEAL, 3)
+        self.assertEqual(batches, [])
+        
+        self.assertEqual(bus.flush(), 6)
+        self.assertEqual(batches, [[(i, "player") for i in range(5)], [(3,)]])
+        self.assertEqual(bus.flush(), 0)
+        self.assertEqual(len(batches), 2)
+    
+    def test_events_emitted_during_flush_wait_a_frame(self):
+        """Events emitted by a subscriber are delivered on the next flush"""
+        bus = EventBus()
+        heals = []
+        bus.subscribe(HIT, lambda events: bus.emit(HEAL, len(events)))
+        bus.subscribe(HEAL, heals.append)
+        
+        bus.emit(HIT, 1, None)
+        bus.flush()
+        self.assertEqual(heals, [])
+        bus.flush()
+        self.assertEqual(heals, [[(1,)]])
+    
+    def test_recorder_round_trip(self):
+        """The binary log reads back the recorded events"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "events.bin")
+            bus = EventBus(recorder=EventRecorder(path))
+            bus.emit(HIT, 12, "player")
+            bus.emit(HIT, 2.5, None)
+            bus.flush()
+            bus.emit(HEAL, True)
+            bus.emit(HIT, -3, "player")
+            bus.flush()
+            bus.recorder.close()
+            
+            self.assertEqual(read_event_log(path), [
+                (0, "test_hit", {"amount": 12, "target": "player"}),
+                (0, "test_hit", {"amount": 2.5, "target": None}),
+                (1, "test_heal", {"amount": True}),
+                (1, "test_hit", {"amount": -3, "target": "player"}),
+            ])
+        finally:
+            shutil.rmtree(directory)
+
+class TestGameEvents(unittest.TestCase):
+    """Test that the game systems get aggregated batches"""
+    
+    def test_subscribers_fold_batches(self):
+        """A frame of events becomes a few calls per system"""
+        game = MockGame()
+        connect_tracking_events(game)
+        connect_progress_events(game)
+        
+        for _ in range(3):
+            emit_event(game, ENEMY_KILLED, "basic", 1)
+        emit_event(game, ENEMY_KILLED, "ranged", 2)
+        emit_event(game, DAMAGE_TAKEN, 5, "basic")
+        emit_event(game, DAMAGE_TAKEN, 7, "ranged")
+        emit_event(game, RESOURCE_COLLECTED, "wood", 2, "node")
+        emit_event(game, RESOURCE_COLLECTED, "wood", 3, "node")
+        game.event_bus.flush()
+        
+        self.assertEqual(game.performance_tracker.calls, [
+            ('combat', 'enemy_killed', 3, 'basic'),
+            ('combat', 'enemy_killed', 1, 'ranged'),
+            ('combat', 'damage_taken', 12),
+            ('resource', 'wood', 5, 'node'),
+        ])
+        self.assertEqual(game.adaptive_difficulty_system.calls, [
+            ('combat', 'enemy_killed', 4),
+            ('combat', 'damage_taken', 12),
+            ('resource', 'collected', 'wood', 5),
+        ])
+        self.assertEqual(game.quest_manager.calls, [('kill', 'basic', 3), ('kill', 'ranged', 1)])
+        self.assertEqual(game.challenge_system.calls, [('score', 'basic', 3), ('score', 'ranged', 2)])
+    
+    def test_kills_reach_quests_and_challenges(self):
+        """Kills emitted on the bus advance quest objectives and challenge scores"""
+        game = MockProgressGame()
+        connect_progress_events(game)
+        connect_progress_events(game)
+        
+        quest = game.quest_manager.create_quest("hunt", "Hunt", QuestType.SIDE, "Kill basic enemies")
+        quest.add_objective(QuestObjective("kills", "Kill 5 basic enemies", ObjectiveType.KILL, "basic", 5))
+        self.assertTrue(game.quest_manager.accept_quest("hunt"))
+        challenge = game.challenge_system.challenges["time_trial_1"]
+        challenge.status = ChallengeStatus.IN_PROGRESS
+        game.challenge_system.current_challenge = challenge
+        
+        for _ in range(3):
+            emit_event(game, ENEMY_KILLED, "basic", 1)
+        emit_event(game, ENEMY_KILLED, "ranged", 2)
+        game.event_bus.flush()
+        
+        self.assertEqual(quest.objectives[0].current_progress, 3)
+        self.assertEqual(challenge.score, 5)
+
+if __name__ == "__main__":
+    unittest.main()
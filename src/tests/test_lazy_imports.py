@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test lazy package imports and the startup profiler
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+import unittest
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+
+from engine.startup_profiler import StartupProfiler
+
+def run_in_fresh_interpreter(code):
+    """Run code in a new interpreter with src on the path and return its output"""
+    result = subprocess.run([sys.executable, "-c", code], cwd=src_dir,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+class TestLazyImports(unittest.TestCase):
+    """Test that packages only import what is used"""
+    
+    def test_submodule_does_not_load_game(self):
+        """Importing a game submodule does not import the game itself"""
+        output = run_in_fresh_interpreter(
+            "import sys, game.day_night_cycle; print('game.main' in sys.modules, 'game.player' in sys.modules)")
+        self.assertEqual(output, "False False")
+    
+    def test_exports_resolve_on_access(self):
+        """Package exports are imported on first access"""
+        output = run_in_fresh_interpreter(
+            "import sys, engine; print('engine.renderer' in sys.modules); "
+            "print(engine.ResourceManager.__module__); print('engine.renderer' in sys.modules)")
+        self.assertEqual(output.split(), ["False", "engine.resource_manager", "False"])
+    
+    def test_single_engine_root(self):
+        """The physics package is only loaded under the engine root"""
+        output = run_in_fresh_interpreter(
+            "import sys, engine.physics, game.character_physics; "
+            "print(any(name.startswith('src.') for name in sys.modules))")
+        self.assertEqual(output, "False")
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test the import-time tree"""
+    
+    def test_import_tree(self):
+        """First-time imports are recorded with their nested imports"""
+        import builtins
+        original_import = builtins.__import__
+        
+        with tempfile.TemporaryDirectory() as module_dir:
+            with open(os.path.join(module_dir, "profiled_outer.py"), "w") as f:
+                f.write("import profiled_inner\n")
+            with open(os.path.join(module_dir, "profiled_inner.py"), "w") as f:
+                f.write("VALUE = 1\n")
+            sys.path.insert(0, module_dir)
+            
+            profiler = StartupProfiler()
+            profiler.install()
+            try:
+                import profiled_outer
+            finally:
+                profiler.uninstall()
+                sys.path.remove(module_dir)
+                sys.modules.pop("profiled_outer", None)
+                sys.modules.pop("profiled_inner", None)
+        
+        self.assertIs(builtins.__import__, original_import)
+        self.assertEqual(profiled_outer.profiled_inner.VALUE, 1)
+        outer = profiler.root.children[0]
+        self.assertEqual(outer.name, "profiled_outer")
+        self.assertEqual([child.name for child in outer.children], ["profiled_inner"])
+        self.assertGreaterEqual(outer.duration, outer.children[0].duration)
+
+if __name__ == "__main__":
+    unittest.main()
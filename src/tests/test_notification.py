@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the pooled notification system
+"""
+
+import sys
+import os
+import unittest
+
+from panda3d.core import NodePath
+
+# Add the src directory to the path so we can import the engine modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.ui.notification import NotificationSystem
+
+class MockGame:
+    """Mock game providing the 2D scene root"""
+    def __init__(self):
+        self.aspect2d = NodePath("aspect2d")
+
+class TestNotificationSystem(unittest.TestCase):
+    """Test that notifications reuse their slots and fade with intervals"""
+    
+    def setUp(self):
+        """Create the notification system"""
+        self.game = MockGame()
+        self.system = NotificationSystem(self.game)
+        self.node_count = self.game.aspect2d.countNumDescendants()
+    
+    def tearDown(self):
+        """Clean up the notification system"""
+        self.system.cleanup()
+    
+    def test_burst_creates_no_nodes(self):
+        """A burst of notifications only reuses the slots"""
+        for i in range(20):
+            self.system.add_notification(f"Wood +{i}", type="item" if i % 2 else "warning")
+        
+        self.assertEqual(self.game.aspect2d.countNumDescendants(), self.node_count)
+        self.assertEqual(len(self.system.notifications), self.system.max_visible)
+        
+        # The newest notifications are kept, newest at the top
+        newest = self.system.notifications[-1]
+        self.assertEqual(newest["text"]["text"], "Wood +19")
+        self.assertEqual(newest["frame"].getZ(), 0)
+        self.assertEqual(newest["frame"]["frameColor"], NotificationSystem.COLORS["item"])
+    
+    def test_fade_uses_color_scale(self):
+        """The fade scales the slot alpha, then frees the slot"""
+        self.system.add_notification("Fog is rising", duration=2.0, type="warning")
+        notification = self.system.notifications[0]
+        interval = notification["interval"]
+        
+        interval.pause()
+        interval.setT(2.0 + NotificationSystem.FADE_TIME / 2)
+        self.assertAlmostEqual(notification["frame"].getColorScale()[3], 0.5, places=3)
+        
+        interval.finish()
+        self.assertEqual(self.system.notifications, [])
+        self.assertTrue(notification["frame"].isHidden())
+        self.assertEqual(len(self.system.free_slots), self.system.max_visible)
+        
+        # A reused slot starts opaque again
+        self.system.add_notification("Enemy defeated")
+        self.assertEqual(self.system.notifications[0]["frame"].getColorScale()[3], 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test the vectorized particle rasterizer and the shared texture atlas
+"""
+
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+# Add the repository root to Python path (the asset tools import through src)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from src.tools.asset_generator.particle_rasterizer import ParticleBatch, render_particles, separable_blur
+from src.tools.asset_generator.texture_atlas import TextureAtlas
+from src.tools.asset_generator.effect_generator import EffectGenerator
+
+class TestParticleRasterizer(unittest.TestCase):
+    """Test cases for the particle rasterizer"""
+    
+    def test_particles_land_in_their_frame(self):
+        """Each particle is drawn in its own frame only"""
+        batch = ParticleBatch()
+        batch.add([0, 2], [4, 10], [5, 12], 1, (255, 0, 0), 255)
+        frames = render_particles(batch, 3, (16, 16))
+        
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].size, (16, 16))
+        self.assertEqual(frames[0].mode, "RGBA")
+        
+        data = [np.array(frame) for frame in frames]
+        self.assertEqual(tuple(data[0][5, 4]), (255, 0, 0, 255))
+        self.assertEqual(data[0][:, :, 3].sum(), 9 * 255)
+        self.assertFalse(data[1].any())
+        self.assertEqual(tuple(data[2][12, 10]), (255, 0, 0, 255))
+    
+    def test_blur_keeps_uniform_color(self):
+        """Blurring premultiplied colors does not darken the edges"""
+        frames = np.zeros((1, 16, 16, 4), dtype=np.float32)
+        frames[0, 6:10, 6:10] = (200, 100, 50, 1.0)
+        separable_blur(frames, 1.0)
+        
+        visible = frames[0, ..., 3] > 0.01
+        self.assertGreater(visible.sum(), 16)
+        self.assertTrue(np.allclose(frames[0][visible][:, :3], (200, 100, 50), atol=0.5))
+        self.assertLess(frames[0, 8, 8, 3], 1.0)
+    
+    def test_effects_are_deterministic(self):
+        """The same seed produces the same effect frames"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            generator = EffectGenerator(output_dir)
+            params = {"effect_type": "fire", "size": (64, 64), "frame_count": 4}
+            first = generator.generate("fire", params, seed=7)
+            second = generator.generate("fire", params, seed=7)
+        
+        self.assertEqual(len(first), 4)
+        for frame_a, frame_b in zip(first, second):
+            self.assertTrue(np.array_equal(np.array(frame_a), np.array(frame_b)))
+
+class TestTextureAtlas(unittest.TestCase):
+    """Test cases for the texture atlas"""
+    
+    def test_pack_round_trip(self):
+        """Packed frames keep their pixels and never overlap"""
+        atlas = TextureAtlas(max_size=64)
+        rng = np.random.RandomState(3)
+        sprites = {
+            "fire": [Image.fromarray(rng.randint(1, 256, (20, 30, 4), dtype=np.uint8), "RGBA") for _ in range(4)],
+            "walk": [Image.fromarray(rng.randint(1, 256, (12, 9, 4), dtype=np.uint8), "RGBA") for _ in range(6)]
+        }
+        for name, frames in sprites.items():
+            atlas.add_frames(name, frames, {"frame_duration": 80})
+        
+        pages, index = atlas.pack()
+        self.assertGreater(len(pages), 1)
+        self.assertEqual(index["sprites"]["fire"]["frame_duration"], 80)
+        
+        used = [np.zeros((page.size[1], page.size[0]), dtype=np.int32) for page in pages]
+        for name, frames in sprites.items():
+            for frame, (page, x, y, width, height) in zip(frames, index["sprites"][name]["frames"]):
+                self.assertEqual((width, height), frame.size)
+                crop = np.array(pages[page].crop((x, y, x + width, y + height)))
+                self.assertTrue(np.array_equal(crop, np.array(frame)))
+                used[page][y:y + height, x:x + width] += 1
+        
+        self.assertLessEqual(max(page_used.max() for page_used in used), 1)
+    
+    def test_save_writes_index(self):
+        """Saving writes the page images and a JSON index naming them"""
+        atlas = TextureAtlas()
+        atlas.add_frames("spark", [Image.new("RGBA", (8, 8), (255, 255, 0, 255))])
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            index_path = atlas.save(output_dir)
+            with open(index_path) as f:
+                index = json.load(f)
+            
+            self.assertEqual(len(index["page_files"]), 1)
+            self.assertTrue(os.path.exists(os.path.join(output_dir, index["page_files"][0])))
+            self.assertEqual(index["sprites"]["spark"]["frames"], [[0, 1, 1, 8, 8]])
+        
+        self.assertIsNone(TextureAtlas().save(output_dir))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for session recording and replay
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+# Add the src directory to the path so we can import the engine modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from direct.showbase.DirectObject import DirectObject
+from direct.showbase.MessengerGlobal import messenger
+from panda3d.core import ClockObject
+
+from engine.replay import SessionRecorder, SessionReplay, read_session_log
+
+class MockInputManager:
+    """Mock input manager with a settable mouse"""
+    def __init__(self):
+        self.mouse = None
+        self.replay = None
+    
+    def read_mouse(self):
+        return self.replay.mouse if self.replay else self.mouse
+
+class MockSceneManager:
+    """Mock scene manager remembering the scene changes"""
+    def __init__(self):
+        self.current_scene_name = "main_menu"
+        self.changes = []
+    
+    def change_scene(self, scene_name):
+        self.current_scene_name = scene_name
+        self.changes.append(scene_name)
+
+class MockGame:
+    """Mock game without a window"""
+    def __init__(self):
+        self.messenger = messenger
+        self.input_manager = MockInputManager()
+        self.scene_manager = MockSceneManager()
+
+class InputListener(DirectObject):
+    """Collects the input events sent to the messenger"""
+    def __init__(self, names):
+        DirectObject.__init__(self)
+        self.received = []
+        for name in names:
+            self.accept(name, self.received.append, [name])
+
+class TestSessionReplay(unittest.TestCase):
+    """Test that a recorded session replays the same inputs and frames"""
+    
+    def setUp(self):
+        """Record a short session"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "session.bin")
+        
+        game = MockGame()
+        recorder = SessionRecorder(self.path, seed=1234)
+        messenger.send("w")
+        recorder.begin_frame(game, 0.016)
+        
+        game.input_manager.mouse = (0.25, -0.5)
+        messenger.send("mouse1")
+        messenger.send("w-up")
+        recorder.begin_frame(game, 0.02)
+        
+        game.scene_manager.current_scene_name = "game"
+        recorder.begin_frame(game, 0.5)
+        recorder.close()
+        
+        # Events sent after closing are not recorded
+        messenger.send("w")
+    
+    def tearDown(self):
+        """Remove the log and restore the clock"""
+        ClockObject.getGlobalClock().setMode(ClockObject.MNormal)
+        shutil.rmtree(self.directory)
+    
+    def test_log_round_trip(self):
+        """The log reads back the seed and the frames"""
+        seed, frames = read_session_log(self.path)
+        self.assertEqual(seed, 1234)
+        self.assertEqual(frames, [
+            (0.016, ["w"], None, "main_menu"),
+            (0.02, ["mouse1", "w-up"], (0.25, -0.5), None),
+            (0.5, [], (0.25, -0.5), "game"),
+        ])
+    
+    def test_modifier_inputs_recorded(self):
+        """Events prefixed by held modifiers are recorded like plain ones"""
+        path = os.path.join(self.directory, "modifiers.bin")
+        game = MockGame()
+        recorder = SessionRecorder(path, seed=1)
+        for name in ("shift", "shift-w", "shift-control-mouse1", "control-wheel_up", "shift-w-up", "shift-up"):
+            messenger.send(name)
+        recorder.begin_frame(game, 0.016)
+        recorder.close()
+        
+        seed, frames = read_session_log(path)
+        self.assertEqual(frames[0][1], ["shift", "shift-w", "shift-control-mouse1",
+                                        "control-wheel_up", "shift-w-up", "shift-up"])
+    
+    def test_replay_drives_the_game(self):
+        """Replay sends the inputs, feeds the mouse and slaves the clock"""
+        game = MockGame()
+        listener = InputListener(["w", "w-up", "mouse1"])
+        replay = SessionReplay(self.path)
+        replay.start(game)
+        clock = ClockObject.getGlobalClock()
+        start_time = clock.getFrameTime()
+        
+        dts = []
+        while True:
+            dt = replay.begin_frame(game)
+            if dt is None:
+                break
+            dts.append(dt)
+            replay.end_frame()
+        replay.stop(game)
+        listener.ignoreAll()
+        
+        self.assertEqual(dts, [0.016, 0.02, 0.5])
+        self.assertEqual(listener.received, ["w", "mouse1", "w-up"])
+        self.assertEqual(game.scene_manager.changes, ["game"])
+        self.assertAlmostEqual(clock.getFrameTime() - start_time, 0.536)
+        self.assertIsNone(game.input_manager.replay)
+        self.assertEqual(replay.get_summary()['frames'], 3)
+
+class TestHeadlessReplay(unittest.TestCase):
+    """Smoke test of the game replaying a session without a window"""
+    
+    def test_headless_replay_runs(self):
+        """The real game replays every recorded frame with --replay --headless"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "session.bin")
+        csv_path = os.path.join(directory, "frames.csv")
+        
+        game = MockGame()
+        recorder = SessionRecorder(path, seed=99)
+        for frame in range(10):
+            if frame == 3:
+                messenger.send("mouse1")
+                messenger.send("mouse1-up")
+            recorder.begin_frame(game, 0.016)
+        recorder.close()
+        
+        src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        env = dict(os.environ, PYTHONPATH=src_dir)
+        result = subprocess.run([sys.executable, "-m", "game.main", "--replay", path, "--headless",
+                                 "--frame-times", csv_path],
+                                cwd=directory, env=env, capture_output=True, text=True, timeout=300)
+        
+        self.assertEqual(result.returncode, 0, result.stdout[-2000:] + result.stderr[-2000:])
+        self.assertNotIn("Traceback", result.stderr)
+        self.assertIn(f"Replay of {path} finished: 10 frames", result.stdout)
+        with open(csv_path) as f:
+            self.assertEqual(len(f.readlines()), 11)
+
+if __name__ == "__main__":
+    unittest.main()
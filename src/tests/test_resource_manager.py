@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test asynchronous asset loading in the resource manager
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+
+from panda3d.core import NodePath, Vec3
+
+from engine.resource_manager import ResourceManager
+from game.points_of_interest import PointOfInterest, POIType
+
+class MockLoader:
+    """Mock Panda3D loader recording the order of loads"""
+    def __init__(self):
+        self.loaded = []
+        self.sound_threads = []
+    
+    def loadSfx(self, path):
+        self.sound_threads.append(threading.current_thread())
+        return NodePath(os.path.basename(path))
+    
+    def loadModel(self, path):
+        self.loaded.append(path)
+        if "missing" in path:
+            return None
+        return NodePath(os.path.basename(path))
+
+class MockPlayer:
+    """Mock player at the origin"""
+    def __init__(self):
+        self.position = Vec3(0, 0, 0)
+
+class MockGame:
+    """Mock game with a loader and a scene graph"""
+    def __init__(self):
+        self.loader = MockLoader()
+        self.render = NodePath("render")
+        self.player = MockPlayer()
+
+class TestAsyncResourceLoading(unittest.TestCase):
+    """Test asynchronous loading with placeholders"""
+    
+    def setUp(self):
+        self.game = MockGame()
+        self.resources = ResourceManager(self.game)
+        self.resources.async_loading = False
+    
+    def test_requests_are_deduplicated(self):
+        """Requests for an asset already in flight share one load"""
+        results = []
+        first = self.resources.load_model_async("models/box", results.append)
+        second = self.resources.load_model_async("models/box", results.append)
+        self.assertIs(first, second)
+        self.assertFalse(first.done())
+        
+        self.resources.update()
+        self.assertTrue(first.done())
+        self.assertEqual(self.game.loader.loaded, ["models/box"])
+        self.assertEqual(len(results), 2)
+        
+        # Cached assets resolve immediately
+        self.assertTrue(self.resources.load_model_async("models/box").done())
+    
+    def test_nearest_loads_first(self):
+        """Queued loads start nearest to the player first"""
+        self.resources.max_in_flight = 1
+        self.resources.load_model_async("models/far", position=Vec3(50, 0, 0))
+        self.resources.load_model_async("models/near", position=Vec3(5, 0, 0))
+        self.resources.load_model_async("models/ui")
+        for _ in range(3):
+            self.resources.update()
+        self.assertEqual(self.game.loader.loaded, ["models/ui", "models/near", "models/far"])
+    
+    def test_requeue_at_higher_priority(self):
+        """Requesting a queued asset again can only make it more urgent"""
+        self.resources.max_in_flight = 1
+        self.resources.load_model_async("models/a", priority=10)
+        self.resources.load_model_async("models/b", priority=20)
+        self.resources.load_model_async("models/b", priority=1)
+        self.resources.update()
+        self.resources.update()
+        self.assertEqual(self.game.loader.loaded, ["models/b", "models/a"])
+    
+    def test_placeholder_replaced(self):
+        """Attached models show a placeholder until they arrive"""
+        parent = self.game.render.attachNewNode("enemy")
+        holder = self.resources.attach_model_async("models/box", parent)
+        holder.setScale(2.0)
+        self.assertFalse(holder.find("placeholder").isEmpty())
+        
+        self.resources.update()
+        self.assertTrue(holder.find("placeholder").isEmpty())
+        self.assertFalse(holder.find("box").isEmpty())
+        self.assertEqual(holder.getScale(), Vec3(2, 2, 2))
+    
+    def test_failed_load_keeps_placeholder(self):
+        """Models that fail to load keep their placeholder"""
+        holder = self.resources.attach_model_async("models/missing", self.game.render)
+        self.resources.update()
+        self.assertFalse(holder.find("placeholder").isEmpty())
+        self.assertEqual(self.resources.in_flight, 0)
+    
+    def test_sounds_created_on_main_thread(self):
+        """Async sound loads only read the file on the loader thread"""
+        self.resources.async_loading = True
+        sounds = []
+        self.resources.load_sound_async("sfx/hit.wav", sounds.append)
+        self.resources.update()
+        self.resources.executor.shutdown(wait=True)
+        self.resources.executor = None
+        self.assertEqual(self.game.loader.sound_threads, [])
+        
+        self.resources.update()
+        self.assertEqual(self.game.loader.sound_threads, [threading.main_thread()])
+        self.assertEqual(len(sounds), 1)
+        self.assertIs(self.resources.sounds["sfx/hit.wav"], sounds[0])
+    
+    def test_failed_load_uses_fallback(self):
+        """A fallback replaces the placeholder of models that fail to load"""
+        failed = []
+        holder = self.resources.attach_model_async("models/missing", self.game.render,
+                                                   fallback=failed.append)
+        self.resources.update()
+        self.assertEqual(failed, [holder])
+        self.assertTrue(holder.find("placeholder").isEmpty())
+    
+    def test_poi_marker_for_missing_model(self):
+        """POIs whose model fails to load show the red marker"""
+        poi = PointOfInterest("cave", "Cave", POIType.DUNGEON, Vec3(10, 0, 0))
+        poi.MODEL_PATHS = {POIType.DUNGEON: "models/missing"}
+        node = poi.create_world_representation(self.game.render, self.resources)
+        self.resources.update()
+        
+        marker = node.find("**/poi_marker")
+        self.assertFalse(marker.isEmpty())
+        self.assertTrue(node.find("**/placeholder").isEmpty())
+        self.assertEqual(marker.getScale(node), Vec3(1, 1, 1))
+
+if __name__ == "__main__":
+    unittest.main()
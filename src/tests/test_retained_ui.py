@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the retained-mode UI layer
+"""
+
+import sys
+import os
+import unittest
+
+# Add the src directory to the path so we can import the engine modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.ui.retained import RetainedLayer
+
+class MockWidget:
+    """Mock DirectGui widget recording the calls made on it"""
+    def __init__(self, props):
+        self.options = dict(props)
+        self.calls = []
+        self.hidden = False
+        self.destroyed = False
+    
+    def __setitem__(self, name, value):
+        self.calls.append(name)
+        self.options[name] = value
+    
+    def setPos(self, *pos):
+        self.calls.append("pos")
+        self.options["pos"] = pos
+    
+    def setScale(self, scale):
+        self.calls.append("scale")
+        self.options["scale"] = scale
+    
+    def setColor(self, *color):
+        self.calls.append("color")
+        self.options["color"] = color
+    
+    def show(self):
+        self.hidden = False
+    
+    def hide(self):
+        self.hidden = True
+    
+    def destroy(self):
+        self.destroyed = True
+
+class TestRetainedLayer(unittest.TestCase):
+    """Test diffing and pooling in the retained layer"""
+    
+    def setUp(self):
+        """Create a layer of mock widgets"""
+        self.created = []
+        self.layer = RetainedLayer(self._create, max_pool=1)
+    
+    def _create(self, key, props):
+        widget = MockWidget(props)
+        self.created.append(widget)
+        return widget
+    
+    def _models(self, count, color=(1, 1, 1, 1)):
+        return {f"node_{i}": {"pos": (i, 0, 0), "frameColor": color, "text": f"Node {i}"} for i in range(count)}
+    
+    def test_unchanged_refresh_touches_nothing(self):
+        """Showing the same view model again patches no widget"""
+        self.assertEqual(self.layer.update(self._models(3)), 3)
+        self.assertEqual(self.layer.update(self._models(3)), 0)
+        self.assertEqual(len(self.created), 3)
+        self.assertTrue(all(not widget.calls for widget in self.created))
+    
+    def test_only_changed_properties_are_patched(self):
+        """A changed property is applied alone to its own widget"""
+        self.layer.update(self._models(3))
+        models = self._models(3)
+        models["node_1"]["frameColor"] = (0.5, 0.5, 0.5, 1)
+        
+        self.assertEqual(self.layer.update(models), 1)
+        self.assertEqual(self.layer.get("node_1").calls, ["frameColor"])
+        self.assertEqual(self.layer.get("node_0").calls, [])
+        
+        self.assertFalse(self.layer.patch("node_1", {"frameColor": (0.5, 0.5, 0.5, 1)}))
+        self.assertTrue(self.layer.patch("node_1", {"pos": (4, 0, 0)}))
+        self.assertEqual(self.layer.get("node_1").options["pos"], (4, 0, 0))
+    
+    def test_released_widgets_are_reused(self):
+        """Widgets of removed keys are hidden, pooled and reused"""
+        self.layer.update(self._models(3))
+        self.layer.update(self._models(1))
+        
+        # Only one released widget fits in the pool, the other is destroyed
+        self.assertEqual(len(self.layer.pool), 1)
+        self.assertEqual(sum(widget.destroyed for widget in self.created), 1)
+        
+        models = self._models(1)
+        models["other"] = {"pos": (9, 0, 0), "frameColor": (1, 1, 1, 1), "text": "Other"}
+        self.layer.update(models)
+        
+        other = self.layer.get("other")
+        self.assertEqual(len(self.created), 3)
+        self.assertFalse(other.hidden)
+        self.assertEqual(other.options["text"], "Other")
+        self.assertEqual(other.options["pos"], (9, 0, 0))
+        self.assertEqual(self.layer.stats["reused"], 1)
+    
+    def test_destroy_keeps_aliases(self):
+        """Destroying the layer empties the widget dict other code aliases"""
+        widgets = self.layer.widgets
+        self.layer.update(self._models(2))
+        self.layer.destroy()
+        
+        self.assertEqual(widgets, {})
+        self.assertTrue(all(widget.destroyed for widget in self.created))
+
+if __name__ == "__main__":
+    unittest.main()
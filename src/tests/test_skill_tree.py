@@ -8,17 +8,17 @@ Test script for the skill tree and ability systems
 import sys
 import os
 
-# Add the parent directory to the path so we can import the game modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.game.skill_tree import SkillTree, SkillNode, SkillType
-from src.game.ability_system import (
+from game.skill_tree import SkillTree, SkillNode, SkillType
+from game.ability_system import (
     AbilityManager, Ability, ProjectileAbility, MeleeAbility,
     AbilityType, SpecializationPath
 )
-from src.game.character_class import ClassManager, ClassType
-from src.game.ability_factory import AbilityFactory, create_ability
-import src.game.skill_definitions as skill_definitions
+from game.character_class import ClassManager, ClassType
+from game.ability_factory import AbilityFactory, create_ability
+import game.skill_definitions as skill_definitions
 
 class MockPlayer:
     """Mock player for testing"""
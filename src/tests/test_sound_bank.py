@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test the sound bank manifest, preloading and eviction
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+
+from panda3d.core import AudioManager as P3DAudioManager
+
+from game.audio_manager import AudioManager
+from game.day_night_cycle import TimeOfDay
+
+class MockSound:
+    """Mock Panda3D AudioSound"""
+    def play(self):
+        pass
+    
+    def stop(self):
+        pass
+    
+    def status(self):
+        return 1
+    
+    def length(self):
+        return 1.0
+    
+    def setVolume(self, volume):
+        pass
+    
+    def setLoop(self, loop):
+        pass
+
+class MockP3DAudioManager:
+    """Mock Panda3D audio manager recording the load mode of each file"""
+    def __init__(self):
+        self.modes = {}
+        self.threads = set()
+    
+    def getSound(self, path, positional=False, mode=0):
+        self.modes[path] = mode
+        self.threads.add(threading.current_thread())
+        return MockSound()
+    
+    def shutdown(self):
+        pass
+
+class MockDayNightCycle:
+    """Mock day/night cycle storing the time of day name"""
+    def __init__(self):
+        self.time_of_day = TimeOfDay.DAY
+
+class MockGame:
+    """Mock game class for testing"""
+    def __init__(self):
+        self.day_night_cycle = MockDayNightCycle()
+
+class TestSoundBanks(unittest.TestCase):
+    """Test sound banks through the audio manager"""
+    
+    def setUp(self):
+        self.game = MockGame()
+        self.audio = AudioManager(self.game)
+        self.audio.audio_enabled = True
+        self.audio.audio_manager = MockP3DAudioManager()
+        self.banks = self.audio.sound_banks
+        self.banks.async_loading = False
+    
+    def tearDown(self):
+        self.audio.cleanup()
+    
+    def test_manifest_resolves_extensions(self):
+        """Sounds resolve through the manifest whatever extension was asked for"""
+        self.assertTrue(self.banks.resolve("music/combat.ogg")["path"].endswith("combat.wav"))
+        self.assertTrue(self.banks.resolve("music/combat")["stream"])
+        self.assertFalse(self.banks.resolve("sfx/weapon_hit_1.wav")["stream"])
+        self.assertIsNone(self.banks.resolve("sfx/does_not_exist.wav"))
+    
+    def test_dusk_preloads_night_banks(self):
+        """Dusk preloads the combat banks needed at night"""
+        self.game.day_night_cycle.time_of_day = TimeOfDay.DAY
+        self.audio.update(0.016)
+        self.assertNotIn("combat", self.banks.loaded_banks)
+        self.assertIn("ambient_dusk", self.banks.loaded_banks)
+        
+        self.game.day_night_cycle.time_of_day = TimeOfDay.DUSK
+        self.audio.update(0.016)
+        self.assertIn("combat", self.banks.loaded_banks)
+        self.assertIn("ambient_night", self.banks.loaded_banks)
+        
+        hit_path = self.banks.resolve("sfx/weapon_hit_1")["path"]
+        self.assertIn(self.audio.get_pool_key(hit_path, True), self.audio.sound_pools)
+    
+    def test_music_is_streamed(self):
+        """Music is opened as a stream, effects are decoded up front"""
+        self.audio.play_sound("combat", category="music")
+        self.audio.play_sound("weapon_hit_1")
+        modes = self.audio.audio_manager.modes
+        self.assertEqual(modes[self.banks.resolve("music/combat")["path"]], P3DAudioManager.SM_stream)
+        self.assertEqual(modes[self.banks.resolve("sfx/weapon_hit_1")["path"]], P3DAudioManager.SM_sample)
+    
+    def test_sounds_created_on_main_thread(self):
+        """The loader thread only reads files, the sounds are created in update"""
+        self.banks.async_loading = True
+        self.banks.preload_bank("combat")
+        self.banks.executor.shutdown(wait=True)
+        self.banks.executor = None
+        self.assertEqual(self.audio.audio_manager.threads, set())
+        
+        self.banks.update()
+        self.assertIn("combat", self.banks.loaded_banks)
+        self.assertEqual(self.audio.audio_manager.threads, {threading.main_thread()})
+        hit_path = self.banks.resolve("sfx/weapon_hit_1")["path"]
+        self.assertIn(self.audio.get_pool_key(hit_path, True), self.audio.sound_pools)
+    
+    def test_lru_eviction(self):
+        """Banks that are no longer needed are evicted least recently used first"""
+        self.banks.banks["extra"] = ["music/menu"]
+        self.banks.preload_bank("combat")
+        self.banks.preload_bank("extra")
+        self.banks.touch("sfx/weapon_hit_1")
+        
+        self.banks.memory_budget = self.banks.get_bank_memory("combat")
+        self.banks.evict_over_budget()
+        self.assertEqual(list(self.banks.loaded_banks), ["combat"])
+        
+        menu_path = self.banks.resolve("music/menu")["path"]
+        self.assertNotIn(self.audio.get_pool_key(menu_path, False), self.audio.sound_pools)
+    
+    def test_required_banks_are_kept(self):
+        """Banks of the current time of day are never evicted"""
+        self.game.day_night_cycle.time_of_day = TimeOfDay.NIGHT
+        self.audio.update(0.016)
+        self.banks.memory_budget = 0
+        self.banks.evict_over_budget()
+        self.assertIn("ui", self.banks.loaded_banks)
+        self.assertIn("combat", self.banks.loaded_banks)
+
+if __name__ == "__main__":
+    unittest.main()
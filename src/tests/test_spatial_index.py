@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the spatial index of points of interest and NPCs
+"""
+
+import sys
+import os
+import random
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from panda3d.core import Vec3
+
+from game.spatial_index import SpatialGrid
+from game.points_of_interest import PointOfInterestManager, POIType, POIState
+from game.npc_system import NPCManager, NPCType
+
+class MockLoader:
+    """Mock loader without sounds"""
+    def loadSfx(self, path):
+        return None
+
+class MockDayNightCycle:
+    """Mock day/night cycle at a fixed time"""
+    current_time = 0.0
+
+class MockMessageSystem:
+    """Mock message system recording the messages"""
+    def __init__(self):
+        self.messages = []
+    
+    def show_message(self, message, duration=0.0, message_type=None):
+        self.messages.append(message)
+
+class MockGame:
+    """Mock game with the services used by discoveries"""
+    def __init__(self):
+        self.loader = MockLoader()
+        self.day_night_cycle = MockDayNightCycle()
+        self.message_system = MockMessageSystem()
+
+class TestSpatialGrid(unittest.TestCase):
+    """Test the grid queries against linear scans"""
+    
+    def setUp(self):
+        rng = random.Random(7)
+        self.points = [Vec3(rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(0, 5))
+                       for _ in range(400)]
+        self.grid = SpatialGrid(37.0)
+        for index, point in enumerate(self.points):
+            self.grid.insert(index, point)
+        self.queries = [Vec3(rng.uniform(-700, 700), rng.uniform(-700, 700), 0) for _ in range(50)]
+    
+    def test_radius_matches_scan(self):
+        """Radius queries return the scanned objects in insertion order"""
+        for query in self.queries:
+            for radius in (0.0, 25.0, 120.0):
+                expected = [i for i, p in enumerate(self.points) if (p - query).length() <= radius]
+                self.assertEqual(self.grid.query_radius(query, radius), expected)
+    
+    def test_nearest_matches_scan(self):
+        """Nearest queries agree with a scan, with and without a limit and a filter"""
+        even = lambda index: index % 2 == 0
+        for query in self.queries:
+            for max_distance in (float('inf'), 60.0):
+                for predicate in (None, even):
+                    candidates = [(round((p - query).length(), 9), i) for i, p in enumerate(self.points)
+                                  if (p - query).length() < max_distance and (predicate is None or predicate(i))]
+                    expected = min(candidates)[1] if candidates else None
+                    self.assertEqual(self.grid.nearest(query, max_distance, predicate), expected)
+    
+    def test_remove_and_move(self):
+        """Removed objects disappear and moved ones keep their order"""
+        self.grid.remove(0)
+        self.assertNotIn(0, self.grid)
+        self.grid.insert(1, Vec3(1000, 1000, 0))
+        self.assertEqual(self.grid.nearest(Vec3(990, 990, 0)), 1)
+        self.assertEqual(self.grid.query_radius(Vec3(1000, 1000, 0), 1.0), [1])
+        self.assertEqual(len(self.grid), 399)
+
+class TestWorldIndexes(unittest.TestCase):
+    """Test POI discovery and NPC queries through the indexes"""
+    
+    def test_discovery_follows_player(self):
+        """POIs are discovered once the player comes in range, and only once"""
+        game = MockGame()
+        manager = PointOfInterestManager(game)
+        manager.discovery_range = 10.0
+        near = manager.create_poi("near", "Near", POIType.SHRINE, Vec3(15, 0, 0))
+        far = manager.create_poi("far", "Far", POIType.DUNGEON, Vec3(200, 0, 0))
+        
+        manager.update(Vec3(0, 0, 0))
+        self.assertEqual(near.state, POIState.UNDISCOVERED)
+        manager.update(Vec3(6, 0, 0))
+        self.assertEqual(near.state, POIState.DISCOVERED)
+        manager.update(Vec3(7, 0, 0))
+        self.assertEqual(game.message_system.messages, ["Discovered: Near"])
+        self.assertNotIn(near, manager.undiscovered_index)
+        
+        # A POI created next to the player is picked up without changing cell
+        manager.create_poi("new", "New", POIType.SHRINE, Vec3(8, 2, 0))
+        manager.update(Vec3(7, 0, 0))
+        self.assertEqual(game.message_system.messages, ["Discovered: Near", "Discovered: New"])
+        
+        manager.update(Vec3(195, 0, 0))
+        self.assertEqual(far.state, POIState.DISCOVERED)
+        self.assertEqual(len(manager.undiscovered_index), 0)
+    
+    def test_generated_pois_keep_their_distance(self):
+        """Generated POIs respect the minimum distance and are all indexed"""
+        manager = PointOfInterestManager(MockGame())
+        pois = manager.generate_pois_for_region(Vec3(0, 0, 0), Vec3(1000, 1000, 0), world_seed=3)
+        for index, poi in enumerate(pois):
+            for other in pois[index + 1:]:
+                self.assertGreaterEqual((poi.position - other.position).length(), manager.minimum_poi_distance)
+        self.assertEqual(len(manager.poi_index), len(pois))
+        
+        origin = Vec3(500, 500, 0)
+        nearest = min(pois, key=lambda poi: (poi.position - origin).length())
+        self.assertIs(manager.get_nearest_poi(origin), nearest)
+        
+        # Loading a save rebuilds the indexes
+        loaded = PointOfInterestManager(MockGame())
+        loaded.load_data(manager.save_data())
+        self.assertEqual(loaded.get_nearest_poi(origin).poi_id, nearest.poi_id)
+        self.assertEqual(len(loaded.undiscovered_index), len(pois))
+    
+    def test_npc_queries(self):
+        """NPC lookups use the index and follow moved NPCs"""
+        manager = NPCManager(MockGame())
+        manager.create_npc("elder", "Elder", NPCType.QUEST_GIVER, Vec3(5, 5, 0))
+        manager.create_npc("trader", "Trader", NPCType.MERCHANT, Vec3(40, 0, 0))
+        self.assertEqual(manager.get_nearest_npc(Vec3(30, 0, 0)).npc_id, "trader")
+        self.assertEqual(manager.get_npc_at_position(Vec3(6, 5, 0)).npc_id, "elder")
+        self.assertIsNone(manager.get_npc_at_position(Vec3(20, 0, 0)))
+        
+        manager.move_npc("elder", Vec3(30, 1, 0))
+        self.assertEqual(manager.get_nearest_npc(Vec3(30, 0, 0)).npc_id, "elder")
+        self.assertIsNone(manager.get_nearest_npc(Vec3(-100, 0, 0), max_distance=50.0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the stat engine and the stat sources of relics and abilities
+"""
+
+import sys
+import os
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.stat_engine import StatEngine
+from game.ability_system import Ability
+from game.relic_system import RelicSystem
+
+class MockPlayer:
+    """Mock player whose stats come from a stat engine"""
+    def __init__(self):
+        self.stats = StatEngine({"max_health": 100, "max_stamina": 100, "speed": 5.0,
+                                 "damage_multiplier": 1.0, "damage_taken": 1.0, "attack_cooldown": 1.0})
+        self.health = 100
+        self.stamina = 100
+    
+    @property
+    def max_health(self):
+        return self.stats.get("max_health")
+    
+    @property
+    def max_stamina(self):
+        return self.stats.get("max_stamina")
+
+class MockGame:
+    """Mock game with a player"""
+    def __init__(self):
+        self.player = MockPlayer()
+
+class TestStatEngine(unittest.TestCase):
+    """Test derived stats, sources and lazy recomputation"""
+    
+    def test_sources_stack_and_remove(self):
+        """Additive sources add to the base, multiplicative ones scale the total"""
+        stats = StatEngine({"speed": 5.0, "max_health": 100})
+        stats.set_source("boots", multiplicative={"speed": 1.2})
+        stats.set_source("skill", additive={"speed": 1.0, "max_health": 20})
+        stats.set_source("armor", multiplicative={"speed": 0.5})
+        self.assertAlmostEqual(stats.get("speed"), 6.0 * 1.2 * 0.5)
+        self.assertAlmostEqual(stats.get("max_health"), 120)
+        
+        # Replacing a source does not stack, removing one keeps the others
+        self.assertFalse(stats.set_source("skill", additive={"speed": 2.0}))
+        self.assertTrue(stats.remove_source("boots"))
+        self.assertFalse(stats.remove_source("boots"))
+        self.assertAlmostEqual(stats.get("speed"), 7.0 * 0.5)
+        self.assertAlmostEqual(stats.get("max_health"), 100)
+        self.assertEqual(stats.sources, ["armor", "skill"])
+    
+    def test_reads_are_cached(self):
+        """Stats are only recomputed after a change"""
+        stats = StatEngine({"speed": 5.0})
+        stats.set_source("boots", multiplicative={"speed": 2.0})
+        self.assertTrue(stats.dirty)
+        self.assertEqual(stats.get("speed"), 10.0)
+        self.assertFalse(stats.dirty)
+        
+        revision = stats.revision
+        stats.get("speed")
+        self.assertEqual(stats.revision, revision)
+        stats.set_base("speed", 4.0)
+        self.assertGreater(stats.revision, revision)
+        self.assertEqual(stats.get("speed"), 8.0)
+    
+    def test_set_value_keeps_modifiers(self):
+        """Assigning a derived value moves the base and keeps the sources"""
+        stats = StatEngine({"speed": 5.0})
+        stats.set_source("boots", additive={"speed": 1.0}, multiplicative={"speed": 2.0})
+        stats.set_value("speed", stats.get("speed") * 1.5)
+        self.assertAlmostEqual(stats.get("speed"), 18.0)
+        stats.remove_source("boots")
+        self.assertAlmostEqual(stats.get("speed"), 8.0)
+
+class TestStatSources(unittest.TestCase):
+    """Test the relics and abilities built on the stat engine"""
+    
+    def test_relics_restore_stats_when_removed(self):
+        """Unequipping relics in any order brings the stats back exactly"""
+        game = MockGame()
+        player = game.player
+        relics = RelicSystem(game)
+        relics.add_relic("glass_cannon")
+        relics.add_relic("guardian_talisman")
+        self.assertAlmostEqual(player.max_health, 50)
+        self.assertAlmostEqual(player.health, 50)
+        self.assertAlmostEqual(player.stats.get("damage_multiplier"), 2.0)
+        self.assertAlmostEqual(player.stats.get("damage_taken"), 0.85)
+        
+        relics.remove_relic("glass_cannon")
+        self.assertAlmostEqual(player.max_health, 100)
+        self.assertAlmostEqual(player.health, 100)
+        relics.remove_relic("guardian_talisman")
+        for name in ("max_health", "damage_multiplier", "damage_taken", "attack_cooldown"):
+            self.assertAlmostEqual(player.stats.get(name), player.stats.get_base(name))
+        self.assertEqual(player.stats.sources, [])
+    
+    def test_ability_damage_is_cached(self):
+        """Ability damage follows its modifiers and level"""
+        ability = Ability("Bolt", "", 10, 1.0, 10, "projectile", "straight", [])
+        self.assertEqual(ability.get_total_damage(), 10)
+        
+        ability.add_modifier("focus", {"damage_multiplier": 1.5})
+        ability.add_modifier("rune", {"damage_bonus": 2})
+        self.assertEqual(ability.get_total_damage(), 18)
+        key = ability.total_damage_key
+        ability.get_total_damage()
+        self.assertEqual(ability.total_damage_key, key)
+        
+        ability.upgrade()
+        self.assertEqual(ability.damage, 12)
+        self.assertEqual(ability.get_total_damage(), int(14 * 1.5 * 1.1))
+        ability.remove_modifier("focus")
+        self.assertEqual(ability.get_total_damage(), int(14 * 1.1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the status effect system
+"""
+
+import sys
+import os
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.status_effects import StatusEffectSystem
+
+class MockEntity:
+    """Mock entity recording the damage and healing it receives"""
+    def __init__(self, health=100):
+        self.health = health
+        self.hits = []
+        self.heals = []
+    
+    def take_damage(self, amount):
+        self.hits.append(amount)
+        self.health -= amount
+    
+    def heal(self, amount):
+        self.heals.append(amount)
+        self.health += amount
+
+class MockGame:
+    """Mock game without an event bus"""
+    pass
+
+class TestStatusEffects(unittest.TestCase):
+    """Test ticking, stacking, expiry and movement modifiers"""
+    
+    def setUp(self):
+        self.game = MockGame()
+        self.effects = StatusEffectSystem.for_game(self.game)
+    
+    def test_shared_per_game(self):
+        """The system is created once per game"""
+        self.assertIs(StatusEffectSystem.for_game(self.game), self.effects)
+        self.assertIs(self.game.status_effects, self.effects)
+    
+    def test_ticks_do_not_depend_on_frame_rate(self):
+        """A damage over time deals the same total at any frame rate"""
+        slow_frames = MockEntity()
+        fast_frames = MockEntity()
+        self.effects.apply(slow_frames, "burn_dot")
+        self.effects.apply(fast_frames, "burn")
+        for _ in range(5):
+            self.effects.update(1.0)
+        for _ in range(500):
+            self.effects.update(0.01)
+        
+        # Four ticks of four damage, then the effect expires
+        self.assertAlmostEqual(slow_frames.health, 84)
+        self.assertAlmostEqual(fast_frames.health, 84)
+        self.assertEqual(self.effects.count, 0)
+        self.assertEqual(self.effects.get_effects(fast_frames), [])
+    
+    def test_stacking_rules(self):
+        """Refresh keeps one effect, stack adds up to a cap, independent adds rows"""
+        entity = MockEntity()
+        self.effects.apply(entity, "burn")
+        self.effects.apply(entity, {"type": "burn", "magnitude": 2, "duration": 8.0})
+        for _ in range(4):
+            self.effects.apply(entity, "poison")
+        for _ in range(6):
+            self.effects.apply(entity, "poison")
+        self.effects.apply(entity, "bleed")
+        self.effects.apply(entity, "bleed")
+        
+        effects = sorted(self.effects.get_effects(entity))
+        self.assertEqual(effects, [("bleed", 3.0, 3.0), ("bleed", 3.0, 3.0),
+                                   ("burn", 4.0, 8.0), ("poison", 10.0, 6.0)])
+        self.assertFalse(self.effects.apply(entity, "unknown_effect"))
+    
+    def test_damage_is_batched_per_entity(self):
+        """All the effects of an entity land as a single hit per frame"""
+        entity = MockEntity()
+        self.effects.apply(entity, "burn")
+        self.effects.apply(entity, "poison")
+        self.effects.apply(entity, "bleed")
+        self.effects.update(1.0)
+        self.assertEqual(entity.hits, [4 + 2 + 3 * 2])
+        
+        self.effects.apply(entity, "regeneration")
+        self.effects.update(1.0)
+        self.assertEqual(entity.heals, [3])
+    
+    def test_slow_and_stun(self):
+        """Slows keep the strongest one, stuns stop movement until they expire"""
+        entity = MockEntity()
+        self.assertEqual(self.effects.get_speed_multiplier(entity), 1.0)
+        self.effects.apply(entity, "slow_movement")
+        self.effects.apply(entity, {"type": "slow", "magnitude": 0.3, "duration": 10.0})
+        self.assertAlmostEqual(self.effects.get_speed_multiplier(entity), 0.6)
+        
+        self.effects.apply(entity, "stun_short")
+        self.assertEqual(self.effects.get_speed_multiplier(entity), 0.0)
+        self.effects.update(1.5)
+        self.assertAlmostEqual(self.effects.get_speed_multiplier(entity), 0.6)
+    
+    def test_clear_releases_slot(self):
+        """Clearing an entity drops its effects and reuses its slot"""
+        first = MockEntity()
+        second = MockEntity()
+        self.effects.apply(first, "poison")
+        self.effects.apply(second, "burn")
+        self.effects.clear(first)
+        self.assertEqual(self.effects.get_effects(first), [])
+        self.assertEqual(len(self.effects.get_effects(second)), 1)
+        
+        third = MockEntity()
+        self.effects.apply(third, "slow")
+        self.assertEqual(len(self.effects.entities), 2)
+        self.effects.update(1.0)
+        self.assertEqual(first.hits, [])
+        self.assertEqual(second.hits, [4])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the streaming statistics and the bounded performance metrics
+"""
+
+import sys
+import os
+import random
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.streaming_stats import EWMA, RunningStats, P2Quantile, WindowedCounter, WindowedQuantile
+from game.performance_tracker import PerformanceTracker
+from game.adaptive_difficulty import AdaptiveDifficultySystem
+
+class MockGame:
+    """Mock game without debug output"""
+    def __init__(self):
+        self.debug_mode = False
+
+class TestEstimators(unittest.TestCase):
+    """Test the estimators against exact computations"""
+    
+    def setUp(self):
+        """Draw a skewed sample"""
+        rng = random.Random(7)
+        self.samples = [rng.expovariate(0.1) for _ in range(5000)]
+    
+    def test_running_stats_match_exact(self):
+        """Welford's mean and variance match the two-pass values"""
+        stats = RunningStats()
+        for x in self.samples:
+            stats.update(x)
+        
+        mean = sum(self.samples) / len(self.samples)
+        variance = sum((x - mean) ** 2 for x in self.samples) / (len(self.samples) - 1)
+        self.assertAlmostEqual(stats.mean, mean, places=9)
+        self.assertAlmostEqual(stats.variance, variance, places=6)
+        self.assertEqual(stats.max, max(self.samples))
+    
+    def test_p2_quantiles_are_close(self):
+        """P² estimates stay close to the exact quantiles"""
+        ordered = sorted(self.samples)
+        for q in (0.5, 0.9):
+            estimator = P2Quantile(q)
+            for x in self.samples:
+                estimator.update(x)
+            exact = ordered[int(q * (len(ordered) - 1))]
+            self.assertAlmostEqual(estimator.get(), exact, delta=exact * 0.05)
+        
+        few = P2Quantile(0.5)
+        for x in (3, 1, 2):
+            few.update(x)
+        self.assertEqual(few.get(), 2)
+    
+    def test_ewma_follows_recent_samples(self):
+        """The moving average moves toward the recent samples"""
+        average = EWMA(alpha=0.5)
+        self.assertIsNone(average.get())
+        for x in (0, 0, 0, 8, 8, 8):
+            average.update(x)
+        self.assertEqual(average.get(), 7.0)
+    
+    def test_windows_forget_old_samples(self):
+        """Sliding and tumbling windows drop samples older than the window"""
+        counter = WindowedCounter(300, buckets=30)
+        for t in range(1000):
+            counter.add(2, now=t)
+        self.assertEqual(counter.total(now=999), 600)
+        self.assertEqual(counter.count(now=999), 300)
+        self.assertEqual(counter.total(now=5000), 0)
+        self.assertEqual(len(counter.totals), 30)
+        
+        median = WindowedQuantile(0.5, 60)
+        for t in range(60):
+            median.update(100, now=t)
+        for t in range(60, 62):
+            median.update(1, now=t)
+        self.assertEqual(median.get(), 100)
+        for t in range(62, 70):
+            median.update(1, now=t)
+        self.assertEqual(median.get(), 1)
+
+class TestBoundedMetrics(unittest.TestCase):
+    """Test that the performance systems keep bounded state"""
+    
+    def test_tracker_memory_is_bounded(self):
+        """Recording many events keeps constant-size statistics"""
+        tracker = PerformanceTracker(MockGame())
+        for i in range(10000):
+            tracker.record_combat_event('damage_dealt', 10)
+            tracker.record_combat_event('kill', 2 + i % 5, "basic")
+            tracker.record_combat_event('accuracy', 0.5)
+        
+        combat = tracker.metrics['combat']
+        self.assertEqual(combat['time_to_kill'].count, 10000)
+        self.assertAlmostEqual(combat['time_to_kill'].mean, 4.0)
+        self.assertEqual(len(tracker.short_term_windows['damage_dealt'].totals), 30)
+        
+        tracker.last_update_time = 0
+        tracker.update(0.016)
+        self.assertEqual(tracker.short_term_metrics['damage_dealt'], 100000)
+        self.assertEqual(tracker.short_term_metrics['enemies_killed'], 10000)
+        self.assertAlmostEqual(tracker.short_term_metrics['time_to_kill_median'], 4, places=3)
+        self.assertFalse(tracker.metrics_dirty)
+    
+    def test_rating_is_refreshed_on_cadence(self):
+        """Combat events mark the rating dirty instead of recomputing it"""
+        system = AdaptiveDifficultySystem(MockGame())
+        calls = []
+        original = system._update_performance_rating
+        system._update_performance_rating = lambda: (calls.append(1), original())
+        
+        for _ in range(500):
+            system.record_combat_event('damage_dealt', 20)
+        self.assertEqual(calls, [])
+        
+        system.update(0.016)
+        system.update(0.016)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(system.performance_trend.count, 1)
+        
+        # Reading the stats refreshes a dirty rating right away
+        system.record_combat_event('damage_taken', 20)
+        self.assertLess(system.get_difficulty_stats()['performance_rating'], 0)
+        self.assertEqual(len(calls), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test the heightfield terrain
+"""
+
+import sys
+import os
+import time
+import unittest
+
+# Add src directory to Python path, and its parent for the asset tools
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+sys.path.insert(0, os.path.dirname(os.path.dirname(current_dir)))
+
+from panda3d.core import NodePath, Vec3
+
+from game.terrain import HeightField, TerrainManager, perlin_grid
+from game.projectile import Projectile
+from engine.physics import PhysicsManager
+from src.tools.asset_generator.body_part_generator import BodyPartGenerator, CharacterClass
+
+class MockGame:
+    """Mock game with a scene graph"""
+    def __init__(self):
+        self.render = NodePath("render")
+
+class MockTerrain:
+    """Mock terrain sloping up along X"""
+    def height_at(self, x, y):
+        return 0.5 * x
+
+class TestHeightField(unittest.TestCase):
+    """Test height lookups"""
+    
+    def setUp(self):
+        self.heightfield = HeightField(size=64, cell_size=2.0)
+        self.heightfield.generate(seed=7, amplitude=3.0, flat_radius=10.0)
+    
+    def test_city_is_flat(self):
+        """The area around the origin stays at ground level"""
+        self.assertEqual(self.heightfield.height_at(0, 0), 0.0)
+        self.assertEqual(self.heightfield.height_at(5, -5), 0.0)
+    
+    def test_interpolation(self):
+        """Lookups match the samples and interpolate between them"""
+        heights = self.heightfield.heights
+        column, row = self.heightfield.get_cell(40, 50)
+        self.assertAlmostEqual(self.heightfield.height_at(40, 50), float(heights[row, column]), places=5)
+        
+        midpoint = (float(heights[row, column]) + float(heights[row, column + 1])) / 2
+        self.assertAlmostEqual(self.heightfield.height_at(41, 50), midpoint, places=5)
+    
+    def test_noise_grid(self):
+        """Grid noise is deterministic per seed and matches single samples"""
+        xs = [0.25, 1.5, -3.75]
+        ys = [0.5, -2.25]
+        field = perlin_grid(xs, ys, seed=4)
+        self.assertEqual(field.shape, (2, 3))
+        self.assertTrue((field == perlin_grid(xs, ys, seed=4)).all())
+        self.assertFalse((field == perlin_grid(xs, ys, seed=5)).all())
+        self.assertAlmostEqual(float(perlin_grid([xs[2]], [ys[1]], seed=4)[0, 0]), float(field[1, 2]))
+        self.assertLessEqual(abs(field).max(), 1.0)
+    
+    def test_outside_uses_edge(self):
+        """Positions beyond the grid use the nearest edge sample"""
+        self.assertAlmostEqual(self.heightfield.height_at(1000, 1000),
+                               float(self.heightfield.heights[-1, -1]), places=5)
+
+class TestTerrainManager(unittest.TestCase):
+    """Test terrain rendering and modification"""
+    
+    def setUp(self):
+        self.game = MockGame()
+        self.terrain = TerrainManager(self.game, size=128, seed=3)
+    
+    def tearDown(self):
+        self.terrain.cleanup()
+    
+    def test_blocks_match_heights(self):
+        """Rendered blocks reproduce the heightfield"""
+        self.assertEqual(len(self.terrain.blocks), 4)
+        block = self.terrain.blocks[(1, 1)]
+        root = block.terrain.getRoot()
+        elevation = block.terrain.getElevation(10, 20) * root.getSz() + root.getZ()
+        self.assertAlmostEqual(elevation, self.terrain.height_at(10, 20), places=3)
+    
+    def test_modify_rebuilds_in_background(self):
+        """Modifications apply at once and rebuild the touched blocks"""
+        before = self.terrain.height_at(0, 0)
+        old_node = self.terrain.blocks[(0, 0)].terrain.getRoot()
+        
+        # The origin is the corner shared by all four blocks
+        self.terrain.modify(0, 0, 4, 2.0)
+        self.assertAlmostEqual(self.terrain.height_at(0, 0), before + 2.0, places=5)
+        self.assertEqual(self.terrain.dirty_blocks, set(self.terrain.blocks))
+        
+        self.terrain.update()
+        deadline = time.time() + 5.0
+        while any(block.rebuilding for block in self.terrain.blocks.values()) and time.time() < deadline:
+            time.sleep(0.01)
+            self.terrain.update()
+        
+        for block in self.terrain.blocks.values():
+            self.assertEqual(block.built_version, block.version)
+        self.assertFalse(old_node.hasParent())
+    
+    def test_projectile_hits_ground(self):
+        """Projectiles stop when they reach the terrain"""
+        self.game.terrain = self.terrain
+        self.terrain.modify(10, 0, 3, 5.0)
+        projectile = Projectile(self.game, Vec3(0, 0, 0.5), Vec3(1, 0, 0), 10.0, 10, 100.0)
+        
+        alive = True
+        for _ in range(100):
+            alive = projectile.update(0.05)
+            if not alive:
+                break
+        self.assertFalse(alive)
+        self.assertLess(projectile.position.x, 10.0)
+
+class TestCharacterGround(unittest.TestCase):
+    """Test that physics characters stand on the terrain"""
+    
+    def test_characters_follow_terrain(self):
+        """Characters created by the physics manager take the terrain height"""
+        physics = PhysicsManager(MockGame())
+        physics.register_physics_entity("hero", Vec3(4, 0, 3), 0.5)
+        model = BodyPartGenerator().generate_character_model(CharacterClass.WARRIOR, 2.0, variation_seed=1)
+        character = physics.create_character_physics("hero", model)
+        self.assertIsNone(character.terrain)
+        
+        physics.set_terrain(MockTerrain())
+        physics.update(physics.fixed_timestep)
+        center = character._get_character_center()
+        self.assertAlmostEqual(character.ground_height, 0.5 * center.x, places=4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test batched terrain tile synthesis
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+# Add the repository root to Python path (the asset tools import through src)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from src.tools.asset_generator.terrain_generator import TerrainGenerator
+
+class TestTerrainTiles(unittest.TestCase):
+    """Test the array-based tile synthesizer"""
+    
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.generator = TerrainGenerator(self.output_dir.name)
+    
+    def tearDown(self):
+        self.output_dir.cleanup()
+    
+    def test_noise_field(self):
+        """Noise fields are deterministic per seed and stay in range"""
+        field = self.generator.perlin_noise_field([1, 2, 1], scale=10.0, octaves=3)
+        self.assertEqual(field.shape, (3, 64, 64))
+        self.assertTrue(np.array_equal(field[0], field[2]))
+        self.assertFalse(np.array_equal(field[0], field[1]))
+        self.assertLessEqual(np.abs(field).max(), 1.0)
+    
+    def test_batched_matches_single(self):
+        """A batched tileset renders the same tiles as one tile at a time"""
+        for terrain_type in self.generator.tile_recipes:
+            batched = self.generator.generate_tileset(terrain_type, variations=3, seed=7)
+            single = self.generator.generate_tileset(terrain_type, variations=3, seed=7, batched=False)
+            for first, second in zip(batched, single):
+                self.assertTrue(np.array_equal(np.array(first), np.array(second)), terrain_type)
+    
+    def test_details_are_stamped(self):
+        """Detail passes add palette colors on top of the noise"""
+        pixels = np.zeros((2, 64, 64, 3), dtype=np.float32)
+        rngs = [np.random.RandomState(seed) for seed in (1, 2)]
+        palette = self.generator.terrain_palettes["snow"]
+        self.generator._stamp_sparkles(pixels, palette, 20, rngs)
+        
+        stamped = (pixels == palette["highlight"]).all(axis=3)
+        self.assertGreaterEqual(stamped[0].sum(), 15)
+        self.assertFalse(np.array_equal(stamped[0], stamped[1]))
+    
+    def test_perlin_keeps_transparency(self):
+        """Noise blending leaves transparent pixels untouched"""
+        img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+        img.paste((100, 100, 100, 255), (0, 0, 32, 64))
+        result = np.array(self.generator.apply_perlin_noise(img, [(0, 0, 0), (255, 255, 255)], seed=3))
+        self.assertTrue((result[:, 32:] == 0).all())
+        self.assertTrue((result[:, :32, 3] == 255).all())
+
+if __name__ == "__main__":
+    unittest.main()
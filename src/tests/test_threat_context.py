@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test the shared threat context used by the enemy psychology system
+"""
+
+import sys
+import os
+import unittest
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+
+from panda3d.core import Vec3
+
+from game.enemy_psychology import EnemyPsychology, PsychologyTraits, ThreatContext
+
+class MockPlayer:
+    """Mock player for testing"""
+    def __init__(self, position):
+        self.position = Vec3(position)
+        self.level = 3
+        self.health = 80
+        self.max_health = 100
+        self.projectile_type = "straight"
+        self.projectile_types = {"straight": {"damage": 15}}
+
+class MockCityManager:
+    """Mock city manager for testing"""
+    def __init__(self):
+        self.city_center = Vec3(0, 0, 0)
+        self.city_radius = 10.0
+        self.defense = 50
+    
+    def is_inside_city(self, position):
+        return (position - self.city_center).length() < self.city_radius
+
+class MockFog:
+    """Mock night fog with a fixed visibility"""
+    def __init__(self, visibility):
+        self.active = True
+        self.visibility = visibility
+    
+    def get_visibility_factor(self, position):
+        return self.visibility
+    
+    def is_in_fog(self, position):
+        return self.visibility < 0.7
+
+class MockEntityManager:
+    """Mock entity manager for testing"""
+    def __init__(self):
+        self.enemies = []
+
+class MockGame:
+    """Mock game class for testing"""
+    def __init__(self):
+        self.player = MockPlayer((0, 0, 0))
+        self.city_manager = MockCityManager()
+        self.entity_manager = MockEntityManager()
+
+class MockEnemy:
+    """Mock enemy with a psychology"""
+    def __init__(self, game, position, health=50, dominance=1.0):
+        self.game = game
+        self.position = Vec3(position)
+        self.health = health
+        self.max_health = 50
+        self.damage = 10
+        self.detection_range = 10.0
+        self.psychology = EnemyPsychology(self)
+        self.psychology.traits = PsychologyTraits(dominance=dominance)
+
+class TestThreatContext(unittest.TestCase):
+    """Test the shared threat context"""
+    
+    def setUp(self):
+        """Set up a small pack of enemies around the player"""
+        self.game = MockGame()
+        positions = [(3, 0, 0), (5, 2, 0), (20, 0, 0), (8, 8, 0)]
+        for index, position in enumerate(positions):
+            enemy = MockEnemy(self.game, position, health=50 - index * 12,
+                              dominance=1.4 if index == 1 else 1.0)
+            self.game.entity_manager.enemies.append(enemy)
+        self.enemies = self.game.entity_manager.enemies
+    
+    def test_player_terms(self):
+        """Player-side terms are captured once per context"""
+        context = ThreatContext(self.game)
+        self.assertTrue(context.inside_city)
+        self.assertAlmostEqual(context.city_defense_bonus, 0.5)
+        self.assertAlmostEqual(context.player_visibility, 1.0)
+        # level 3 * (1 + 15/10) * (0.5 + 0.8/2) * (1 + 0.5)
+        self.assertAlmostEqual(context.player_power, 3 * 2.5 * 0.9 * 1.5)
+    
+    def test_matches_per_enemy_evaluation(self):
+        """Batched evaluation matches the per-enemy calculation"""
+        self.game.night_fog = MockFog(0.6)
+        self.enemies[0].psychology.memory['grudge_factor'] = 0.4
+        
+        context = ThreatContext(self.game)
+        context.evaluate(self.enemies)
+        batched = [(context.lookup(e.psychology), e.psychology.pack_strength_bonus,
+                    e.psychology.nearby_ally_count, e.psychology.alpha_nearby)
+                   for e in self.enemies]
+        
+        for enemy, (evaluation, pack_bonus, ally_count, alpha_nearby) in zip(self.enemies, batched):
+            psychology = enemy.psychology
+            self.assertAlmostEqual(psychology.calculate_pack_strength(), pack_bonus)
+            self.assertEqual(psychology.nearby_ally_count, ally_count)
+            self.assertEqual(psychology.alpha_nearby, alpha_nearby)
+            
+            power_ratio, proximity = evaluation
+            self.assertAlmostEqual(psychology.calculate_player_power_ratio(context), power_ratio)
+            
+            distance = (enemy.position - self.game.player.position).length()
+            expected_proximity = max(0.0, 1.0 - distance / enemy.detection_range)
+            self.assertAlmostEqual(proximity, expected_proximity)
+    
+    def test_update_uses_evaluation(self):
+        """Psychology updates consume the shared context"""
+        context = ThreatContext(self.game)
+        context.evaluate(self.enemies)
+        for enemy in self.enemies:
+            enemy.psychology.update(0.1, context)
+            self.assertIsNotNone(enemy.psychology.state)
+        
+        # Updates without a context still work
+        self.enemies[0].psychology.update(0.1)
+    
+    def test_no_player(self):
+        """Without a player the power ratio is neutral"""
+        self.game.player = None
+        context = ThreatContext(self.game)
+        context.evaluate(self.enemies)
+        self.assertEqual(context.lookup(self.enemies[0].psychology), (1.0, 1.0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the tower targeting service
+"""
+
+import sys
+import os
+import unittest
+
+# Add the src directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from panda3d.core import Vec3
+
+from game.tower_targeting import TowerTargeting, TargetMode
+from game.city_automation import BuildingState
+from game.city_buildings import Tower
+
+class MockEnemy:
+    """Mock enemy taking damage"""
+    def __init__(self, x, y, health=100):
+        self.position = Vec3(x, y, 0)
+        self.health = health
+    
+    def take_damage(self, amount):
+        self.health -= amount
+
+class MockEntityManager:
+    """Mock entity manager with enemy lists"""
+    def __init__(self, enemies):
+        self.enemies = enemies
+        self.subservient_enemies = []
+
+class MockGame:
+    """Mock game with an entity manager"""
+    def __init__(self, enemies):
+        self.entity_manager = MockEntityManager(enemies)
+
+class MockCityManager:
+    """Mock city manager mapping grid cells to world units"""
+    def __init__(self, game):
+        self.game = game
+    
+    def grid_to_world(self, grid_pos):
+        return (grid_pos[0] * 2, grid_pos[1] * 2, 0)
+
+class TestTowerTargeting(unittest.TestCase):
+    """Test target selection, stickiness and ring queries"""
+    
+    def test_nearest_and_lowest_health(self):
+        """Each tower picks by its own rule among the enemies in range"""
+        near, weak, far = MockEnemy(3, 0), MockEnemy(0, 8, health=20), MockEnemy(40, 0)
+        game = MockGame([near, weak, far])
+        targeting = TowerTargeting.for_game(game)
+        self.assertIs(TowerTargeting.for_game(game), targeting)
+        
+        targeting.register_tower("nearest", (0, 0, 0), 10.0)
+        targeting.register_tower("weakest", (0, 0, 0), 10.0, TargetMode.LOWEST_HEALTH)
+        targeting.register_tower("idle", (100, 100, 0), 10.0)
+        targeting.update()
+        
+        self.assertIs(targeting.get_target("nearest"), near)
+        self.assertIs(targeting.get_target("weakest"), weak)
+        self.assertIsNone(targeting.get_target("idle"))
+    
+    def test_targets_are_sticky(self):
+        """A tower keeps its target until it dies or leaves the range"""
+        first = MockEnemy(8, 0)
+        game = MockGame([first])
+        targeting = TowerTargeting(game)
+        targeting.register_tower("tower", (0, 0, 0), 10.0)
+        targeting.update()
+        self.assertEqual(targeting.queries, 1)
+        
+        closer = MockEnemy(1, 0)
+        game.entity_manager.enemies.append(closer)
+        targeting.update()
+        self.assertIs(targeting.get_target("tower"), first)
+        self.assertEqual(targeting.queries, 0)
+        
+        first.position = Vec3(30, 0, 0)
+        targeting.update()
+        self.assertIs(targeting.get_target("tower"), closer)
+        
+        closer.health = 0
+        self.assertIsNone(targeting.get_target("tower"))
+        
+        # Allies are never targeted
+        game.entity_manager.subservient_enemies.append(first)
+        first.position = Vec3(2, 0, 0)
+        targeting.update()
+        self.assertIsNone(targeting.get_target("tower"))
+    
+    def test_ring_query(self):
+        """The early-warning ring counts enemies between two distances"""
+        game = MockGame([MockEnemy(10, 0), MockEnemy(0, 55), MockEnemy(-60, 0), MockEnemy(200, 0)])
+        targeting = TowerTargeting(game)
+        targeting.update()
+        self.assertEqual(targeting.count_in_ring(Vec3(0, 0, 0), 70.0, 50.0), 2)
+        self.assertEqual(targeting.count_in_ring(Vec3(0, 0, 0), 70.0), 3)
+        self.assertEqual(targeting.count_in_ring(Vec3(195, 5, 0), 8.0), 1)
+        self.assertEqual(targeting.count_in_ring(Vec3(0, 0, 0), 500.0, 100.0), 1)
+        self.assertEqual(targeting.count_in_ring(Vec3(100, 100, 0), 5.0), 0)
+    
+    def test_tower_building_attacks_target(self):
+        """An operational tower registers itself and fires on cooldown"""
+        enemy = MockEnemy(12, 0)
+        game = MockGame([enemy])
+        city_manager = MockCityManager(game)
+        tower = Tower("tower_1", (5, 0))
+        tower.state = BuildingState.OPERATIONAL
+        
+        tower.update(0.1, city_manager)
+        self.assertTrue(tower.targeting_registered)
+        game.tower_targeting.update()
+        tower.update(0.1, city_manager)
+        self.assertEqual(enemy.health, 100 - tower.defense_damage)
+        
+        # Damaged towers stop targeting
+        tower.state = BuildingState.DAMAGED
+        tower.update(0.1, city_manager)
+        self.assertNotIn(tower, game.tower_targeting.towers)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,8 +21,11 @@ from panda3d.core import KeyboardButton
 # Add src parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.engine.physics.verlet import VerletSystem
-from src.game.character_physics import CharacterPhysics, MovementState
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.physics.verlet import VerletSystem
+from game.character_physics import CharacterPhysics, MovementState
 from src.tools.asset_generator.body_part_generator import BodyPartGenerator, CharacterClass
 
 class TestVerletCharacter(ShowBase):
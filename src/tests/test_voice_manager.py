@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test audio voice management and sound pools
+"""
+
+import sys
+import os
+import unittest
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+
+from panda3d.core import AudioSound
+
+from game.voice_manager import VoiceManager, SoundPool
+from game.audio_manager import AudioManager, SoundCategory
+
+class MockSound:
+    """Mock Panda3D AudioSound"""
+    def __init__(self, length=1.0):
+        self._length = length
+        self.playing = False
+        self.volume = 1.0
+    
+    def play(self):
+        self.playing = True
+    
+    def stop(self):
+        self.playing = False
+    
+    def status(self):
+        return AudioSound.PLAYING if self.playing else AudioSound.READY
+    
+    def length(self):
+        return self._length
+    
+    def setVolume(self, volume):
+        self.volume = volume
+    
+    def setLoop(self, loop):
+        pass
+    
+    def set3dAttributes(self, *args):
+        pass
+    
+    def set3dMinDistance(self, distance):
+        pass
+    
+    def set3dMaxDistance(self, distance):
+        pass
+
+class MockP3DAudioManager:
+    """Mock Panda3D audio manager creating mock sounds"""
+    def __init__(self):
+        self.created = 0
+    
+    def getSound(self, path, positional=False, mode=0):
+        self.created += 1
+        return MockSound()
+
+class MockGame:
+    """Mock game class for testing"""
+    pass
+
+class TestVoiceManager(unittest.TestCase):
+    """Test the voice manager on its own"""
+    
+    def setUp(self):
+        self.voices = VoiceManager({"limits": {"sfx": 2}, "max_identical_per_frame": 3})
+    
+    def add(self, sound_id, importance, loop=False, name="hit"):
+        sound = MockSound()
+        sound.play()
+        self.voices.add_voice(sound_id, {"sound": sound, "sound_name": name, "category": "sfx",
+                                         "importance": importance, "loop": loop}, 1.0)
+        return sound
+    
+    def test_voice_stealing(self):
+        """Full categories steal the least important voice"""
+        self.add("a", 10, name="a")
+        self.add("b", 30, name="b")
+        self.assertEqual(self.voices.request_voice("c", "sfx", 20, 1.0), (True, "a"))
+        self.assertEqual(self.voices.request_voice("c", "sfx", 5, 1.0), (False, None))
+    
+    def test_distance_culling(self):
+        """Positional sounds beyond their audible range are culled"""
+        self.voices.listener_position = (0, 0, 0)
+        self.assertEqual(self.voices.get_attenuation((100, 0, 0), 10, 50), 0.0)
+        self.assertAlmostEqual(self.voices.get_attenuation((30, 0, 0), 10, 50), 0.5)
+        self.assertEqual(self.voices.request_voice("hit", "sfx", 0, 0.0), (False, None))
+    
+    def test_rate_limit(self):
+        """Identical sounds are capped per frame"""
+        self.voices.limits["sfx"] = 100
+        allowed = 0
+        for index in range(40):
+            if self.voices.request_voice("hit", "sfx", 50, 1.0)[0]:
+                self.add(f"hit_{index}", 50)
+                allowed += 1
+        self.assertEqual(allowed, 3)
+        
+        # A new frame allows the sound again
+        self.voices.update(0.016)
+        self.assertTrue(self.voices.request_voice("hit", "sfx", 50, 1.0)[0])
+    
+    def test_finished_voices(self):
+        """One-shot voices are reported once their length has elapsed"""
+        sound = self.add("a", 10)
+        self.add("loop", 10, loop=True, name="loop")
+        self.assertEqual(self.voices.update(0.5), [])
+        
+        # Still playing past its length: checked again later
+        self.assertEqual(self.voices.update(0.6), [])
+        sound.stop()
+        self.assertEqual(self.voices.update(0.3), ["a"])
+    
+    def test_sound_pool(self):
+        """Pools hand out distinct instances"""
+        pool = SoundPool([MockSound(), MockSound()])
+        first, second = pool.acquire(), pool.acquire()
+        self.assertIsNot(first, second)
+        self.assertIsNone(pool.acquire())
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+
+class TestAudioManagerVoices(unittest.TestCase):
+    """Test voice management through the audio manager"""
+    
+    def setUp(self):
+        self.audio = AudioManager(MockGame())
+        self.audio.audio_enabled = True
+        self.audio.audio_manager = MockP3DAudioManager()
+    
+    def test_overlapping_playback(self):
+        """The same effect can overlap itself using pooled instances"""
+        first = self.audio.play_sound("weapon_hit_1")
+        second = self.audio.play_sound("weapon_hit_1")
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertIsNot(self.audio.active_sounds[first]["sound"],
+                         self.audio.active_sounds[second]["sound"])
+    
+    def test_burst_collapses(self):
+        """A burst of identical hits collapses into a few voices"""
+        started = [self.audio.play_sound("weapon_hit_1") for _ in range(40)]
+        self.assertEqual(len([sound_id for sound_id in started if sound_id]),
+                         self.audio.voice_manager.max_identical_per_frame)
+    
+    def test_stop_returns_instance(self):
+        """Stopped sounds go back to their pool"""
+        sound_id = self.audio.play_sound("weapon_hit_1")
+        pool = self.audio.active_sounds[sound_id]["pool"]
+        free_before = len(pool.free)
+        self.audio.stop_sound(sound_id)
+        self.assertEqual(len(pool.free), free_before + 1)
+        self.assertNotIn(sound_id, self.audio.active_sounds)
+    
+    def test_rejected_sound_keeps_victim(self):
+        """The category voice is only stolen once the new sound has an instance"""
+        self.audio.voice_manager.configure({"limits": {"sfx": 3}, "pool_sizes": {"sfx": 2}})
+        strong = [self.audio.play_sound("weapon_hit_1", priority=90) for _ in range(2)]
+        weak = self.audio.play_sound("weapon_hit_2", priority=10)
+        self.audio.voice_manager.update(0.016)
+        
+        # The pool of weapon_hit_1 only holds stronger voices
+        self.assertIsNone(self.audio.play_sound("weapon_hit_1", priority=50))
+        self.assertIn(weak, self.audio.active_sounds)
+        self.assertTrue(self.audio.active_sounds[weak]["sound"].playing)
+        self.assertEqual(self.audio.voice_manager.stats["stolen"], 0)
+        
+        # A stronger sound takes a pool instance and then the category voice
+        self.assertIsNotNone(self.audio.play_sound("weapon_hit_1", priority=95))
+        self.assertNotIn(weak, self.audio.active_sounds)
+        self.assertEqual(len([sid for sid in strong if sid in self.audio.active_sounds]), 1)
+    
+    def test_missing_sound(self):
+        """Missing files fail without creating a pool each time"""
+        self.assertIsNone(self.audio.play_sound("does_not_exist", category=SoundCategory.UI))
+        self.assertIsNone(self.audio.play_sound("does_not_exist", category=SoundCategory.UI))
+        self.assertEqual(self.audio.audio_manager.created, 0)
+
+if __name__ == "__main__":
+    unittest.main()
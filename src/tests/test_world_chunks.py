@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Test world chunk streaming
+"""
+
+import sys
+import os
+import unittest
+
+# Add src directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), "")
+sys.path.insert(0, src_dir)
+
+from panda3d.core import CardMaker, NodePath, Vec3
+
+from game.resource_node import ResourceNode
+from game.world_chunks import WorldChunkManager
+
+class MockLoader:
+    """Mock loader returning a small card for every model"""
+    def loadModel(self, path):
+        cm = CardMaker(path)
+        cm.setFrame(0, 1, 0, 1)
+        return NodePath(cm.generate())
+
+class MockEntityManager:
+    """Mock entity manager keeping resource nodes in a list"""
+    def __init__(self, game):
+        self.game = game
+        self.resource_nodes = []
+    
+    def create_resource_node(self, position, resource_type="wood"):
+        self.resource_nodes.append(ResourceNode(self.game, position, resource_type))
+    
+    def remove_entity(self, entity):
+        self.resource_nodes.remove(entity)
+
+class MockGame:
+    """Mock game with a scene graph"""
+    def __init__(self):
+        self.render = NodePath("render")
+        self.loader = MockLoader()
+        self.entity_manager = MockEntityManager(self)
+
+class TestWorldChunks(unittest.TestCase):
+    """Test the world chunk manager"""
+    
+    def setUp(self):
+        self.game = MockGame()
+        self.chunks = WorldChunkManager(self.game, world_seed=1234, load_radius=1, unload_radius=2)
+    
+    def test_layout_is_reproducible(self):
+        """Chunk layouts depend only on the world seed and the coordinates"""
+        other = WorldChunkManager(MockGame(), world_seed=1234)
+        self.assertEqual(self.chunks.generate_layout((3, -2)), other.generate_layout((3, -2)))
+        self.assertNotEqual(self.chunks.generate_layout((3, -2)), self.chunks.generate_layout((2, -2)))
+    
+    def test_static_geometry_is_flattened(self):
+        """Each chunk's decoration is merged into a single GeomNode"""
+        self.chunks.update(Vec3(0, 0, 0))
+        self.assertEqual(len(self.chunks.get_loaded_chunks()), 9)
+        for coords in self.chunks.get_loaded_chunks():
+            static_node = self.chunks.chunks[coords].static_node
+            self.assertLessEqual(static_node.findAllMatches("**/+GeomNode").getNumPaths(), 1)
+    
+    def test_hysteresis(self):
+        """Chunks unload only once the camera is beyond the unload radius"""
+        self.chunks.update(Vec3(0, 0, 0))
+        self.assertTrue(self.chunks.chunks[(-1, 0)].loaded)
+        
+        # One chunk away: (-1, 0) is now two chunks away but still kept
+        self.chunks.update(Vec3(WorldChunkManager.CHUNK_SIZE * 1.5, 0, 0))
+        self.assertTrue(self.chunks.chunks[(-1, 0)].loaded)
+        
+        self.chunks.update(Vec3(WorldChunkManager.CHUNK_SIZE * 2.5, 0, 0))
+        self.assertFalse(self.chunks.chunks[(-1, 0)].loaded)
+    
+    def test_loads_are_spread_over_updates(self):
+        """After the first update only a few chunks load per update"""
+        self.chunks.update(Vec3(0, 0, 0))
+        self.chunks.update(Vec3(WorldChunkManager.CHUNK_SIZE * 10, 0, 0))
+        self.assertEqual(len(self.chunks.get_loaded_chunks()), self.chunks.max_loads_per_update)
+    
+    def test_resource_state_survives_unload(self):
+        """Harvested resource nodes are restored when their chunk reloads"""
+        coords = (2, 2)
+        self.chunks.load_chunk(coords)
+        chunk = self.chunks.chunks[coords]
+        node = chunk.resource_nodes[0]
+        position = Vec3(node.position)
+        node.deplete()
+        
+        self.chunks.unload_chunk(coords)
+        self.assertEqual(self.game.entity_manager.resource_nodes, [])
+        
+        self.chunks.load_chunk(coords)
+        restored = chunk.resource_nodes[0]
+        self.assertIsNot(restored, node)
+        self.assertEqual(restored.position, position)
+        self.assertTrue(restored.is_depleted)
+        self.assertTrue(chunk.combiner_dirty)
+    
+    def test_props_hidden_with_chunk(self):
+        """Props of other systems are stashed while their chunk is unloaded"""
+        prop = self.game.render.attachNewNode("poi")
+        prop.setPos(70, 70, 0)
+        self.chunks.attach_prop(prop, prop.getPos())
+        self.assertTrue(prop.getParent().isStashed())
+        
+        self.chunks.load_chunk(self.chunks.get_chunk_coords(prop.getPos()))
+        self.assertFalse(prop.getParent().isStashed())
+        self.assertEqual(prop.getPos(self.game.render), Vec3(70, 70, 0))
+
+if __name__ == "__main__":
+    unittest.main()
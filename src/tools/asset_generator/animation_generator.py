@@ -7,14 +7,15 @@ Creates organic animations using verlet integration physics
 """
 
 import os
-import random
-import math
 import numpy as np
-from PIL import Image, ImageDraw, ImageFilter, ImageChops
+from PIL import Image
 from enum import Enum
 import json
 
 from src.tools.asset_generator.base_generator import AssetGenerator, AssetType, AssetCategory
+from src.tools.asset_generator.asset_cache import generate_cached_batch
+from src.tools.asset_generator.particle_rasterizer import ParticleBatch, composite_particles, separable_blur
+from src.tools.asset_generator.verlet_rig import VerletRig
 
 class AnimationType(Enum):
     """Types d'animations que le générateur peut produire"""
@@ -50,6 +51,9 @@ class AnimationGenerator(AssetGenerator):
         """
         super().__init__(output_dir)
         
+        # Atlas partagé, affecté par le système de génération
+        self.atlas = None
+        
         # Création des sous-répertoires pour les animations
         self.animation_dirs = {anim_type: os.path.join(output_dir, anim_type.value) 
                               for anim_type in AnimationType}
@@ -75,6 +79,29 @@ class AnimationGenerator(AssetGenerator):
         self.friction = 0.95
         self.stiffness = 0.5
         
+        # Squelette commun à tous les personnages : points, masses et contraintes
+        self.rig = VerletRig(
+            ["head", "torso", "hip", "left_hand", "right_hand", "left_foot", "right_foot"],
+            [1.0, 2.0, 1.5, 0.5, 0.5, 0.5, 0.5],
+            [("head", "torso"), ("torso", "hip"), ("torso", "left_hand"),
+             ("torso", "right_hand"), ("hip", "left_foot"), ("hip", "right_foot")],
+            gravity=self.gravity, friction=self.friction, stiffness=self.stiffness
+        )
+        
+        # Suivi de la pose par point : la tête et les mains gardent du jeu
+        self.pose_weights = np.array([0.35, 0.8, 1.0, 0.7, 0.7, 1.0, 1.0], dtype=np.float32)
+        
+        # Couleurs (torse, membres) par classe de personnage
+        self.class_colors = {
+            "warrior": ((180, 30, 30, 255), (50, 50, 50, 255)),
+            "mage": ((50, 50, 180, 255), (70, 70, 100, 255)),
+            "cleric": ((180, 180, 180, 255), (80, 80, 80, 255)),
+            "alchemist": ((80, 140, 80, 255), (60, 90, 60, 255)),
+            "ranger": ((80, 120, 50, 255), (60, 70, 40, 255)),
+            "summoner": ((140, 80, 160, 255), (80, 60, 100, 255)),
+            "default": ((100, 100, 100, 255), (70, 70, 70, 255))
+        }
+        
     def generate(self, asset_id, asset_params, seed=None):
         """
         Génère une animation selon les paramètres spécifiés
@@ -87,369 +114,316 @@ class AnimationGenerator(AssetGenerator):
         Returns:
             dict: Animation générée (frames + metadata)
         """
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-        
-        # Extraire les paramètres
-        anim_type_str = asset_params.get("animation_type", "idle")
-        anim_type = next((at for at in AnimationType if at.value == anim_type_str), AnimationType.IDLE)
-        
-        size = asset_params.get("size", self.base_sprite_size)
-        frame_count = asset_params.get("frame_count", self.frame_count.get(anim_type))
-        character_type = asset_params.get("character_type", "warrior")
-        
-        # Générer le modèle de personnage en verlet pour l'animation
-        character_model = self._create_character_model(character_type, size)
-        
-        # Générer l'animation selon son type
-        if anim_type == AnimationType.WALK:
-            frames = self._generate_walk_animation(character_model, frame_count, size)
-        elif anim_type == AnimationType.RUN:
-            frames = self._generate_run_animation(character_model, frame_count, size)
-        elif anim_type == AnimationType.ATTACK:
-            frames = self._generate_attack_animation(character_model, frame_count, size)
-        elif anim_type == AnimationType.IDLE:
-            frames = self._generate_idle_animation(character_model, frame_count, size)
-        elif anim_type == AnimationType.JUMP:
-            frames = self._generate_jump_animation(character_model, frame_count, size)
-        elif anim_type == AnimationType.FALL:
-            frames = self._generate_fall_animation(character_model, frame_count, size)
-        elif anim_type == AnimationType.DEATH:
-            frames = self._generate_death_animation(character_model, frame_count, size)
-        elif anim_type == AnimationType.CAST:
-            frames = self._generate_cast_animation(character_model, frame_count, size)
-        else:
-            # Type inconnu, générer une animation idle par défaut
-            frames = self._generate_idle_animation(character_model, frame_count, size)
-        
-        # Créer les métadonnées pour l'animation
-        animation_data = {
-            "frames": frames,
-            "metadata": {
-                "asset_id": asset_id,
-                "animation_type": anim_type.value,
-                "character_type": character_type,
-                "frame_count": frame_count,
-                "frame_duration": 100,  # ms par image par défaut
-                "loop": anim_type != AnimationType.DEATH  # Toutes les animations en boucle sauf la mort
-            }
-        }
+        return self.generate_batch([(asset_id, asset_params, seed)])[0]
+    
+    def generate_batch(self, requests):
+        """
+        Génère plusieurs animations, simulées et rendues par lots
+        
+        Les requêtes de même type d'animation, de même taille et de même
+        nombre de frames sont simulées ensemble par le squelette Verlet,
+        puis toutes leurs frames sont rendues en un seul passage.
         
-        return animation_data
+        Args:
+            requests (list): Liste de tuples (asset_id, asset_params, seed)
+            
+        Returns:
+            list: Animations générées (frames + metadata) dans l'ordre des requêtes
+        """
+        groups = {}
+        for position, (asset_id, asset_params, seed) in enumerate(requests):
+            anim_type_str = asset_params.get("animation_type", "idle")
+            anim_type = next((at for at in AnimationType if at.value == anim_type_str), AnimationType.IDLE)
+            size = tuple(asset_params.get("size", self.base_sprite_size))
+            frame_count = asset_params.get("frame_count", self.frame_count.get(anim_type))
+            groups.setdefault((anim_type, size, frame_count), []).append(position)
+        
+        animations = [None] * len(requests)
+        for (anim_type, size, frame_count), positions in groups.items():
+            models = [self._create_character_model(requests[p][1].get("character_type", "warrior"), size)
+                      for p in positions]
+            
+            # Légère variation d'amplitude par seed, pour des variantes distinctes
+            amplitude = np.array([1.0 if requests[p][2] is None else
+                                  np.random.RandomState(requests[p][2]).uniform(0.9, 1.1)
+                                  for p in positions], dtype=np.float32)
+            
+            loop = anim_type not in (AnimationType.DEATH, AnimationType.JUMP)
+            times = np.arange(frame_count, dtype=np.float32) / (frame_count if loop else max(frame_count - 1, 1))
+            scale = min(size) / self.base_sprite_size[0]
+            
+            rest = np.stack([model["rest"] for model in models])
+            offsets = self._get_pose_offsets(anim_type, times, amplitude) * scale
+            targets = rest[:, np.newaxis] + offsets
+            
+            positions_by_frame = self.rig.simulate(targets, self.pose_weights, rest=self.rig.rest_lengths(rest),
+                                                   cycles=2 if loop else 1)
+            frames = self._render_frames(positions_by_frame, models, size)
+            
+            for index, position in enumerate(positions):
+                asset_id = requests[position][0]
+                animations[position] = {
+                    "frames": frames[index * frame_count:(index + 1) * frame_count],
+                    "metadata": {
+                        "asset_id": asset_id,
+                        "animation_type": anim_type.value,
+                        "character_type": models[index]["character_type"],
+                        "frame_count": frame_count,
+                        "frame_duration": 100,  # ms par image par défaut
+                        "loop": loop  # La mort et le saut ne bouclent pas, comme dans la simulation
+                    }
+                }
+        
+        return animations
+    
+    def generate_batch_with_cache(self, requests):
+        """
+        Génère plusieurs animations en réutilisant celles présentes dans le cache disque
+        
+        Args:
+            requests (list): Liste de tuples (asset_id, asset_params, seed)
+            
+        Returns:
+            list: Animations de chaque requête, depuis le cache ou nouvellement générées
+        """
+        return generate_cached_batch(self, requests, self.generate_batch)
     
     def _create_character_model(self, character_type, size):
         """
-        Crée un modèle de personnage avec des points et contraintes pour la simulation verlet
+        Crée la pose de repos et l'apparence d'un personnage
         
         Args:
             character_type (str): Type de personnage (warrior, mage, etc.)
             size (tuple): Dimensions de base du sprite
             
         Returns:
-            dict: Modèle du personnage avec points et contraintes pour verlet
+            dict: Positions de repos des points (points, 2) et propriétés visuelles
         """
         width, height = size
-        center_x, center_y = width // 2, height // 2
-        
-        # Définir les points du modèle (position, ancienne position, masse)
-        # Les positions sont relatives au centre de l'image
-        points = {
-            "head": {"pos": [center_x, center_y - 15], "old_pos": [center_x, center_y - 15], "mass": 1.0},
-            "torso": {"pos": [center_x, center_y], "old_pos": [center_x, center_y], "mass": 2.0},
-            "hip": {"pos": [center_x, center_y + 10], "old_pos": [center_x, center_y + 10], "mass": 1.5},
-            "left_hand": {"pos": [center_x - 12, center_y], "old_pos": [center_x - 12, center_y], "mass": 0.5},
-            "right_hand": {"pos": [center_x + 12, center_y], "old_pos": [center_x + 12, center_y], "mass": 0.5},
-            "left_foot": {"pos": [center_x - 8, center_y + 20], "old_pos": [center_x - 8, center_y + 20], "mass": 0.5},
-            "right_foot": {"pos": [center_x + 8, center_y + 20], "old_pos": [center_x + 8, center_y + 20], "mass": 0.5}
-        }
-        
-        # Définir les contraintes qui lient les points (distance fixe)
-        constraints = [
-            {"p1": "head", "p2": "torso", "distance": 15},
-            {"p1": "torso", "p2": "hip", "distance": 10},
-            {"p1": "torso", "p2": "left_hand", "distance": 12},
-            {"p1": "torso", "p2": "right_hand", "distance": 12},
-            {"p1": "hip", "p2": "left_foot", "distance": 20},
-            {"p1": "hip", "p2": "right_foot", "distance": 20}
-        ]
+        scale = min(size) / self.base_sprite_size[0]
+        
+        # Positions relatives au centre de l'image, dans l'ordre des points du squelette
+        rest = np.array([
+            [0, -15],   # head
+            [0, 0],     # torso
+            [0, 10],    # hip
+            [-12, 0],   # left_hand
+            [12, 0],    # right_hand
+            [-8, 20],   # left_foot
+            [8, 20]     # right_foot
+        ], dtype=np.float32) * scale + np.array([width // 2, height // 2], dtype=np.float32)
         
         # Propriétés visuelles (couleurs, tailles) spécifiques au type de personnage
-        visual_props = {}
-        if character_type == "warrior":
-            visual_props = {
-                "head_color": (180, 150, 120, 255),
-                "torso_color": (180, 30, 30, 255),  # Rouge pour guerrier
-                "limb_color": (50, 50, 50, 255),
-                "head_size": 5,
-                "torso_size": 8,
-                "limb_size": 3
-            }
-        elif character_type == "mage":
-            visual_props = {
-                "head_color": (180, 150, 120, 255),
-                "torso_color": (50, 50, 180, 255),  # Bleu pour mage
-                "limb_color": (70, 70, 100, 255),
-                "head_size": 5,
-                "torso_size": 8,
-                "limb_size": 3
-            }
-        else:
-            # Propriétés par défaut
-            visual_props = {
-                "head_color": (180, 150, 120, 255),
-                "torso_color": (100, 100, 100, 255),
-                "limb_color": (70, 70, 70, 255),
-                "head_size": 5,
-                "torso_size": 8,
-                "limb_size": 3
-            }
-        
-        # Assembler le modèle complet
-        character_model = {
-            "points": points,
-            "constraints": constraints,
+        colors = self.class_colors.get(character_type, self.class_colors["default"])
+        visual_props = {
+            "head_color": (180, 150, 120, 255),
+            "torso_color": colors[0],
+            "limb_color": colors[1],
+            "head_size": max(1, round(5 * scale)),
+            "torso_size": max(1, round(8 * scale)),
+            "limb_size": max(1, round(3 * scale))
+        }
+        
+        return {
+            "rest": rest,
             "visual": visual_props,
             "character_type": character_type
         }
-        
-        return character_model
     
-    def _update_verlet_physics(self, model, dt=1.0):
+    def _get_pose_offsets(self, anim_type, times, amplitude):
         """
-        Met à jour les positions des points selon la simulation verlet
+        Calcule les décalages des points par rapport à la pose de repos
         
         Args:
-            model (dict): Modèle de personnage avec points et contraintes
-            dt (float): Pas de temps pour la simulation
+            anim_type (AnimationType): Type d'animation
+            times (numpy.ndarray): Avancement de chaque frame dans l'animation, de forme (frames,)
+            amplitude (numpy.ndarray): Amplitude du mouvement de chaque séquence, de forme (séquences,)
             
         Returns:
-            dict: Modèle mis à jour
+            numpy.ndarray: Décalages en pixels de forme (séquences, frames, points, 2)
         """
-        points = model["points"]
-        constraints = model["constraints"]
-        
-        # Mettre à jour les positions (intégration de verlet)
-        for point_name, point in points.items():
-            # Sauvegarder la position actuelle
-            pos = point["pos"]
-            old_pos = point["old_pos"]
-            mass = point["mass"]
-            
-            # Calculer la vélocité
-            vel_x = (pos[0] - old_pos[0]) * self.friction
-            vel_y = (pos[1] - old_pos[1]) * self.friction
+        a = amplitude[:, np.newaxis]
+        u = 2 * np.pi * times[np.newaxis, :]
+        offsets = np.zeros((amplitude.size, times.size, len(self.rig.point_names), 2), dtype=np.float32)
+        head, torso, hip, left_hand, right_hand, left_foot, right_foot = range(7)
+        
+        if anim_type in (AnimationType.WALK, AnimationType.RUN):
+            running = anim_type == AnimationType.RUN
+            stride, lift, arm, bounce = (12, 6, 9, 3) if running else (8, 3, 5, 1.5)
             
-            # Mettre à jour l'ancienne position
-            point["old_pos"] = [pos[0], pos[1]]
+            # Jambes alternées, bras opposés aux jambes ; le pied levé ne passe pas sous le sol
+            swing = np.sin(u) * stride * a
+            offsets[..., left_foot, 0] = swing
+            offsets[..., right_foot, 0] = -swing
+            offsets[..., left_foot, 1] = -np.maximum(np.sin(u), 0) * lift * a
+            offsets[..., right_foot, 1] = -np.maximum(-np.sin(u), 0) * lift * a
+            offsets[..., left_hand, 0] = -np.sin(u) * arm * a
+            offsets[..., right_hand, 0] = np.sin(u) * arm * a
             
-            # Appliquer la gravité et mettre à jour la position
-            point["pos"] = [
-                pos[0] + vel_x,
-                pos[1] + vel_y + self.gravity / mass * dt
-            ]
-        
-        # Satisfaire les contraintes (plusieurs itérations pour stabilité)
-        for _ in range(5):
-            for constraint in constraints:
-                p1_name = constraint["p1"]
-                p2_name = constraint["p2"]
-                distance = constraint["distance"]
-                
-                p1 = points[p1_name]
-                p2 = points[p2_name]
-                
-                # Calculer le vecteur entre les points
-                dx = p2["pos"][0] - p1["pos"][0]
-                dy = p2["pos"][1] - p1["pos"][1]
-                
-                # Calculer la distance actuelle
-                current_distance = max(0.01, math.sqrt(dx*dx + dy*dy))
-                
-                # Calculer le facteur de correction
-                difference = (distance - current_distance) / current_distance
-                
-                # Redistribuer en fonction des masses
-                m1 = p1["mass"]
-                m2 = p2["mass"]
-                total_mass = m1 + m2
-                m1_factor = m2 / total_mass
-                m2_factor = m1 / total_mass
-                
-                # Appliquer la correction
-                p1["pos"] = [
-                    p1["pos"][0] - dx * 0.5 * difference * m1_factor * self.stiffness,
-                    p1["pos"][1] - dy * 0.5 * difference * m1_factor * self.stiffness
-                ]
-                
-                p2["pos"] = [
-                    p2["pos"][0] + dx * 0.5 * difference * m2_factor * self.stiffness,
-                    p2["pos"][1] + dy * 0.5 * difference * m2_factor * self.stiffness
-                ]
-        
-        # Retourner le modèle mis à jour
-        return model
+            # Léger rebond du corps, penché en avant pour la course
+            body = -np.abs(np.sin(2 * u)) * bounce * a
+            for point in (head, torso, hip, left_hand, right_hand):
+                offsets[..., point, 1] += body
+            if running:
+                offsets[..., head, 0] += 3
+                offsets[..., torso, 0] += 1.5
+        
+        elif anim_type == AnimationType.IDLE:
+            # Respiration
+            breath = np.sin(u) * a
+            offsets[..., head, 1] = breath
+            offsets[..., torso, 1] = breath * 0.8
+            offsets[..., left_hand, 1] = breath * 0.6
+            offsets[..., right_hand, 1] = breath * 0.6
+        
+        elif anim_type == AnimationType.ATTACK:
+            # Armer le bras vers l'arrière, frapper vers l'avant, puis revenir
+            t = np.broadcast_to(times, u.shape)
+            windup = np.clip(t / 0.4, 0, 1)
+            strike = np.clip((t - 0.4) / 0.2, 0, 1)
+            recover = np.clip((t - 0.6) / 0.4, 0, 1)
+            angle = (-2.4 * windup + 2.9 * strike - 0.5 * recover) * a
+            offsets[..., right_hand, 0] = 12 * (np.cos(angle) - 1)
+            offsets[..., right_hand, 1] = 12 * np.sin(angle)
+            lean = (-2 * windup + 5 * strike - 3 * recover) * a
+            offsets[..., head, 0] = lean * 1.5
+            offsets[..., torso, 0] = lean
+            offsets[..., left_foot, 0] = (4 * strike - 4 * recover) * a
+        
+        elif anim_type == AnimationType.JUMP:
+            # Accroupi, puis saut en cloche avec les pieds repliés et les bras levés
+            t = np.broadcast_to(times, u.shape)
+            crouch = np.sin(np.pi * np.clip(t / 0.3, 0, 1)) * (t < 0.3)
+            air = np.sin(np.pi * np.clip((t - 0.3) / 0.7, 0, 1))
+            offsets[..., :, 1] = (-14 * air * a)[..., np.newaxis]
+            for point in (head, torso, hip, left_hand, right_hand):
+                offsets[..., point, 1] += 4 * crouch
+            offsets[..., left_foot, 1] -= 3 * air
+            offsets[..., right_foot, 1] -= 3 * air
+            offsets[..., left_hand, 1] -= 8 * air
+            offsets[..., right_hand, 1] -= 8 * air
+        
+        elif anim_type == AnimationType.FALL:
+            # Bras levés et jambes qui battent
+            flail = np.sin(u) * a
+            offsets[..., left_hand, 1] = -10 + 2 * flail
+            offsets[..., right_hand, 1] = -10 - 2 * flail
+            offsets[..., left_foot, 0] = 3 * flail
+            offsets[..., right_foot, 0] = -3 * flail
+            offsets[..., left_foot, 1] = -2
+            offsets[..., right_foot, 1] = -2
+        
+        elif anim_type == AnimationType.DEATH:
+            # Bascule en arrière autour des pieds jusqu'au sol
+            t = np.broadcast_to(times, u.shape)
+            angle = -0.5 * np.pi * (t * t * (3 - 2 * t)) * a
+            rest = np.array([[0, -15], [0, 0], [0, 10], [-12, 0], [12, 0], [-8, 20], [8, 20]], dtype=np.float32)
+            relative = rest - np.array([0, 20], dtype=np.float32)
+            cos, sin = np.cos(angle)[..., np.newaxis], np.sin(angle)[..., np.newaxis]
+            offsets[..., 0] = relative[:, 0] * cos - relative[:, 1] * sin - relative[:, 0]
+            offsets[..., 1] = relative[:, 0] * sin + relative[:, 1] * cos - relative[:, 1]
+        
+        elif anim_type == AnimationType.CAST:
+            # Mains levées au-dessus de la tête au milieu de l'incantation
+            raise_hands = (np.sin(np.pi * np.broadcast_to(times, u.shape)) ** 2) * a
+            offsets[..., left_hand, 0] = 4 * raise_hands
+            offsets[..., right_hand, 0] = -4 * raise_hands
+            offsets[..., left_hand, 1] = -16 * raise_hands
+            offsets[..., right_hand, 1] = -16 * raise_hands
+            offsets[..., head, 1] = -raise_hands
+            offsets[..., torso, 1] = -raise_hands
+        
+        return offsets
     
-    def _render_character(self, model, size):
+    def _render_frames(self, positions, models, size):
         """
-        Rend le modèle de personnage en une image
+        Rend toutes les frames d'un lot de séquences simulées
+        
+        Les calques (jambes, torse, bras, tête) sont rastérisés séparément
+        puis écrits dans l'ordre, chacun recouvrant les précédents.
         
         Args:
-            model (dict): Modèle de personnage avec points et contraintes
-            size (tuple): Dimensions de l'image
+            positions (numpy.ndarray): Positions simulées (séquences, frames, points, 2)
+            models (list): Modèles de personnage de chaque séquence
+            size (tuple): Dimensions des frames
             
         Returns:
-            PIL.Image: Rendu du personnage
+            list: Images RGBA de toutes les frames, séquence après séquence
         """
-        # Créer une image vide avec transparence
-        img = Image.new("RGBA", size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        points = model["points"]
-        visual = model["visual"]
-        
-        # Dessiner les connections (membres)
-        # Jambes
-        draw.line([tuple(points["hip"]["pos"]), tuple(points["left_foot"]["pos"])], 
-                  fill=visual["limb_color"], width=visual["limb_size"])
-        draw.line([tuple(points["hip"]["pos"]), tuple(points["right_foot"]["pos"])], 
-                  fill=visual["limb_color"], width=visual["limb_size"])
-        
-        # Torse
-        draw.line([tuple(points["head"]["pos"]), tuple(points["torso"]["pos"])], 
-                  fill=visual["torso_color"], width=visual["torso_size"])
-        draw.line([tuple(points["torso"]["pos"]), tuple(points["hip"]["pos"])], 
-                  fill=visual["torso_color"], width=visual["torso_size"])
-        
-        # Bras
-        draw.line([tuple(points["torso"]["pos"]), tuple(points["left_hand"]["pos"])], 
-                  fill=visual["limb_color"], width=visual["limb_size"])
-        draw.line([tuple(points["torso"]["pos"]), tuple(points["right_hand"]["pos"])], 
-                  fill=visual["limb_color"], width=visual["limb_size"])
-        
-        # Dessiner les points (articulations)
-        radius = visual["head_size"]
-        head_pos = points["head"]["pos"]
-        draw.ellipse([
-            head_pos[0] - radius, head_pos[1] - radius,
-            head_pos[0] + radius, head_pos[1] + radius
-        ], fill=visual["head_color"])
-        
-        # Dessiner les autres points selon besoin
-        # ...
+        count, frame_count = positions.shape[:2]
+        total = count * frame_count
+        flat = positions.reshape(total, -1, 2)
+        frame = np.arange(total)
+        sequence = frame // frame_count
+        
+        def visual(key):
+            return np.array([model["visual"][key] for model in models])[sequence]
+        
+        limb_color, limb_size = visual("limb_color"), visual("limb_size")
+        torso_color, torso_size = visual("torso_color"), visual("torso_size")
+        head_color, head_size = visual("head_color"), visual("head_size")
+        head, torso, hip, left_hand, right_hand, left_foot, right_foot = range(7)
+        
+        legs = ParticleBatch()
+        for foot in (left_foot, right_foot):
+            legs.add_polylines(frame, flat[:, [hip, foot]], limb_size, limb_color[:, :3], limb_color[:, 3])
+        body = ParticleBatch()
+        body.add_polylines(frame, flat[:, [head, torso, hip]], torso_size, torso_color[:, :3], torso_color[:, 3])
+        arms = ParticleBatch()
+        for hand in (left_hand, right_hand):
+            arms.add_polylines(frame, flat[:, [torso, hand]], limb_size, limb_color[:, :3], limb_color[:, 3])
+        head_layer = ParticleBatch()
+        head_layer.add(frame, flat[:, head, 0], flat[:, head, 1], head_size, head_color[:, :3], head_color[:, 3],
+                       round_shape=True)
         
-        # Appliquer des effets de style Octopath Traveler
-        img = self._apply_octopath_style(img)
+        width, height = size
+        pixels = np.zeros((total, height, width, 4), dtype=np.uint8)
+        flat_pixels = pixels.reshape(-1, 4)
+        for layer in (legs, body, arms, head_layer):
+            covered, colors, opacity = composite_particles(layer.arrays(), total, size)
+            flat_pixels[covered, :3] = colors + 0.5
+            flat_pixels[covered, 3] = opacity * 255 + 0.5
         
-        return img
+        # Appliquer des effets de style Octopath Traveler
+        pixels = self._apply_octopath_style_batch(pixels)
+        return [Image.fromarray(frame_pixels, "RGBA") for frame_pixels in pixels]
     
-    def _apply_octopath_style(self, img):
-        """Applique les effets de style Octopath Traveler à une image"""
-        # Renforcer les contrastes pour un aspect plus net
-        enhancer = ImageEnhance.Contrast(img)
-        img = enhancer.enhance(1.2)
-        
-        # Légère pixelisation pour le style rétro
-        original_size = img.size
-        reduced_size = (original_size[0] // 2, original_size[1] // 2)
-        img = img.resize(reduced_size, Image.NEAREST).resize(original_size, Image.NEAREST)
-        
-        # Ajouter un léger bloom pour l'effet de profondeur
-        bloom = img.filter(ImageFilter.GaussianBlur(2))
-        img = ImageChops.screen(img, bloom)
+    def _apply_octopath_style_batch(self, pixels):
+        """
+        Applique les effets de style Octopath Traveler à un lot de frames
         
-        return img
-    
-    def _generate_walk_animation(self, character_model, frame_count, size):
-        """Génère une animation de marche avec physique verlet"""
-        frames = []
-        model = character_model.copy()
-        
-        for frame in range(frame_count):
-            # Calculer la phase de l'animation (0 à 2π)
-            phase = frame / frame_count * 2 * math.pi
-            
-            # Appliquer les modifications spécifiques à la marche
-            model = self._apply_walk_pose(model, phase)
-            
-            # Mettre à jour la physique
-            model = self._update_verlet_physics(model)
+        Args:
+            pixels (numpy.ndarray): Frames RGBA (frames, hauteur, largeur, 4) en uint8
             
-            # Rendre l'image
-            img = self._render_character(model, size)
-            frames.append(img)
+        Returns:
+            numpy.ndarray: Frames stylisées, de même forme
+        """
+        frames = pixels.astype(np.float32)
         
-        return frames
-    
-    def _apply_walk_pose(self, model, phase):
-        """Applique une pose de marche au modèle"""
-        # Simuler le mouvement de marche en modifiant les positions cibles
-        points = model["points"]
-        
-        # Mouvement des jambes alternant
-        leg_swing = math.sin(phase) * 8
-        points["left_foot"]["pos"][0] = points["hip"]["pos"][0] - 8 + leg_swing
-        points["right_foot"]["pos"][0] = points["hip"]["pos"][0] + 8 - leg_swing
-        
-        # Hauteur des pieds variant avec la phase
-        left_foot_height = -math.sin(phase) * 3
-        right_foot_height = -math.sin(phase + math.pi) * 3
-        points["left_foot"]["pos"][1] = points["hip"]["pos"][1] + 20 + left_foot_height
-        points["right_foot"]["pos"][1] = points["hip"]["pos"][1] + 20 + right_foot_height
-        
-        # Mouvement des bras opposé aux jambes
-        arm_swing = math.sin(phase + math.pi) * 5
-        points["left_hand"]["pos"][0] = points["torso"]["pos"][0] - 12 + arm_swing
-        points["right_hand"]["pos"][0] = points["torso"]["pos"][0] + 12 - arm_swing
-        
-        # Léger mouvement vertical du corps
-        body_bounce = -math.abs(math.sin(phase * 2)) * 1.5
-        points["torso"]["pos"][1] = model["points"]["torso"]["old_pos"][1] + body_bounce
-        
-        return model
-    
-    def _generate_run_animation(self, character_model, frame_count, size):
-        """Génère une animation de course avec physique verlet"""
-        # Similaire à la marche mais plus rapide et avec plus d'amplitude
-        frames = []
-        # À implémenter
-        return frames
-    
-    def _generate_attack_animation(self, character_model, frame_count, size):
-        """Génère une animation d'attaque avec physique verlet"""
-        frames = []
-        # À implémenter
-        return frames
-    
-    def _generate_idle_animation(self, character_model, frame_count, size):
-        """Génère une animation idle avec physique verlet"""
-        frames = []
-        # À implémenter
-        return frames
-    
-    def _generate_jump_animation(self, character_model, frame_count, size):
-        """Génère une animation de saut avec physique verlet"""
-        frames = []
-        # À implémenter
-        return frames
-    
-    def _generate_fall_animation(self, character_model, frame_count, size):
-        """Génère une animation de chute avec physique verlet"""
-        frames = []
-        # À implémenter
-        return frames
-    
-    def _generate_death_animation(self, character_model, frame_count, size):
-        """Génère une animation de mort avec physique verlet"""
-        frames = []
-        # À implémenter
-        return frames
+        # Renforcer les contrastes autour de la luminance moyenne de chaque frame
+        luminance = frames[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        mean = np.floor(luminance.mean(axis=(1, 2)) + 0.5)[:, np.newaxis, np.newaxis, np.newaxis]
+        frames[..., :3] = np.clip(mean + (frames[..., :3] - mean) * 1.2, 0, 255)
+        
+        # Légère pixelisation pour le style rétro
+        height, width = frames.shape[1:3]
+        frames = frames[:, 1::2, 1::2].repeat(2, axis=1).repeat(2, axis=2)
+        frames = np.pad(frames, ((0, 0), (0, height - frames.shape[1]), (0, width - frames.shape[2]), (0, 0)),
+                        mode="edge")
+        
+        # Ajouter un léger bloom pour l'effet de profondeur (mode écran)
+        bloom = frames.copy()
+        bloom[..., 3] /= 255.0
+        separable_blur(bloom, 2.0)
+        bloom[..., 3] *= 255.0
+        frames = 255.0 - (255.0 - frames) * (255.0 - bloom) / 255.0
+        
+        return np.clip(frames + 0.5, 0, 255).astype(np.uint8)
     
-    def _generate_cast_animation(self, character_model, frame_count, size):
-        """Génère une animation de cast avec physique verlet"""
-        frames = []
-        # À implémenter
-        return frames
+    def _apply_octopath_style(self, img):
+        """Applique les effets de style Octopath Traveler à une image"""
+        pixels = np.asarray(img.convert("RGBA"))[np.newaxis]
+        return Image.fromarray(self._apply_octopath_style_batch(pixels)[0], "RGBA")
     
     def save_asset(self, asset, filepath, **kwargs):
         """
@@ -492,6 +466,12 @@ class AnimationGenerator(AssetGenerator):
                 spritesheet_path = f"{filepath}_spritesheet.png"
                 self._create_spritesheet(frames, spritesheet_path)
             
+            # Ajouter les frames à l'atlas partagé
+            if self.atlas is not None:
+                self.atlas.add_frames(os.path.splitext(os.path.basename(filepath))[0], frames,
+                                      {"frame_duration": metadata.get("frame_duration", 100),
+                                       "loop": metadata.get("loop", True)})
+            
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde de l'animation: {e}")
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Asset Cache for Nightfall Defenders
+Content-addressed on-disk cache shared by all asset generators
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import inspect
+import tempfile
+from enum import Enum
+
+import numpy as np
+
+# Source digests by generator class, computed once per process
+_generator_versions = {}
+
+def get_generator_version(generator):
+    """
+    Get the code version of a generator
+    
+    Generators can declare a CACHE_VERSION class attribute, bumped whenever
+    their output changes for the same parameters, including through edits
+    to the helper modules they use; otherwise any edit to the module
+    defining the generator class or to the helper modules of its package
+    it relies on (e.g. particle_rasterizer, verlet_rig, ml_refiner) changes
+    the version, so cached assets of an older version of the code are never
+    reused.
+    
+    Args:
+        generator: Generator instance
+    
+    Returns:
+        str: Declared version, or hex digest of the generator's source files
+    """
+    cls = type(generator)
+    if cls not in _generator_versions:
+        version = getattr(cls, "CACHE_VERSION", None)
+        if version is None:
+            digest = hashlib.sha256()
+            try:
+                for module in _get_source_modules(sys.modules[cls.__module__]):
+                    with open(inspect.getsourcefile(module), 'rb') as f:
+                        digest.update(module.__name__.encode("utf-8") + b"\0" + f.read())
+                version = digest.hexdigest()[:16]
+            except (KeyError, OSError, TypeError):
+                version = cls.__module__
+        _generator_versions[cls] = str(version)
+    return _generator_versions[cls]
+
+def _get_source_modules(module):
+    """
+    Get a module and the modules of its package it uses, directly or not
+    
+    The cache module itself is left out: its edits do not change the
+    generated assets.
+    
+    Args:
+        module: Module defining a generator
+    
+    Returns:
+        list: Modules sorted by name
+    """
+    prefix = module.__name__.rpartition('.')[0] + "."
+    found = {}
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        if current.__name__ in found:
+            continue
+        found[current.__name__] = current
+        for value in list(vars(current).values()):
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None)
+            if isinstance(name, str) and name.startswith(prefix) and name != __name__ and name not in found:
+                dependency = sys.modules.get(name)
+                if dependency is not None:
+                    pending.append(dependency)
+    return [found[name] for name in sorted(found)]
+
+def canonicalize(value):
+    """
+    Convert generation parameters into a JSON value with a single spelling
+    
+    Args:
+        value: Parameters (dicts, sequences, enums, numpy values...)
+    
+    Returns:
+        A JSON-serializable equivalent with sorted keys
+    """
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, dict):
+        return {str(canonicalize(key)): canonicalize(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonicalize(item) for item in value), key=str)
+    if isinstance(value, np.ndarray):
+        return canonicalize(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+class AssetCache:
+    """
+    Content-addressed asset cache stored on disk
+    
+    Each asset is stored under a digest of the generator name, the digest
+    of the generator's code, the canonicalized parameters and the seed, so
+    the same request finds the same entry across runs while any change to
+    one of them misses. A JSON manifest records the size and last use of
+    every entry; the least recently used entries are removed when the cache
+    grows beyond its size limit. Entries and the manifest are written to a
+    temporary file and renamed into place, so an interrupted run never
+    leaves a partial file behind.
+    """
+    
+    MANIFEST_NAME = "manifest.json"
+    
+    def __init__(self, cache_dir=os.path.join("cache", "assets"), max_size_mb=512):
+        """
+        Initialize the cache
+        
+        Args:
+            cache_dir (str): Directory holding the entries and the manifest
+            max_size_mb (float): Size limit of the cached entries in megabytes
+        """
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        self.manifest_path = os.path.join(cache_dir, self.MANIFEST_NAME)
+        self.entries = self._load_manifest()
+        self.manifest_dirty = False
+        
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    def _load_manifest(self):
+        """Read the manifest, starting empty if it is missing or damaged"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable asset cache manifest: {e}")
+            return {}
+    
+    def _write_atomic(self, path, write):
+        """
+        Write a file through a temporary file in the same directory
+        
+        Args:
+            path (str): Final path of the file
+            write: Function writing the content to an open binary file
+        """
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def make_key(self, generator_name, generator_version, asset_id, params, seed):
+        """
+        Compute the cache key of a generation request
+        
+        Args:
+            generator_name (str): Name of the generator
+            generator_version (str): Digest of the generator's code
+            asset_id (str): Identifier of the asset
+            params (dict): Generation parameters
+            seed (int): Generation seed
+        
+        Returns:
+            str: Hex digest identifying the request
+        """
+        request = {
+            "generator": generator_name,
+            "version": generator_version,
+            "asset_id": asset_id,
+            "params": canonicalize(params or {}),
+            "seed": seed
+        }
+        encoded = json.dumps(request, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def get_entry_path(self, key):
+        """Get the file of an entry, fanned out by the first digest characters"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+    
+    def get(self, key):
+        """
+        Load a cached asset
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            tuple: (True, asset) on a hit, (False, None) on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return False, None
+        
+        try:
+            with open(self.get_entry_path(key), 'rb') as f:
+                asset = pickle.load(f)
+        except Exception as e:
+            print(f"Dropping unreadable asset cache entry {key}: {e}")
+            self.remove(key)
+            self.stats["misses"] += 1
+            return False, None
+        
+        entry["last_used"] = time.time()
+        self.manifest_dirty = True
+        self.stats["hits"] += 1
+        return True, asset
+    
+    def put(self, key, asset, info=None, flush=True):
+        """
+        Store an asset
+        
+        Args:
+            key (str): Cache key
+            asset: The asset to store; it must be picklable
+            info (dict): Extra manifest fields, such as the asset ID
+            flush (bool): Write the manifest now; batches pass False and
+                flush once at the end
+        
+        Returns:
+            bool: True if the asset was stored
+        """
+        path = self.get_entry_path(key)
+        try:
+            data = pickle.dumps(asset, protocol=pickle.HIGHEST_PROTOCOL)
+            self._write_atomic(path, lambda f: f.write(data))
+        except Exception as e:
+            print(f"Could not cache asset {key}: {e}")
+            return False
+        
+        now = time.time()
+        entry = dict(info or {})
+        entry.update({"size": len(data), "created": now, "last_used": now})
+        self.entries[key] = entry
+        self.manifest_dirty = True
+        self.evict_over_budget()
+        if flush:
+            self.flush()
+        return True
+    
+    def remove(self, key):
+        """Remove an entry and its file"""
+        self.entries.pop(key, None)
+        try:
+            os.remove(self.get_entry_path(key))
+        except OSError:
+            pass
+        self.manifest_dirty = True
+    
+    def get_size(self):
+        """Get the total size of the cached entries in bytes"""
+        return sum(entry["size"] for entry in self.entries.values())
+    
+    def evict_over_budget(self):
+        """Remove least recently used entries until the cache fits its size limit"""
+        size = self.get_size()
+        if size <= self.max_size:
+            return
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if size <= self.max_size:
+                break
+            size -= self.entries[key]["size"]
+            self.remove(key)
+            self.stats["evictions"] += 1
+    
+    def flush(self, force=False):
+        """
+        Write the manifest if it changed
+        
+        Args:
+            force (bool): Write even if nothing changed
+        """
+        if not (force or self.manifest_dirty):
+            return
+        data = json.dumps({"entries": self.entries}, indent=1, sort_keys=True).encode("utf-8")
+        self._write_atomic(self.manifest_path, lambda f: f.write(data))
+        self.manifest_dirty = False
+    
+    def clear(self):
+        """Remove every entry"""
+        for key in list(self.entries):
+            self.remove(key)
+        self.flush(force=True)
+
+def generate_cached(generator, asset_id, params=None, seed=None, generate=None):
+    """
+    Run a generator entry point through the generator's asset cache
+    
+    Requests without a seed are random by design and always generated.
+    
+    Args:
+        generator: Generator instance; its "cache" attribute may hold an AssetCache
+        asset_id (str): Identifier of the asset
+        params (dict): Generation parameters
+        seed (int): Generation seed
+        generate: Function called as generate(asset_id, params, seed) on a
+            miss, generator.generate by default
+    
+    Returns:
+        The cached or newly generated asset
+    """
+    generate = generate or generator.generate
+    cache = getattr(generator, 'cache', None)
+    if cache is None or seed is None:
+        return generate(asset_id, params, seed)
+    
+    key = cache.make_key(type(generator).__name__, get_generator_version(generator), asset_id, params, seed)
+    hit, asset = cache.get(key)
+    if hit:
+        return asset
+    
+    asset = generate(asset_id, params, seed)
+    if asset is not None:
+        cache.put(key, asset, {"generator": type(generator).__name__, "asset_id": asset_id})
+    return asset
+
+def generate_cached_batch(generator, requests, generate_batch):
+    """
+    Run a batched generator entry point, generating only the uncached assets
+    
+    Args:
+        generator: Generator instance; its "cache" attribute may hold an AssetCache
+        requests (list): List of (asset_id, params, seed) tuples
+        generate_batch: Function generating a list of assets from a list of requests
+    
+    Returns:
+        list: The cached or newly generated asset of each request, in order
+    """
+    cache = getattr(generator, 'cache', None)
+    if cache is None:
+        return generate_batch(requests)
+    
+    name = type(generator).__name__
+    version = get_generator_version(generator)
+    assets = [None] * len(requests)
+    keys = [None] * len(requests)
+    missing = []
+    
+    for i, (asset_id, params, seed) in enumerate(requests):
+        if seed is not None:
+            keys[i] = cache.make_key(name, version, asset_id, params, seed)
+            hit, assets[i] = cache.get(keys[i])
+            if hit:
+                continue
+        missing.append(i)
+    
+    if missing:
+        generated = generate_batch([requests[i] for i in missing])
+        for i, asset in zip(missing, generated):
+            assets[i] = asset
+            if keys[i] is not None and asset is not None:
+                cache.put(keys[i], asset, {"generator": name, "asset_id": requests[i][0]}, flush=False)
+        cache.flush()
+    
+    return assets
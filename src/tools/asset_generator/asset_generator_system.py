@@ -16,6 +16,8 @@ from tqdm import tqdm
 
 # Importer les classes de base
 from src.tools.asset_generator.base_generator import AssetGenerator, AssetType, AssetCategory
+from src.tools.asset_generator.texture_atlas import TextureAtlas
+from src.tools.asset_generator.asset_cache import AssetCache
 
 # Importer les générateurs spécifiques
 from src.tools.asset_generator.sprite_generator import SpriteGenerator, SpriteType, CharacterClass
@@ -58,6 +60,14 @@ class AssetGeneratorSystem:
         for directory in self.output_dirs.values():
             os.makedirs(directory, exist_ok=True)
         
+        # Cache disque partagé par tous les générateurs
+        cache_config = self.config.get("cache", {})
+        self.cache = AssetCache(cache_config.get("dir", os.path.join("cache", "assets")),
+                                cache_config.get("max_size_mb", 512))
+        
+        # Atlas partagé par les effets et les animations
+        self.atlas = TextureAtlas()
+        
         # Initialiser les générateurs spécifiques
         self.generators = {}
         self._init_generators()
@@ -129,6 +139,14 @@ class AssetGeneratorSystem:
             hybrid_output_dir = os.path.join(self.output_base_dir, "materials")
             self.generators["pbr_material"] = HybridGenerator(hybrid_output_dir)
             
+            # Brancher le cache partagé sur chaque générateur
+            for generator in self.generators.values():
+                generator.cache = self.cache
+            
+            # Les frames d'effets et d'animations sont regroupées dans l'atlas
+            self.generators[AssetType.EFFECT].atlas = self.atlas
+            self.generators[AssetType.ANIMATION].atlas = self.atlas
+            
         except Exception as e:
             print(f"Erreur lors de l'initialisation des générateurs: {e}")
     
@@ -152,6 +170,90 @@ class AssetGeneratorSystem:
             return None, None
             
         # Préparer les paramètres
+        params = self._prepare_params(asset_category, params)
+            
+        # Mesurer le temps de génération
+        start_time = time.time()
+        
+        # Générer l'asset
+        generator = self.generators[asset_type]
+        asset = generator.generate_with_cache(asset_id, params, seed)
+        
+        output_path = self._store_asset(generator, asset, asset_type, asset_category, asset_id, params, seed,
+                                        time.time() - start_time)
+        return asset, output_path
+    
+    def generate_asset_batch(self, asset_type, asset_category, requests):
+        """
+        Génère plusieurs assets d'un même type, en un seul lot si le générateur le permet
+        
+        Args:
+            asset_type (AssetType): Type d'asset à générer
+            asset_category (AssetCategory): Catégorie des assets
+            requests (list): Liste de tuples (asset_id, params, seed)
+            
+        Returns:
+            list: Tuples (asset généré, chemin où il a été sauvegardé) dans l'ordre des requêtes
+        """
+        generator = self.generators.get(asset_type)
+        if not hasattr(generator, 'generate_batch_with_cache'):
+            return [self.generate_asset(asset_type, asset_category, asset_id, params, seed)
+                    for asset_id, params, seed in requests]
+        
+        requests = [(asset_id, self._prepare_params(asset_category, params), seed)
+                    for asset_id, params, seed in requests]
+        
+        # Les maps de tous les assets du lot partagent les mêmes passes de raffinement ML
+        start_time = time.time()
+        assets = generator.generate_batch_with_cache(requests)
+        generation_time = (time.time() - start_time) / max(len(requests), 1)
+        
+        results = []
+        for (asset_id, params, seed), asset in zip(requests, assets):
+            output_path = self._store_asset(generator, asset, asset_type, asset_category, asset_id, params, seed,
+                                            generation_time)
+            results.append((asset, output_path))
+        return results
+    
+    def generate_asset_batch_or_each(self, asset_type, asset_category, requests):
+        """
+        Génère un lot d'assets, puis reprend une par une les requêtes d'un lot en échec
+        
+        Args:
+            asset_type (AssetType): Type d'asset à générer
+            asset_category (AssetCategory): Catégorie des assets
+            requests (list): Liste de tuples (asset_id, params, seed)
+            
+        Returns:
+            tuple: (résultats (asset, chemin) des requêtes réussies, nombre de requêtes en échec)
+        """
+        try:
+            return self.generate_asset_batch(asset_type, asset_category, requests), 0
+        except Exception as e:
+            print(f"Erreur lors de la génération du lot {requests[0][0]}..{requests[-1][0]}: {e}")
+        
+        # Une seule requête invalide ne doit pas empêcher les autres d'être générées et sauvegardées
+        results = []
+        failed = 0
+        for asset_id, params, seed in requests:
+            try:
+                results.append(self.generate_asset(asset_type, asset_category, asset_id, params, seed))
+            except Exception as e:
+                print(f"Erreur lors de la génération de {asset_id}: {e}")
+                failed += 1
+        return results, failed
+    
+    def _prepare_params(self, asset_category, params):
+        """
+        Complète les paramètres d'un asset avec la configuration de sa catégorie
+        
+        Args:
+            asset_category (AssetCategory): Catégorie de l'asset
+            params (dict, optional): Paramètres spécifiques pour la génération
+            
+        Returns:
+            dict: Paramètres complets
+        """
         if params is None:
             params = {}
             
@@ -159,7 +261,27 @@ class AssetGeneratorSystem:
         category_key = asset_category.value if hasattr(asset_category, 'value') else asset_category
         if category_key in self.config:
             params.update(self.config[category_key])
+        return params
+    
+    def _store_asset(self, generator, asset, asset_type, asset_category, asset_id, params, seed, generation_time):
+        """
+        Sauvegarde un asset généré avec ses métadonnées et met à jour les statistiques
+        
+        Args:
+            generator: Générateur qui a produit l'asset
+            asset: L'asset généré
+            asset_type (AssetType): Type de l'asset
+            asset_category (AssetCategory): Catégorie de l'asset
+            asset_id (str): Identifiant unique pour l'asset
+            params (dict): Paramètres de génération
+            seed (int): Seed de génération
+            generation_time (float): Durée de génération en secondes
             
+        Returns:
+            str: Chemin où l'asset a été sauvegardé
+        """
+        category_key = asset_category.value if hasattr(asset_category, 'value') else asset_category
+        
         # Chemin de sortie
         output_dir = self.output_dirs.get(asset_category, self.output_base_dir)
         if not os.path.exists(output_dir):
@@ -171,17 +293,6 @@ class AssetGeneratorSystem:
             output_path = os.path.join(output_dir, f"{asset_id}.png")
         else:
             output_path = os.path.join(output_dir, f"{asset_id}")
-            
-        # Mesurer le temps de génération
-        start_time = time.time()
-        
-        # Générer l'asset
-        if asset_type == "pbr_material":
-            generator = self.generators["pbr_material"]
-        else:
-            generator = self.generators[asset_type]
-            
-        asset = generator.generate_with_cache(asset_id, params, seed)
         
         # Sauvegarder l'asset
         if asset:
@@ -192,7 +303,7 @@ class AssetGeneratorSystem:
             metadata.update({
                 "asset_id": asset_id,
                 "asset_type": asset_type.value if hasattr(asset_type, 'value') else asset_type,
-                "asset_category": asset_category.value if hasattr(asset_category, 'value') else asset_category,
+                "asset_category": category_key,
                 "generated_at": time.time(),
                 "seed": seed
             })
@@ -200,7 +311,6 @@ class AssetGeneratorSystem:
             generator.save_metadata(asset_id, metadata)
         
         # Mettre à jour les statistiques
-        generation_time = time.time() - start_time
         self.generation_stats["total_assets_generated"] += 1
         self.generation_stats["total_generation_time"] += generation_time
         
@@ -208,7 +318,7 @@ class AssetGeneratorSystem:
             self.generation_stats["assets_by_category"][category_key] = 0
         self.generation_stats["assets_by_category"][category_key] += 1
         
-        return asset, output_path
+        return output_path
     
     def generate_pbr_material(self, material_type, asset_id, size=(512, 512), context=None, age_factor=0.0, use_ml=True, seed=None):
         """
@@ -312,59 +422,60 @@ class AssetGeneratorSystem:
             # Générer les assets pour ce groupe
             successful_in_group = 0
             
+            # Construire les requêtes du groupe
+            requests = []
+            for i in range(count):
+                for v_idx, variation in enumerate(variations):
+                    # Construire l'ID de l'asset
+                    asset_id = f"{group_name}_{i}_{v_idx}" if len(variations) > 1 else f"{group_name}_{i}"
+                    
+                    # Combiner les paramètres de base avec la variation
+                    params = base_params.copy()
+                    params.update(variation)
+                    
+                    # Générer un seed déterministe si demandé
+                    seed = None
+                    if use_seed:
+                        seed = base_seed + i * 100 + v_idx
+                    
+                    requests.append((asset_id, params, seed))
+            
+            # Générer par lots : les générateurs qui le permettent traitent un lot en une passe
+            chunk_size = max(1, group_config.get("batch_size", 32))
+            
             # Utiliser tqdm pour afficher une barre de progression
-            with tqdm(total=count * len(variations), desc=f"Groupe {group_name}") as pbar:
-                for i in range(count):
-                    for v_idx, variation in enumerate(variations):
-                        # Construire l'ID de l'asset
-                        asset_id = f"{group_name}_{i}_{v_idx}" if len(variations) > 1 else f"{group_name}_{i}"
-                        
-                        # Combiner les paramètres de base avec la variation
-                        params = base_params.copy()
-                        params.update(variation)
-                        
-                        # Générer un seed déterministe si demandé
-                        seed = None
-                        if use_seed:
-                            seed = base_seed + i * 100 + v_idx
-                        
-                        try:
-                            # Générer l'asset
-                            asset, path = self.generate_asset(
-                                asset_type, 
-                                asset_category, 
-                                asset_id, 
-                                params, 
-                                seed
-                            )
+            with tqdm(total=len(requests), desc=f"Groupe {group_name}") as pbar:
+                for start in range(0, len(requests), chunk_size):
+                    chunk = requests[start:start + chunk_size]
+                    
+                    # Générer les assets, requête par requête si le lot échoue
+                    results, failed = self.generate_asset_batch_or_each(asset_type, asset_category, chunk)
+                    batch_stats["failed_assets"] += failed
+                    
+                    for asset, path in results:
+                        if asset:
+                            successful_in_group += 1
+                            
+                            # Mettre à jour les statistiques par catégorie
+                            category_key = asset_category
+                            if hasattr(asset_category, 'value'):
+                                category_key = asset_category.value
+                            
+                            if category_key not in batch_stats["assets_by_category"]:
+                                batch_stats["assets_by_category"][category_key] = 0
+                            batch_stats["assets_by_category"][category_key] += 1
                             
-                            if asset:
-                                successful_in_group += 1
-                                
-                                # Mettre à jour les statistiques par catégorie
-                                category_key = asset_category
-                                if hasattr(asset_category, 'value'):
-                                    category_key = asset_category.value
-                                
-                                if category_key not in batch_stats["assets_by_category"]:
-                                    batch_stats["assets_by_category"][category_key] = 0
-                                batch_stats["assets_by_category"][category_key] += 1
-                                
-                                # Mettre à jour les statistiques par type
-                                type_key = asset_type
-                                if hasattr(asset_type, 'value'):
-                                    type_key = asset_type.value
-                                
-                                if type_key not in batch_stats["assets_by_type"]:
-                                    batch_stats["assets_by_type"][type_key] = 0
-                                batch_stats["assets_by_type"][type_key] += 1
-                        
-                        except Exception as e:
-                            print(f"Erreur lors de la génération de {asset_id}: {e}")
-                            batch_stats["failed_assets"] += 1
-                        
-                        # Mettre à jour la barre de progression
-                        pbar.update(1)
+                            # Mettre à jour les statistiques par type
+                            type_key = asset_type
+                            if hasattr(asset_type, 'value'):
+                                type_key = asset_type.value
+                            
+                            if type_key not in batch_stats["assets_by_type"]:
+                                batch_stats["assets_by_type"][type_key] = 0
+                            batch_stats["assets_by_type"][type_key] += 1
+                    
+                    # Mettre à jour la barre de progression
+                    pbar.update(len(chunk))
             
             # Mettre à jour les statistiques du batch
             batch_stats["total_assets"] += count * len(variations)
@@ -378,8 +489,14 @@ class AssetGeneratorSystem:
         print(f"Génération du batch terminée en {batch_stats['generation_time']:.2f} secondes")
         print(f"Total: {batch_stats['successful_assets']}/{batch_stats['total_assets']} assets générés avec succès")
         
+        # Enregistrer les dates d'utilisation des entrées du cache
+        self.cache.flush()
+        print(f"Cache: {self.cache.stats['hits']} assets réutilisés, {self.cache.stats['misses']} générés")
+        
+        self.save_atlas()
+        
         return batch_stats
-
+    
     def generate_all(self, seed=None):
         """
         Génère tous les assets selon la configuration
@@ -533,21 +650,17 @@ class AssetGeneratorSystem:
             character_types = self.config["animations"].get("character_types", ["warrior", "mage"])
             
             print(f"Génération de {len(animation_types) * len(character_types)} animations...")
-            for animation_type in tqdm(animation_types):
-                for character_type in character_types:
-                    params = {
-                        "animation_type": animation_type,
-                        "character_type": character_type
-                    }
-                    
-                    try:
-                        asset_id = f"{character_type}_{animation_type}"
-                        asset, path = self.generate_asset(AssetType.ANIMATION, AssetCategory.CHARACTER, asset_id, params)
-                        if asset:
-                            total_assets += 1
-                    except Exception as e:
-                        print(f"Erreur lors de la génération de l'animation {character_type}_{animation_type}: {e}")
-                        errors += 1
+            
+            # Toutes les animations sont simulées et rendues par lots
+            requests = [(f"{character_type}_{animation_type}",
+                         {"animation_type": animation_type, "character_type": character_type},
+                         seed)
+                        for animation_type in animation_types
+                        for character_type in character_types]
+            results, failed = self.generate_asset_batch_or_each(AssetType.ANIMATION, AssetCategory.CHARACTER,
+                                                                requests)
+            errors += failed
+            total_assets += sum(1 for asset, path in results if asset)
         
         # Générer les matériaux PBR
         if "materials" in self.config:
@@ -584,7 +697,25 @@ class AssetGeneratorSystem:
             "categories": self.generation_stats["assets_by_category"]
         }
         
+        self.save_atlas()
+        
         return stats
+    
+    def save_atlas(self):
+        """
+        Sauvegarde l'atlas des effets et des animations générés
+        
+        Returns:
+            str: Chemin de l'index de l'atlas, ou None s'il est vide ou en erreur
+        """
+        try:
+            index_path = self.atlas.save(os.path.join(self.output_base_dir, "atlas"))
+            if index_path:
+                print(f"Atlas: {len(self.atlas.sprites)} sprites regroupés dans {index_path}")
+            return index_path
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde de l'atlas: {e}")
+            return None
 
 # Fonction utilitaire pour la génération d'assets
 def generate_all_assets(base_dir, config, seed=None):
@@ -13,6 +13,8 @@ import time
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from src.tools.asset_generator.asset_cache import canonicalize, generate_cached
+
 class AssetType(Enum):
     """Types d'assets que le système peut générer"""
     SPRITE_2D = "sprite_2d"  # Images 2D pour personnages, UI, etc.
@@ -58,6 +60,9 @@ class AssetGenerator(ABC):
         
         # Cache pour éviter de régénérer les mêmes assets (basé sur seed et paramètres)
         self.asset_cache = {}
+        
+        # Cache disque partagé (AssetCache), assigné par le système de génération
+        self.cache = None
     
     @abstractmethod
     def generate(self, asset_id, asset_params, seed=None):
@@ -156,23 +161,28 @@ class AssetGenerator(ABC):
         Returns:
             object: L'asset généré (depuis le cache ou nouvellement généré)
         """
-        # Créer une clé de cache basée sur l'ID et les paramètres
-        cache_key = f"{asset_id}_{hash(str(asset_params))}_{seed}"
+        # Créer une clé de cache stable basée sur l'ID et les paramètres
+        cache_key = f"{asset_id}_{json.dumps(canonicalize(asset_params), sort_keys=True)}_{seed}"
         
         # Vérifier si l'asset est déjà en cache
         if cache_key in self.asset_cache:
             return self.asset_cache[cache_key]
         
-        # Mesurer le temps de génération
-        start_time = time.time()
-        
-        # Générer l'asset
-        asset = self.generate(asset_id, asset_params, seed)
-        
-        # Mettre à jour les statistiques
-        generation_time = time.time() - start_time
-        self.generation_stats["assets_generated"] += 1
-        self.generation_stats["generation_time"] += generation_time
+        def generate_and_measure(asset_id, asset_params, seed):
+            # Mesurer le temps de génération
+            start_time = time.time()
+            
+            # Générer l'asset
+            asset = self.generate(asset_id, asset_params, seed)
+            
+            # Mettre à jour les statistiques
+            generation_time = time.time() - start_time
+            self.generation_stats["assets_generated"] += 1
+            self.generation_stats["generation_time"] += generation_time
+            return asset
+        
+        # Passer par le cache disque : seuls les assets absents sont générés
+        asset = generate_cached(self, asset_id, asset_params, seed, generate_and_measure)
         
         # Mettre en cache l'asset généré
         self.asset_cache[cache_key] = asset
@@ -8,12 +8,12 @@ Generates procedural visual effects in Octopath Traveler style
 
 import os
 import random
-import math
 import numpy as np
-from PIL import Image, ImageDraw, ImageFilter, ImageEnhance, ImageChops
+from PIL import Image, ImageFilter, ImageEnhance, ImageChops
 from enum import Enum
 
 from src.tools.asset_generator.base_generator import AssetGenerator, AssetType, AssetCategory
+from src.tools.asset_generator.particle_rasterizer import ParticleBatch, render_particles
 
 class EffectType(Enum):
     """Types d'effets que le générateur peut produire"""
@@ -37,6 +37,9 @@ class EffectGenerator(AssetGenerator):
         """
         super().__init__(output_dir)
         
+        # Atlas partagé, affecté par le système de génération
+        self.atlas = None
+        
         # Créer des sous-répertoires pour chaque type d'effet
         self.effect_dirs = {effect_type: os.path.join(output_dir, effect_type.value) 
                            for effect_type in EffectType}
@@ -131,182 +134,142 @@ class EffectGenerator(AssetGenerator):
     
     def _generate_fire_effect(self, size, frame_count, intensity=1.0, scale=1.0):
         """Génère un effet de feu pixelisé style Octopath Traveler"""
-        frames = []
-        palette = self.effect_palettes[EffectType.FIRE]
+        palette = np.array(self.effect_palettes[EffectType.FIRE], dtype=np.float32)
         width, height = size
+        batch = ParticleBatch()
         
-        for frame in range(frame_count):
-            # Créer une image avec canal alpha
-            img = Image.new("RGBA", size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # Paramètres de l'animation
-            time_offset = frame / frame_count
-            
-            # Générer plusieurs particules de feu
-            num_particles = int(40 * intensity)
-            for i in range(num_particles):
-                # Position de base et taille de la particule
-                particle_life = random.random()
-                particle_x = width // 2 + random.randint(-int(width/4), int(width/4))
-                particle_y = height - random.randint(0, int(height * 0.8 * particle_life))
-                
-                # La taille diminue avec la hauteur (particules plus petites en montant)
-                particle_size = max(1, int((1 - particle_life) * 6 * scale))
-                
-                # Les couleurs varient du jaune au rouge en montant
-                color_idx = min(len(palette)-1, int(particle_life * len(palette)))
-                color = palette[color_idx]
-                
-                # Animation de la position - mouvement ondulant
-                wave = math.sin((particle_life * 10 + time_offset * 6) * math.pi) * width * 0.05
-                particle_x += int(wave)
-                
-                # Dessiner la particule (pixel carré pour style pixelisé)
-                draw.rectangle([
-                    particle_x - particle_size, particle_y - particle_size,
-                    particle_x + particle_size, particle_y + particle_size
-                ], fill=color + (200,))  # Alpha pour transparence
-            
-            # Appliquer un flou léger pour l'effet de "glow"
-            img = img.filter(ImageFilter.GaussianBlur(1))
-            
-            frames.append(img)
+        # Les particules de toutes les frames sont tirées en une fois
+        num_particles = int(40 * intensity)
+        frames = np.repeat(np.arange(frame_count), num_particles)
+        time_offset = frames / frame_count
         
-        return frames
+        # Position de base et taille de chaque particule
+        particle_life = np.random.random(frames.size)
+        particle_x = width // 2 + np.random.randint(-int(width/4), int(width/4) + 1, frames.size)
+        particle_y = height - np.floor(np.random.random(frames.size) * (np.floor(height * 0.8 * particle_life) + 1))
+        
+        # La taille diminue avec la hauteur (particules plus petites en montant)
+        particle_size = np.maximum(1, ((1 - particle_life) * 6 * scale).astype(int))
+        
+        # Les couleurs varient du jaune au rouge en montant
+        color_idx = np.minimum(len(palette) - 1, (particle_life * len(palette)).astype(int))
+        
+        # Animation de la position - mouvement ondulant
+        wave = np.sin((particle_life * 10 + time_offset * 6) * np.pi) * width * 0.05
+        particle_x = particle_x + wave.astype(int)
+        
+        # Particules carrées pour le style pixelisé, avec transparence
+        batch.add(frames, particle_x, particle_y, particle_size, palette[color_idx], 200)
+        
+        # Rastériser toutes les frames avec un flou léger pour l'effet de "glow"
+        return render_particles(batch, frame_count, size, blur_sigma=1.0)
     
     def _generate_water_effect(self, size, frame_count, intensity=1.0, scale=1.0):
         """Génère un effet d'eau pixelisé style Octopath Traveler"""
-        frames = []
-        palette = self.effect_palettes[EffectType.WATER]
+        palette = np.array(self.effect_palettes[EffectType.WATER], dtype=np.float32)
         width, height = size
+        batch = ParticleBatch()
         
-        for frame in range(frame_count):
-            # Créer une image avec canal alpha
-            img = Image.new("RGBA", size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # Paramètres de l'animation
-            time_offset = frame / frame_count
-            
-            # Générer des vaguelettes d'eau
-            num_waves = int(20 * intensity)
-            for i in range(num_waves):
-                # Position et taille de la vague
-                wave_x = random.randint(0, width)
-                wave_y = random.randint(int(height * 0.5), height)
-                wave_width = random.randint(10, 30) * scale
-                wave_height = random.randint(3, 8) * scale
-                
-                # Animation - les vagues se déplacent horizontalement
-                wave_x = (wave_x + int(time_offset * width * 0.5)) % width
-                
-                # Couleur de la vague
-                color_idx = random.randint(0, len(palette) - 1)
-                color = palette[color_idx]
-                
-                # Dessiner une vague stylisée
-                points = [
-                    (wave_x - wave_width, wave_y),
-                    (wave_x - wave_width/2, wave_y - wave_height),
-                    (wave_x, wave_y),
-                    (wave_x + wave_width/2, wave_y - wave_height),
-                    (wave_x + wave_width, wave_y)
-                ]
-                draw.line(points, fill=color + (180,), width=int(2 * scale))
-            
-            # Ajouter des reflets (points brillants)
-            num_sparkles = int(15 * intensity)
-            for i in range(num_sparkles):
-                sparkle_x = random.randint(0, width)
-                sparkle_y = random.randint(int(height * 0.5), height)
-                sparkle_size = random.randint(1, 3) * scale
-                
-                # Les reflets apparaissent et disparaissent
-                alpha = int(200 * abs(math.sin((time_offset + i * 0.1) * math.pi * 2)))
-                
-                draw.ellipse([
-                    sparkle_x - sparkle_size, sparkle_y - sparkle_size,
-                    sparkle_x + sparkle_size, sparkle_y + sparkle_size
-                ], fill=(255, 255, 255, alpha))
-            
-            frames.append(img)
+        # Générer des vaguelettes d'eau pour toutes les frames
+        num_waves = int(20 * intensity)
+        frames = np.repeat(np.arange(frame_count), num_waves)
+        time_offset = frames / frame_count
         
-        return frames
+        # Position et taille des vagues
+        wave_x = np.random.randint(0, width + 1, frames.size)
+        wave_y = np.random.randint(int(height * 0.5), height + 1, frames.size)
+        wave_width = np.random.randint(10, 31, frames.size) * scale
+        wave_height = np.random.randint(3, 9, frames.size) * scale
+        
+        # Animation - les vagues se déplacent horizontalement
+        wave_x = (wave_x + (time_offset * width * 0.5).astype(int)) % width
+        
+        # Couleur des vagues
+        colors = palette[np.random.randint(0, len(palette), frames.size)]
+        
+        # Dessiner des vagues stylisées
+        points = np.stack([
+            np.stack([wave_x - wave_width, wave_y], axis=1),
+            np.stack([wave_x - wave_width/2, wave_y - wave_height], axis=1),
+            np.stack([wave_x, wave_y], axis=1),
+            np.stack([wave_x + wave_width/2, wave_y - wave_height], axis=1),
+            np.stack([wave_x + wave_width, wave_y], axis=1)
+        ], axis=1)
+        batch.add_polylines(frames, points, int(2 * scale), colors, 180)
+        
+        # Ajouter des reflets (points brillants)
+        num_sparkles = int(15 * intensity)
+        frames = np.repeat(np.arange(frame_count), num_sparkles)
+        time_offset = frames / frame_count
+        sparkle_index = np.tile(np.arange(num_sparkles), frame_count)
+        
+        sparkle_x = np.random.randint(0, width + 1, frames.size)
+        sparkle_y = np.random.randint(int(height * 0.5), height + 1, frames.size)
+        sparkle_size = np.random.randint(1, 4, frames.size) * scale
+        
+        # Les reflets apparaissent et disparaissent
+        alpha = (200 * np.abs(np.sin((time_offset + sparkle_index * 0.1) * np.pi * 2))).astype(int)
+        
+        batch.add(frames, sparkle_x, sparkle_y, sparkle_size, (255, 255, 255), alpha, round_shape=True)
+        
+        return render_particles(batch, frame_count, size)
     
     def _generate_magic_effect(self, size, frame_count, intensity=1.0, scale=1.0):
         """Génère un effet magique pixelisé style Octopath Traveler"""
-        frames = []
-        palette = self.effect_palettes[EffectType.MAGIC]
+        palette = np.array(self.effect_palettes[EffectType.MAGIC], dtype=np.float32)
         width, height = size
+        batch = ParticleBatch()
         
-        for frame in range(frame_count):
-            # Créer une image avec canal alpha
-            img = Image.new("RGBA", size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # Paramètres de l'animation
-            time_offset = frame / frame_count
-            
-            # Générer un cercle magique qui s'élargit
-            circle_radius = int(width * 0.1 + width * 0.3 * time_offset) * scale
-            circle_x, circle_y = width // 2, height // 2
+        # Paramètres de l'animation pour chaque frame
+        time_offset = np.arange(frame_count) / frame_count
+        
+        # Générer un cercle magique qui s'élargit
+        circle_radius = (width * 0.1 + width * 0.3 * time_offset).astype(int) * scale
+        circle_x, circle_y = width // 2, height // 2
+        
+        # Dessiner plusieurs cercles concentriques
+        num_circles = 3
+        for i in range(num_circles):
+            radius = circle_radius - i * (circle_radius // num_circles)
+            visible = radius > 0
             
-            # Dessiner plusieurs cercles concentriques
-            num_circles = 3
-            for i in range(num_circles):
-                radius = circle_radius - i * (circle_radius // num_circles)
-                if radius <= 0:
-                    continue
-                
-                # Couleur du cercle
-                color_idx = min(len(palette)-1, i)
-                color = palette[color_idx]
-                
-                # Épaisseur du cercle diminue avec le rayon
-                thickness = max(1, int(3 * scale * (1 - i/num_circles)))
-                
-                # Opacité qui varie avec le temps
-                alpha = int(200 * (1 - i/num_circles) * (1 - time_offset))
-                
-                draw.ellipse([
-                    circle_x - radius, circle_y - radius,
-                    circle_x + radius, circle_y + radius
-                ], outline=color + (alpha,), width=thickness)
+            # Couleur du cercle
+            color = palette[min(len(palette)-1, i)]
             
-            # Ajouter des particules magiques
-            num_particles = int(50 * intensity)
-            for i in range(num_particles):
-                # Angle et distance du centre
-                angle = 2 * math.pi * (i / num_particles + time_offset)
-                distance = circle_radius * random.uniform(0.5, 1.2)
-                
-                # Position de la particule
-                particle_x = circle_x + int(math.cos(angle) * distance)
-                particle_y = circle_y + int(math.sin(angle) * distance)
-                
-                # Taille de la particule
-                particle_size = max(1, int(3 * random.random() * scale))
-                
-                # Couleur de la particule
-                color_idx = random.randint(0, len(palette) - 1)
-                color = palette[color_idx]
-                
-                # Alpha basé sur la distance et le temps
-                alpha = int(255 * (1 - distance/circle_radius) * random.uniform(0.5, 1.0))
-                
-                # Dessiner la particule
-                draw.rectangle([
-                    particle_x - particle_size, particle_y - particle_size,
-                    particle_x + particle_size, particle_y + particle_size
-                ], fill=color + (alpha,))
+            # Épaisseur du cercle diminue avec le rayon
+            thickness = max(1, int(3 * scale * (1 - i/num_circles)))
             
-            # Appliquer un léger flou pour l'effet de glow
-            img = img.filter(ImageFilter.GaussianBlur(1))
+            # Opacité qui varie avec le temps
+            alpha = (200 * (1 - i/num_circles) * (1 - time_offset)).astype(int)
             
-            frames.append(img)
+            batch.add_rings(np.nonzero(visible)[0], circle_x, circle_y, radius[visible], thickness,
+                            color, alpha[visible])
         
-        return frames
+        # Ajouter des particules magiques
+        num_particles = int(50 * intensity)
+        frames = np.repeat(np.arange(frame_count), num_particles)
+        particle_index = np.tile(np.arange(num_particles), frame_count)
+        frame_radius = circle_radius[frames]
+        
+        # Angle et distance du centre
+        angle = 2 * np.pi * (particle_index / max(num_particles, 1) + time_offset[frames])
+        distance = frame_radius * np.random.uniform(0.5, 1.2, frames.size)
+        
+        # Position de la particule
+        particle_x = circle_x + (np.cos(angle) * distance).astype(int)
+        particle_y = circle_y + (np.sin(angle) * distance).astype(int)
+        
+        # Taille et couleur de la particule
+        particle_size = np.maximum(1, (3 * np.random.random(frames.size) * scale).astype(int))
+        colors = palette[np.random.randint(0, len(palette), frames.size)]
+        
+        # Alpha basé sur la distance et le temps
+        alpha = (255 * (1 - distance / np.maximum(frame_radius, 1)) * np.random.uniform(0.5, 1.0, frames.size)).astype(int)
+        
+        batch.add(frames, particle_x, particle_y, particle_size, colors, np.maximum(alpha, 0))
+        
+        # Appliquer un léger flou pour l'effet de glow
+        return render_particles(batch, frame_count, size, blur_sigma=1.0)
     
     def _generate_smoke_effect(self, size, frame_count, intensity=1.0, scale=1.0):
         """Génère un effet de fumée pixelisé style Octopath Traveler"""
@@ -383,6 +346,11 @@ class EffectGenerator(AssetGenerator):
                 asset[0].save(gif_path, save_all=True, append_images=asset[1:], 
                              optimize=False, duration=duration, loop=0)
             
+            # Ajouter les frames à l'atlas partagé
+            if self.atlas is not None:
+                self.atlas.add_frames(os.path.splitext(os.path.basename(filepath))[0], asset,
+                                      {"frame_duration": kwargs.get("frame_duration", 100)})
+            
             return True
         except Exception as e:
             print(f"Erreur lors de la sauvegarde de l'effet: {e}")
@@ -8,12 +8,14 @@ Generates all game assets procedurally
 
 import os
 import sys
+import zlib
 import argparse
 from tqdm import tqdm
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
+from src.tools.asset_generator.asset_cache import AssetCache
 from src.tools.asset_generator.sprite_generator import SpriteGenerator
 from src.tools.asset_generator.terrain_generator import TerrainGenerator
 
@@ -91,7 +93,7 @@ def generate_character_assets(base_dir, seed=None):
         for i in range(ASSET_CONFIG["characters"]["variations_per_class"]):
             # Use a deterministic seed if provided
             if seed is not None:
-                var_seed = seed + hash(class_type + str(i)) % 1000
+                var_seed = seed + zlib.crc32((class_type + str(i)).encode()) % 1000
             else:
                 var_seed = None
             
@@ -107,13 +109,13 @@ def generate_character_assets(base_dir, seed=None):
     
     print(f"Generated {len(ASSET_CONFIG['characters']['class_types'])} character classes")
 
-def generate_terrain_assets(base_dir, seed=None):
-    """Generate terrain assets"""
+def generate_terrain_assets(base_dir, seed=None, cache=None):
+    """Generate terrain assets, reusing cached tiles"""
     print("Generating terrain assets...")
     
     # Create terrain generator
     environment_dir = os.path.join(base_dir, "environment")
-    terrain_generator = TerrainGenerator(environment_dir)
+    terrain_generator = TerrainGenerator(environment_dir, cache=cache)
     
     # Generate each terrain type
     all_tiles = terrain_generator.generate_all_terrain_types(
@@ -124,7 +126,7 @@ def generate_terrain_assets(base_dir, seed=None):
     # Save all generated tiles
     for terrain_type, tiles in all_tiles.items():
         for i, tile in enumerate(tiles):
-            filename = f"{terrain_type}_tile_{i+1}.png"
+            filename = os.path.join(terrain_generator.terrain_dirs[terrain_type], f"{terrain_type}_tile_{i+1}.png")
             terrain_generator.save_tile(tile, filename)
     
     print(f"Generated {len(ASSET_CONFIG['terrain']['terrain_types'])} terrain types")
@@ -313,14 +315,17 @@ def generate_all_assets(seed=None):
     
     # Setup directories
     base_dir = setup_output_directories()
+    cache = AssetCache()
     
     # Generate assets
     generate_character_assets(base_dir, seed)
-    generate_terrain_assets(base_dir, seed)
+    generate_terrain_assets(base_dir, seed, cache)
     generate_prop_assets(base_dir, seed)
     generate_building_assets(base_dir, seed)
     generate_ui_assets(base_dir, seed)
     
+    cache.flush()
+    print(f"Asset cache: {cache.stats['hits']} reused, {cache.stats['misses']} generated")
     print("Asset generation complete!")
 
 if __name__ == "__main__":
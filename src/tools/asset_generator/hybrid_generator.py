@@ -20,7 +20,9 @@ import opensimplex
 from scipy.ndimage import gaussian_filter
 
 # Import base generator classes
-from src.tools.asset_generator.base_generator import AssetGenerator, AssetType, AssetCategory
+from src.tools.asset_generator.asset_cache import generate_cached_batch
+from src.tools.asset_generator.base_generator import AssetGenerator, AssetCategory
+from src.tools.asset_generator.ml_refiner import TextureRefiner
 
 # Custom Worley noise implementation to replace the worley package
 def custom_worley(width, height, points=20, noise_scale=1.0):
@@ -97,12 +99,13 @@ class HybridGenerator(AssetGenerator):
     techniques PBR et raffinement par machine learning
     """
     
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, ml_options=None):
         """
         Initialise le générateur hybride
         
         Args:
             output_dir (str): Répertoire de sortie pour les assets générés
+            ml_options (dict, optional): Options du raffineur ML (threads, taille des patchs et des lots)
         """
         super().__init__(output_dir)
         
@@ -122,14 +125,15 @@ class HybridGenerator(AssetGenerator):
             
         # Initialiser le modèle ML pour le raffinement (si disponible)
         self.ml_model = None
+        self.ml_refiner = None
         self.ml_available = False
         
         try:
             # Tente de charger un modèle ONNX simple pour le raffinement des textures
-            import onnxruntime as ort
             model_path = os.path.join(os.path.dirname(__file__), "models", "texture_refiner.onnx")
             if os.path.exists(model_path):
-                self.ml_model = ort.InferenceSession(model_path)
+                self.ml_refiner = TextureRefiner.from_model(model_path, **(ml_options or {}))
+                self.ml_model = self.ml_refiner.session
                 self.ml_available = True
             else:
                 print("Modèle ML non trouvé. Le raffinement ML sera désactivé.")
@@ -155,28 +159,65 @@ class HybridGenerator(AssetGenerator):
         Returns:
             dict: Ensemble des maps PBR générées
         """
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-            
-        # Extraire les paramètres communs
-        size = asset_params.get("size", (512, 512))
-        asset_type = asset_params.get("asset_type", AssetType.MODEL_3D)
-        material_type = asset_params.get("material", MaterialPresets.STONE)
+        return self.generate_batch([(asset_id, asset_params, seed)])[0]
+    
+    def generate_batch(self, requests):
+        """
+        Génère plusieurs assets en raffinant toutes leurs maps en une seule passe ML
         
-        # Générer les maps PBR de base avec les règles procédurales
-        pbr_maps = self._generate_pbr_maps(asset_id, asset_params, size, material_type)
+        Args:
+            requests (list): Liste de tuples (asset_id, asset_params, seed)
+            
+        Returns:
+            list: Maps PBR générées pour chaque requête, dans le même ordre
+        """
+        materials = []
+        random_states = []
         
-        # Appliquer la couche de raffinement ML si disponible
-        if self.ml_available and asset_params.get("use_ml_refinement", True):
-            pbr_maps = self._apply_ml_refinement(pbr_maps)
+        for asset_id, asset_params, seed in requests:
+            if seed is not None:
+                random.seed(seed)
+                np.random.seed(seed)
+                
+            # Extraire les paramètres communs
+            size = asset_params.get("size", (512, 512))
+            material_type = asset_params.get("material", MaterialPresets.STONE)
             
+            # Générer les maps PBR de base avec les règles procédurales
+            materials.append(self._generate_pbr_maps(asset_id, asset_params, size, material_type))
+            
+            # Les règles contextuelles reprennent l'aléatoire là où la génération l'a laissé
+            random_states.append((random.getstate(), np.random.get_state()))
+        
+        # Appliquer la couche de raffinement ML si disponible, en un seul lot
+        if self.ml_available:
+            refine_indices = [i for i, (_, asset_params, _) in enumerate(requests)
+                              if asset_params.get("use_ml_refinement", True)]
+            refined = self._apply_ml_refinement_batch([materials[i] for i in refine_indices])
+            for i, pbr_maps in zip(refine_indices, refined):
+                materials[i] = pbr_maps
+        
         # Appliquer les règles contextuelles si nécessaire
-        if asset_params.get("apply_context_rules", True):
-            context = asset_params.get("context", {})
-            pbr_maps = self._apply_context_rules(pbr_maps, context)
+        for i, (_, asset_params, _) in enumerate(requests):
+            if asset_params.get("apply_context_rules", True):
+                random.setstate(random_states[i][0])
+                np.random.set_state(random_states[i][1])
+                context = asset_params.get("context", {})
+                materials[i] = self._apply_context_rules(materials[i], context)
+        
+        return materials
+    
+    def generate_batch_with_cache(self, requests):
+        """
+        Génère plusieurs assets en réutilisant ceux présents dans le cache disque
+        
+        Args:
+            requests (list): Liste de tuples (asset_id, asset_params, seed)
             
-        return pbr_maps
+        Returns:
+            list: Maps PBR de chaque requête, depuis le cache ou nouvellement générées
+        """
+        return generate_cached_batch(self, requests, self.generate_batch)
         
     def _generate_pbr_maps(self, asset_id, params, size, material_type):
         """
@@ -223,27 +264,38 @@ class HybridGenerator(AssetGenerator):
         Returns:
             dict: Maps PBR raffinées
         """
-        if not self.ml_available:
-            return pbr_maps
-            
-        refined_maps = {}
+        return self._apply_ml_refinement_batch([pbr_maps])[0]
+    
+    def _apply_ml_refinement_batch(self, materials):
+        """
+        Applique le raffinement ML aux maps de plusieurs matériaux à la fois
         
+        Args:
+            materials (list): Maps PBR de chaque matériau
+            
+        Returns:
+            list: Maps PBR raffinées de chaque matériau
+        """
+        if not self.ml_available or not materials:
+            return materials
+            
         try:
-            # Pour chaque map, appliquer le raffinement ML
-            for map_type, map_data in pbr_maps.items():
-                # Convertir l'image en format compatible avec le modèle ML
-                input_data = self._prepare_map_for_ml(map_data, map_type)
-                
-                # Appliquer le modèle
-                output_data = self.ml_model.run(None, {"input": input_data})[0]
-                
-                # Reconvertir en format image
-                refined_maps[map_type] = self._process_ml_output(output_data, map_type)
+            # Rassembler toutes les maps pour les traiter par lots de patchs
+            entries = [(i, map_type) for i, pbr_maps in enumerate(materials) for map_type in pbr_maps]
+            inputs = [self._prepare_map_for_ml(materials[i][map_type], map_type) for i, map_type in entries]
+            
+            # Appliquer le modèle
+            outputs = self.ml_refiner.refine(inputs)
+            
+            # Reconvertir en format image
+            refined_materials = [{} for _ in materials]
+            for (i, map_type), output_data in zip(entries, outputs):
+                refined_materials[i][map_type] = self._process_ml_output(output_data, map_type)
                 
-            return refined_maps
+            return refined_materials
         except Exception as e:
             print(f"Erreur lors du raffinement ML: {e}")
-            return pbr_maps
+            return materials
             
     def _apply_context_rules(self, pbr_maps, context):
         """
@@ -327,7 +379,7 @@ class HybridGenerator(AssetGenerator):
                 "height_scale": 0.2
             }
         } 
-
+    
     def _generate_height_map(self, size, params, material_preset):
         """
         Génère une height map de base
@@ -687,7 +739,7 @@ class HybridGenerator(AssetGenerator):
             map_type (str): Type de map (diffuse, normal, etc.)
             
         Returns:
-            numpy.ndarray: Données préparées pour le modèle ML
+            numpy.ndarray: Données (hauteur, largeur, canaux) en float32 dans [0, 1]
         """
         # Convertir en numpy array si nécessaire
         if isinstance(map_data, Image.Image):
@@ -696,27 +748,13 @@ class HybridGenerator(AssetGenerator):
         # Normaliser à [0, 1]
         if map_data.dtype == np.uint8:
             map_data = map_data.astype(np.float32) / 255.0
+        else:
+            map_data = map_data.astype(np.float32, copy=False)
             
-        # Formater selon le modèle (ex: ajouter dimension de batch, normaliser, etc.)
-        # Note: à adapter selon les spécifications exactes du modèle ML
-        
-        # Exemple simple: redimensionner à la taille attendue par le modèle
-        expected_size = (256, 256)  # À adapter selon modèle
-        if map_data.shape[:2] != expected_size:
-            # Redimensionner tout en préservant le nombre de canaux
-            channels = 1 if len(map_data.shape) == 2 else map_data.shape[2]
-            resized = np.zeros((*expected_size, channels), dtype=np.float32)
-            
-            if channels == 1:
-                resized[..., 0] = cv2.resize(map_data, expected_size)
-            else:
-                for c in range(channels):
-                    resized[..., c] = cv2.resize(map_data[..., c], expected_size)
-                    
-            map_data = resized
-            
-        # Ajouter dimension batch (requis par la plupart des modèles)
-        map_data = np.expand_dims(map_data, axis=0)
+        # Le raffineur découpe les maps en patchs : pas de redimensionnement,
+        # seulement un axe de canaux explicite
+        if map_data.ndim == 2:
+            map_data = map_data[..., np.newaxis]
         
         return map_data
     
@@ -725,14 +763,15 @@ class HybridGenerator(AssetGenerator):
         Convertit la sortie du modèle ML en map utilisable
         
         Args:
-            output_data (numpy.ndarray): Données de sortie du modèle ML
+            output_data (numpy.ndarray): Données de sortie (hauteur, largeur, canaux) du modèle ML
             map_type (str): Type de map (diffuse, normal, etc.)
             
         Returns:
             PIL.Image: Image résultante
         """
-        # Retirer la dimension batch
-        output_data = np.squeeze(output_data, axis=0)
+        # Retirer l'axe de canaux des maps en niveaux de gris
+        if output_data.shape[-1] == 1:
+            output_data = output_data[..., 0]
         
         # Normaliser à [0, 255] et convertir en uint8
         output_data = np.clip(output_data * 255, 0, 255).astype(np.uint8)
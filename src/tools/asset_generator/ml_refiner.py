@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Raffinement ML des textures pour Nightfall Defenders
+Inférence ONNX par lots, découpée en patchs qui se chevauchent
+"""
+
+import os
+import numpy as np
+
+class TextureRefiner:
+    """
+    Applique un modèle ONNX de raffinement à de nombreuses maps à la fois
+    
+    Les maps sont découpées en patchs de taille fixe qui se chevauchent ;
+    les patchs de même nombre de canaux, quelle que soit la map ou le
+    matériau d'origine, sont regroupés dans un même tenseur (NHWC). Les
+    sorties sont recomposées avec une pondération qui s'atténue sur les
+    zones de chevauchement, ce qui évite les coutures. La mémoire reste
+    bornée par la taille d'un lot, et les buffers d'entrée et de sortie
+    sont réutilisés d'un appel à l'autre.
+    """
+    
+    def __init__(self, session, patch_size=256, overlap=32, batch_size=16):
+        """
+        Initialise le raffineur
+        
+        Args:
+            session: Session d'inférence (onnxruntime.InferenceSession)
+            patch_size (int): Côté des patchs si le modèle ne l'impose pas
+            overlap (int): Chevauchement entre patchs voisins en pixels
+            batch_size (int): Nombre de patchs par lot si le modèle ne l'impose pas
+        """
+        self.session = session
+        
+        model_input = session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_name = session.get_outputs()[0].name
+        
+        # Les dimensions symboliques du modèle sont des chaînes ou None
+        shape = list(model_input.shape)
+        self.fixed_batch = len(shape) == 4 and isinstance(shape[0], int) and shape[0] > 0
+        if self.fixed_batch:
+            batch_size = shape[0]
+        if len(shape) == 4 and isinstance(shape[1], int) and shape[1] > 0:
+            patch_size = shape[1]
+        
+        self.patch_size = patch_size
+        self.batch_size = batch_size
+        self.overlap = min(overlap, patch_size // 2)
+        self.stride = patch_size - self.overlap
+        self.blend_weights = self._make_blend_weights()
+        
+        # Buffers réutilisés par nombre de canaux : (entrée, sortie, io binding)
+        self.buffers = {}
+        
+        self.stats = {"batches": 0, "patches": 0}
+    
+    @classmethod
+    def from_model(cls, model_path, intra_op_threads=None, inter_op_threads=1, **kwargs):
+        """
+        Crée un raffineur à partir d'un fichier ONNX
+        
+        Args:
+            model_path (str): Chemin du modèle ONNX
+            intra_op_threads (int, optional): Threads par opérateur, tous les coeurs par défaut
+            inter_op_threads (int): Threads entre opérateurs ; le modèle est séquentiel
+            **kwargs: Paramètres de découpage transmis au constructeur
+        
+        Returns:
+            TextureRefiner: Le raffineur prêt à l'emploi
+        """
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads or os.cpu_count() or 1
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        return cls(session, **kwargs)
+    
+    def _make_blend_weights(self):
+        """Crée la pondération d'un patch, atténuée linéairement sur les bords"""
+        ramp = np.ones(self.patch_size, dtype=np.float32)
+        if self.overlap > 0:
+            edge = (np.arange(self.overlap, dtype=np.float32) + 0.5) / self.overlap
+            ramp[:self.overlap] = edge
+            ramp[-self.overlap:] = edge[::-1]
+        return np.outer(ramp, ramp)[..., np.newaxis]
+    
+    def _get_patch_starts(self, length):
+        """Positions des patchs le long d'un axe, le dernier collé au bord"""
+        if length <= self.patch_size:
+            return [0]
+        starts = list(range(0, length - self.patch_size, self.stride))
+        starts.append(length - self.patch_size)
+        return starts
+    
+    def _get_buffers(self, channels):
+        """Récupère les buffers d'un nombre de canaux, créés au premier usage"""
+        if channels not in self.buffers:
+            shape = (self.batch_size, self.patch_size, self.patch_size, channels)
+            input_buffer = np.zeros(shape, dtype=np.float32)
+            output_buffer = np.zeros(shape, dtype=np.float32)
+            
+            binding = None
+            if hasattr(self.session, "io_binding"):
+                binding = self.session.io_binding()
+                binding.bind_output(self.output_name, "cpu", 0, np.float32,
+                                    list(shape), output_buffer.ctypes.data)
+            
+            self.buffers[channels] = (input_buffer, output_buffer, binding)
+        return self.buffers[channels]
+    
+    def _run_batch(self, channels, count):
+        """
+        Exécute le modèle sur les premiers patchs du buffer d'entrée
+        
+        Args:
+            channels (int): Nombre de canaux des patchs
+            count (int): Nombre de patchs remplis
+        
+        Returns:
+            numpy.ndarray: Sorties du modèle pour ces patchs
+        """
+        input_buffer, output_buffer, binding = self._get_buffers(channels)
+        self.stats["batches"] += 1
+        self.stats["patches"] += count
+        
+        # Un lot partiel passe tel quel si le modèle accepte un batch variable
+        if count < self.batch_size and not self.fixed_batch:
+            return self.session.run([self.output_name], {self.input_name: input_buffer[:count]})[0]
+        
+        if binding is not None:
+            binding.bind_cpu_input(self.input_name, input_buffer)
+            self.session.run_with_iobinding(binding)
+            return output_buffer[:count]
+        
+        return self.session.run([self.output_name], {self.input_name: input_buffer})[0][:count]
+    
+    def refine(self, maps):
+        """
+        Raffine un ensemble de maps en aussi peu d'appels au modèle que possible
+        
+        Args:
+            maps (list): Maps float32 de forme (hauteur, largeur, canaux) dans [0, 1]
+        
+        Returns:
+            list: Maps raffinées, de mêmes formes que les entrées
+        """
+        size = self.patch_size
+        padded_maps = []
+        accumulators = []
+        weight_sums = []
+        patches_by_channels = {}
+        
+        for index, map_data in enumerate(maps):
+            height, width, channels = map_data.shape
+            
+            # Les maps plus petites qu'un patch sont étendues par leurs bords
+            pad_height = max(size - height, 0)
+            pad_width = max(size - width, 0)
+            if pad_height or pad_width:
+                map_data = np.pad(map_data, ((0, pad_height), (0, pad_width), (0, 0)), mode="edge")
+            padded_maps.append(map_data)
+            accumulators.append(np.zeros(map_data.shape, dtype=np.float32))
+            weight_sums.append(np.zeros(map_data.shape[:2] + (1,), dtype=np.float32))
+            
+            patches = patches_by_channels.setdefault(channels, [])
+            for y in self._get_patch_starts(map_data.shape[0]):
+                for x in self._get_patch_starts(map_data.shape[1]):
+                    patches.append((index, y, x))
+        
+        for channels, patches in patches_by_channels.items():
+            input_buffer = self._get_buffers(channels)[0]
+            
+            for start in range(0, len(patches), self.batch_size):
+                batch = patches[start:start + self.batch_size]
+                for slot, (index, y, x) in enumerate(batch):
+                    input_buffer[slot] = padded_maps[index][y:y + size, x:x + size]
+                
+                output = self._run_batch(channels, len(batch))
+                
+                for slot, (index, y, x) in enumerate(batch):
+                    accumulators[index][y:y + size, x:x + size] += output[slot] * self.blend_weights
+                    weight_sums[index][y:y + size, x:x + size] += self.blend_weights
+        
+        refined = []
+        for map_data, accumulator, weight_sum in zip(maps, accumulators, weight_sums):
+            height, width = map_data.shape[:2]
+            refined.append((accumulator / weight_sum)[:height, :width])
+        return refined
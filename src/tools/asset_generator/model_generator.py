@@ -18,6 +18,7 @@ from panda3d.core import TransformState, Mat4, LMatrix4f
 from panda3d.core import Filename, LoaderOptions
 from enum import Enum
 
+from src.tools.asset_generator.asset_cache import generate_cached
 from src.tools.asset_generator.base_generator import AssetGenerator, AssetType, AssetCategory
 
 class ModelType(Enum):
@@ -278,7 +279,21 @@ class ModelGenerator(AssetGenerator):
 
     def generate_with_cache(self, asset_id, params=None, seed=None):
         """
-        Génère un modèle 3D avec cache et métadonnées
+        Génère un modèle 3D en passant par le cache disque
+        
+        Args:
+            asset_id (str): Identifiant du modèle
+            params (dict, optional): Paramètres de génération spécifiques
+            seed (int, optional): Seed pour la génération déterministe
+            
+        Returns:
+            NodePath: Le modèle 3D généré ou chargé depuis le cache
+        """
+        return generate_cached(self, asset_id, params, seed, self.generate_from_id)
+    
+    def generate_from_id(self, asset_id, params=None, seed=None):
+        """
+        Génère un modèle 3D en déduisant son type de l'identifiant
         
         Args:
             asset_id (str): Identifiant du modèle
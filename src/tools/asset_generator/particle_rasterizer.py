@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Particle Rasterizer for Nightfall Defenders
+Rastérise en une passe NumPy les particules de toutes les frames d'un effet
+"""
+
+import numpy as np
+from PIL import Image
+
+class ParticleBatch:
+    """
+    Particules de toutes les frames d'un effet, stockées en tableaux
+    
+    Chaque particule est un carré (ou un disque) centré en (x, y) de
+    demi-taille "radius", dans la frame "frame", avec une couleur RGBA.
+    """
+    
+    def __init__(self):
+        """Initialise un lot vide"""
+        self.parts = []
+    
+    def add(self, frame, x, y, radius, color, alpha, round_shape=False):
+        """
+        Ajoute des particules ; chaque argument peut être un scalaire ou un tableau
+        
+        Args:
+            frame: Indices des frames
+            x: Positions horizontales en pixels
+            y: Positions verticales en pixels
+            radius: Demi-tailles en pixels (0 pour un pixel seul)
+            color: Couleurs RGB, de forme (3,) ou (N, 3)
+            alpha: Opacités entre 0 et 255
+            round_shape (bool): Dessiner des disques plutôt que des carrés
+        """
+        frame, x, y, radius, alpha = np.broadcast_arrays(
+            np.asarray(frame), np.rint(x), np.rint(y), np.rint(radius), np.asarray(alpha, dtype=np.float32))
+        count = frame.size
+        color = np.broadcast_to(np.asarray(color, dtype=np.float32), (count, 3))
+        self.parts.append((frame.ravel().astype(np.int64), x.ravel().astype(np.int64), y.ravel().astype(np.int64),
+                           np.maximum(radius.ravel(), 0).astype(np.int64), color,
+                           alpha.ravel(), np.full(count, round_shape)))
+    
+    def add_polylines(self, frame, points, width, color, alpha):
+        """
+        Ajoute des lignes brisées sous forme de particules espacées d'un pixel
+        
+        Args:
+            frame: Indice de la frame de chaque ligne, de forme (N,)
+            points: Sommets (x, y) des lignes, de forme (N, sommets, 2)
+            width: Épaisseur des lignes en pixels
+            color: Couleurs RGB, de forme (3,) ou (N, 3)
+            alpha: Opacités entre 0 et 255
+        """
+        points = np.asarray(points, dtype=np.float32)
+        count, vertices = points.shape[:2]
+        starts = points[:, :-1].reshape(-1, 2)
+        deltas = (points[:, 1:] - points[:, :-1]).reshape(-1, 2)
+        
+        # Un échantillon par pixel le long de l'axe principal de chaque segment
+        steps = np.maximum(1, np.ceil(np.abs(deltas).max(axis=1))).astype(np.int64)
+        segment = np.repeat(np.arange(steps.size), steps + 1)
+        first = np.cumsum(steps + 1) - (steps + 1)
+        t = (np.arange(segment.size) - first[segment]) / steps[segment]
+        samples = starts[segment] + deltas[segment] * t[:, np.newaxis]
+        line = segment // (vertices - 1)
+        
+        self.add(np.broadcast_to(frame, count)[line], samples[:, 0], samples[:, 1],
+                 np.maximum(0, (np.broadcast_to(width, count)[line] - 1) / 2),
+                 np.broadcast_to(np.asarray(color, dtype=np.float32), (count, 3))[line],
+                 np.broadcast_to(alpha, count)[line])
+    
+    def add_rings(self, frame, cx, cy, radius, width, color, alpha):
+        """
+        Ajoute des contours de cercles sous forme de particules espacées d'un pixel
+        
+        Args:
+            frame: Indice de la frame de chaque cercle, de forme (N,)
+            cx: Centres horizontaux
+            cy: Centres verticaux
+            radius: Rayons des cercles
+            width: Épaisseurs des contours
+            color: Couleurs RGB, de forme (3,) ou (N, 3)
+            alpha: Opacités entre 0 et 255
+        """
+        frame, cx, cy, radius, width, alpha = (np.asarray(value, dtype=np.float32).ravel() for value in
+                                               np.broadcast_arrays(frame, cx, cy, radius, width, alpha))
+        count = frame.size
+        
+        # Le contour est tracé vers l'intérieur, comme ImageDraw.ellipse
+        half_width = np.maximum(0, (width - 1) / 2)
+        center_radius = np.maximum(radius - half_width, 0)
+        
+        steps = np.maximum(8, np.ceil(2 * np.pi * center_radius)).astype(np.int64)
+        ring = np.repeat(np.arange(count), steps)
+        first = np.cumsum(steps) - steps
+        angles = 2 * np.pi * (np.arange(ring.size) - first[ring]) / steps[ring]
+        
+        self.add(frame[ring].astype(np.int64),
+                 cx[ring] + np.cos(angles) * center_radius[ring],
+                 cy[ring] + np.sin(angles) * center_radius[ring],
+                 half_width[ring],
+                 np.broadcast_to(np.asarray(color, dtype=np.float32), (count, 3))[ring],
+                 alpha[ring])
+    
+    def arrays(self):
+        """Concatène les particules ajoutées en tableaux plats"""
+        if not self.parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty, empty, np.zeros((0, 3), np.float32), np.zeros(0, np.float32), np.zeros(0, bool)
+        return tuple(np.concatenate(column) for column in zip(*self.parts))
+
+def gaussian_kernel(sigma):
+    """
+    Crée un noyau gaussien 1D normalisé
+    
+    Args:
+        sigma (float): Écart type en pixels
+    
+    Returns:
+        numpy.ndarray: Coefficients du noyau
+    """
+    radius = max(1, int(np.ceil(2 * sigma)))
+    offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+    kernel = np.exp(-offsets ** 2 / (2 * sigma ** 2))
+    return kernel / kernel.sum()
+
+def _convolve_axis(data, kernel, axis):
+    """Convolue un buffer le long d'un axe par un noyau symétrique, bords à zéro"""
+    radius = len(kernel) // 2
+    pad = [(0, 0)] * data.ndim
+    pad[axis] = (radius, radius)
+    padded = np.pad(data, pad)
+    length = data.shape[axis]
+    
+    def shifted(offset):
+        index = [slice(None)] * data.ndim
+        index[axis] = slice(radius + offset, radius + offset + length)
+        return padded[tuple(index)]
+    
+    # Les coefficients symétriques sont appliqués aux deux décalages à la fois
+    result = shifted(0) * kernel[radius]
+    pair = np.empty_like(result)
+    for offset in range(1, radius + 1):
+        np.add(shifted(-offset), shifted(offset), out=pair)
+        pair *= kernel[radius + offset]
+        result += pair
+    return result
+
+def separable_blur(frames, sigma):
+    """
+    Floute toutes les frames à la fois par une convolution séparable
+    
+    La convolution porte sur les couleurs prémultipliées par l'alpha, pour
+    que les pixels transparents ne noircissent pas les bords, et se limite
+    à la zone couverte par les particules dans l'ensemble des frames.
+    
+    Args:
+        frames (numpy.ndarray): Buffer (frames, hauteur, largeur, 4) en float32, flouté sur place
+        sigma (float): Écart type du flou en pixels
+        
+    Returns:
+        numpy.ndarray: Le buffer flouté
+    """
+    covered = frames[..., 3].any(axis=0)
+    if sigma <= 0 or not covered.any():
+        return frames
+    
+    kernel = gaussian_kernel(sigma)
+    radius = len(kernel) // 2
+    height, width = covered.shape
+    
+    rows = np.nonzero(covered.any(axis=1))[0]
+    cols = np.nonzero(covered.any(axis=0))[0]
+    y0, y1 = max(rows[0] - radius, 0), min(rows[-1] + radius + 1, height)
+    x0, x1 = max(cols[0] - radius, 0), min(cols[-1] + radius + 1, width)
+    region = frames[:, y0:y1, x0:x1]
+    
+    # Prémultiplier les quatre canaux d'un coup, puis rétablir l'alpha
+    premultiplied = region * region[..., 3:4]
+    premultiplied[..., 3] = region[..., 3]
+    premultiplied = _convolve_axis(_convolve_axis(premultiplied, kernel, 1), kernel, 2)
+    
+    # Les couleurs des pixels restés transparents sont sans importance
+    alpha = premultiplied[..., 3:4].copy()
+    premultiplied *= 1.0 / np.maximum(alpha, 1e-6)
+    premultiplied[..., 3:4] = alpha
+    region[...] = premultiplied
+    return frames
+
+def composite_particles(particles, frame_count, size):
+    """
+    Calcule la couleur et l'opacité des pixels couverts par des particules
+    
+    Les couleurs des particules qui se recouvrent sont moyennées en
+    fonction de leur opacité et l'opacité d'un pixel est celle de la
+    particule la plus opaque, ce qui ne dépend pas de l'ordre de dessin.
+    
+    Args:
+        particles (tuple): Tableaux de ParticleBatch.arrays()
+        frame_count (int): Nombre de frames
+        size (tuple): Dimensions (largeur, hauteur) des frames
+        
+    Returns:
+        tuple: (indices à plat des pixels couverts, triés, dans un buffer
+            (frames, hauteur, largeur) ; couleurs (N, 3) dans [0, 255] ;
+            opacités (N,) dans [0, 1])
+    """
+    width, height = size
+    frame, x, y, radius, color, alpha, round_shape = particles
+    alpha = np.clip(alpha, 0, 255) / 255.0
+    
+    # Pixels couverts par chaque particule ; les particules de même taille
+    # partagent la même grille de décalages
+    covered_pixels = []
+    covered_particles = []
+    for size_value in np.unique(radius):
+        selected = np.nonzero((radius == size_value) & (alpha > 0) & (frame >= 0) & (frame < frame_count))[0]
+        offsets = np.arange(-size_value, size_value + 1)
+        dx, dy = np.meshgrid(offsets, offsets)
+        dx, dy = dx.ravel(), dy.ravel()
+        inside_disc = dx ** 2 + dy ** 2 <= size_value ** 2 + size_value
+        
+        px = x[selected, np.newaxis] + dx
+        py = y[selected, np.newaxis] + dy
+        keep = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        keep &= ~round_shape[selected, np.newaxis] | inside_disc
+        
+        particle, _ = np.nonzero(keep)
+        particle = selected[particle]
+        covered_pixels.append((frame[particle] * height + py[keep]) * width + px[keep])
+        covered_particles.append(particle)
+    
+    if not covered_pixels:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 3), dtype=np.float32), np.zeros(0, dtype=np.float32)
+    
+    pixels, inverse = np.unique(np.concatenate(covered_pixels), return_inverse=True)
+    particle = np.concatenate(covered_particles)
+    weights = alpha[particle]
+    
+    weight_sums = np.bincount(inverse, weights, minlength=pixels.size)
+    colors = np.empty((pixels.size, 3), dtype=np.float32)
+    for channel in range(3):
+        colors[:, channel] = np.bincount(inverse, weights * color[particle, channel], minlength=pixels.size) / weight_sums
+    
+    opacity = np.zeros(pixels.size, dtype=np.float32)
+    np.maximum.at(opacity, inverse, weights.astype(np.float32))
+    return pixels, colors, opacity
+
+def _to_uint8(frames):
+    """Arrondit un buffer de frames flottant en pixels RGBA 8 bits"""
+    # Les couleurs sont des moyennes de couleurs valides : seul l'arrondi reste à faire
+    scaled = frames * np.array([1, 1, 1, 255], dtype=np.float32)
+    scaled += 0.5
+    pixels = np.empty(frames.shape, dtype=np.uint8)
+    np.copyto(pixels, scaled, casting="unsafe")
+    return pixels
+
+def render_particles(batch, frame_count, size, blur_sigma=0.0, chunk_frames=None):
+    """
+    Rastérise, floute et convertit en images toutes les frames d'un effet
+    
+    Sans flou, seuls les pixels couverts sont écrits dans les frames. Le
+    flou travaille sur la zone couverte de blocs de quelques frames, assez
+    petits pour que chaque passe reste dans le cache du processeur.
+    
+    Args:
+        batch (ParticleBatch): Particules de toutes les frames
+        frame_count (int): Nombre de frames
+        size (tuple): Dimensions (largeur, hauteur) des frames
+        blur_sigma (float): Écart type du flou de "glow", 0 pour aucun flou
+        chunk_frames (int, optional): Nombre de frames par bloc flouté, environ 1 Mo de buffer par défaut
+        
+    Returns:
+        list: Images RGBA de chaque frame
+    """
+    width, height = size
+    pixels, colors, opacity = composite_particles(batch.arrays(), frame_count, size)
+    output = np.zeros((frame_count, height, width, 4), dtype=np.uint8)
+    
+    if blur_sigma <= 0:
+        flat = output.reshape(-1, 4)
+        flat[pixels, :3] = colors + 0.5
+        flat[pixels, 3] = opacity * 255 + 0.5
+        return [Image.fromarray(frame, "RGBA") for frame in output]
+    
+    if chunk_frames is None:
+        chunk_frames = max(1, (1 << 16) // (width * height))
+    radius = len(gaussian_kernel(blur_sigma)) // 2
+    
+    # Les pixels sont triés par frame : chaque bloc en est une tranche
+    starts = np.arange(0, frame_count, chunk_frames)
+    bounds = np.searchsorted(pixels, np.append(starts, frame_count) * (width * height))
+    
+    for index, start in enumerate(starts):
+        lo, hi = bounds[index], bounds[index + 1]
+        if lo == hi:
+            continue
+        count = min(chunk_frames, frame_count - start)
+        frame, y, x = np.unravel_index(pixels[lo:hi] - start * width * height, (count, height, width))
+        
+        # Zone couverte dans le bloc, élargie du rayon du flou
+        y0, y1 = max(y.min() - radius, 0), min(y.max() + radius + 1, height)
+        x0, x1 = max(x.min() - radius, 0), min(x.max() + radius + 1, width)
+        region = np.zeros((count, y1 - y0, x1 - x0, 4), dtype=np.float32)
+        region[frame, y - y0, x - x0, :3] = colors[lo:hi]
+        region[frame, y - y0, x - x0, 3] = opacity[lo:hi]
+        
+        separable_blur(region, blur_sigma)
+        output[start:start + count, y0:y1, x0:x1] = _to_uint8(region)
+    
+    return [Image.fromarray(frame, "RGBA") for frame in output]
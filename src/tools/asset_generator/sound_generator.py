@@ -7,14 +7,13 @@ Generates placeholders for sound effects and ambiance
 """
 
 import os
+import json
 import wave
-import array
-import math
-import random
-import struct
 import numpy as np
 from enum import Enum
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.tools.asset_generator.asset_cache import generate_cached, generate_cached_batch
 
 class SoundType(Enum):
     """Types of sounds that can be generated"""
@@ -24,6 +23,134 @@ class SoundType(Enum):
     MUSIC = "music"
     VOICE = "voice"
 
+# Sound bank manifest written next to the sound directories
+BANK_MANIFEST = "bank_manifest.json"
+
+def oscillator_envelope(index, length, fade):
+    """
+    Linear fade in and out of an oscillator
+    
+    Args:
+        index (numpy.ndarray): Sample index within the oscillator
+        length: Length of the oscillator in samples
+        fade: Fade length in samples
+        
+    Returns:
+        numpy.ndarray: Envelope between 0 and 1
+    """
+    if np.all(np.asarray(fade) <= 0):
+        return np.ones(np.shape(index))
+    return np.minimum(1.0, index / fade) * np.minimum(1.0, (length - index) / fade)
+
+def oscillator_bank(total, sample_rate, starts, lengths, frequencies, amplitudes, fade=0.0, arch=False,
+                    vibrato_depth=0.0, vibrato_rate=0.0):
+    """
+    Mix a bank of sine oscillators into one signal
+    
+    Every oscillator is expanded to its samples in a single array, so a
+    whole bank costs a few NumPy passes whatever the number of oscillators.
+    
+    Args:
+        total (int): Length of the mixed signal in samples
+        sample_rate (int): Sample rate in Hz
+        starts: Start sample of each oscillator
+        lengths: Length of each oscillator in samples (cut at the end of the signal)
+        frequencies: Frequency of each oscillator in Hz
+        amplitudes: Peak amplitude of each oscillator
+        fade (float): Linear fade in and out in seconds
+        arch (bool): Use a half-sine envelope instead of the linear fades
+        vibrato_depth (float): Relative frequency modulation depth
+        vibrato_rate (float): Frequency modulation rate in Hz
+        
+    Returns:
+        numpy.ndarray: Mixed signal
+    """
+    starts, lengths, frequencies, amplitudes = (np.ravel(value) for value in
+                                                np.broadcast_arrays(starts, lengths, frequencies, amplitudes))
+    starts = starts.astype(np.int64)
+    lengths = lengths.astype(np.int64)
+    played = np.clip(total - starts, 0, lengths)
+    
+    oscillator = np.repeat(np.arange(starts.size), played)
+    first = np.cumsum(played) - played
+    index = np.arange(oscillator.size) - first[oscillator]
+    t = index / sample_rate
+    length = lengths[oscillator]
+    
+    if arch:
+        envelope = np.sin(np.pi * index / length)
+    else:
+        envelope = oscillator_envelope(index, length, fade * sample_rate)
+    
+    frequency = frequencies[oscillator]
+    if vibrato_depth:
+        frequency = frequency * (1 + vibrato_depth * np.sin(2 * np.pi * vibrato_rate * t))
+    
+    values = amplitudes[oscillator] * envelope * np.sin(2 * np.pi * frequency * t)
+    return np.bincount(starts[oscillator] + index, values, minlength=total)[:total]
+
+def noise_bank(rng, count, length, smoothing=0.0, uniform=False):
+    """
+    Generate layers of noise, optionally low-pass filtered
+    
+    The one-pole filter y[i] = a * y[i-1] + (1 - a) * x[i] is applied in
+    the frequency domain for all layers at once. The filter wraps around,
+    so the filtered noise loops without a seam.
+    
+    Args:
+        rng (numpy.random.Generator): Random generator of the job
+        count (int): Number of noise layers
+        length (int): Length of each layer in samples
+        smoothing (float): Filter coefficient a, 0 for white noise
+        uniform (bool): Uniform noise in [-1, 1] instead of normal noise
+        
+    Returns:
+        numpy.ndarray: Noise of shape (count, length)
+    """
+    if uniform:
+        noise = rng.uniform(-1.0, 1.0, (count, length))
+    else:
+        noise = rng.standard_normal((count, length))
+    
+    if smoothing > 0 and length > 1:
+        omega = 2 * np.pi * np.arange(length // 2 + 1) / length
+        response = (1 - smoothing) / (1 - smoothing * np.exp(-1j * omega))
+        noise = np.fft.irfft(np.fft.rfft(noise, axis=1) * response, n=length, axis=1)
+    return noise
+
+def to_pcm16(signal):
+    """
+    Convert a signal to 16-bit little-endian PCM bytes
+    
+    Args:
+        signal (numpy.ndarray): Signal in sample units
+        
+    Returns:
+        bytes: PCM data, clipped to the 16-bit range
+    """
+    return np.clip(np.rint(signal), -32768, 32767).astype('<i2').tobytes()
+
+def measure_loudness(samples):
+    """
+    Measure the level of 16-bit samples
+    
+    Args:
+        samples (numpy.ndarray): 16-bit samples
+        
+    Returns:
+        dict: RMS loudness and peak level in dBFS (-96 for silence)
+    """
+    if samples.size == 0:
+        return {"loudness_db": -96.0, "peak_db": -96.0}
+    
+    values = samples.astype(np.float64) / 32768.0
+    rms = np.sqrt(np.mean(values * values))
+    peak = np.abs(values).max()
+    return {
+        "loudness_db": round(float(max(20 * np.log10(max(rms, 1e-12)), -96.0)), 2),
+        "peak_db": round(float(max(20 * np.log10(max(peak, 1e-12)), -96.0)), 2)
+    }
+
 class SoundGenerator:
     """Generator for sound effects and ambient sounds"""
     
@@ -35,8 +162,12 @@ class SoundGenerator:
             output_dir (str): Directory to save generated sounds
         """
         self.output_dir = output_dir
+        self.cache = None
         os.makedirs(output_dir, exist_ok=True)
         
+        # Worker threads for synthesis and encoding (NumPy and ffmpeg release the GIL)
+        self.max_workers = min(8, os.cpu_count() or 1)
+        
         # Create subdirectories for different sound types
         self.sound_dirs = {
             SoundType.UI: os.path.join(output_dir, "ui"),
@@ -53,6 +184,51 @@ class SoundGenerator:
         """
         Generate a sound asset with caching
         
+        Args:
+            asset_id (str): Identifier for the sound
+            params (dict): Parameters for generation
+            seed (int): Random seed for deterministic generation
+            
+        Returns:
+            tuple: (sound data, sample rate), generated or cached
+        """
+        return generate_cached(self, asset_id, params, seed)
+    
+    def generate_batch(self, requests):
+        """
+        Synthesize several sounds concurrently
+        
+        Every job draws from its own random generator, so jobs can run on
+        the worker pool in any order and still give the same sounds.
+        
+        Args:
+            requests (list): List of (asset_id, params, seed) tuples
+            
+        Returns:
+            list: (sound data, sample rate) of each request, in order
+        """
+        if len(requests) <= 1:
+            return [self.generate(*request) for request in requests]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="SoundSynth") as pool:
+            return list(pool.map(lambda request: self.generate(*request), requests))
+    
+    def generate_batch_with_cache(self, requests):
+        """
+        Synthesize several sounds, reusing those found in the asset cache
+        
+        Args:
+            requests (list): List of (asset_id, params, seed) tuples
+            
+        Returns:
+            list: (sound data, sample rate) of each request, in order
+        """
+        return generate_cached_batch(self, requests, self.generate_batch)
+    
+    def generate(self, asset_id, params=None, seed=None):
+        """
+        Generate a sound asset
+        
         Args:
             asset_id (str): Identifier for the sound
             params (dict): Parameters for generation
@@ -63,14 +239,14 @@ class SoundGenerator:
         """
         if params is None:
             params = {}
-            
-        # Set random seed if provided
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        
+        # A generator per job instead of the global random state
+        rng = np.random.default_rng(seed)
         
         # Determine sound type from asset_id
         sound_type = params.get("sound_type", None)
+        if isinstance(sound_type, str):
+            sound_type = next((st for st in SoundType if st.value == sound_type), None)
         if sound_type is None:
             if asset_id.startswith("ui_"):
                 sound_type = SoundType.UI
@@ -92,12 +268,12 @@ class SoundGenerator:
         elif asset_id == "ui_notification_error" or asset_id.endswith("ui_notification_error.wav"):
             return self.generate_notification_sound(False, params)
         elif asset_id == "ambient_birds_morning" or asset_id.endswith("ambient_birds_morning.ogg"):
-            return self.generate_ambient_sound("birds", params)
+            return self.generate_ambient_sound("birds", params, rng)
         elif asset_id == "ambient_wind_light" or asset_id.endswith("ambient_wind_light.ogg"):
-            return self.generate_ambient_sound("wind", params)
+            return self.generate_ambient_sound("wind", params, rng)
         else:
             # Generate a default sound
-            return self.generate_default_sound(sound_type, params)
+            return self.generate_default_sound(sound_type, params, rng)
     
     def generate_notification_sound(self, is_success, params=None):
         """
@@ -115,7 +291,6 @@ class SoundGenerator:
             
         # Sound parameters
         sample_rate = params.get("sample_rate", 44100)
-        duration = params.get("duration", 0.5 if is_success else 0.7)
         
         # Generate different tones based on success/error
         if is_success:
@@ -126,43 +301,30 @@ class SoundGenerator:
             # Error sound: falling tone
             frequencies = [440, 330, 220]
             durations = [0.2, 0.2, 0.3]
-            
-        # Generate sound data
-        sound_data = []
-        current_time = 0
         
-        for freq, dur in zip(frequencies, durations):
-            # Calculate number of samples for this tone
-            num_samples = int(dur * sample_rate)
-            
-            # Generate tone
-            for i in range(num_samples):
-                t = current_time + i / sample_rate
-                # Sine wave with fade in/out
-                envelope = min(1.0, i / (0.1 * sample_rate)) * min(1.0, (num_samples - i) / (0.1 * sample_rate))
-                value = int(32767 * envelope * math.sin(2 * math.pi * freq * t))
-                sound_data.append(value)
-                
-            current_time += dur
-            
-        # Convert to bytes
-        byte_data = struct.pack('<' + 'h' * len(sound_data), *sound_data)
+        # The tones play one after the other
+        lengths = np.array([int(duration * sample_rate) for duration in durations])
+        starts = np.cumsum(lengths) - lengths
+        signal = oscillator_bank(int(lengths.sum()), sample_rate, starts, lengths, frequencies, 32767, fade=0.1)
         
-        return byte_data, sample_rate
+        return to_pcm16(signal), sample_rate
     
-    def generate_ambient_sound(self, ambient_type, params=None):
+    def generate_ambient_sound(self, ambient_type, params=None, rng=None):
         """
         Generate an ambient sound
         
         Args:
             ambient_type (str): Type of ambient sound to generate
             params (dict): Parameters for generation
+            rng (numpy.random.Generator, optional): Random generator of the job
             
         Returns:
             tuple: (sound data, sample rate)
         """
         if params is None:
             params = {}
+        if rng is None:
+            rng = np.random.default_rng()
             
         # Sound parameters
         sample_rate = params.get("sample_rate", 44100)
@@ -170,59 +332,39 @@ class SoundGenerator:
         
         # Number of samples
         num_samples = int(duration * sample_rate)
-        sound_data = np.zeros(num_samples, dtype=np.int16)
+        signal = np.zeros(num_samples)
         
         if ambient_type == "birds":
-            # Simulate bird chirps
-            num_chirps = random.randint(20, 40)
-            
-            for _ in range(num_chirps):
-                # Random timing for chirp
-                chirp_start = random.randint(0, num_samples - int(0.3 * sample_rate))
-                chirp_length = random.randint(int(0.1 * sample_rate), int(0.3 * sample_rate))
-                chirp_freq = random.uniform(2000, 4000)
-                
-                # Create chirp
-                for i in range(chirp_length):
-                    t = i / sample_rate
-                    # Chirp envelope
-                    envelope = math.sin(math.pi * i / chirp_length)
-                    # Add some frequency variation
-                    freq_variation = chirp_freq * (1 + 0.1 * math.sin(2 * math.pi * 10 * t))
-                    value = int(8000 * envelope * math.sin(2 * math.pi * freq_variation * t))
-                    
-                    if chirp_start + i < num_samples:
-                        sound_data[chirp_start + i] += value
+            # Simulate bird chirps: one oscillator per chirp, with a little vibrato
+            num_chirps = rng.integers(20, 41)
+            starts = rng.integers(0, num_samples - int(0.3 * sample_rate) + 1, num_chirps)
+            lengths = rng.integers(int(0.1 * sample_rate), int(0.3 * sample_rate) + 1, num_chirps)
+            frequencies = rng.uniform(2000, 4000, num_chirps)
+            signal = oscillator_bank(num_samples, sample_rate, starts, lengths, frequencies, 8000,
+                                     arch=True, vibrato_depth=0.1, vibrato_rate=10)
                         
         elif ambient_type == "wind":
-            # Simulate wind using filtered noise
-            noise = np.random.normal(0, 1, num_samples)
-            
-            # Apply low-pass filter for wind effect
-            for i in range(1, num_samples):
-                noise[i] = 0.95 * noise[i-1] + 0.05 * noise[i]
-                
-            # Scale and convert to int16
-            sound_data = (noise * 8000).astype(np.int16)
-        
-        # Convert to bytes
-        byte_data = sound_data.tobytes()
+            # Simulate wind using low-pass filtered noise
+            signal = noise_bank(rng, 1, num_samples, smoothing=0.95)[0] * 8000
         
-        return byte_data, sample_rate
+        return to_pcm16(signal), sample_rate
     
-    def generate_default_sound(self, sound_type, params=None):
+    def generate_default_sound(self, sound_type, params=None, rng=None):
         """
         Generate a default sound when specific type is not recognized
         
         Args:
             sound_type (SoundType): Type of sound to generate
             params (dict): Parameters for generation
+            rng (numpy.random.Generator, optional): Random generator of the job
             
         Returns:
             tuple: (sound data, sample rate)
         """
         if params is None:
             params = {}
+        if rng is None:
+            rng = np.random.default_rng()
             
         # Sound parameters
         sample_rate = params.get("sample_rate", 44100)
@@ -233,69 +375,96 @@ class SoundGenerator:
         
         if sound_type == SoundType.UI:
             # Simple beep
-            frequency = 440
-            sound_data = []
-            
-            for i in range(num_samples):
-                t = i / sample_rate
-                # Sine wave with quick fade in/out
-                envelope = min(1.0, i / (0.05 * sample_rate)) * min(1.0, (num_samples - i) / (0.05 * sample_rate))
-                value = int(16000 * envelope * math.sin(2 * math.pi * frequency * t))
-                sound_data.append(value)
+            signal = oscillator_bank(num_samples, sample_rate, 0, num_samples, 440, 16000, fade=0.05)
                 
         elif sound_type == SoundType.SFX:
             # White noise with envelope
-            sound_data = []
-            
-            for i in range(num_samples):
-                # Envelope: fade in/out
-                envelope = min(1.0, i / (0.1 * sample_rate)) * min(1.0, (num_samples - i) / (0.1 * sample_rate))
-                value = int(16000 * envelope * (random.random() * 2 - 1))
-                sound_data.append(value)
+            envelope = oscillator_envelope(np.arange(num_samples), num_samples, 0.1 * sample_rate)
+            signal = 16000 * envelope * noise_bank(rng, 1, num_samples, uniform=True)[0]
                 
         elif sound_type == SoundType.AMBIENT:
             # Low filtered noise
-            sound_data = []
-            last_value = 0
-            
-            for i in range(num_samples):
-                # Low-pass filter for ambient sound
-                new_value = 0.95 * last_value + 0.05 * (random.random() * 2 - 1)
-                value = int(8000 * new_value)
-                sound_data.append(value)
-                last_value = new_value
+            signal = 8000 * noise_bank(rng, 1, num_samples, smoothing=0.95, uniform=True)[0]
                 
         elif sound_type == SoundType.MUSIC:
             # Simple sine wave melody
             notes = [261.63, 293.66, 329.63, 349.23, 392.00, 440.00, 493.88]  # C4 to B4
             note_duration = 0.25  # quarter note
-            sound_data = []
+            note_length = int(note_duration * sample_rate)
+            note_count = int(duration / note_duration)
             
-            for i in range(int(duration / note_duration)):
-                frequency = random.choice(notes)
-                for j in range(int(note_duration * sample_rate)):
-                    t = j / sample_rate
-                    # Sine wave with quick fade in/out
-                    envelope = min(1.0, j / (0.05 * sample_rate)) * min(1.0, (int(note_duration * sample_rate) - j) / (0.05 * sample_rate))
-                    value = int(16000 * envelope * math.sin(2 * math.pi * frequency * t))
-                    sound_data.append(value)
+            signal = oscillator_bank(note_count * note_length, sample_rate,
+                                     np.arange(note_count) * note_length, note_length,
+                                     rng.choice(notes, note_count), 16000, fade=0.05)
                     
         else:  # VOICE or default
             # Just use a soft sine wave
-            frequency = 150
-            sound_data = []
+            signal = oscillator_bank(num_samples, sample_rate, 0, num_samples, 150, 8000, fade=0.1)
+        
+        return to_pcm16(signal), sample_rate
+    
+    def build_sound_bank(self, sounds, manifest_name=BANK_MANIFEST):
+        """
+        Synthesize and encode a whole sound bank on the worker pool
+        
+        The bank manifest records the duration and loudness of every sound,
+        so the game can decide what to preload without opening the files.
+        
+        Args:
+            sounds (list): Tuples (path relative to the output directory,
+                params, seed), e.g. ("sfx/weapon_hit_1.wav", {}, 7)
+            manifest_name (str): File name of the manifest in the output directory
             
-            for i in range(num_samples):
-                t = i / sample_rate
-                # Sine wave with envelope
-                envelope = min(1.0, i / (0.1 * sample_rate)) * min(1.0, (num_samples - i) / (0.1 * sample_rate))
-                value = int(8000 * envelope * math.sin(2 * math.pi * frequency * t))
-                sound_data.append(value)
+        Returns:
+            dict: Manifest entries of the built sounds by "category/name" key
+        """
+        requests = []
+        for path, params, seed in sounds:
+            params = dict(params or {})
+            category = os.path.dirname(path.replace("\\", "/"))
+            if "sound_type" not in params and category in [st.value for st in SoundType]:
+                params["sound_type"] = SoundType(category)
+            requests.append((os.path.splitext(os.path.basename(path))[0], params, seed))
         
-        # Convert to bytes
-        byte_data = struct.pack('<' + 'h' * len(sound_data), *sound_data)
+        # Cache lookups stay on this thread; only the missing sounds are synthesized
+        assets = self.generate_batch_with_cache(requests)
         
-        return byte_data, sample_rate
+        def encode(job):
+            (path, params, seed), (sound_data, sample_rate) = job
+            output_path = os.path.join(self.output_dir, path)
+            self.save_asset((sound_data, sample_rate), output_path)
+            
+            samples = np.frombuffer(sound_data, dtype='<i2')
+            entry = {
+                "file": path.replace("\\", "/"),
+                "sample_rate": sample_rate,
+                "duration": samples.size / float(sample_rate),
+                "size": os.path.getsize(output_path) if os.path.exists(output_path) else len(sound_data)
+            }
+            entry.update(measure_loudness(samples))
+            return os.path.splitext(entry["file"])[0], entry
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="SoundEncode") as pool:
+            entries = dict(pool.map(encode, zip(sounds, assets)))
+        
+        # Merge with the manifest of earlier builds
+        manifest_path = os.path.join(self.output_dir, manifest_name)
+        manifest = {"sounds": {}}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+            except Exception as e:
+                print(f"Error reading sound bank manifest: {e}")
+        manifest.setdefault("sounds", {}).update(entries)
+        
+        try:
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+        except Exception as e:
+            print(f"Error saving sound bank manifest: {e}")
+        
+        return entries
     
     def save_asset(self, asset_data, output_path):
         """
@@ -378,7 +547,6 @@ class SoundGenerator:
         os.makedirs(metadata_dir, exist_ok=True)
         
         # Save metadata to JSON file
-        import json
         metadata_path = os.path.join(metadata_dir, f"{asset_id}.json")
         
         try:
@@ -394,20 +562,17 @@ def main():
     
     generator = SoundGenerator(output_dir)
     
-    # Generate and save some example sounds
-    print("Generating notification sounds...")
-    info_sound, rate = generator.generate_notification_sound(True)
-    error_sound, rate = generator.generate_notification_sound(False)
-    
-    generator._save_wav(info_sound, rate, os.path.join(output_dir, "ui/ui_notification_info.wav"))
-    generator._save_wav(error_sound, rate, os.path.join(output_dir, "ui/ui_notification_error.wav"))
-    
-    print("Generating ambient sounds...")
-    birds_sound, rate = generator.generate_ambient_sound("birds")
-    wind_sound, rate = generator.generate_ambient_sound("wind")
+    # Build the example sounds as one bank, with its manifest
+    print("Generating sound bank...")
+    entries = generator.build_sound_bank([
+        ("sfx/ui_notification_info.wav", {}, 1),
+        ("sfx/ui_notification_error.wav", {}, 2),
+        ("ambient/ambient_birds_morning.wav", {}, 3),
+        ("ambient/ambient_wind_light.wav", {}, 4)
+    ])
     
-    generator._save_wav(birds_sound, rate, os.path.join(output_dir, "ambient/ambient_birds_morning.wav"))
-    generator._save_wav(wind_sound, rate, os.path.join(output_dir, "ambient/ambient_wind_light.wav"))
+    for key, entry in sorted(entries.items()):
+        print(f"{key}: {entry['duration']:.2f} s, {entry['loudness_db']:.1f} dBFS")
     
     print("Sound generation complete!")
 
@@ -8,23 +8,32 @@ Procedurally generates environment tiles in Octopath Traveler style
 
 import os
 import numpy as np
-from PIL import Image, ImageDraw, ImageFilter, ImageEnhance, ImageChops
+from PIL import Image, ImageFilter, ImageEnhance
 import random
-import noise
 import math
-import colorsys
+import zlib
+
+from src.tools.asset_generator.asset_cache import AssetCache, generate_cached, get_generator_version
 
 class TerrainGenerator:
     """Generator for procedural terrain tiles and environment assets"""
     
-    def __init__(self, output_dir):
+    # Perlin gradient directions selected by corner hashes
+    GRADIENTS = np.array([(1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.float64)
+    
+    # Bump when the synthesis code changes; recipe changes are part of the cache keys
+    CACHE_VERSION = 1
+    
+    def __init__(self, output_dir, cache=None):
         """
         Initialize the terrain generator
         
         Args:
             output_dir (str): Directory to save generated terrain
+            cache (AssetCache): Optional on-disk cache for generated tiles
         """
         self.output_dir = output_dir
+        self.cache = cache
         os.makedirs(output_dir, exist_ok=True)
         
         # Create subdirectories for different terrain types
@@ -85,6 +94,24 @@ class TerrainGenerator:
                 "highlight": (255, 255, 255)
             }
         }
+        
+        # How each terrain type is synthesized: a noise-blended palette or
+        # another terrain as the base, an optional brightness change, then
+        # detail passes as (detail, palette, density)
+        self.tile_recipes = {
+            "grass": {"palette": "grass", "noise": {"scale": 20.0},
+                      "details": [("grass", "grass", 40)]},
+            "forest": {"base": "grass", "brightness": 0.85,
+                       "details": [("trees", "forest", 3)]},
+            "mountain": {"palette": "mountain", "noise": {"scale": 10.0, "octaves": 4},
+                         "details": [("rocks", "mountain", 15)]},
+            "water": {"palette": "water", "noise": {"scale": 30.0, "amplitude": 0.5},
+                      "details": [("waves", "water", 10)]},
+            "desert": {"palette": "desert", "noise": {"scale": 15.0},
+                       "details": [("sand", "desert", 8)]},
+            "snow": {"palette": "snow", "noise": {"scale": 25.0, "amplitude": 0.3},
+                     "details": [("sparkles", "snow", 20)]}
+        }
     
     def generate_tile(self, terrain_type, seed=None):
         """
@@ -104,366 +131,385 @@ class TerrainGenerator:
         if terrain_type not in self.terrain_palettes:
             raise ValueError(f"Unknown terrain type: {terrain_type}")
         
-        # Create a base tile image
-        img = Image.new('RGBA', (self.tile_size, self.tile_size), (0, 0, 0, 0))
-        
-        # Generate terrain based on type
-        if terrain_type == "grass":
-            img = self.generate_grass_tile(img, seed)
-        elif terrain_type == "forest":
-            img = self.generate_forest_tile(img, seed)
-        elif terrain_type == "mountain":
-            img = self.generate_mountain_tile(img, seed)
-        elif terrain_type == "water":
-            img = self.generate_water_tile(img, seed)
-        elif terrain_type == "desert":
-            img = self.generate_desert_tile(img, seed)
-        elif terrain_type == "snow":
-            img = self.generate_snow_tile(img, seed)
-        
-        # Apply Octopath Traveler style post-processing
-        img = self.apply_octopath_style(img)
-        
-        # Scale up the image for pixel art clarity
-        if self.pixel_scale > 1:
-            img = img.resize(
-                (self.tile_size * self.pixel_scale, self.tile_size * self.pixel_scale),
-                Image.NEAREST
-            )
-        
-        return img
+        return self.synthesize_tiles(terrain_type, [seed])[0]
     
-    def generate_grass_tile(self, img, seed=None):
-        """Generate a grass terrain tile"""
-        draw = ImageDraw.Draw(img)
-        palette = self.terrain_palettes["grass"]
+    def apply_perlin_noise(self, img, variation_colors, scale=20.0, octaves=2, persistence=0.5, amplitude=1.0, seed=None):
+        """Apply Perlin noise variation to an image"""
+        if seed is not None:
+            noise_seed = seed
+        else:
+            noise_seed = random.randint(0, 1000)
         
-        # Fill base color
-        draw.rectangle([(0, 0), (self.tile_size, self.tile_size)], fill=palette["base"])
+        # Noise for the whole tile at once, normalized to 0-1 and scaled by amplitude
+        field = self.perlin_noise_field([noise_seed], scale=scale, octaves=octaves, persistence=persistence)[0]
+        noise_val = 0.5 + ((field + 1) / 2 - 0.5) * amplitude
         
-        # Add noise variation
-        img = self.apply_perlin_noise(img, palette["variation"], scale=20.0, seed=seed)
+        pixels = np.array(img.convert('RGBA'))
         
-        # Add grass detail
-        self.add_grass_detail(img, palette, density=40, seed=seed)
+        # Interpolate between variation colors, leaving transparent pixels alone
+        color_min = np.array(variation_colors[0], dtype=np.float32)
+        color_max = np.array(variation_colors[1], dtype=np.float32)
+        blended = color_min + (color_max - color_min) * noise_val[..., np.newaxis]
+        opaque = pixels.any(axis=2)
+        pixels[opaque, :3] = blended[opaque].astype(np.uint8)
         
-        return img
+        return Image.fromarray(pixels, 'RGBA')
     
-    def generate_forest_tile(self, img, seed=None):
-        """Generate a forest terrain tile"""
-        # Start with a grass base
-        img = self.generate_grass_tile(img, seed)
-        palette = self.terrain_palettes["forest"]
-        
-        # Make it a bit darker overall
-        enhancer = ImageEnhance.Brightness(img)
-        img = enhancer.enhance(0.85)
-        
-        # Add tree base shapes (just random dark spots for now)
-        self.add_tree_spots(img, palette, density=3, seed=seed)
+    def perlin_noise_field(self, seeds, scale=20.0, octaves=2, persistence=0.5, size=None):
+        """
+        Generate tile-sized Perlin noise for several seeds at once
         
-        return img
+        Args:
+            seeds (list): One seed per field
+            scale (float): Noise periods across the tile
+            octaves (int): Number of noise octaves
+            persistence (float): Amplitude falloff between octaves
+            size (int): Field size in pixels, the tile size if None
+            
+        Returns:
+            numpy.ndarray: Noise of shape (len(seeds), size, size), roughly in -1..1
+        """
+        size = size or self.tile_size
+        
+        # One permutation table per seed, doubled to avoid wrapping indices
+        permutations = np.array([np.random.RandomState(seed % (2 ** 32)).permutation(256) for seed in seeds])
+        permutations = np.concatenate([permutations, permutations], axis=1)
+        
+        coords = np.arange(size, dtype=np.float64) / size * scale
+        x = coords[np.newaxis, np.newaxis, :]
+        y = coords[np.newaxis, :, np.newaxis]
+        
+        total = np.zeros((len(seeds), size, size))
+        frequency = 1.0
+        amplitude = 1.0
+        max_amplitude = 0.0
+        for _ in range(octaves):
+            total += self._perlin_octave(x * frequency, y * frequency, permutations) * amplitude
+            max_amplitude += amplitude
+            amplitude *= persistence
+            frequency *= 2.0
+        
+        return total / max_amplitude
     
-    def generate_mountain_tile(self, img, seed=None):
-        """Generate a mountain terrain tile"""
-        draw = ImageDraw.Draw(img)
-        palette = self.terrain_palettes["mountain"]
-        
-        # Fill base color
-        draw.rectangle([(0, 0), (self.tile_size, self.tile_size)], fill=palette["base"])
-        
-        # Add noise variation for rocky texture
-        img = self.apply_perlin_noise(img, palette["variation"], scale=10.0, octaves=4, seed=seed)
-        
-        # Add rocky detail
-        self.add_rocky_detail(img, palette, density=15, seed=seed)
-        
-        return img
+    def _perlin_octave(self, x, y, permutations):
+        """Evaluate one octave of 2D Perlin noise on a grid for every permutation table"""
+        batch = np.arange(len(permutations))[:, np.newaxis, np.newaxis]
+        x0 = np.floor(x)
+        y0 = np.floor(y)
+        xf = np.broadcast_to(x - x0, (1, y.shape[1], x.shape[2]))
+        yf = np.broadcast_to(y - y0, (1, y.shape[1], x.shape[2]))
+        xi = np.broadcast_to(x0.astype(int) & 255, xf.shape)
+        yi = np.broadcast_to(y0.astype(int) & 255, yf.shape)
+        
+        # Hash the four cell corners
+        a = permutations[batch, xi] + yi
+        b = permutations[batch, xi + 1] + yi
+        
+        u = xf * xf * xf * (xf * (xf * 6 - 15) + 10)
+        v = yf * yf * yf * (yf * (yf * 6 - 15) + 10)
+        
+        bottom = self._lerp(self._gradient(permutations[batch, a], xf, yf),
+                            self._gradient(permutations[batch, b], xf - 1, yf), u)
+        top = self._lerp(self._gradient(permutations[batch, a + 1], xf, yf - 1),
+                         self._gradient(permutations[batch, b + 1], xf - 1, yf - 1), u)
+        return self._lerp(bottom, top, v)
     
-    def generate_water_tile(self, img, seed=None):
-        """Generate a water terrain tile"""
-        draw = ImageDraw.Draw(img)
-        palette = self.terrain_palettes["water"]
-        
-        # Fill base color
-        draw.rectangle([(0, 0), (self.tile_size, self.tile_size)], fill=palette["base"])
-        
-        # Add noise variation for water ripples
-        # Use a lower amplitude noise to make it subtle
-        img = self.apply_perlin_noise(img, palette["variation"], scale=30.0, amplitude=0.5, seed=seed)
-        
-        # Add wave highlights
-        self.add_wave_detail(img, palette, density=10, seed=seed)
-        
-        return img
+    def _gradient(self, hashes, x, y):
+        """Dot the corner gradients with the offsets from the corners"""
+        index = hashes & 7
+        return self.GRADIENTS[:, 0].take(index) * x + self.GRADIENTS[:, 1].take(index) * y
     
-    def generate_desert_tile(self, img, seed=None):
-        """Generate a desert terrain tile"""
-        draw = ImageDraw.Draw(img)
-        palette = self.terrain_palettes["desert"]
-        
-        # Fill base color
-        draw.rectangle([(0, 0), (self.tile_size, self.tile_size)], fill=palette["base"])
-        
-        # Add noise variation for sandy texture
-        img = self.apply_perlin_noise(img, palette["variation"], scale=15.0, seed=seed)
-        
-        # Add sand dune detail
-        self.add_sand_detail(img, palette, density=8, seed=seed)
-        
-        return img
+    def _lerp(self, a, b, t):
+        """Linear interpolation between arrays"""
+        return a + (b - a) * t
     
-    def generate_snow_tile(self, img, seed=None):
-        """Generate a snow terrain tile"""
-        draw = ImageDraw.Draw(img)
-        palette = self.terrain_palettes["snow"]
-        
-        # Fill base color
-        draw.rectangle([(0, 0), (self.tile_size, self.tile_size)], fill=palette["base"])
+    def apply_octopath_style(self, img):
+        """Apply Octopath Traveler-inspired post-processing effects"""
+        # Increase contrast slightly
+        enhancer = ImageEnhance.Contrast(img)
+        img = enhancer.enhance(1.2)
         
-        # Add noise variation for snow texture
-        img = self.apply_perlin_noise(img, palette["variation"], scale=25.0, amplitude=0.3, seed=seed)
+        # Add a slight blur for anti-aliasing edges
+        img = img.filter(ImageFilter.GaussianBlur(0.5))
         
-        # Add snow detail (subtle sparkles)
-        self.add_snow_detail(img, palette, density=20, seed=seed)
+        # Re-sharpen to maintain pixel art feel
+        enhancer = ImageEnhance.Sharpness(img)
+        img = enhancer.enhance(1.3)
         
         return img
     
-    def apply_perlin_noise(self, img, variation_colors, scale=20.0, octaves=2, persistence=0.5, amplitude=1.0, seed=None):
-        """Apply Perlin noise variation to an image"""
-        if seed is not None:
-            noise_seed = seed
-        else:
-            noise_seed = random.randint(0, 1000)
-        
-        # Create a copy of the image to work with
-        result = img.copy()
-        pixels = result.load()
-        
-        # Get color variation range
-        color_min = variation_colors[0]
-        color_max = variation_colors[1]
-        
-        # Apply noise to each pixel
-        for y in range(self.tile_size):
-            for x in range(self.tile_size):
-                # Get Perlin noise value
-                nx = x / self.tile_size * scale
-                ny = y / self.tile_size * scale
-                noise_val = noise.pnoise2(nx, ny, octaves=octaves, persistence=persistence, base=noise_seed)
-                
-                # Normalize noise to 0-1 range
-                noise_val = (noise_val + 1) / 2
-                
-                # Adjust by amplitude
-                noise_val = 0.5 + (noise_val - 0.5) * amplitude
-                
-                # Get current pixel color
-                r, g, b, a = pixels[x, y]
-                
-                if (r, g, b, a) == (0, 0, 0, 0):  # If transparent, skip
-                    continue
-                
-                # Interpolate between variation colors based on noise
-                new_r = int(color_min[0] + (color_max[0] - color_min[0]) * noise_val)
-                new_g = int(color_min[1] + (color_max[1] - color_min[1]) * noise_val)
-                new_b = int(color_min[2] + (color_max[2] - color_min[2]) * noise_val)
-                
-                # Set new pixel color
-                pixels[x, y] = (new_r, new_g, new_b, a)
-        
-        return result
-    
-    def add_grass_detail(self, img, palette, density=30, seed=None):
-        """Add grass details to a terrain tile"""
-        if seed is not None:
-            random.seed(seed)
+    def synthesize_tiles(self, terrain_type, seeds):
+        """
+        Generate several tiles of one terrain type in a single array pass
         
-        draw = ImageDraw.Draw(img)
+        The noise of every tile is built at once, the palette is blended by
+        broadcasting and the details are stamped with masks, so the tiles
+        only reach PIL for the final post-processing.
         
-        # Add small grass clumps
-        for _ in range(density):
-            x = random.randint(0, self.tile_size - 1)
-            y = random.randint(0, self.tile_size - 1)
-            
-            # Randomize size
-            size = random.randint(1, 3)
-            
-            # Choose detail or highlight color
-            if random.random() < 0.7:
-                color = palette["detail"]
-            else:
-                color = palette["highlight"]
+        Args:
+            terrain_type (str): Type of terrain to generate
+            seeds (list): One seed per tile, None for a random seed
             
-            # Draw grass tuft
-            if random.random() < 0.5:
-                # Small lines
-                angle = random.uniform(0, math.pi)
-                x2 = x + size * math.cos(angle)
-                y2 = y + size * math.sin(angle)
-                draw.line([(x, y), (x2, y2)], fill=color, width=1)
-            else:
-                # Small dots
-                draw.point([(x, y)], fill=color)
-    
-    def add_tree_spots(self, img, palette, density=3, seed=None):
-        """Add tree base shapes to a forest tile"""
-        if seed is not None:
-            random.seed(seed)
+        Returns:
+            list: Generated PIL images, one per seed
+        """
+        if terrain_type not in self.tile_recipes:
+            raise ValueError(f"Unknown terrain type: {terrain_type}")
         
-        draw = ImageDraw.Draw(img)
+        seeds = [seed if seed is not None else random.randint(0, 2 ** 31 - 1) for seed in seeds]
+        
+        # Detail passes draw from one random stream per tile
+        rngs = [np.random.RandomState(seed % (2 ** 32)) for seed in seeds]
+        pixels = self._synthesize_pixels(terrain_type, seeds, rngs)
+        
+        alpha = np.full(pixels.shape[:3] + (1,), 255, dtype=np.uint8)
+        tiles = np.concatenate([np.clip(pixels, 0, 255).astype(np.uint8), alpha], axis=3)
+        
+        images = []
+        for tile in tiles:
+            img = self.apply_octopath_style(Image.fromarray(tile, 'RGBA'))
+            if self.pixel_scale > 1:
+                img = img.resize(
+                    (self.tile_size * self.pixel_scale, self.tile_size * self.pixel_scale),
+                    Image.NEAREST
+                )
+            images.append(img)
+        return images
+    
+    def _synthesize_pixels(self, terrain_type, seeds, rngs):
+        """
+        Build the RGB arrays of a batch of tiles from a terrain recipe
         
-        # Add tree bases as dark circles
-        for _ in range(density):
-            x = random.randint(5, self.tile_size - 5)
-            y = random.randint(5, self.tile_size - 5)
-            
-            # Randomize size
-            radius = random.randint(3, 8)
+        Args:
+            terrain_type (str): Type of terrain to generate
+            seeds (list): One seed per tile
+            rngs (list): One random stream per tile for the detail passes
             
-            # Draw tree base
-            draw.ellipse([(x-radius, y-radius), (x+radius, y+radius)], fill=palette["detail"])
+        Returns:
+            numpy.ndarray: Float colors of shape (tiles, size, size, 3)
+        """
+        recipe = self.tile_recipes[terrain_type]
+        if "base" in recipe:
+            pixels = self._synthesize_pixels(recipe["base"], seeds, rngs)
+        else:
+            # Blend between the palette's variation colors by the noise
+            noise_params = dict(recipe["noise"])
+            amplitude = noise_params.pop("amplitude", 1.0)
+            field = self.perlin_noise_field(seeds, **noise_params)
+            noise_val = 0.5 + ((field + 1) / 2 - 0.5) * amplitude
             
-            # Draw highlight on one side for 3D effect
-            highlight_angle = random.uniform(0, 2*math.pi)
-            hx = x + int(radius * 0.7 * math.cos(highlight_angle))
-            hy = y + int(radius * 0.7 * math.sin(highlight_angle))
-            draw.ellipse([(hx-1, hy-1), (hx+1, hy+1)], fill=palette["highlight"])
-    
-    def add_rocky_detail(self, img, palette, density=15, seed=None):
-        """Add rocky details to a mountain tile"""
-        if seed is not None:
-            random.seed(seed)
+            color_min, color_max = (np.array(color, dtype=np.float32)
+                                    for color in self.terrain_palettes[recipe["palette"]]["variation"])
+            pixels = np.floor(color_min + (color_max - color_min) * noise_val[..., np.newaxis]).astype(np.float32)
         
-        draw = ImageDraw.Draw(img)
+        if "brightness" in recipe:
+            pixels *= recipe["brightness"]
         
-        # Add rock shapes
-        for _ in range(density):
-            x = random.randint(5, self.tile_size - 5)
-            y = random.randint(5, self.tile_size - 5)
-            
-            # Randomize size
-            size = random.randint(2, 6)
-            
-            # Draw rock
-            if random.random() < 0.7:
-                # Angular rock
-                points = []
-                for i in range(5):
-                    angle = math.pi * 2 * i / 5 + random.uniform(0, 0.5)
-                    dist = size * (0.8 + random.random() * 0.4)
-                    px = x + dist * math.cos(angle)
-                    py = y + dist * math.sin(angle)
-                    points.append((px, py))
-                
-                # Choose detail or highlight color
-                if random.random() < 0.6:
-                    color = palette["detail"]
-                else:
-                    color = palette["highlight"]
-                    
-                draw.polygon(points, fill=color)
-            else:
-                # Simple circular rock
-                draw.ellipse([(x-size, y-size), (x+size, y+size)], fill=palette["detail"])
+        for detail, palette_name, density in recipe["details"]:
+            stamp = getattr(self, f"_stamp_{detail}")
+            stamp(pixels, self.terrain_palettes[palette_name], density, rngs)
+        return pixels
     
-    def add_wave_detail(self, img, palette, density=10, seed=None):
-        """Add wave details to a water tile"""
-        if seed is not None:
-            random.seed(seed)
+    def _pixel_grid(self, x0, y0, width, height):
+        """
+        Get the pixel coordinates of a window around every shape
         
-        draw = ImageDraw.Draw(img)
+        Args:
+            x0, y0: Top-left pixel of each window, of shape (tiles, shapes)
+            width (int): Window width in pixels
+            height (int): Window height in pixels
         
-        # Add wave highlights as curved lines
-        for _ in range(density):
-            x = random.randint(5, self.tile_size - 15)
-            y = random.randint(5, self.tile_size - 5)
-            
-            # Randomize size
-            width = random.randint(5, 15)
-            height = random.randint(1, 3)
-            
-            # Draw a curved wave
-            points = []
-            for i in range(5):
-                px = x + (width * i / 4)
-                py = y + height * math.sin(i * math.pi / 2)
-                points.append((px, py))
-            
-            draw.line(points, fill=palette["highlight"], width=1)
+        Returns:
+            tuple: X and Y coordinates of shape (tiles, shapes, height, width)
+        """
+        x0 = np.asarray(x0, dtype=int)[..., np.newaxis, np.newaxis]
+        y0 = np.asarray(y0, dtype=int)[..., np.newaxis, np.newaxis]
+        xs = x0 + np.arange(width)[np.newaxis, :]
+        ys = y0 + np.arange(height)[:, np.newaxis]
+        return np.broadcast_arrays(xs, ys)
     
-    def add_sand_detail(self, img, palette, density=8, seed=None):
-        """Add sand details to a desert tile"""
-        if seed is not None:
-            random.seed(seed)
+    def _stamp(self, pixels, grid, masks, colors):
+        """
+        Paint shapes into tiles, later shapes covering earlier ones
         
-        draw = ImageDraw.Draw(img)
+        Args:
+            pixels (numpy.ndarray): Tiles of shape (tiles, size, size, 3), modified in place
+            grid (tuple): Window coordinates from _pixel_grid
+            masks (numpy.ndarray): Shape coverage of the windows
+            colors (numpy.ndarray): Shape colors of shape (tiles, shapes, 3)
+        """
+        xs, ys = grid
+        size = self.tile_size
+        covered = masks & (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+        tile_index, shape_index, _, _ = np.nonzero(covered)
         
-        # Add sand ripples as curved lines
-        for _ in range(density):
-            x = random.randint(0, self.tile_size - 20)
-            y = random.randint(0, self.tile_size - 1)
-            
-            # Randomize size
-            width = random.randint(15, 30)
-            height = random.randint(1, 2)
-            
-            # Draw a curved sand ripple
-            points = []
-            for i in range(width):
-                px = x + i
-                # Slight curve for ripple effect
-                py = y + height * math.sin(i * math.pi / width)
-                points.append((px, py))
-            
-            # Choose detail or highlight color
-            if random.random() < 0.5:
-                color = palette["detail"]
-            else:
-                color = palette["highlight"]
-                
-            draw.line(points, fill=color, width=1)
+        # Covered pixels come out in shape order, so later shapes are written last
+        pixels[tile_index, ys[covered], xs[covered]] = colors[tile_index, shape_index]
     
-    def add_snow_detail(self, img, palette, density=20, seed=None):
-        """Add snow details to a snow tile"""
-        if seed is not None:
-            random.seed(seed)
-        
-        draw = ImageDraw.Draw(img)
-        
-        # Add snow sparkles as small dots
-        for _ in range(density):
-            x = random.randint(0, self.tile_size - 1)
-            y = random.randint(0, self.tile_size - 1)
-            
-            # Always use highlight color for sparkles
-            color = palette["highlight"]
-            
-            # Draw a small sparkle
-            if random.random() < 0.7:
-                # Single pixel
-                draw.point([(x, y)], fill=color)
-            else:
-                # Small cross
-                draw.line([(x-1, y), (x+1, y)], fill=color, width=1)
-                draw.line([(x, y-1), (x, y+1)], fill=color, width=1)
+    def _segment_masks(self, grid, x1, y1, x2, y2):
+        """Get the one pixel wide coverage of line segments within their windows"""
+        xs, ys = grid
+        x1, y1, x2, y2 = (np.asarray(v, dtype=np.float32)[..., np.newaxis, np.newaxis] for v in (x1, y1, x2, y2))
+        dx = x2 - x1
+        dy = y2 - y1
+        length_sq = np.maximum(dx * dx + dy * dy, 1e-6)
+        t = np.clip(((xs - x1) * dx + (ys - y1) * dy) / length_sq, 0.0, 1.0)
+        return np.hypot(xs - (x1 + t * dx), ys - (y1 + t * dy)) <= 0.5
     
-    def apply_octopath_style(self, img):
-        """Apply Octopath Traveler-inspired post-processing effects"""
-        # Increase contrast slightly
-        enhancer = ImageEnhance.Contrast(img)
-        img = enhancer.enhance(1.2)
-        
-        # Add a slight blur for anti-aliasing edges
-        img = img.filter(ImageFilter.GaussianBlur(0.5))
+    def _disc_masks(self, grid, x, y, radius):
+        """Get the coverage of filled circles within their windows"""
+        xs, ys = grid
+        x, y, radius = (np.asarray(v, dtype=np.float32)[..., np.newaxis, np.newaxis] for v in (x, y, radius))
+        return (xs - x) ** 2 + (ys - y) ** 2 <= radius ** 2
+    
+    def _polygon_masks(self, grid, x, y, vertices_x, vertices_y):
+        """
+        Get the coverage of polygons that are star-shaped around a center
         
-        # Re-sharpen to maintain pixel art feel
-        enhancer = ImageEnhance.Sharpness(img)
-        img = enhancer.enhance(1.3)
+        Args:
+            grid (tuple): Window coordinates from _pixel_grid
+            x, y: Centers of shape (tiles, shapes)
+            vertices_x, vertices_y: Vertices in angular order, of shape (tiles, shapes, vertices)
         
-        return img
+        Returns:
+            numpy.ndarray: Coverage of the windows
+        """
+        xs, ys = grid
+        cx = np.asarray(x, dtype=np.float32)[..., np.newaxis, np.newaxis]
+        cy = np.asarray(y, dtype=np.float32)[..., np.newaxis, np.newaxis]
+        
+        # Union of the triangles fanning out from the center
+        covered = np.zeros(xs.shape, dtype=bool)
+        count = vertices_x.shape[2]
+        for k in range(count):
+            ax = vertices_x[:, :, k, np.newaxis, np.newaxis]
+            ay = vertices_y[:, :, k, np.newaxis, np.newaxis]
+            bx = vertices_x[:, :, (k + 1) % count, np.newaxis, np.newaxis]
+            by = vertices_y[:, :, (k + 1) % count, np.newaxis, np.newaxis]
+            d1 = (ax - cx) * (ys - cy) - (ay - cy) * (xs - cx)
+            d2 = (bx - ax) * (ys - ay) - (by - ay) * (xs - ax)
+            d3 = (cx - bx) * (ys - by) - (cy - by) * (xs - bx)
+            covered |= ((d1 >= 0) & (d2 >= 0) & (d3 >= 0)) | ((d1 <= 0) & (d2 <= 0) & (d3 <= 0))
+        return covered
+    
+    def _choose_colors(self, choices, first, second):
+        """Pick one of two colors per shape from boolean choices"""
+        return np.where(np.asarray(choices)[..., np.newaxis], np.array(first, dtype=np.float32),
+                        np.array(second, dtype=np.float32))
+    
+    def _uniform_colors(self, color, shape):
+        """Get the same color for every shape"""
+        return np.broadcast_to(np.array(color, dtype=np.float32), tuple(shape) + (3,))
+    
+    def _stamp_grass(self, pixels, palette, density, rngs):
+        """Stamp grass tufts: short lines and dots"""
+        size = self.tile_size
+        x = np.array([rng.randint(0, size, density) for rng in rngs])
+        y = np.array([rng.randint(0, size, density) for rng in rngs])
+        length = np.array([rng.randint(1, 4, density) for rng in rngs])
+        detail = np.array([rng.random_sample(density) < 0.7 for rng in rngs])
+        line = np.array([rng.random_sample(density) < 0.5 for rng in rngs])
+        angle = np.array([rng.uniform(0, math.pi, density) for rng in rngs])
+        
+        # Dots are lines of zero length
+        length = np.where(line, length, 0)
+        grid = self._pixel_grid(x - 3, y - 3, 7, 7)
+        masks = self._segment_masks(grid, x, y, x + length * np.cos(angle), y + length * np.sin(angle))
+        self._stamp(pixels, grid, masks, self._choose_colors(detail, palette["detail"], palette["highlight"]))
+    
+    def _stamp_trees(self, pixels, palette, density, rngs):
+        """Stamp tree bases as dark discs with a highlight on one side"""
+        size = self.tile_size
+        x = np.array([rng.randint(5, size - 4, density) for rng in rngs])
+        y = np.array([rng.randint(5, size - 4, density) for rng in rngs])
+        radius = np.array([rng.randint(3, 9, density) for rng in rngs])
+        angle = np.array([rng.uniform(0, 2 * math.pi, density) for rng in rngs])
+        hx = x + (radius * 0.7 * np.cos(angle)).astype(int)
+        hy = y + (radius * 0.7 * np.sin(angle)).astype(int)
+        
+        # Interleave each base with its highlight so the next tree covers both
+        centers_x = np.stack([x, hx], axis=2).reshape(len(rngs), density * 2)
+        centers_y = np.stack([y, hy], axis=2).reshape(len(rngs), density * 2)
+        radii = np.stack([radius, np.ones_like(radius)], axis=2).reshape(len(rngs), density * 2)
+        grid = self._pixel_grid(centers_x - 8, centers_y - 8, 17, 17)
+        masks = self._disc_masks(grid, centers_x, centers_y, radii)
+        colors = np.tile(np.array([palette["detail"], palette["highlight"]], dtype=np.float32), (len(rngs), density, 1))
+        self._stamp(pixels, grid, masks, colors)
+    
+    def _stamp_rocks(self, pixels, palette, density, rngs):
+        """Stamp rocks: angular pentagons and round stones"""
+        size = self.tile_size
+        x = np.array([rng.randint(5, size - 4, density) for rng in rngs])
+        y = np.array([rng.randint(5, size - 4, density) for rng in rngs])
+        radius = np.array([rng.randint(2, 7, density) for rng in rngs])
+        angular = np.array([rng.random_sample(density) < 0.7 for rng in rngs])
+        detail = np.array([rng.random_sample(density) < 0.6 for rng in rngs])
+        jitter = np.array([rng.uniform(0, 0.5, (density, 5)) for rng in rngs])
+        spread = np.array([0.8 + rng.random_sample((density, 5)) * 0.4 for rng in rngs])
+        
+        angles = math.pi * 2 * np.arange(5) / 5 + jitter
+        distance = radius[..., np.newaxis] * spread
+        vertices_x = x[..., np.newaxis] + distance * np.cos(angles)
+        vertices_y = y[..., np.newaxis] + distance * np.sin(angles)
+        
+        grid = self._pixel_grid(x - 8, y - 8, 17, 17)
+        masks = np.where(angular[..., np.newaxis, np.newaxis],
+                         self._polygon_masks(grid, x, y, vertices_x, vertices_y),
+                         self._disc_masks(grid, x, y, radius))
+        colors = self._choose_colors(detail | ~angular, palette["detail"], palette["highlight"])
+        self._stamp(pixels, grid, masks, colors)
+    
+    def _stamp_waves(self, pixels, palette, density, rngs):
+        """Stamp wave highlights as one period of a sine polyline"""
+        size = self.tile_size
+        x = np.array([rng.randint(5, size - 14, density) for rng in rngs])
+        y = np.array([rng.randint(5, size - 4, density) for rng in rngs])
+        width = np.array([rng.randint(5, 16, density) for rng in rngs])
+        height = np.array([rng.randint(1, 4, density) for rng in rngs])
+        
+        # Five points a quarter period apart, joined by four segments
+        grid = self._pixel_grid(x, y - 4, 16, 9)
+        masks = np.zeros(grid[0].shape, dtype=bool)
+        for step in range(4):
+            x1 = x + width * step / 4
+            x2 = x + width * (step + 1) / 4
+            y1 = y + height * math.sin(step * math.pi / 2)
+            y2 = y + height * math.sin((step + 1) * math.pi / 2)
+            masks |= self._segment_masks(grid, x1, y1, x2, y2)
+        self._stamp(pixels, grid, masks, self._uniform_colors(palette["highlight"], x.shape))
+    
+    def _stamp_sand(self, pixels, palette, density, rngs):
+        """Stamp sand ripples as half a sine period"""
+        size = self.tile_size
+        x = np.array([rng.randint(0, size - 19, density) for rng in rngs])
+        y = np.array([rng.randint(0, size, density) for rng in rngs])
+        width = np.array([rng.randint(15, 31, density) for rng in rngs])
+        height = np.array([rng.randint(1, 3, density) for rng in rngs])
+        detail = np.array([rng.random_sample(density) < 0.5 for rng in rngs])
+        
+        # The ripple covers one pixel per column along its curve
+        grid = self._pixel_grid(x, y, 31, 4)
+        xs, ys = grid
+        offset = xs - x[..., np.newaxis, np.newaxis]
+        width = width[..., np.newaxis, np.newaxis]
+        curve = y[..., np.newaxis, np.newaxis] + height[..., np.newaxis, np.newaxis] * np.sin(offset * math.pi / width)
+        masks = (offset < width) & (np.abs(ys - curve) <= 0.5)
+        self._stamp(pixels, grid, masks, self._choose_colors(detail, palette["detail"], palette["highlight"]))
+    
+    def _stamp_sparkles(self, pixels, palette, density, rngs):
+        """Stamp snow sparkles: single pixels and small crosses"""
+        size = self.tile_size
+        x = np.array([rng.randint(0, size, density) for rng in rngs])
+        y = np.array([rng.randint(0, size, density) for rng in rngs])
+        cross = np.array([rng.random_sample(density) >= 0.7 for rng in rngs]).astype(int)
+        
+        # A single pixel is a cross with zero-length arms
+        grid = self._pixel_grid(x - 1, y - 1, 3, 3)
+        masks = (self._segment_masks(grid, x - cross, y, x + cross, y) |
+                 self._segment_masks(grid, x, y - cross, x, y + cross))
+        self._stamp(pixels, grid, masks, self._uniform_colors(palette["highlight"], x.shape))
     
-    def generate_tileset(self, terrain_type, variations=5, seed=None):
+    def generate_tileset(self, terrain_type, variations=5, seed=None, batched=True):
         """
         Generate a set of terrain tiles of the specified type
         
@@ -471,11 +517,12 @@ class TerrainGenerator:
             terrain_type (str): Type of terrain to generate
             variations (int): Number of tile variations to generate
             seed (int): Base random seed for deterministic generation
+            batched (bool): Render all variations in one array pass
             
         Returns:
             list: List of generated tile images
         """
-        tiles = []
+        seeds = []
         
         for i in range(variations):
             if seed is not None:
@@ -483,10 +530,85 @@ class TerrainGenerator:
                 var_seed = seed + i * 100
             else:
                 var_seed = None
-                
-            tile = self.generate_tile(terrain_type, seed=var_seed)
-            tiles.append(tile)
+            seeds.append(var_seed)
+        
+        if self.cache is not None and None not in seeds:
+            return self._generate_cached_tileset(terrain_type, seeds, batched)
+        
+        if batched:
+            return self.synthesize_tiles(terrain_type, seeds)
+        return [self.generate_tile(terrain_type, seed=var_seed) for var_seed in seeds]
+    
+    def get_recipe_params(self, terrain_type):
+        """
+        Get everything a tile of the given type depends on, for cache keys
+        
+        Args:
+            terrain_type (str): Type of terrain
+            
+        Returns:
+            dict: The recipe, the recipes it builds on, every palette they
+                use and the tile size and scale
+        """
+        recipes = []
+        palette_names = {terrain_type}
+        recipe_type = terrain_type
+        while recipe_type is not None:
+            recipe = self.tile_recipes[recipe_type]
+            recipes.append(recipe)
+            palette_names.add(recipe_type)
+            if "palette" in recipe:
+                palette_names.add(recipe["palette"])
+            palette_names.update(palette_name for _, palette_name, _ in recipe["details"])
+            recipe_type = recipe.get("base")
+        
+        return {
+            "terrain_type": terrain_type,
+            "recipes": recipes,
+            "palettes": {name: self.terrain_palettes.get(name) for name in sorted(palette_names)},
+            "tile_size": self.tile_size,
+            "pixel_scale": self.pixel_scale
+        }
+    
+    def _generate_cached_tileset(self, terrain_type, seeds, batched):
+        """
+        Load the cached tiles of a tileset and synthesize only the missing ones
+        
+        Args:
+            terrain_type (str): Type of terrain
+            seeds (list): Seed of each tile
+            batched (bool): Render the missing tiles in one array pass
             
+        Returns:
+            list: List of tile images
+        """
+        asset_id = f"{terrain_type}_tile"
+        params = self.get_recipe_params(terrain_type)
+        version = get_generator_version(self)
+        keys = [self.cache.make_key(type(self).__name__, version, asset_id, params, var_seed) for var_seed in seeds]
+        
+        tiles = [None] * len(seeds)
+        missing = []
+        for i, key in enumerate(keys):
+            hit, tile = self.cache.get(key)
+            if hit:
+                tiles[i] = tile
+            else:
+                missing.append(i)
+        
+        if missing:
+            missing_seeds = [seeds[i] for i in missing]
+            if batched:
+                new_tiles = self.synthesize_tiles(terrain_type, missing_seeds)
+            else:
+                new_tiles = [self.generate_tile(terrain_type, seed=var_seed) for var_seed in missing_seeds]
+            
+            # One manifest write for the whole tileset
+            for i, tile in zip(missing, new_tiles):
+                tiles[i] = tile
+                self.cache.put(keys[i], tile, {"generator": type(self).__name__, "asset_id": asset_id}, flush=False)
+            self.cache.flush()
+        
         return tiles
     
     def save_tile(self, tile, filename):
@@ -510,6 +632,20 @@ class TerrainGenerator:
         """
         Generate a terrain asset with caching support
         
+        Args:
+            asset_id (str): Identifier for the asset
+            params (dict): Parameters for generation
+            seed (int): Random seed for generation
+            
+        Returns:
+            PIL.Image: The generated or cached terrain
+        """
+        return generate_cached(self, asset_id, params, seed)
+    
+    def generate(self, asset_id, params=None, seed=None):
+        """
+        Generate a terrain asset
+        
         Args:
             asset_id (str): Identifier for the asset
             params (dict): Parameters for generation
@@ -518,8 +654,7 @@ class TerrainGenerator:
         Returns:
             PIL.Image: The generated terrain
         """
-        if params is None:
-            params = {}
+        params = dict(params) if params else {}
         
         # Extract terrain type from asset_id if not in params
         if "terrain_type" not in params:
@@ -569,13 +704,14 @@ class TerrainGenerator:
         except Exception as e:
             print(f"Error saving metadata: {e}")
     
-    def generate_all_terrain_types(self, variations_per_type=3, seed=None):
+    def generate_all_terrain_types(self, variations_per_type=3, seed=None, batched=True):
         """
         Generate tiles for all terrain types
         
         Args:
             variations_per_type (int): Number of variations per terrain type
             seed (int): Base random seed
+            batched (bool): Render the variations of each type in one array pass
             
         Returns:
             dict: Dictionary of terrain_type -> list of tile images
@@ -585,11 +721,12 @@ class TerrainGenerator:
         for terrain_type in self.terrain_palettes.keys():
             if seed is not None:
                 # Use different but deterministic seeds for each type
-                type_seed = seed + hash(terrain_type) % 1000
+                type_seed = seed + zlib.crc32(terrain_type.encode()) % 1000
             else:
                 type_seed = None
                 
-            all_tiles[terrain_type] = self.generate_tileset(terrain_type, variations=variations_per_type, seed=type_seed)
+            all_tiles[terrain_type] = self.generate_tileset(terrain_type, variations=variations_per_type,
+                                                            seed=type_seed, batched=batched)
             
         return all_tiles
 
@@ -597,7 +734,8 @@ class TerrainGenerator:
 def main():
     """Generate and save example terrain tiles"""
     output_dir = os.path.join("src", "assets", "generated", "environment")
-    generator = TerrainGenerator(output_dir)
+    cache = AssetCache()
+    generator = TerrainGenerator(output_dir, cache=cache)
     
     # Generate tiles for each terrain type
     all_tiles = generator.generate_all_terrain_types(variations_per_type=3, seed=42)
@@ -605,9 +743,12 @@ def main():
     # Save all generated tiles
     for terrain_type, tiles in all_tiles.items():
         for i, tile in enumerate(tiles):
-            filename = f"{terrain_type}_tile_{i+1}.png"
+            filename = os.path.join(generator.terrain_dirs[terrain_type], f"{terrain_type}_tile_{i+1}.png")
             generator.save_tile(tile, filename)
             print(f"Generated {terrain_type} tile {i+1}")
+    
+    cache.flush()
+    print(f"Asset cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses")
 
 
 if __name__ == "__main__":
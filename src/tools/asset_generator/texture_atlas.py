@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Texture Atlas for Nightfall Defenders
+Regroupe les frames des effets et des animations dans un atlas global
+"""
+
+import os
+import json
+from PIL import Image
+
+class TextureAtlas:
+    """
+    Atlas de textures global avec index de placement
+    
+    Les frames de tous les sprites ajoutés sont rangées par étagères
+    (shelf packing), des plus hautes aux plus basses, dans des pages dont
+    les côtés sont des puissances de deux. L'index JSON associe à chaque
+    sprite la page et le rectangle de chacune de ses frames, pour que le
+    jeu lie une seule texture au lieu de nombreuses petites planches.
+    """
+    
+    def __init__(self, max_size=4096, padding=1):
+        """
+        Initialise l'atlas
+        
+        Args:
+            max_size (int): Côté maximal d'une page en pixels
+            padding (int): Marge transparente autour de chaque frame
+        """
+        self.max_size = max_size
+        self.padding = padding
+        self.sprites = {}
+    
+    def add_frames(self, name, frames, metadata=None):
+        """
+        Ajoute les frames d'un sprite ; un sprite du même nom est remplacé
+        
+        Args:
+            name (str): Nom du sprite dans l'index
+            frames (list): Images PIL des frames
+            metadata (dict, optional): Informations ajoutées à l'entrée de l'index
+        """
+        self.sprites[name] = {
+            "frames": [frame.convert("RGBA") for frame in frames],
+            "metadata": dict(metadata or {})
+        }
+    
+    def _next_power_of_two(self, value):
+        """Plus petite puissance de deux supérieure ou égale à une valeur"""
+        size = 1
+        while size < value:
+            size *= 2
+        return size
+    
+    def pack(self):
+        """
+        Range toutes les frames dans les pages de l'atlas
+        
+        Returns:
+            tuple: (liste des pages PIL, index du placement)
+        
+        Raises:
+            ValueError: Si une frame est plus grande qu'une page
+        """
+        pad = self.padding
+        rects = []
+        for name in sorted(self.sprites):
+            for index, frame in enumerate(self.sprites[name]["frames"]):
+                width, height = frame.size
+                if width + 2 * pad > self.max_size or height + 2 * pad > self.max_size:
+                    raise ValueError(f"Frame {index} of {name} ({width}x{height}) does not fit in a {self.max_size} atlas page")
+                rects.append((height, width, name, index))
+        
+        # Les plus hautes d'abord, pour des étagères bien remplies
+        rects.sort(key=lambda rect: (-rect[0], -rect[1], rect[2], rect[3]))
+        
+        total_area = sum((height + 2 * pad) * (width + 2 * pad) for height, width, _, _ in rects)
+        widest = max((width + 2 * pad for _, width, _, _ in rects), default=1)
+        page_width = min(self.max_size, max(self._next_power_of_two(int(total_area ** 0.5)),
+                                            self._next_power_of_two(widest)))
+        
+        placements = {}
+        page_heights = []
+        page, x, y, shelf_height = 0, 0, 0, 0
+        for height, width, name, index in rects:
+            cell_width, cell_height = width + 2 * pad, height + 2 * pad
+            
+            # Nouvelle étagère, puis nouvelle page si la page est pleine
+            if x + cell_width > page_width:
+                x, y = 0, y + shelf_height
+                shelf_height = 0
+            if y + cell_height > self.max_size:
+                page_heights.append(y)
+                page, x, y, shelf_height = page + 1, 0, 0, 0
+            
+            placements[(name, index)] = (page, x + pad, y + pad, width, height)
+            x += cell_width
+            shelf_height = max(shelf_height, cell_height)
+        page_heights.append(y + shelf_height)
+        
+        pages = [Image.new("RGBA", (page_width, self._next_power_of_two(max(height, 1))), (0, 0, 0, 0))
+                 for height in page_heights]
+        
+        index = {"pages": [list(page_image.size) for page_image in pages], "sprites": {}}
+        for name in sorted(self.sprites):
+            sprite = self.sprites[name]
+            entry = dict(sprite["metadata"])
+            entry["frames"] = []
+            for frame_index, frame in enumerate(sprite["frames"]):
+                page, x, y, width, height = placements[(name, frame_index)]
+                pages[page].paste(frame, (x, y))
+                entry["frames"].append([page, x, y, width, height])
+            index["sprites"][name] = entry
+        
+        return pages, index
+    
+    def save(self, directory, name="atlas"):
+        """
+        Sauvegarde les pages de l'atlas et leur index
+        
+        Args:
+            directory (str): Répertoire de sortie
+            name (str): Préfixe des fichiers
+        
+        Returns:
+            str: Chemin du fichier d'index, ou None si l'atlas est vide
+        """
+        if not self.sprites:
+            return None
+        
+        os.makedirs(directory, exist_ok=True)
+        pages, index = self.pack()
+        
+        page_files = []
+        for page_number, page in enumerate(pages):
+            filename = f"{name}_{page_number}.png"
+            page.save(os.path.join(directory, filename), "PNG")
+            page_files.append(filename)
+        index["page_files"] = page_files
+        
+        index_path = os.path.join(directory, f"{name}.json")
+        with open(index_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        return index_path
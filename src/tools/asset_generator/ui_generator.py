@@ -12,6 +12,8 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFilter, ImageEnhance, ImageChops
 import math
 
+from src.tools.asset_generator.asset_cache import generate_cached
+
 class UIGenerator:
     """Generator for UI elements like backgrounds, buttons, panels"""
     
@@ -23,6 +25,7 @@ class UIGenerator:
             output_dir (str): Directory to save generated UI elements
         """
         self.output_dir = output_dir
+        self.cache = None
         os.makedirs(output_dir, exist_ok=True)
         
         # Set default sizes
@@ -54,6 +57,20 @@ class UIGenerator:
         """
         Generate a UI asset with caching support
         
+        Args:
+            asset_id (str): Identifier for the asset
+            params (dict): Parameters for generation
+            seed (int): Random seed for generation
+            
+        Returns:
+            PIL.Image: The generated or cached UI element
+        """
+        return generate_cached(self, asset_id, params, seed)
+    
+    def generate(self, asset_id, params=None, seed=None):
+        """
+        Generate a UI asset
+        
         Args:
             asset_id (str): Identifier for the asset
             params (dict): Parameters for generation
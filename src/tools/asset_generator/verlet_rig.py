@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Verlet Rig for Nightfall Defenders
+Squelettes 2D en tableaux, simulés par intégration de Verlet sur des lots de séquences
+"""
+
+import numpy as np
+
+class VerletRig:
+    """
+    Squelette 2D dont les points et les contraintes sont des tableaux d'indices
+    
+    Un même squelette simule d'un coup un lot de séquences (par exemple
+    toutes les classes de personnages pour un type d'animation) : les
+    positions ont la forme (séquences, points, 2) et chaque étape de
+    l'intégration ou de la résolution des contraintes est une opération
+    NumPy sur tout le lot. Seule la boucle sur les frames reste en Python.
+    
+    Chaque point suit sa position cible avec un poids entre 0 (point
+    purement physique) et 1 (point piloté par la pose) ; la gravité et
+    les contraintes de distance donnent le mouvement secondaire.
+    """
+    
+    def __init__(self, point_names, masses, constraints, gravity=0.5, friction=0.95, stiffness=0.5, iterations=5):
+        """
+        Initialise le squelette
+        
+        Args:
+            point_names (list): Noms des points, dans l'ordre des tableaux
+            masses (list): Masse de chaque point
+            constraints (list): Paires (nom du point 1, nom du point 2) liées par une distance
+            gravity (float): Accélération verticale par frame
+            friction (float): Conservation de la vitesse d'une frame à l'autre
+            stiffness (float): Raideur des contraintes de distance
+            iterations (int): Passes de résolution des contraintes par frame
+        """
+        self.point_names = list(point_names)
+        self.index = {name: i for i, name in enumerate(self.point_names)}
+        self.masses = np.asarray(masses, dtype=np.float32)
+        self.first = np.array([self.index[p1] for p1, _ in constraints], dtype=np.int64)
+        self.second = np.array([self.index[p2] for _, p2 in constraints], dtype=np.int64)
+        self.gravity = gravity
+        self.friction = friction
+        self.stiffness = stiffness
+        self.iterations = iterations
+    
+    def rest_lengths(self, positions):
+        """
+        Calcule la longueur des contraintes pour des positions de repos
+        
+        Args:
+            positions (numpy.ndarray): Positions de forme (..., points, 2)
+        
+        Returns:
+            numpy.ndarray: Longueurs de forme (..., contraintes)
+        """
+        positions = np.asarray(positions, dtype=np.float32)
+        return np.linalg.norm(positions[..., self.second, :] - positions[..., self.first, :], axis=-1)
+    
+    def _satisfy_constraints(self, positions, rest, inverse_mass):
+        """Projette les contraintes de distance, séquentiellement mais sur tout le lot"""
+        for _ in range(self.iterations):
+            for c in range(self.first.size):
+                p1, p2 = self.first[c], self.second[c]
+                delta = positions[:, p2] - positions[:, p1]
+                current = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 0.01)
+                difference = (rest[:, c] - current) / current
+                
+                # Répartition selon les masses ; un point piloté ne bouge pas
+                w1, w2 = inverse_mass[:, p1], inverse_mass[:, p2]
+                total = np.maximum(w1 + w2, 1e-6)
+                correction = delta * (0.5 * self.stiffness * difference / total)[:, np.newaxis]
+                positions[:, p1] -= correction * w1[:, np.newaxis]
+                positions[:, p2] += correction * w2[:, np.newaxis]
+    
+    def simulate(self, targets, weights, rest=None, settle_frames=4, cycles=1):
+        """
+        Simule des séquences de frames pilotées par des poses cibles
+        
+        Args:
+            targets (numpy.ndarray): Positions cibles de forme (séquences, frames, points, 2)
+            weights (numpy.ndarray): Poids de suivi des cibles, de forme (points,) ou (séquences, points)
+            rest (numpy.ndarray, optional): Longueurs des contraintes, de forme
+                (contraintes,) ou (séquences, contraintes) ; prises sur la première cible par défaut
+            settle_frames (int): Frames simulées sur la première pose avant l'enregistrement
+            cycles (int): Nombre de passages sur la séquence ; seul le dernier est
+                enregistré, ce qui raccorde les animations en boucle
+        
+        Returns:
+            numpy.ndarray: Positions simulées de forme (séquences, frames, points, 2)
+        """
+        targets = np.asarray(targets, dtype=np.float32)
+        count, frame_count, point_count = targets.shape[:3]
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float32), (count, point_count))
+        if rest is None:
+            rest = self.rest_lengths(targets[:, 0])
+        rest = np.broadcast_to(np.asarray(rest, dtype=np.float32), (count, self.first.size))
+        
+        # Les points entièrement pilotés ont une masse infinie pour les contraintes
+        inverse_mass = (1.0 - weights) / self.masses
+        fall = self.gravity / self.masses
+        
+        positions = targets[:, 0].copy()
+        old_positions = positions.copy()
+        recorded = np.empty_like(targets)
+        
+        schedule = [0] * settle_frames + list(range(frame_count)) * cycles
+        record_from = len(schedule) - frame_count
+        for step, frame in enumerate(schedule):
+            # Intégration de Verlet
+            velocity = (positions - old_positions) * self.friction
+            old_positions[...] = positions
+            positions += velocity
+            positions[..., 1] += fall
+            
+            # Attraction vers la pose, puis contraintes
+            positions += (targets[:, frame] - positions) * weights[..., np.newaxis]
+            self._satisfy_constraints(positions, rest, inverse_mass)
+            
+            if step >= record_from:
+                recorded[:, frame] = positions
+        return recorded
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Definitions Compiler for Nightfall Defenders
+Compiles the skill, ability, relic, fusion and harmonization tables into the store the game loads
+"""
+
+import os
+import sys
+import argparse
+
+# The game modules import each other through the game package
+src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from game.definitions import DEFAULT_PATH, compile_definitions
+
+def main():
+    """Compile the definition tables"""
+    parser = argparse.ArgumentParser(description="Compile the game definition tables")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="Path of the compiled definitions")
+    args = parser.parse_args()
+    
+    counts = compile_definitions(args.output)
+    for name, count in counts.items():
+        print(f"{name}: {count} entries")
+    print(f"Definitions written to {args.output}")
+
+if __name__ == "__main__":
+    main()